@@ -0,0 +1,24 @@
+"""
+Benchmarks
+Synthetic board generation and performance measurement for the parsers,
+DRC engine and rule engines
+
+Run with scripts/benchmark_suite.py.
+"""
+from .synthetic import BoardSpec, WRITERS, write_project, kicad_board_text
+from .suite import BenchmarkSuite, Measurement, OfflineHybridParser, scaling_exponents
+from .baseline import compare, load_baseline, save_baseline
+
+__all__ = [
+    "BoardSpec",
+    "WRITERS",
+    "write_project",
+    "kicad_board_text",
+    "BenchmarkSuite",
+    "Measurement",
+    "OfflineHybridParser",
+    "scaling_exponents",
+    "compare",
+    "load_baseline",
+    "save_baseline",
+]
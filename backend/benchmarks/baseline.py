@@ -0,0 +1,88 @@
+"""
+Benchmark Baselines
+Saves suite results as JSON and compares a new run against them
+
+Times are normalised by the calibration workload (benchmarks.suite.calibrate)
+recorded with each run, so a baseline taken on one machine stays usable on
+another of different speed. Peak memory is compared as is.
+"""
+import json
+import platform
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from benchmarks.suite import Measurement
+
+BASELINE_VERSION = 1
+
+
+@dataclass
+class Regression:
+    key: str
+    metric: str  # "seconds" or "peak_mb"
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def __str__(self) -> str:
+        unit = "s" if self.metric == "seconds" else " MB"
+        return (f"{self.key}: {self.metric} {self.baseline:.4g}{unit} -> {self.current:.4g}{unit} "
+                f"({(self.ratio - 1) * 100:+.0f}%)")
+
+
+def save_baseline(path: Path, results: Sequence[Measurement], calibration_seconds: float,
+                  settings: Optional[Dict] = None):
+    """Write results (errored cases excluded) to a baseline file"""
+    data = {
+        "version": BASELINE_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "calibration_seconds": calibration_seconds,
+        "settings": settings or {},
+        "results": {m.key: m.to_dict() for m in results if not m.error},
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def load_baseline(path: Path) -> Dict:
+    data = json.loads(Path(path).read_text())
+    if data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version {data.get('version')!r} in {path}")
+    return data
+
+
+def compare(
+    results: Sequence[Measurement],
+    baseline: Dict,
+    calibration_seconds: float,
+    time_tolerance: float = 0.25,
+    memory_tolerance: float = 0.20,
+    min_seconds: float = 0.005,
+) -> List[Regression]:
+    """
+    Cases slower or hungrier than the baseline by more than the tolerance
+
+    Cases faster than min_seconds in the baseline are not checked for time;
+    at that scale timer noise dominates.
+    """
+    scale = calibration_seconds / baseline["calibration_seconds"] if baseline.get("calibration_seconds") else 1.0
+    regressions = []
+    for m in results:
+        base = baseline["results"].get(m.key)
+        if base is None or m.error:
+            continue
+        expected_seconds = base["seconds"] * scale
+        if base["seconds"] >= min_seconds and m.seconds > expected_seconds * (1 + time_tolerance):
+            regressions.append(Regression(m.key, "seconds", expected_seconds, m.seconds))
+        if base.get("peak_mb") and m.peak_mb is not None and m.peak_mb > base["peak_mb"] * (1 + memory_tolerance):
+            regressions.append(Regression(m.key, "peak_mb", base["peak_mb"], m.peak_mb))
+    return regressions
@@ -0,0 +1,281 @@
+"""
+Benchmark Suite
+Times the parsing and analysis pipeline on synthetic boards
+
+Cases (each run at every board size):
+- hybrid_parser:           HybridParser.parse on the KiCad project
+- universal_parser:<fmt>:  UniversalParser.parse per synthetic format
+- parser_bridge:<tool>:    ParserBridge.parse_to_canonical (KiCad, Gerber)
+- drc_v2:                  DRCEngineV2.run_full_analysis on the canonical board
+- rule:<Engine>:           each rule engine's analyze() on the parsed board
+
+The GPT semantic pass of HybridParser is skipped (OfflineHybridParser), so
+runs are deterministic and need no network.
+"""
+import gc
+import logging
+import math
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.synthetic import WRITERS, BoardSpec, write_project
+from config import get_settings
+from parsers.base_parser import ParsedPCBData
+from parsers.format_detector import EDAToolFamily
+from parsers.hybrid_parser import HybridParser
+from parsers.kicad_sch_parser import KiCadSchematicParser
+from rules import (
+    MainsSafetyRules,
+    BusInterfaceRules,
+    PowerSMPSRules,
+    BOMValidationRules,
+    HighSpeedInterfaceRules,
+    ThermalAnalysisRules,
+    BOMSanityRules,
+    AssemblyTestRules,
+)
+from services.rule_scheduler import RuleSpec
+
+logger = logging.getLogger(__name__)
+
+# Parser output fields compared against the generator's counts, per case.
+# Only what each parser is meant to extract from the synthetic format.
+PARSER_CHECKS = {
+    "hybrid_parser": ("components", "nets", "tracks", "vias", "zones"),
+    "universal_parser:kicad": ("components", "nets", "tracks", "vias", "zones"),
+    "universal_parser:ipc2581": ("components", "nets", "tracks", "vias"),
+    "universal_parser:odbpp": ("components", "nets", "tracks", "vias", "zones"),
+    "universal_parser:gerber": ("components", "nets", "tracks", "vias", "zones"),
+}
+
+
+def rule_specs(fab_profile: str = "cheap_cn_8mil") -> List[RuleSpec]:
+    """Same engines and arguments as AnalysisService._run_rule_engines"""
+    return [
+        RuleSpec(MainsSafetyRules, (fab_profile,)),
+        RuleSpec(BusInterfaceRules, (fab_profile,)),
+        RuleSpec(PowerSMPSRules, (fab_profile,)),
+        RuleSpec(BOMSanityRules, (fab_profile,)),
+        RuleSpec(AssemblyTestRules, (fab_profile,)),
+        RuleSpec(BOMValidationRules),
+        RuleSpec(HighSpeedInterfaceRules, (fab_profile,)),
+        RuleSpec(ThermalAnalysisRules, kwargs={"copper_oz": 1.0}),
+    ]
+
+
+class OfflineHybridParser(HybridParser):
+    """HybridParser without the GPT semantic classification"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.client = None
+        self.sch_parser = KiCadSchematicParser()
+
+    def _classify_semantics_gpt(self, geometric_data: Dict, pcb_sample: str) -> Dict:
+        return {}
+
+
+def parsed_counts(data: ParsedPCBData) -> Dict[str, int]:
+    return {
+        "components": len(data.components),
+        "nets": len(data.nets),
+        "tracks": len(data.tracks),
+        "vias": len(data.vias),
+        "zones": len(data.zones),
+    }
+
+
+@dataclass
+class Measurement:
+    """One case at one board size"""
+    case: str
+    components: int
+    objects: int
+    seconds: float
+    peak_mb: Optional[float] = None
+    counts: Dict[str, int] = field(default_factory=dict)
+    mismatches: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}@{self.components}"
+
+    @property
+    def throughput(self) -> float:
+        """Board objects (components + segments + vias) per second"""
+        return self.objects / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {"seconds": self.seconds, "peak_mb": self.peak_mb, "objects": self.objects}
+
+
+@dataclass
+class _Case:
+    name: str
+    run: Callable[[], object]
+    counts: Optional[Callable[[object], Dict[str, int]]] = None
+    expected: Optional[Dict[str, int]] = None
+
+
+def time_best(fn: Callable[[], object], repeat: int) -> Tuple[object, float]:
+    """Best-of-N wall time (GC collected between runs, not during timing)"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def peak_memory_mb(fn: Callable[[], object]) -> float:
+    """Peak Python heap allocated during one call (tracemalloc)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def calibrate(repeat: int = 5) -> float:
+    """
+    Time a fixed pure-Python workload
+
+    Stored with a baseline so a comparison on a faster or slower machine
+    scales the baseline's times instead of flagging everything.
+    """
+    def workload():
+        values = [(i * 7919) % 10007 for i in range(200000)]
+        values.sort()
+        return {v: str(v) for v in values[::4]}
+    return time_best(workload, repeat)[1]
+
+
+class BenchmarkSuite:
+    """Generates boards at each size and measures every selected case"""
+
+    def __init__(
+        self,
+        sizes: Sequence[int],
+        formats: Sequence[str] = tuple(WRITERS),
+        spec_overrides: Optional[Dict] = None,
+        densities: Optional[Dict[str, float]] = None,
+        repeat: int = 3,
+        memory: bool = True,
+        drc_profile: str = "ipc2221_class2",
+        fab_profile: str = "cheap_cn_8mil",
+        case_filter: Optional[Sequence[str]] = None,
+    ):
+        self.sizes = list(sizes)
+        self.formats = list(formats)
+        self.spec_overrides = spec_overrides or {}
+        self.densities = densities or {}
+        self.repeat = repeat
+        self.memory = memory
+        self.drc_profile = drc_profile
+        self.fab_profile = fab_profile
+        self.case_filter = list(case_filter or [])
+
+    def spec(self, components: int) -> BoardSpec:
+        """
+        Board of the given size; spec_overrides are fixed BoardSpec fields,
+        densities are per-component counts (e.g. {"segments": 20})
+        """
+        counts = {name: max(1, int(per * components)) for name, per in self.densities.items()}
+        return BoardSpec(components=components, **self.spec_overrides, **counts)
+
+    def run(self, on_result: Optional[Callable[[Measurement], None]] = None) -> List[Measurement]:
+        results = []
+        for components in self.sizes:
+            spec = self.spec(components)
+            with tempfile.TemporaryDirectory(prefix="boardmint_bench_") as tmp:
+                for case in self._cases(spec, Path(tmp)):
+                    if self.case_filter and not any(f in case.name for f in self.case_filter):
+                        continue
+                    measurement = self._measure(case, spec)
+                    results.append(measurement)
+                    if on_result:
+                        on_result(measurement)
+        return results
+
+    def _cases(self, spec: BoardSpec, root: Path) -> List[_Case]:
+        # Imported here: UniversalParser builds a HybridParser (OpenAI client) on construction
+        from parsers.universal_parser import UniversalParser
+        from services.drc_engine_v2 import DRCEngineV2
+        from services.parser_bridge import ParserBridge
+
+        projects, expected = {}, {}
+        for fmt in sorted(set(self.formats) | {"kicad"}):
+            projects[fmt] = root / fmt
+            expected[fmt] = write_project(fmt, spec, projects[fmt])
+
+        hybrid = OfflineHybridParser()
+        universal = UniversalParser()
+        universal.parsers[EDAToolFamily.KICAD] = hybrid
+        bridge = ParserBridge()
+        drc = DRCEngineV2()
+
+        # Inputs of the analysis cases: the board as the analysis pipeline sees it
+        parsed = hybrid.parse(projects["kicad"])
+        board = bridge._convert_to_canonical(parsed, str(projects["kicad"] / "board.kicad_pcb"), "kicad")
+
+        cases = [_Case("hybrid_parser", lambda: hybrid.parse(projects["kicad"]),
+                       parsed_counts, expected["kicad"])]
+        for fmt in self.formats:
+            cases.append(_Case(f"universal_parser:{fmt}", lambda p=projects[fmt]: universal.parse(p),
+                               lambda r: parsed_counts(r.pcb_data), expected[fmt]))
+        for fmt in ("kicad", "gerber"):
+            if fmt in projects:
+                cases.append(_Case(f"parser_bridge:{fmt}",
+                                   lambda p=projects[fmt], f=fmt: bridge.parse_to_canonical(str(p), f),
+                                   lambda b: {"components": b.component_count(), "nets": b.net_count()}))
+        cases.append(_Case("drc_v2", lambda: drc.run_full_analysis(board, self.drc_profile),
+                           lambda r: {"violations": len(r.violations)}))
+        for rule_spec in rule_specs(self.fab_profile):
+            cases.append(_Case(f"rule:{rule_spec.name}", lambda s=rule_spec: s.build().analyze(parsed),
+                               lambda issues: {"issues": len(issues)}))
+        return cases
+
+    def _measure(self, case: _Case, spec: BoardSpec) -> Measurement:
+        measurement = Measurement(case.name, spec.components, spec.objects, seconds=0.0)
+        try:
+            result, measurement.seconds = time_best(case.run, self.repeat)
+            if self.memory:
+                measurement.peak_mb = peak_memory_mb(case.run)
+        except Exception as e:
+            logger.debug("Benchmark case failed", exc_info=True)
+            measurement.error = f"{e.__class__.__name__}: {e}"
+            return measurement
+
+        if case.counts:
+            measurement.counts = case.counts(result)
+        for key in PARSER_CHECKS.get(case.name, ()):
+            got, want = measurement.counts.get(key), case.expected.get(key)
+            if got != want:
+                measurement.mismatches.append(f"{key} {got} != {want}")
+        return measurement
+
+
+def scaling_exponents(results: Sequence[Measurement]) -> Dict[str, float]:
+    """
+    Per case, the exponent k in time ~ objects^k between the smallest and
+    largest board (1.0 is linear; noticeably above 1 means superlinear)
+    """
+    by_case: Dict[str, List[Measurement]] = {}
+    for m in results:
+        if not m.error and m.seconds > 0:
+            by_case.setdefault(m.case, []).append(m)
+    exponents = {}
+    for case, runs in by_case.items():
+        runs.sort(key=lambda m: m.objects)
+        first, last = runs[0], runs[-1]
+        if last.objects > first.objects:
+            exponents[case] = math.log(last.seconds / first.seconds) / math.log(last.objects / first.objects)
+    return exponents
@@ -0,0 +1,541 @@
+"""
+Synthetic Boards
+Generates PCB projects of configurable size in the formats the parsers read
+
+Each writer lays out the same kind of board (random placement, random
+routing) from a BoardSpec and returns the object counts it wrote, so a
+benchmark can check what a parser extracted against what was generated.
+Output is deterministic for a given spec (seeded RNG).
+
+Formats:
+- kicad:   .kicad_pcb in the KiCad 5/6/7/8 dialects
+- ipc2581: IPC-2581 XML
+- odbpp:   ODB++ directory tree (matrix, steps, layers, symbols)
+- gerber:  Gerber RS-274X copper/outline layers, Excellon drill,
+           BOM, pick-and-place and IPC-D-356 netlist
+"""
+import random
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+KICAD_VERSIONS = {
+    5: "(kicad_pcb (version 20171130) (host pcbnew 5.1.9)",
+    6: "(kicad_pcb (version 20211014) (generator pcbnew)",
+    7: "(kicad_pcb (version 20221018) (generator pcbnew)",
+    8: '(kicad_pcb (version 20240108) (generator "pcbnew") (generator_version "8.0")',
+}
+
+VALUES = ("10k", "4k7", "100n", "1uF", "10uF", "220R", "BSS138", "LM1117-3.3")
+
+
+@dataclass
+class BoardSpec:
+    """
+    Size of a synthetic board
+
+    Counts left as None scale with components: 1.5 nets, 10 track
+    segments and 1 via per component.
+    """
+    components: int = 1000
+    nets: Optional[int] = None
+    segments: Optional[int] = None
+    vias: Optional[int] = None
+    zones: int = 1
+    layers: int = 2
+    seed: int = 42
+    width: float = 200.0
+    height: float = 150.0
+
+    def __post_init__(self):
+        if self.nets is None:
+            self.nets = max(2, self.components * 3 // 2)
+        if self.segments is None:
+            self.segments = self.components * 10
+        if self.vias is None:
+            self.vias = self.components
+        if self.layers < 2 or self.layers % 2:
+            raise ValueError("layers must be an even number >= 2")
+
+    @property
+    def objects(self) -> int:
+        """Components + segments + vias, the size axis of scaling curves"""
+        return self.components + self.segments + self.vias
+
+    def copper_layers(self) -> List[str]:
+        """KiCad copper layer names, top to bottom"""
+        inner = [f"In{i}.Cu" for i in range(1, self.layers - 1)]
+        return ["F.Cu"] + inner + ["B.Cu"]
+
+
+@dataclass
+class _Placement:
+    ref: str
+    value: str
+    x: float
+    y: float
+    rotation: int
+    pads: List[int]  # Net number per pad (1-based)
+
+
+@dataclass
+class _Layout:
+    """Geometry shared by every format's writer"""
+    placements: List[_Placement]
+    segments: List[Tuple[float, float, float, float, int, int]]  # x1, y1, x2, y2, layer index, net
+    vias: List[Tuple[float, float, int]]  # x, y, net
+
+
+def _layout(spec: BoardSpec) -> _Layout:
+    rng = random.Random(spec.seed)
+    placements = []
+    for i in range(spec.components):
+        x, y = rng.uniform(0, spec.width), rng.uniform(0, spec.height)
+        placements.append(_Placement(
+            ref=f"R{i}", value=VALUES[i % len(VALUES)], x=x, y=y,
+            rotation=rng.choice([0, 90, 180, 270]),
+            pads=[rng.randrange(1, spec.nets + 1) for _ in range(rng.randint(2, 8))],
+        ))
+    segments = []
+    for _ in range(spec.segments):
+        x, y = rng.uniform(0, spec.width), rng.uniform(0, spec.height)
+        segments.append((x, y, x + rng.uniform(-3, 3), y + rng.uniform(-3, 3),
+                         rng.randrange(spec.layers), rng.randrange(1, spec.nets + 1)))
+    vias = [(rng.uniform(0, spec.width), rng.uniform(0, spec.height), rng.randrange(1, spec.nets + 1))
+            for _ in range(spec.vias)]
+    return _Layout(placements, segments, vias)
+
+
+def _zone_strips(spec: BoardSpec) -> List[Tuple[float, float]]:
+    """Zones tile the board as vertical strips: (x_min, x_max) per zone"""
+    step = spec.width / max(spec.zones, 1)
+    return [(i * step, (i + 1) * step) for i in range(spec.zones)]
+
+
+def _expected(spec: BoardSpec, layout: _Layout, **overrides) -> Dict[str, int]:
+    counts = {
+        "components": spec.components,
+        "nets": spec.nets,
+        "tracks": spec.segments,
+        "vias": spec.vias,
+        "zones": spec.zones,
+        "pads": sum(len(p.pads) for p in layout.placements),
+    }
+    counts.update(overrides)
+    return counts
+
+
+# ---------------------------------------------------------------- KiCad
+
+def _q(version: int, text: str) -> str:
+    """KiCad 5 leaves simple tokens unquoted, 6+ quotes every string"""
+    return text if version == 5 else f'"{text}"'
+
+
+def _stamp(version: int, rng: random.Random) -> str:
+    if version >= 8:
+        return f'(uuid "{uuid.UUID(int=rng.getrandbits(128))}")'
+    return f"(tstamp {uuid.UUID(int=rng.getrandbits(128))})"
+
+
+def _stroke(version: int, width: float) -> str:
+    return f"(width {width})" if version <= 6 else f"(stroke (width {width}) (type default))"
+
+
+def _kicad_footprint(version: int, rng: random.Random, placement: _Placement) -> str:
+    tag = "module" if version == 5 else "footprint"
+    layers = " ".join(_q(version, l) for l in ("F.Cu", "F.Paste", "F.Mask"))
+    effects = "(effects (font (size 1 1) (thickness 0.15)))"
+
+    if version >= 8:
+        texts = (
+            f'(property "Reference" "{placement.ref}" (at 0 -1.43 0) (layer "F.SilkS") {_stamp(version, rng)} {effects})'
+            f'(property "Value" "{placement.value}" (at 0 1.43 0) (layer "F.Fab") {_stamp(version, rng)} {effects})'
+        )
+    else:
+        texts = (
+            f"(fp_text reference {_q(version, placement.ref)} (at 0 -1.43) (layer {_q(version, 'F.SilkS')}) {effects})"
+            f"(fp_text value {_q(version, placement.value)} (at 0 1.43) (layer {_q(version, 'F.Fab')}) {effects})"
+        )
+
+    pads = [
+        f"(pad {_q(version, str(pad))} smd roundrect (at {pad * 0.65:.2f} 0) (size 0.875 0.95) "
+        f"(layers {layers}) (roundrect_rratio 0.25) (net {net} {_q(version, f'N{net}')}) {_stamp(version, rng)})"
+        for pad, net in enumerate(placement.pads, 1)
+    ]
+    outline = "".join(
+        f"(fp_line (start {-1.5 + i} -0.8) (end {-0.5 + i} -0.8) (layer {_q(version, 'F.SilkS')}) {_stroke(version, 0.12)})"
+        for i in range(4)
+    )
+    return (
+        f"  ({tag} {_q(version, 'Resistor_SMD:R_0603_1608Metric')} (layer {_q(version, 'F.Cu')}) {_stamp(version, rng)} "
+        f"(at {placement.x:.4f} {placement.y:.4f} {placement.rotation}) {texts} {outline} {' '.join(pads)})"
+    )
+
+
+def kicad_board_text(spec: BoardSpec, version: int = 7) -> Tuple[str, Dict[str, int]]:
+    """Synthetic .kicad_pcb text in the given KiCad major version's dialect"""
+    layout = _layout(spec)
+    rng = random.Random(spec.seed + 1)
+    copper = spec.copper_layers()
+    cu = [_q(version, name) for name in copper]
+    edge = _q(version, "Edge.Cuts")
+
+    lines = [KICAD_VERSIONS[version], "  (general (thickness 1.6))"]
+    ordinals = list(range(len(copper) - 1)) + [31]
+    layer_defs = " ".join(f"({n} {name} signal)" for n, name in zip(ordinals, cu))
+    lines.append(f"  (layers {layer_defs} (44 {edge} user))")
+    lines.append('  (net 0 "")')
+    lines.extend(f"  (net {i} {_q(version, f'N{i}')})" for i in range(1, spec.nets + 1))
+
+    lines.extend(_kicad_footprint(version, rng, p) for p in layout.placements)
+
+    for x1, y1, x2, y2, layer, net in layout.segments:
+        lines.append(
+            f"  (segment (start {x1:.4f} {y1:.4f}) (end {x2:.4f} {y2:.4f}) "
+            f"(width 0.25) (layer {cu[layer]}) (net {net}) {_stamp(version, rng)})"
+        )
+    for x, y, net in layout.vias:
+        lines.append(
+            f"  (via (at {x:.4f} {y:.4f}) (size 0.8) (drill 0.4) "
+            f"(layers {cu[0]} {cu[-1]}) (net {net}) {_stamp(version, rng)})"
+        )
+
+    for i, (x_min, x_max) in enumerate(_zone_strips(spec)):
+        net = i % spec.nets + 1
+        pts = " ".join(f"(xy {x:g} {y:g})" for x, y in
+                       ((x_min, 0), (x_max, 0), (x_max, spec.height), (x_min, spec.height)))
+        lines.append(
+            f"  (zone (net {net}) (net_name {_q(version, f'N{net}')}) (layer {cu[-1 - i % len(cu)]}) "
+            f"{_stamp(version, rng)} (hatch edge 0.508) (min_thickness 0.254) (polygon (pts {pts})))"
+        )
+    w, h = spec.width, spec.height
+    for (x1, y1), (x2, y2) in (((0, 0), (w, 0)), ((w, 0), (w, h)), ((w, h), (0, h)), ((0, h), (0, 0))):
+        lines.append(
+            f"  (gr_line (start {x1:g} {y1:g}) (end {x2:g} {y2:g}) (layer {edge}) "
+            f"{_stroke(version, 0.1)} {_stamp(version, rng)})"
+        )
+    lines.append(")")
+
+    # Net 0 (unconnected) is a net too
+    return "\n".join(lines) + "\n", _expected(spec, layout, nets=spec.nets + 1)
+
+
+def write_kicad_project(spec: BoardSpec, directory: Path, version: int = 7) -> Dict[str, int]:
+    """Write board.kicad_pcb into directory"""
+    text, expected = kicad_board_text(spec, version)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "board.kicad_pcb").write_text(text)
+    return expected
+
+
+# ---------------------------------------------------------------- IPC-2581
+
+def _ipc_layer(index: int, layers: int) -> str:
+    if index == 0:
+        return "TOP"
+    if index == layers - 1:
+        return "BOTTOM"
+    return f"L{index + 1}"
+
+
+def write_ipc2581_project(spec: BoardSpec, directory: Path) -> Dict[str, int]:
+    """Write board.xml (IPC-2581 revision C) into directory"""
+    layout = _layout(spec)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    by_layer_net: Dict[Tuple[int, int], List[Tuple[float, float, float, float]]] = {}
+    for x1, y1, x2, y2, layer, net in layout.segments:
+        by_layer_net.setdefault((layer, net), []).append((x1, y1, x2, y2))
+    vias_by_net: Dict[int, List[Tuple[float, float]]] = {}
+    for x, y, net in layout.vias:
+        vias_by_net.setdefault(net, []).append((x, y))
+    pins_by_net: Dict[int, List[Tuple[str, int]]] = {}
+    for p in layout.placements:
+        for pin, net in enumerate(p.pads, 1):
+            pins_by_net.setdefault(net, []).append((p.ref, pin))
+
+    with open(directory / "board.xml", "w") as f:
+        w = f.write
+        w('<?xml version="1.0" encoding="UTF-8"?>\n')
+        w('<IPC-2581 revision="C" xmlns="http://webstds.ipc.org/2581">\n')
+        w('  <Content roleRef="Owner">\n    <FunctionMode mode="ASSEMBLY"/>\n    <StepRef name="pcb"/>\n')
+        for i in range(spec.layers):
+            w(f'    <LayerRef name="{_ipc_layer(i, spec.layers)}"/>\n')
+        w('  </Content>\n')
+
+        w('  <Bom name="board_bom">\n')
+        for value in VALUES:
+            w(f'    <BomItem OEMDesignNumberRef="{value}" quantity="1">\n')
+            for p in layout.placements:
+                if p.value == value:
+                    w(f'      <RefDes name="{p.ref}" packageRef="R0603" populate="true" layerRef="TOP"/>\n')
+            w(f'      <Characteristics category="ELECTRICAL" value="{value}"/>\n')
+            w(f'      <ApprovedManufacturerPart mpn="MPN-{value}"/>\n')
+            w('    </BomItem>\n')
+        w('  </Bom>\n')
+
+        w('  <Ecad name="board">\n    <CadHeader units="MILLIMETER"/>\n    <CadData>\n')
+        w('      <Step name="pcb">\n')
+        w('        <Stackup name="stackup">\n          <StackupGroup name="group">\n')
+        for i in range(spec.layers):
+            w(f'            <StackupLayer layerOrGroupRef="{_ipc_layer(i, spec.layers)}" '
+              f'layerFunctionValue="SIGNAL" thickness="0.035"/>\n')
+        w('          </StackupGroup>\n        </Stackup>\n')
+
+        w('        <Profile>\n          <Polygon>\n            <PolyBegin x="0" y="0"/>\n')
+        for x, y in ((spec.width, 0), (spec.width, spec.height), (0, spec.height), (0, 0)):
+            w(f'            <PolyStepSegment x="{x:g}" y="{y:g}"/>\n')
+        w('          </Polygon>\n        </Profile>\n')
+
+        w('        <Package name="R0603" type="RESISTOR">\n')
+        w(''.join(f'          <Pin number="{n}" x="{n * 0.65:.2f}" y="0"/>\n' for n in range(1, 9)))
+        w('        </Package>\n')
+        for p in layout.placements:
+            w(f'        <Component refDes="{p.ref}" packageRef="R0603" layerRef="TOP" part="{p.value}">\n'
+              f'          <Location x="{p.x:.4f}" y="{p.y:.4f}" rotation="{p.rotation}"/>\n'
+              f'        </Component>\n')
+        for net in range(1, spec.nets + 1):
+            pins = pins_by_net.get(net, [])
+            w(f'        <LogicalNet name="N{net}">')
+            w(''.join(f'<PinRef componentRef="{ref}" pin="{pin}"/>' for ref, pin in pins))
+            w('</LogicalNet>\n')
+
+        for layer in range(spec.layers):
+            w(f'        <LayerFeature layerRef="{_ipc_layer(layer, spec.layers)}">\n')
+            for net in range(1, spec.nets + 1):
+                lines = by_layer_net.get((layer, net))
+                if not lines:
+                    continue
+                w(f'          <Set net="N{net}">\n')
+                for x1, y1, x2, y2 in lines:
+                    w(f'            <Line startX="{x1:.4f}" startY="{y1:.4f}" endX="{x2:.4f}" endY="{y2:.4f}" lineWidth="0.25"/>\n')
+                w('          </Set>\n')
+            w('        </LayerFeature>\n')
+        w('        <LayerFeature layerRef="DRILL_TOP_BOTTOM">\n')
+        for net, points in sorted(vias_by_net.items()):
+            w(f'          <Set net="N{net}" padUsage="VIA">\n')
+            w(''.join(f'            <Via x="{x:.4f}" y="{y:.4f}"/>\n' for x, y in points))
+            w('          </Set>\n')
+        w('        </LayerFeature>\n')
+        w('      </Step>\n    </CadData>\n  </Ecad>\n</IPC-2581>\n')
+
+    # Zones are not written: the IPC-2581 parser has no zone support
+    return _expected(spec, layout, zones=0)
+
+
+# ---------------------------------------------------------------- ODB++
+
+def _odb_layer(index: int, layers: int) -> str:
+    if index == 0:
+        return "top"
+    if index == layers - 1:
+        return "bottom"
+    return f"inner{index}"
+
+
+def write_odbpp_project(spec: BoardSpec, directory: Path) -> Dict[str, int]:
+    """Write an ODB++ job tree rooted at directory"""
+    layout = _layout(spec)
+    step = directory / "steps" / "pcb"
+    for sub in ("matrix", "symbols", "fonts", "misc", "steps/pcb/eda", "steps/pcb/components"):
+        (directory / sub).mkdir(parents=True, exist_ok=True)
+
+    names = [_odb_layer(i, spec.layers) for i in range(spec.layers)]
+    matrix = ["STEP {", "    COL=1", "    NAME=PCB", "}"]
+    for i, name in enumerate(names):
+        matrix += ["LAYER {", f"    ROW={i + 1}", "    CONTEXT=BOARD", "    TYPE=SIGNAL",
+                   f"    NAME={name}", "    POLARITY=POSITIVE", "}"]
+    matrix += ["LAYER {", f"    ROW={spec.layers + 1}", "    CONTEXT=BOARD", "    TYPE=DRILL",
+               "    NAME=drill", "    POLARITY=POSITIVE", f"    START_NAME={names[0]}",
+               f"    END_NAME={names[-1]}", "}"]
+    (directory / "matrix" / "matrix").write_text("\n".join(matrix) + "\n")
+    (directory / "misc" / "info").write_text("JOB_NAME=board\nUNITS=MM\n")
+
+    w, h = spec.width, spec.height
+    (step / "profile").write_text(
+        f"UNITS=MM\nS P 0\nOB 0 0 I\nOS {w:g} 0\nOS {w:g} {h:g}\nOS 0 {h:g}\nOS 0 0\nOE\nSE\n"
+    )
+
+    sides = {"top": [], "bot": []}
+    for i, p in enumerate(layout.placements):
+        side = "bot" if i % 4 == 3 else "top"
+        sides[side].append(
+            f"CMP {i} {p.x:.4f} {p.y:.4f} {p.rotation} N {p.ref} R0603\n"
+            f"PRP VALUE '{p.value}'\nPRP MPN 'MPN-{p.value}'\n"
+        )
+    for side, records in sides.items():
+        (step / "components" / side).write_text("UNITS=MM\n# CMP <pkg> <x> <y> <rot> <mirror> <ref>\n"
+                                                 + "".join(records))
+
+    # Feature records per layer; FIDs per net and subnet type -> (layer, feature index)
+    features: Dict[int, List[str]] = {i: [] for i in range(spec.layers)}
+    fids: Dict[Tuple[int, str], List[Tuple[int, int]]] = {}
+
+    def add(layer: int, net: int, subnet: str, record: str):
+        fids.setdefault((net, subnet), []).append((layer, len(features[layer])))
+        features[layer].append(record)
+
+    for x1, y1, x2, y2, layer, net in layout.segments:
+        add(layer, net, "TRC", f"L {x1:.4f} {y1:.4f} {x2:.4f} {y2:.4f} 0 P 0\n")
+    for x, y, net in layout.vias:
+        # Through vias: one pad per copper layer, .pad_usage=via
+        for layer in range(spec.layers):
+            add(layer, net, "VIA", f"P {x:.4f} {y:.4f} 1 P 0 0;0=1\n")
+    for i, (x0, x1) in enumerate(_zone_strips(spec)):
+        # Same zones as the KiCad board; rounded top corners exercise OC arcs
+        r = min(1.0, (x1 - x0) / 4)
+        add(spec.layers - 1 - i % spec.layers, i % spec.nets + 1, "PLN",
+            f"S P 0\nOB {x0:.4f} 0 I\nOS {x1:.4f} 0\nOS {x1:.4f} {h - r:.4f}\n"
+            f"OC {x1 - r:.4f} {h:.4f} {x1 - r:.4f} {h - r:.4f} N\nOS {x0 + r:.4f} {h:.4f}\n"
+            f"OC {x0:.4f} {h - r:.4f} {x0 + r:.4f} {h - r:.4f} N\nOS {x0:.4f} 0\nOE\n"
+            f"OB {(x0 + x1) / 2:.4f} 1 H\nOS {(x0 + x1) / 2 + 0.5:.4f} 1\n"
+            f"OS {(x0 + x1) / 2 + 0.5:.4f} 1.5\nOS {(x0 + x1) / 2:.4f} 1\nOE\nSE\n")
+
+    header = ("UNITS=MM\n#\n#Feature symbol names\n#\n$0 r250\n$1 r800\n"
+              "#\n#Feature attribute names\n#\n@0 .pad_usage\n#\n#Layer features\n#\n")
+    for layer, records in features.items():
+        layer_dir = step / "layers" / names[layer]
+        layer_dir.mkdir(parents=True, exist_ok=True)
+        (layer_dir / "features").write_text(header + "".join(records))
+    (step / "layers" / "drill").mkdir(parents=True, exist_ok=True)
+    (step / "layers" / "drill" / "features").write_text(
+        "UNITS=MM\n$0 r400\n" + "".join(f"P {x:.4f} {y:.4f} 0 P 0 0\n" for x, y, _ in layout.vias)
+    )
+
+    # EDA data: NET records in order define net numbers (0 is the unconnected net)
+    eda = ["HDR ODB++ synthetic", "UNITS=MM", "LYR " + " ".join(names), "NET $NONE$"]
+    for net in range(1, spec.nets + 1):
+        eda.append(f"NET N{net}")
+        for subnet in ("TRC", "VIA", "PLN"):
+            records = fids.get((net, subnet))
+            if records:
+                eda.append(f"SNT {subnet}")
+                eda += [f"FID C {layer} {index}" for layer, index in records]
+    (step / "eda" / "data").write_text("\n".join(eda) + "\n")
+
+    # $NONE$ counts as a net
+    return _expected(spec, layout, nets=spec.nets + 1)
+
+
+# ---------------------------------------------------------------- Gerber
+
+def _gerber_coord(mm: float) -> int:
+    """Format 3.4, as declared by %FSLAX34Y34*%"""
+    return int(round(mm * 10000))
+
+
+def _gerber_header(function: str) -> List[str]:
+    """Header with X2 aperture functions (copper layers draw every object with a TO.N net)"""
+    return [
+        "G04 Synthetic board*",
+        f"%TF.FileFunction,{function}*%",
+        "%FSLAX34Y34*%",
+        "%MOMM*%",
+        "%LPD*%",
+        "G75*",
+        "%TA.AperFunction,Conductor*%",
+        "%ADD10C,0.250000*%",
+        "%TA.AperFunction,ViaPad*%",
+        "%ADD11C,0.800000*%",
+        "%TA.AperFunction,SMDPad,CuDef*%",
+        "%ADD12R,0.875000X0.950000*%",
+        "%TD*%",
+    ]
+
+
+def write_gerber_project(spec: BoardSpec, directory: Path) -> Dict[str, int]:
+    """Write a fabrication/assembly output set into directory"""
+    layout = _layout(spec)
+    directory.mkdir(parents=True, exist_ok=True)
+    c = _gerber_coord
+    w, h = spec.width, spec.height
+
+    for layer in range(spec.layers):
+        if layer == 0:
+            name, function = "board-F_Cu.gtl", "Copper,L1,Top"
+        elif layer == spec.layers - 1:
+            name, function = "board-B_Cu.gbl", f"Copper,L{spec.layers},Bot"
+        else:
+            name, function = f"board-In{layer}_Cu.gbr", f"Copper,L{layer + 1},Inr"
+        out = _gerber_header(function) + ["D10*"]
+        for x1, y1, x2, y2, seg_layer, net in layout.segments:
+            if seg_layer == layer:
+                out.append(f"%TO.N,N{net}*%")
+                out.append(f"X{c(x1)}Y{c(y1)}D02*")
+                out.append(f"X{c(x2)}Y{c(y2)}D01*")
+        if layer in (0, spec.layers - 1):
+            out.append("D11*")
+            for x, y, net in layout.vias:
+                out.append(f"%TO.N,N{net}*%")
+                out.append(f"X{c(x)}Y{c(y)}D03*")
+        if layer == 0:
+            out.append("D12*")
+            for p in layout.placements:
+                for pad, net in enumerate(p.pads, 1):
+                    out.append(f"%TO.N,N{net}*%")
+                    out.append(f"X{c(p.x + pad * 0.65)}Y{c(p.y)}D03*")
+        out.append("%TA.AperFunction,Conductor*%")
+        for i, (x0, x1) in enumerate(_zone_strips(spec)):
+            if spec.layers - 1 - i % spec.layers != layer:
+                continue
+            # Same zones as the KiCad board; rounded top corners exercise G03 arcs
+            r = min(1.0, (x1 - x0) / 4)
+            out += [f"%TO.N,N{i % spec.nets + 1}*%", "G36*", f"X{c(x0)}Y0D02*", f"G01X{c(x1)}Y0D01*",
+                    f"X{c(x1)}Y{c(h - r)}D01*", f"G03X{c(x1 - r)}Y{c(h)}I{c(-r)}J0D01*",
+                    f"G01X{c(x0 + r)}Y{c(h)}D01*", f"G03X{c(x0)}Y{c(h - r)}I0J{c(-r)}D01*",
+                    f"G01X{c(x0)}Y0D01*", "G37*"]
+        out += ["%TD*%", "M02*"]
+        (directory / name).write_text("\n".join(out) + "\n")
+
+    outline = _gerber_header("Profile,NP") + ["D10*", "X0Y0D02*"]
+    outline += [f"X{c(x)}Y{c(y)}D01*" for x, y in ((w, 0), (w, h), (0, h), (0, 0))]
+    (directory / "board-Edge_Cuts.gko").write_text("\n".join(outline + ["M02*"]) + "\n")
+
+    # KiCad-style X2 attribute comments mark the tool as via drills
+    drill = ["M48", f"; #@! TF.FileFunction,Plated,1,{spec.layers},PTH", "METRIC,TZ",
+             "; #@! TA.AperFunction,Plated,PTH,ViaDrill", "T1C0.400", "%", "G90", "G05", "T1"]
+    drill += [f"X{x:.4f}Y{y:.4f}" for x, y, _ in layout.vias]
+    (directory / "board.drl").write_text("\n".join(drill + ["M30"]) + "\n")
+
+    bom = ["Reference,Value,Footprint,MPN"]
+    bom += [f"{p.ref},{p.value},R_0603_1608Metric,MPN-{p.value}" for p in layout.placements]
+    (directory / "board-bom.csv").write_text("\n".join(bom) + "\n")
+
+    pos = ["Ref,Val,Package,PosX,PosY,Rot,Side"]
+    pos += [f"{p.ref},{p.value},R_0603_1608Metric,{p.x:.4f},{p.y:.4f},{p.rotation},top"
+            for p in layout.placements]
+    (directory / "board-pos.pos").write_text("\n".join(pos) + "\n")
+
+    # IPC-D-356: net name in columns 3-16, refdes 17-22, pin 23-26; coordinates in microns
+    um = lambda mm: int(round(mm * 1000))
+    netlist = ["C  Synthetic board netlist", "P  JOB   board", "P  UNITS CUST 1"]
+    for p in layout.placements:
+        for pin, net in enumerate(p.pads, 1):
+            netlist.append(f"327{f'N{net}':<14.14}{p.ref:<6.6}{f'-{pin}':<4.4}"
+                           f"D0000PA01X+{um(p.x):06d}Y+{um(p.y):06d}X0875Y0950R000S1")
+    for x, y, net in layout.vias:
+        netlist.append(f"317{f'N{net}':<14.14}VIA         D0400PA00X+{um(x):06d}Y+{um(y):06d}X0800Y0000R000S0")
+    (directory / "board.ipc").write_text("\n".join(netlist + ["999"]) + "\n")
+
+    # The netlist only names nets that have pads or vias
+    used = {net for p in layout.placements for net in p.pads} | {net for _, _, net in layout.vias}
+    return _expected(spec, layout, nets=len(used))
+
+
+WRITERS: Dict[str, Callable[[BoardSpec, Path], Dict[str, int]]] = {
+    "kicad": write_kicad_project,
+    "ipc2581": write_ipc2581_project,
+    "odbpp": write_odbpp_project,
+    "gerber": write_gerber_project,
+}
+
+
+def write_project(fmt: str, spec: BoardSpec, directory: Path) -> Dict[str, int]:
+    """Write a synthetic project in one of WRITERS' formats; returns expected counts"""
+    try:
+        writer = WRITERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown format {fmt!r} (choose from {', '.join(WRITERS)})")
+    return writer(spec, Path(directory))
@@ -27,11 +27,51 @@ class Settings(BaseSettings):
     # File uploads
     upload_dir: str = "./uploads"
     max_upload_size: int = 524288000  # 500MB (increased from 100MB)
+    archive_max_members: int = 20000  # Entries per uploaded ZIP
+    archive_max_unpacked_bytes: int = 4294967296  # 4GB once extracted
+    archive_max_ratio: int = 200  # Uncompressed/compressed size per member (zip bombs)
+    blob_store_enabled: bool = True  # Store uploaded and extracted files once per content hash
+    blob_store_dir: str = ""  # Default: {upload_dir}/blobs; must be on upload_dir's filesystem (trees hard-link into it)
     
     # Performance settings
     max_workers: int = 16  # Parallel workers for DRC
+    rule_workers: int = 0  # Processes for rule engines (0 = CPU count)
+    rule_pool_min_components: int = 200  # Smaller boards run rule engines inline
+    parser_workers: int = 0  # Processes for parsing layers/files in parallel (0 = CPU count)
+    parser_pool_min_bytes: int = 8388608  # Inputs under 8MB are parsed inline
+    parser_file_timeout: int = 600  # Seconds one file of a multi-file parse may take (0 = no limit)
+    parser_file_memory_mb: int = 4096  # Extra address space per file in pool workers (0 = no limit)
+    detection_cache_entries: int = 20000  # Remembered format detections (0 = off)
     enable_caching: bool = True
     cache_ttl: int = 3600  # Cache TTL in seconds
+    memory_cache_max_bytes: int = 268435456  # 256MB budget for the in-memory fallback
+    memory_cache_sweep_interval: int = 60  # Seconds between expired-entry sweeps
+    redis_url: str = "redis://localhost:6379/0"
+    redis_max_connections: int = 50  # Shared pool size per process
+    redis_socket_timeout: float = 2.0  # Seconds
+    cache_compression: str = "zstd"  # zstd | zlib | none (zstd falls back to zlib if not installed)
+    cache_compression_min_bytes: int = 1024  # Smaller payloads are stored uncompressed
+    parsed_cache_dir: str = "./cache/parsed_boards"  # On-disk parsed board cache
+    parsed_cache_max_bytes: int = 1073741824  # 1GB
+    metrics_dir: str = "./cache/metrics"  # Per-process metric snapshots merged by /metrics
+    issue_insert_batch_size: int = 1000  # Issue rows per bulk INSERT / COPY
+    
+    # Background job queue (analyses)
+    job_queue_embedded_workers: int = 2  # Worker processes started with the API (0 = run worker.py separately)
+    job_queue_small_lane_workers: int = 1  # Workers reserved for small boards
+    job_queue_small_board_bytes: int = 5242880  # Uploads up to 5MB use the small lane
+    job_queue_org_concurrency: int = 2  # Running jobs per organization
+    job_queue_max_attempts: int = 3
+    job_queue_lease_seconds: int = 120  # Renewed by heartbeats; expired leases are reclaimed
+    job_queue_retry_base_seconds: float = 10.0  # Doubled on each retry
+    job_queue_retry_max_seconds: float = 600.0
+    job_queue_poll_interval: float = 1.0  # Idle worker poll interval in seconds
+    
+    # Analysis progress (coalesced writes, live events over SSE)
+    progress_persist_interval: float = 2.0  # Max seconds between progress writes to the database
+    progress_persist_steps: int = 5  # ...or write once this many updates are pending
+    progress_publish_interval: float = 0.25  # Live event debounce in seconds
+    progress_stream_heartbeat: float = 15.0  # SSE keep-alive (and stored-status check) interval
     
     model_config = SettingsConfigDict(
         extra="ignore",  # Ignore extra fields like VITE_* from .env
@@ -4,7 +4,7 @@ Main application entry point
 """
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse
 from typing import List, Optional
 from contextlib import asynccontextmanager
 import uvicorn
@@ -16,12 +16,18 @@ from database import engine, Base, get_db
 from sqlalchemy.orm import Session
 from models.project import Project
 from models.analysis_job import AnalysisJob
+from models.issue import Issue as IssueModel
 from services.upload_service import UploadService
 from services.analysis_service import AnalysisService
 from services.export_service import ExportService
 from services.rule_profiles import RuleProfileLibrary, ProfileType
 from services.enhanced_analysis_service import EnhancedAnalysisService
 from services.cost_estimator import CostEstimator
+from services.rule_scheduler import shutdown_rule_scheduler
+from parsers.parse_pool import shutdown_parse_pool
+from services.job_queue import get_job_queue
+from services.job_worker import WorkerSupervisor
+from metrics import get_metrics
 
 # Configure logging
 logging.basicConfig(
@@ -41,14 +47,34 @@ async def lifespan(app: FastAPI):
     # Create database tables (optional - may fail if no DB configured)
     try:
         Base.metadata.create_all(bind=engine)
+        # create_all skips existing tables, including indexes added later
+        for index in IssueModel.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
         logger.info("Database tables created/verified")
     except Exception as e:
         logger.warning(f"Could not connect to database (using Supabase API instead): {e}")
     
+    # Counters of workers from an earlier run would otherwise be summed forever
+    get_metrics().clear_snapshots()
+    
+    # Analyses run in worker processes, not in the API process
+    settings = get_settings()
+    supervisor = None
+    if settings.job_queue_embedded_workers > 0:
+        supervisor = WorkerSupervisor(
+            settings.job_queue_embedded_workers,
+            settings.job_queue_small_lane_workers
+        )
+        supervisor.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down PCB Analyzer API...")
+    if supervisor:
+        supervisor.stop()
+    shutdown_rule_scheduler()
+    shutdown_parse_pool()
 
 
 # Initialize FastAPI app
@@ -92,6 +118,33 @@ async def health_check():
     }
 
 
+@app.get("/api/queue/stats")
+async def queue_stats():
+    """Background job queue depth per lane and status"""
+    return get_job_queue().get_stats()
+
+
+def _queue_depth_metrics() -> List[str]:
+    """Queue depth gauge, read from the job queue at scrape time"""
+    lines = [
+        "# HELP boardmint_job_queue_jobs Jobs in the background queue",
+        "# TYPE boardmint_job_queue_jobs gauge",
+    ]
+    for lane, statuses in sorted(get_job_queue().get_stats()["lanes"].items()):
+        for status, count in sorted(statuses.items()):
+            lines.append(f'boardmint_job_queue_jobs{{lane="{lane}",status="{status}"}} {count}')
+    return lines
+
+
+get_metrics().gauge_callback(_queue_depth_metrics)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics: pipeline stage timings, job outcomes, queue depth"""
+    return PlainTextResponse(get_metrics().render(), media_type="text/plain; version=0.0.4")
+
+
 # Project endpoints
 @app.post("/api/upload")
 async def upload_project(
@@ -144,7 +197,6 @@ async def upload_project(
 @app.post("/api/analyze/{project_id}")
 async def start_analysis(
     project_id: str,
-    background_tasks: BackgroundTasks,
     fab_profile: str = "cheap_cn_8mil"
 ):
     """
@@ -163,11 +215,11 @@ async def start_analysis(
         # Create analysis job
         job = await analysis_service.create_job(project_id, fab_profile)
         
-        # Run analysis in background
-        background_tasks.add_task(
-            analysis_service.run_analysis,
-            job.id,
-            project_id
+        # Run analysis in a worker process
+        get_job_queue().enqueue(
+            "legacy_analysis",
+            {"job_id": job.id, "project_id": project_id},
+            size_bytes=analysis_service.get_upload_size(project_id)
         )
         
         return {
@@ -0,0 +1,241 @@
+"""
+Metrics
+Minimal Prometheus-style counters and histograms, rendered in the text
+exposition format on /metrics (no client library needed)
+
+Analyses run in worker processes (services/job_worker.py), so each process
+periodically writes a snapshot of its metrics to metrics_dir; the process
+serving /metrics adds up every snapshot with its own live values.
+
+Usage:
+    JOBS = counter("boardmint_jobs_total", "Jobs run", ["kind", "status"])
+    JOBS.inc(kind="pcb_analysis", status="succeeded")
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds; analysis stages range from sub-millisecond checks to minutes of AI calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelKey = Tuple[str, ...]
+
+# Joins label values into snapshot keys (JSON objects need string keys)
+_SEP = "\x1f"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {_SEP.join(k): v for k, v in self._values.items()}
+
+    @staticmethod
+    def merge(total: Dict, other: Dict):
+        for key, value in other.items():
+            total[key] = total.get(key, 0.0) + value
+
+    def render(self, values: Dict) -> List[str]:
+        return [
+            f"{self.name}{_label_text(self.labelnames, key.split(_SEP) if self.labelnames else ())} {_format_value(v)}"
+            for key, v in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Bucketed observations (cumulative buckets, sum and count) per label set"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (+Inf last), sum]
+        self._values: Dict[LabelKey, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {_SEP.join(k): [list(counts), total] for k, (counts, total) in self._values.items()}
+
+    @staticmethod
+    def merge(total: Dict, other: Dict):
+        for key, (counts, value_sum) in other.items():
+            if key not in total:
+                total[key] = [list(counts), value_sum]
+            else:
+                total[key][0] = [a + b for a, b in zip(total[key][0], counts)]
+                total[key][1] += value_sum
+
+    def render(self, values: Dict) -> List[str]:
+        lines = []
+        for key, (counts, value_sum) in sorted(values.items()):
+            label_values = key.split(_SEP) if self.labelnames else ()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, label_values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labelnames, label_values)} {_format_value(value_sum)}")
+            lines.append(f"{self.name}_count{_label_text(self.labelnames, label_values)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds this process's metrics and renders them merged with other processes'"""
+
+    def __init__(self, metrics_dir: Optional[str] = None):
+        self.metrics_dir = Path(metrics_dir or get_settings().metrics_dir)
+        self._metrics: Dict[str, _Metric] = {}
+        self._gauges: List[Callable[[], List[str]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge_callback(self, collect: Callable[[], List[str]]):
+        """Register a function returning exposition lines computed at scrape time"""
+        self._gauges.append(collect)
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def snapshot(self) -> Dict:
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def flush(self):
+        """Write this process's snapshot for the process serving /metrics"""
+        try:
+            self.metrics_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.metrics_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp, self.metrics_dir / f"{os.getpid()}.json")
+        except OSError as e:
+            logger.warning(f"Could not write metrics snapshot: {e}")
+
+    def clear_snapshots(self):
+        """Drop snapshots left by processes of an earlier run"""
+        if not self.metrics_dir.is_dir():
+            return
+        for path in self.metrics_dir.glob("*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format, summed across processes"""
+        merged = {name: metric.snapshot() for name, metric in self._metrics.items()}
+        own = f"{os.getpid()}.json"
+        if self.metrics_dir.is_dir():
+            for path in self.metrics_dir.glob("*.json"):
+                if path.name == own:
+                    continue  # Live values above are newer
+                try:
+                    other = json.loads(path.read_text())
+                except (OSError, ValueError):
+                    continue
+                for name, values in other.items():
+                    metric = self._metrics.get(name)
+                    if metric is not None:
+                        metric.merge(merged[name], values)
+
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render(merged[name]))
+        for collect in self._gauges:
+            try:
+                lines.extend(collect())
+            except Exception as e:
+                logger.warning(f"Metrics gauge failed: {e}")
+        return "\n".join(lines) + "\n"
+
+
+_registry: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get global metrics registry"""
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return get_metrics().counter(name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return get_metrics().histogram(name, documentation, labelnames, buckets)
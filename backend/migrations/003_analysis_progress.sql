@@ -0,0 +1,7 @@
+-- Migration: Add live progress to analyses
+-- Stage progress is written (coalesced) by the analysis workers and streamed
+-- to clients from GET /api/analyses/{id}/events
+
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS progress TEXT;
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS progress_percent SMALLINT
+    CHECK (progress_percent BETWEEN 0 AND 100);
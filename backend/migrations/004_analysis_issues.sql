@@ -0,0 +1,56 @@
+-- Migration: Relational issues table for the paginated issues API
+-- GET /api/analyses/{id}/issues pages through these rows (keyset on the sort
+-- column + ordinal) instead of returning analyses.issues_json in full.
+-- Analyses created before this migration are indexed on first listing.
+
+-- ============================================
+-- ANALYSIS ISSUES TABLE
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS analysis_issues (
+    analysis_id UUID NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+    id TEXT NOT NULL,              -- Same id as in issues_json (referenced by issue_comments)
+    organization_id UUID NOT NULL REFERENCES organizations(id),
+    ordinal INTEGER NOT NULL,      -- Position in the analysis output; keyset tiebreaker
+
+    severity TEXT NOT NULL,        -- critical, warning, info
+    severity_rank SMALLINT NOT NULL,  -- 0 critical, 1 warning, 2 info (sort key)
+    category TEXT NOT NULL DEFAULT '',
+    issue_code TEXT NOT NULL DEFAULT '',
+    title TEXT,
+    description TEXT,
+    suggested_fix TEXT,
+    affected_nets TEXT[] NOT NULL DEFAULT '{}',
+    affected_components TEXT[] NOT NULL DEFAULT '{}',
+    location_x DOUBLE PRECISION,
+    location_y DOUBLE PRECISION,
+    layer TEXT NOT NULL DEFAULT '',
+
+    -- Latest status set through the comments API
+    status TEXT NOT NULL DEFAULT 'open',  -- open, acknowledged, resolved, wont_fix
+
+    PRIMARY KEY (analysis_id, id),
+    UNIQUE (analysis_id, ordinal)  -- Also serves sort=position
+);
+
+-- One index per sort key, ordinal last so every page is a range scan
+CREATE INDEX IF NOT EXISTS idx_analysis_issues_severity ON analysis_issues(analysis_id, severity_rank, ordinal);
+CREATE INDEX IF NOT EXISTS idx_analysis_issues_category ON analysis_issues(analysis_id, category, ordinal);
+CREATE INDEX IF NOT EXISTS idx_analysis_issues_code ON analysis_issues(analysis_id, issue_code, ordinal);
+
+-- Filters
+CREATE INDEX IF NOT EXISTS idx_analysis_issues_status ON analysis_issues(analysis_id, status, ordinal);
+CREATE INDEX IF NOT EXISTS idx_analysis_issues_layer ON analysis_issues(analysis_id, layer, ordinal);
+CREATE INDEX IF NOT EXISTS idx_analysis_issues_nets ON analysis_issues USING GIN (affected_nets);
+CREATE INDEX IF NOT EXISTS idx_analysis_issues_components ON analysis_issues USING GIN (affected_components);
+
+-- Issues: Users can only access issues in their organization's analyses
+ALTER TABLE analysis_issues ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY analysis_issues_org_access ON analysis_issues
+    FOR ALL
+    USING (
+        organization_id = (
+            SELECT organization_id FROM users WHERE id = auth.uid()
+        )
+    );
@@ -4,5 +4,6 @@ Database models
 from .project import Project
 from .analysis_job import AnalysisJob
 from .issue import Issue
+from .queued_job import QueuedJob
 
-__all__ = ["Project", "AnalysisJob", "Issue"]
+__all__ = ["Project", "AnalysisJob", "Issue", "QueuedJob"]
@@ -296,11 +296,78 @@ class BoardOutline:
     cutouts: List[Polygon] = field(default_factory=list)
 
 
+@dataclass
+class BoardIndexes:
+    """
+    Lookup tables derived from a Board's components and nets
+    
+    Connectivity (refdes <-> nets, pin -> net) comes from Net.pins entries of
+    the form "REFDES.PAD". Where names repeat, the first occurrence wins, as
+    with the original linear scans.
+    """
+    signature: Tuple
+    components_by_refdes: Dict[str, Component] = field(default_factory=dict)
+    nets_by_name: Dict[str, Net] = field(default_factory=dict)
+    nets_by_refdes: Dict[str, List[str]] = field(default_factory=dict)
+    components_by_net: Dict[str, List[Component]] = field(default_factory=dict)
+    net_by_pin: Dict[str, str] = field(default_factory=dict)
+    pairs_by_name: Dict[str, Tuple[Net, Net]] = field(default_factory=dict)
+    differential_pairs: List[Tuple[Net, Net]] = field(default_factory=list)
+    
+    @classmethod
+    def build(cls, board: "Board") -> "BoardIndexes":
+        indexes = cls(signature=board._index_signature())
+        
+        for comp in board.components:
+            indexes.components_by_refdes.setdefault(comp.refdes, comp)
+        
+        nets_with_pair: Dict[str, List[Net]] = {}
+        for net in board.nets:
+            if net.pair_name:
+                nets_with_pair.setdefault(net.pair_name, []).append(net)
+            
+            if net.name in indexes.nets_by_name:
+                continue
+            indexes.nets_by_name[net.name] = net
+            
+            for pin in net.pins:
+                indexes.net_by_pin.setdefault(pin, net.name)
+                if "." in pin:
+                    connected = indexes.nets_by_refdes.setdefault(pin.split(".")[0], [])
+                    if not connected or connected[-1] != net.name:
+                        connected.append(net.name)
+        
+        # Components per net, in board order (duplicated refdes are all kept)
+        for comp in board.components:
+            for net_name in indexes.nets_by_refdes.get(comp.refdes, ()):
+                indexes.components_by_net.setdefault(net_name, []).append(comp)
+        
+        # Differential pairs: first complementary net sharing the pair name
+        for net in board.nets:
+            if not (net.is_differential and net.pair_name) or net.pair_name in indexes.pairs_by_name:
+                continue
+            complement = next(
+                (n for n in nets_with_pair[net.pair_name] if n.is_positive != net.is_positive),
+                None
+            )
+            if complement:
+                pair = (net, complement) if net.is_positive else (complement, net)
+                indexes.pairs_by_name[net.pair_name] = pair
+                indexes.differential_pairs.append(pair)
+        
+        return indexes
+
+
 @dataclass
 class Board:
     """
     Canonical PCB board representation
     This is the universal model that all parsers translate to
+    
+    Lookups by refdes, net name, pin and pair name go through BoardIndexes,
+    built on first use and rebuilt when the components or nets lists are
+    replaced or change length. Call invalidate_indexes() after editing
+    entries in place (e.g. renaming a net or appending to Net.pins).
     """
     id: str
     name: str
@@ -336,13 +403,40 @@ class Board:
     # 3D models
     step_path: Optional[str] = None
     
+    # Lookup indexes (built lazily)
+    _indexes: Optional[BoardIndexes] = field(default=None, init=False, repr=False, compare=False)
+    
+    def _index_signature(self) -> Tuple:
+        return (id(self.components), len(self.components), id(self.nets), len(self.nets))
+    
+    @property
+    def indexes(self) -> BoardIndexes:
+        """Lookup indexes, rebuilt if components/nets changed since the last build"""
+        indexes = self._indexes
+        if indexes is None or indexes.signature != self._index_signature():
+            indexes = BoardIndexes.build(self)
+            self._indexes = indexes
+        return indexes
+    
+    def invalidate_indexes(self) -> None:
+        """Drop lookup indexes after in-place edits to components or nets"""
+        self._indexes = None
+    
     def get_component(self, refdes: str) -> Optional[Component]:
         """Get component by reference designator"""
-        return next((c for c in self.components if c.refdes == refdes), None)
+        return self.indexes.components_by_refdes.get(refdes)
     
     def get_net(self, name: str) -> Optional[Net]:
         """Get net by name"""
-        return next((n for n in self.nets if n.name == name), None)
+        return self.indexes.nets_by_name.get(name)
+    
+    def get_component_nets(self, refdes: str) -> List[str]:
+        """Get names of nets connected to a component"""
+        return list(self.indexes.nets_by_refdes.get(refdes, ()))
+    
+    def get_pin_net(self, pin: str) -> Optional[str]:
+        """Get the net name a pin (e.g. "U1.1") is connected to"""
+        return self.indexes.net_by_pin.get(pin)
     
     def get_layer_components(self, layer: str) -> List[Component]:
         """Get all components on a specific layer"""
@@ -350,17 +444,7 @@ class Board:
     
     def get_net_components(self, net_name: str) -> List[Component]:
         """Get all components connected to a net"""
-        net = self.get_net(net_name)
-        if not net:
-            return []
-        
-        component_refs = set()
-        for pin in net.pins:
-            if "." in pin:
-                refdes = pin.split(".")[0]
-                component_refs.add(refdes)
-        
-        return [c for c in self.components if c.refdes in component_refs]
+        return list(self.indexes.components_by_net.get(net_name, ()))
     
     def get_high_voltage_nets(self, threshold: float = 48.0) -> List[Net]:
         """Get all high-voltage nets above threshold"""
@@ -368,25 +452,11 @@ class Board:
     
     def get_differential_pairs(self) -> List[Tuple[Net, Net]]:
         """Get all differential pairs"""
-        pairs = []
-        processed = set()
-        
-        for net in self.nets:
-            if net.is_differential and net.pair_name and net.pair_name not in processed:
-                # Find the complementary net
-                complement = next(
-                    (n for n in self.nets 
-                     if n.pair_name == net.pair_name and n.is_positive != net.is_positive),
-                    None
-                )
-                if complement:
-                    if net.is_positive:
-                        pairs.append((net, complement))
-                    else:
-                        pairs.append((complement, net))
-                    processed.add(net.pair_name)
-        
-        return pairs
+        return list(self.indexes.differential_pairs)
+    
+    def get_differential_pair(self, pair_name: str) -> Optional[Tuple[Net, Net]]:
+        """Get (positive, negative) nets of a differential pair"""
+        return self.indexes.pairs_by_name.get(pair_name)
     
     def bounding_box(self) -> Optional[BoundingBox]:
         """Calculate board bounding box"""
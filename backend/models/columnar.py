@@ -0,0 +1,308 @@
+"""
+Columnar (array-backed) storage for canonical routing data
+Tracks and vias stored as NumPy columns with interned net/layer names,
+exposed through read-only row views so list-based rule code keeps working
+"""
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from .canonical import Point, Track, Via
+
+
+class StringTable:
+    """
+    Interned string table
+
+    Each distinct string is stored once and referenced by an integer id.
+    Id -1 is reserved for None.
+    """
+
+    NONE_ID = -1
+
+    def __init__(self):
+        self._strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, value: Optional[str]) -> int:
+        """Get the id for a string, adding it if new"""
+        if value is None:
+            return self.NONE_ID
+        idx = self._ids.get(value)
+        if idx is None:
+            idx = len(self._strings)
+            self._strings.append(value)
+            self._ids[value] = idx
+        return idx
+
+    def id_of(self, value: Optional[str]) -> Optional[int]:
+        """Get the id for a string without adding it (None if unknown)"""
+        if value is None:
+            return self.NONE_ID
+        return self._ids.get(value)
+
+    def __getitem__(self, idx: int) -> Optional[str]:
+        return None if idx < 0 else self._strings[idx]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    @property
+    def strings(self) -> List[str]:
+        return list(self._strings)
+
+
+def _column(values: array, dtype) -> np.ndarray:
+    """Wrap an array.array buffer as a NumPy column without copying"""
+    if len(values) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.frombuffer(values, dtype=dtype)
+
+
+def _float_or_nan(value: Optional[float]) -> float:
+    return float("nan") if value is None else value
+
+
+class TrackTable(Sequence):
+    """
+    Track segments as parallel NumPy arrays
+
+    Columns: x1, y1, x2, y2, width (float64), layer_id, net_id (int32).
+    A missing start or end point is stored as NaN coordinates. Indexing or
+    iterating yields freshly built `Track` objects (ids `track_{index}`), so
+    changes made to a yielded track are not written back.
+    """
+
+    def __init__(
+        self,
+        x1: np.ndarray,
+        y1: np.ndarray,
+        x2: np.ndarray,
+        y2: np.ndarray,
+        width: np.ndarray,
+        layer_id: np.ndarray,
+        net_id: np.ndarray,
+        layers: StringTable,
+        nets: StringTable,
+    ):
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+        self.width = width
+        self.layer_id = layer_id
+        self.net_id = net_id
+        self.layers = layers
+        self.nets = nets
+
+    @classmethod
+    def from_parsed(cls, tracks, layers: StringTable, nets: StringTable) -> "TrackTable":
+        """
+        Build from parser `Track` records (base_parser.Track)
+
+        Values are appended to compact typed buffers, so no per-track
+        canonical objects are created along the way.
+        """
+        x1, y1, x2, y2, width = (array("d") for _ in range(5))
+        layer_id, net_id = array("i"), array("i")
+
+        for t in tracks:
+            start_missing = t.x1 is None
+            end_missing = t.x2 is None
+            x1.append(float("nan") if start_missing else t.x1)
+            y1.append(float("nan") if start_missing else _float_or_nan(t.y1))
+            x2.append(float("nan") if end_missing else t.x2)
+            y2.append(float("nan") if end_missing else _float_or_nan(t.y2))
+            width.append(t.width or 0.0)
+            layer_id.append(layers.intern(t.layer))
+            net_id.append(nets.intern(t.net_name))
+
+        return cls(
+            _column(x1, np.float64), _column(y1, np.float64),
+            _column(x2, np.float64), _column(y2, np.float64),
+            _column(width, np.float64),
+            _column(layer_id, np.int32), _column(net_id, np.int32),
+            layers, nets,
+        )
+
+    def __len__(self) -> int:
+        return len(self.x1)
+
+    def _row(self, i: int) -> Track:
+        x1, y1, x2, y2 = self.x1[i], self.y1[i], self.x2[i], self.y2[i]
+        return Track(
+            id=f"track_{i}",
+            net=self.nets[int(self.net_id[i])],
+            layer=self.layers[int(self.layer_id[i])],
+            start=None if np.isnan(x1) else Point(float(x1), float(y1)),
+            end=None if np.isnan(x2) else Point(float(x2), float(y2)),
+            width=float(self.width[i]),
+        )
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Track, List[Track]]:
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("track index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[Track]:
+        nets, layers = self.nets, self.layers
+        columns = zip(
+            self.x1.tolist(), self.y1.tolist(), self.x2.tolist(), self.y2.tolist(),
+            self.width.tolist(), self.layer_id.tolist(), self.net_id.tolist(),
+        )
+        for i, (x1, y1, x2, y2, width, layer_id, net_id) in enumerate(columns):
+            yield Track(
+                id=f"track_{i}",
+                net=nets[net_id],
+                layer=layers[layer_id],
+                start=None if x1 != x1 else Point(x1, y1),
+                end=None if x2 != x2 else Point(x2, y2),
+                width=width,
+            )
+
+    # --------------------------------------------------------------------------
+    # Vectorized accessors
+    # --------------------------------------------------------------------------
+
+    def has_geometry(self) -> np.ndarray:
+        """Boolean mask of rows with both endpoints"""
+        return ~(np.isnan(self.x1) | np.isnan(self.x2))
+
+    def segments(self) -> np.ndarray:
+        """(N, 4) array of [x1, y1, x2, y2] (NaN rows for missing geometry)"""
+        return np.column_stack([self.x1, self.y1, self.x2, self.y2])
+
+    def lengths(self) -> np.ndarray:
+        """Segment lengths (0 where geometry is missing)"""
+        return np.nan_to_num(np.hypot(self.x2 - self.x1, self.y2 - self.y1))
+
+    def layer_mask(self, layer: Optional[str]) -> np.ndarray:
+        """Boolean mask of rows on a layer"""
+        layer_id = self.layers.id_of(layer)
+        if layer_id is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.layer_id == layer_id
+
+    def net_mask(self, net: Optional[str]) -> np.ndarray:
+        """Boolean mask of rows on a net"""
+        net_id = self.nets.id_of(net)
+        if net_id is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.net_id == net_id
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays"""
+        return sum(col.nbytes for col in (
+            self.x1, self.y1, self.x2, self.y2, self.width, self.layer_id, self.net_id
+        ))
+
+
+class ViaTable(Sequence):
+    """
+    Vias as parallel NumPy arrays
+
+    Columns: x, y, size, drill (float64), net_id, start_layer_id,
+    end_layer_id (int32), is_through (bool). Rows are exposed as `Via`
+    objects with ids `via_{index}`.
+    """
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        size: np.ndarray,
+        drill: np.ndarray,
+        net_id: np.ndarray,
+        start_layer_id: np.ndarray,
+        end_layer_id: np.ndarray,
+        is_through: np.ndarray,
+        layers: StringTable,
+        nets: StringTable,
+    ):
+        self.x = x
+        self.y = y
+        self.size = size
+        self.drill = drill
+        self.net_id = net_id
+        self.start_layer_id = start_layer_id
+        self.end_layer_id = end_layer_id
+        self.is_through = is_through
+        self.layers = layers
+        self.nets = nets
+
+    @classmethod
+    def from_parsed(cls, vias, layers: StringTable, nets: StringTable) -> "ViaTable":
+        """Build from parser `Via` records (base_parser.Via)"""
+        x, y, size, drill = (array("d") for _ in range(4))
+        net_id, start_layer_id, end_layer_id = array("i"), array("i"), array("i")
+        is_through = array("b")
+
+        for v in vias:
+            missing = v.x is None
+            x.append(float("nan") if missing else v.x)
+            y.append(float("nan") if missing else _float_or_nan(v.y))
+            size.append(v.diameter or 0.0)
+            drill.append(v.drill or 0.0)
+            net_id.append(nets.intern(v.net_name))
+            start_layer_id.append(layers.intern(v.start_layer))
+            end_layer_id.append(layers.intern(v.end_layer))
+            if v.start_layer and v.end_layer:
+                is_through.append(v.start_layer == "F.Cu" and v.end_layer == "B.Cu")
+            else:
+                is_through.append(True)
+
+        return cls(
+            _column(x, np.float64), _column(y, np.float64),
+            _column(size, np.float64), _column(drill, np.float64),
+            _column(net_id, np.int32), _column(start_layer_id, np.int32),
+            _column(end_layer_id, np.int32), _column(is_through, np.int8).astype(bool),
+            layers, nets,
+        )
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def _row(self, i: int) -> Via:
+        x, y = self.x[i], self.y[i]
+        return Via(
+            id=f"via_{i}",
+            net=self.nets[int(self.net_id[i])],
+            position=None if np.isnan(x) else Point(float(x), float(y)),
+            size=float(self.size[i]),
+            drill=float(self.drill[i]),
+            start_layer=self.layers[int(self.start_layer_id[i])],
+            end_layer=self.layers[int(self.end_layer_id[i])],
+            is_through=bool(self.is_through[i]),
+        )
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Via, List[Via]]:
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("via index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[Via]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def annular_rings(self) -> np.ndarray:
+        """Vectorized Via.annular_ring()"""
+        return np.where(self.drill > 0, (self.size - self.drill) / 2, 0.0)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays"""
+        return sum(col.nbytes for col in (
+            self.x, self.y, self.size, self.drill,
+            self.net_id, self.start_layer_id, self.end_layer_id, self.is_through
+        ))
@@ -1,7 +1,7 @@
 """
 Issue model - represents individual analysis findings
 """
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, Float
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -10,6 +10,11 @@ from database import Base
 
 class Issue(Base):
     __tablename__ = "issues"
+    __table_args__ = (
+        # Per-job listing, filtered by severity or category
+        Index("ix_issues_job_severity", "job_id", "severity"),
+        Index("ix_issues_job_category", "job_id", "category"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     job_id = Column(String, ForeignKey("analysis_jobs.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,43 @@
+"""
+Queued Job model - durable background work (analyses) claimed by workers
+"""
+from sqlalchemy import Column, String, DateTime, Text, Integer, JSON, Index
+from datetime import datetime
+import uuid
+from database import Base
+
+
+class QueuedJob(Base):
+    __tablename__ = "job_queue"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String(100), nullable=False)  # Handler name, e.g. pcb_analysis
+    payload = Column(JSON, nullable=False, default=dict)  # Handler keyword arguments
+
+    # Scheduling
+    organization_id = Column(String)  # Concurrency limits are per organization
+    lane = Column(String(20), nullable=False, default="default")  # small, default
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, succeeded, failed
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Not claimable before (retry backoff)
+
+    # Retries
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    last_error = Column(Text)
+
+    # Lease held by the worker running the job; expired leases are reclaimed
+    lease_owner = Column(String(255))
+    lease_expires_at = Column(DateTime)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_job_queue_claim", "status", "lane", "available_at"),
+        Index("ix_job_queue_org_status", "organization_id", "status"),
+    )
+
+    def __repr__(self):
+        return f"<QueuedJob {self.id} {self.kind} - {self.status}>"
@@ -12,17 +12,19 @@ LIMITATIONS:
 """
 
 import logging
-import struct
-import zlib
+import math
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple, BinaryIO
-from dataclasses import dataclass, field
-from io import BytesIO
+from typing import Dict, List, Optional
 
+from .altium_records import (
+    UNIT_MM, decode_arcs, decode_pads, decode_tracks, decode_vias,
+    iter_property_records, parse_length, read_properties
+)
 from .base_parser import (
     BaseParser, ParsedPCBData, BoardInfo,
     Component, Net, Track, Via, Zone
 )
+from .geometry import arc_points
 
 logger = logging.getLogger(__name__)
 
@@ -35,14 +37,6 @@ except ImportError:
     logger.warning("olefile not installed - Altium native parsing limited")
 
 
-@dataclass
-class AltiumRecord:
-    """Parsed Altium record"""
-    record_type: int
-    data: Dict[str, Any]
-    raw: bytes
-
-
 class AltiumParser(BaseParser):
     """
     Parser for Altium Designer files (.PcbDoc, .SchDoc)
@@ -50,7 +44,9 @@ class AltiumParser(BaseParser):
     Altium file structure:
     - OLE Compound Document container
     - Contains multiple streams (FileHeader, Board, Components, etc.)
-    - Data is stored in binary records with key-value pairs
+    - Each object type is a storage (Tracks6, Nets6, ...) whose Data stream
+      holds either property-list records or binary primitive records
+      (decoded by altium_records)
     
     Streams in .PcbDoc:
     - FileHeader: Version info
@@ -98,6 +94,9 @@ class AltiumParser(BaseParser):
         38: 'B.Mask',
     }
     
+    # Signal layers (1 top, 2-31 mid, 32 bottom)
+    COPPER_LAYERS = frozenset(range(1, 33))
+    
     def __init__(self):
         """Initialize parser"""
         self.units = 'mil'  # Altium uses mils internally
@@ -157,22 +156,27 @@ class AltiumParser(BaseParser):
             # Parse components
             components = self._parse_components_stream(ole)
             
-            # Parse nets
+            # Parse nets (index order: primitives refer to nets by position)
             nets = self._parse_nets_stream(ole)
+            net_names = [net.name for net in nets]
             
-            # Parse tracks
-            tracks = self._parse_tracks_stream(ole)
+            # Parse tracks and arcs
+            tracks = self._parse_tracks_stream(ole, net_names)
+            tracks.extend(self._parse_arcs_stream(ole, net_names))
             
             # Parse vias
-            vias = self._parse_vias_stream(ole)
+            vias = self._parse_vias_stream(ole, net_names)
+            
+            # Pad connectivity
+            self._parse_pads_stream(ole, nets, components)
             
             # Parse polygons
-            zones = self._parse_polygons_stream(ole)
+            zones = self._parse_polygons_stream(ole, net_names)
             
             return ParsedPCBData(
                 board_info=board_info,
                 components=components,
-                nets=nets,
+                nets=[net for net in nets if net.name],
                 tracks=tracks,
                 vias=vias,
                 zones=zones,
@@ -187,6 +191,7 @@ class AltiumParser(BaseParser):
         """Get stream data from OLE file"""
         # Try different stream path formats
         paths_to_try = [
+            [stream_name, 'Data'],
             [stream_name],
             ['Board6', stream_name],
             ['Data', stream_name],
@@ -194,7 +199,7 @@ class AltiumParser(BaseParser):
         
         for path in paths_to_try:
             try:
-                if ole.exists(path):
+                if ole.exists('/'.join(path)) and ole.get_type(path) == olefile.STGTY_STREAM:
                     return ole.openstream(path).read()
             except:
                 continue
@@ -209,6 +214,33 @@ class AltiumParser(BaseParser):
         
         return None
     
+    def _layer_name(self, layer: str) -> str:
+        """Layer id (binary records) or name (property records) to standard name"""
+        layer = layer.strip().upper()
+        if layer.isdigit():
+            num = int(layer)
+            if num in self.LAYER_MAP:
+                return self.LAYER_MAP[num]
+            if 2 <= num <= 31:
+                return f'In{num - 1}.Cu'
+            return f'Layer{num}'
+        if layer == 'TOP':
+            return 'F.Cu'
+        if layer == 'BOTTOM':
+            return 'B.Cu'
+        if layer.startswith('MID') and layer[3:].isdigit():
+            return f'In{int(layer[3:])}.Cu'
+        return layer
+    
+    def _length(self, value: Optional[str], default: float) -> float:
+        """Property length in mm ("123.4mil", plain numbers are mils)"""
+        if not value:
+            return default
+        try:
+            return parse_length(value, self.scale)
+        except ValueError:
+            return default
+    
     def _parse_board_stream(self, ole: 'olefile.OleFileIO') -> BoardInfo:
         """Parse board information"""
         # Default values
@@ -220,16 +252,23 @@ class AltiumParser(BaseParser):
         
         if board_data:
             try:
-                records = self._parse_binary_records(board_data)
-                
-                for record in records:
-                    data = record.data
+                for record in iter_property_records(board_data):
+                    data = read_properties(record)
                     
-                    # Look for board dimensions
-                    if 'SHEETWIDTH' in data:
-                        size_x = float(data['SHEETWIDTH']) * self.scale
-                    if 'SHEETHEIGHT' in data:
-                        size_y = float(data['SHEETHEIGHT']) * self.scale
+                    # Board outline vertices (VX0/VY0, VX1/VY1, ...)
+                    xs, ys = [], []
+                    while f'VX{len(xs)}' in data and f'VY{len(xs)}' in data:
+                        ys.append(self._length(data[f'VY{len(xs)}'], 0.0))
+                        xs.append(self._length(data[f'VX{len(xs)}'], 0.0))
+                    if len(xs) > 1:
+                        size_x = max(xs) - min(xs)
+                        size_y = max(ys) - min(ys)
+                    else:
+                        # Look for board dimensions
+                        if 'SHEETWIDTH' in data:
+                            size_x = self._length(data['SHEETWIDTH'], size_x)
+                        if 'SHEETHEIGHT' in data:
+                            size_y = self._length(data['SHEETHEIGHT'], size_y)
                     
                     # Layer count from LAYERMASTERSTACK_V8STACK
                     if 'LAYERV8_0NAME' in data:
@@ -249,7 +288,12 @@ class AltiumParser(BaseParser):
         )
     
     def _parse_components_stream(self, ole: 'olefile.OleFileIO') -> List[Component]:
-        """Parse component placements"""
+        """
+        Parse component placements
+        
+        The list stays in record order (pads refer to components by
+        position); unnamed records keep an empty reference.
+        """
         components = []
         
         comp_data = self._get_stream(ole, 'Components6')
@@ -257,31 +301,28 @@ class AltiumParser(BaseParser):
         if not comp_data:
             return components
         
+        keys = ('SOURCEDESIGNATOR', 'DESIGNITEMID', 'NAME', 'X', 'Y', 'ROTATION', 'LAYER',
+                'PATTERN', 'SOURCELIBRARYNAME', 'COMMENT')
         try:
-            records = self._parse_binary_records(comp_data)
-            
-            for record in records:
-                data = record.data
+            for record in iter_property_records(comp_data):
+                data = read_properties(record, keys)
                 
                 # Extract component info
-                ref = data.get('DESIGNITEMID', data.get('NAME', ''))
-                if not ref:
-                    continue
+                ref = data.get('SOURCEDESIGNATOR') or data.get('DESIGNITEMID') or data.get('NAME', '')
                 
                 # Position
-                x = float(data.get('X', 0)) * self.scale
-                y = float(data.get('Y', 0)) * self.scale
-                rotation = float(data.get('ROTATION', 0))
+                x = self._length(data.get('X'), 0.0)
+                y = self._length(data.get('Y'), 0.0)
+                rotation = float(data.get('ROTATION') or 0)
                 
-                # Layer (0 = top, 1 = bottom typically)
-                layer_num = int(data.get('LAYER', 1))
-                layer = self.LAYER_MAP.get(layer_num, 'F.Cu')
+                # Layer (TOP / BOTTOM)
+                layer = self._layer_name(data.get('LAYER') or '1')
                 
                 # Footprint
-                footprint = data.get('PATTERN', data.get('SOURCELIBRARYNAME', ''))
+                footprint = data.get('PATTERN') or data.get('SOURCELIBRARYNAME', '')
                 
                 # Value (often in comment)
-                value = data.get('COMMENT', data.get('SOURCEDESIGNATOR', ''))
+                value = data.get('COMMENT') or data.get('SOURCEDESIGNATOR', '')
                 
                 components.append(Component(
                     reference=ref,
@@ -299,7 +340,7 @@ class AltiumParser(BaseParser):
         return components
     
     def _parse_nets_stream(self, ole: 'olefile.OleFileIO') -> List[Net]:
-        """Parse net definitions"""
+        """Parse net definitions (one per record, in index order)"""
         nets = []
         
         net_data = self._get_stream(ole, 'Nets6')
@@ -308,14 +349,8 @@ class AltiumParser(BaseParser):
             return nets
         
         try:
-            records = self._parse_binary_records(net_data)
-            
-            for record in records:
-                data = record.data
-                
-                net_name = data.get('NAME', '')
-                if not net_name:
-                    continue
+            for record in iter_property_records(net_data):
+                net_name = read_properties(record, ('NAME',)).get('NAME', '')
                 
                 nets.append(Net(
                     name=net_name,
@@ -329,8 +364,12 @@ class AltiumParser(BaseParser):
         
         return nets
     
-    def _parse_tracks_stream(self, ole: 'olefile.OleFileIO') -> List[Track]:
-        """Parse track segments"""
+    def _net_lookup(self, net_names: List[str]) -> Dict[int, str]:
+        """Net index -> name for primitive records ('' for none/unknown)"""
+        return dict(enumerate(net_names))
+    
+    def _parse_tracks_stream(self, ole: 'olefile.OleFileIO', net_names: List[str]) -> List[Track]:
+        """Parse track segments on copper layers"""
         tracks = []
         
         track_data = self._get_stream(ole, 'Tracks6')
@@ -339,33 +378,24 @@ class AltiumParser(BaseParser):
             return tracks
         
         try:
-            records = self._parse_binary_records(track_data)
+            columns = decode_tracks(track_data)
+            names = self._net_lookup(net_names)
+            layers = {num: self._layer_name(str(num)) for num in set(columns.layer)}
+            unit = UNIT_MM
             
-            for record in records:
-                data = record.data
-                
-                # Get coordinates
-                x1 = float(data.get('X1', 0)) * self.scale
-                y1 = float(data.get('Y1', 0)) * self.scale
-                x2 = float(data.get('X2', 0)) * self.scale
-                y2 = float(data.get('Y2', 0)) * self.scale
-                width = float(data.get('WIDTH', 0.254 / self.scale)) * self.scale
-                
-                # Layer
-                layer_num = int(data.get('LAYER', 1))
-                layer = self.LAYER_MAP.get(layer_num, f'Layer{layer_num}')
-                
-                # Net
-                net_name = data.get('NET', '')
-                
+            for layer, net, x1, y1, x2, y2, width in zip(
+                columns.layer, columns.net, columns.x1, columns.y1, columns.x2, columns.y2, columns.width
+            ):
+                if layer not in self.COPPER_LAYERS:
+                    continue
                 tracks.append(Track(
-                    net_name=net_name,
-                    layer=layer,
-                    width=width,
-                    x1=x1,
-                    y1=y1,
-                    x2=x2,
-                    y2=y2
+                    net_name=names.get(net, ''),
+                    layer=layers[layer],
+                    width=width * unit,
+                    x1=x1 * unit,
+                    y1=y1 * unit,
+                    x2=x2 * unit,
+                    y2=y2 * unit
                 ))
                 
         except Exception as e:
@@ -373,7 +403,50 @@ class AltiumParser(BaseParser):
         
         return tracks
     
-    def _parse_vias_stream(self, ole: 'olefile.OleFileIO') -> List[Via]:
+    def _parse_arcs_stream(self, ole: 'olefile.OleFileIO', net_names: List[str]) -> List[Track]:
+        """Parse copper arcs as chord tracks (see geometry.arc_points)"""
+        tracks = []
+        
+        arc_data = self._get_stream(ole, 'Arcs6')
+        
+        if not arc_data:
+            return tracks
+        
+        try:
+            columns = decode_arcs(arc_data)
+            names = self._net_lookup(net_names)
+            unit = UNIT_MM
+            
+            for layer, net, cx, cy, radius, start, end, width in zip(
+                columns.layer, columns.net, columns.cx, columns.cy, columns.radius,
+                columns.start_angle, columns.end_angle, columns.width
+            ):
+                if layer not in self.COPPER_LAYERS or radius <= 0:
+                    continue
+                xc, yc, r = cx * unit, cy * unit, radius * unit
+                xs = xc + r * math.cos(math.radians(start))
+                ys = yc + r * math.sin(math.radians(start))
+                xe = xc + r * math.cos(math.radians(end))
+                ye = yc + r * math.sin(math.radians(end))
+                net_name, layer_name = names.get(net, ''), self._layer_name(str(layer))
+                for x2, y2 in arc_points(xs, ys, xe, ye, xc, yc, clockwise=False):
+                    tracks.append(Track(
+                        net_name=net_name,
+                        layer=layer_name,
+                        width=width * unit,
+                        x1=xs,
+                        y1=ys,
+                        x2=x2,
+                        y2=y2
+                    ))
+                    xs, ys = x2, y2
+                
+        except Exception as e:
+            logger.warning(f"Arcs stream parse error: {e}")
+        
+        return tracks
+    
+    def _parse_vias_stream(self, ole: 'olefile.OleFileIO', net_names: List[str]) -> List[Via]:
         """Parse vias"""
         vias = []
         
@@ -383,26 +456,22 @@ class AltiumParser(BaseParser):
             return vias
         
         try:
-            records = self._parse_binary_records(via_data)
+            columns = decode_vias(via_data)
+            names = self._net_lookup(net_names)
+            unit = UNIT_MM
             
-            for record in records:
-                data = record.data
-                
-                x = float(data.get('X', 0)) * self.scale
-                y = float(data.get('Y', 0)) * self.scale
-                diameter = float(data.get('DIAMETER', 0.6 / self.scale)) * self.scale
-                drill = float(data.get('HOLESIZE', 0.3 / self.scale)) * self.scale
-                
-                net_name = data.get('NET', '')
-                
+            for net, x, y, diameter, hole, start_layer, end_layer in zip(
+                columns.net, columns.x, columns.y, columns.diameter, columns.hole,
+                columns.start_layer, columns.end_layer
+            ):
                 vias.append(Via(
-                    net_name=net_name,
-                    x=x,
-                    y=y,
-                    diameter=diameter,
-                    drill=drill,
-                    start_layer='F.Cu',
-                    end_layer='B.Cu'
+                    net_name=names.get(net, ''),
+                    x=x * unit,
+                    y=y * unit,
+                    diameter=diameter * unit,
+                    drill=hole * unit,
+                    start_layer=self._layer_name(str(start_layer)),
+                    end_layer=self._layer_name(str(end_layer))
                 ))
                 
         except Exception as e:
@@ -410,7 +479,28 @@ class AltiumParser(BaseParser):
         
         return vias
     
-    def _parse_polygons_stream(self, ole: 'olefile.OleFileIO') -> List[Zone]:
+    def _parse_pads_stream(self, ole: 'olefile.OleFileIO', nets: List[Net], components: List[Component]):
+        """Add "REF.PAD" entries to Net.pads for pads on a net and a component"""
+        pad_data = self._get_stream(ole, 'Pads6')
+        
+        if not pad_data:
+            return
+        
+        try:
+            columns = decode_pads(pad_data)
+            
+            for i, (net, component) in enumerate(zip(columns.net, columns.component)):
+                if net >= len(nets) or component >= len(components):
+                    continue  # NO_INDEX (free pad / no net) or unknown
+                reference = components[component].reference
+                if reference:
+                    # Pad names are only decoded here, for connected pads
+                    nets[net].pads.append(f"{reference}.{columns.pad_name(i)}")
+                
+        except Exception as e:
+            logger.warning(f"Pads stream parse error: {e}")
+    
+    def _parse_polygons_stream(self, ole: 'olefile.OleFileIO', net_names: List[str]) -> List[Zone]:
         """Parse copper pours/polygons"""
         zones = []
         
@@ -420,20 +510,26 @@ class AltiumParser(BaseParser):
             return zones
         
         try:
-            records = self._parse_binary_records(poly_data)
+            names = self._net_lookup(net_names)
             
-            for record in records:
-                data = record.data
+            for record in iter_property_records(poly_data):
+                data = read_properties(record)
+                
+                # NET is the net index
+                net = data.get('NET', '')
+                net_name = names.get(int(net), '') if net.isdigit() else net
+                layer = self._layer_name(data.get('LAYER') or '1')
                 
-                net_name = data.get('NET', '')
-                layer_num = int(data.get('LAYER', 1))
-                layer = self.LAYER_MAP.get(layer_num, f'Layer{layer_num}')
+                # Outline vertices (VX0/VY0, VX1/VY1, ...)
+                outline = []
+                while f'VX{len(outline)}' in data and f'VY{len(outline)}' in data:
+                    i = len(outline)
+                    outline.append((self._length(data[f'VX{i}'], 0.0), self._length(data[f'VY{i}'], 0.0)))
                 
-                # Polygon outline (simplified - actual parsing is complex)
                 zones.append(Zone(
                     net_name=net_name,
                     layer=layer,
-                    outline_points=[]  # Would need detailed polygon parsing
+                    outline_points=outline
                 ))
                 
         except Exception as e:
@@ -441,70 +537,6 @@ class AltiumParser(BaseParser):
         
         return zones
     
-    def _parse_binary_records(self, data: bytes) -> List[AltiumRecord]:
-        """
-        Parse Altium binary record format
-        
-        Record format:
-        - First few bytes may be header/count
-        - Records are key-value pairs separated by |
-        - Keys are uppercase, values follow =
-        - Records end with specific terminator
-        """
-        records = []
-        
-        # Try to decompress if compressed
-        try:
-            decompressed = zlib.decompress(data)
-            data = decompressed
-        except:
-            pass
-        
-        # Convert to string and split by record separator
-        try:
-            text = data.decode('utf-8', errors='replace')
-        except:
-            text = data.decode('latin-1', errors='replace')
-        
-        # Common record separators in Altium
-        separators = ['\x00', '|RECORD=']
-        
-        for sep in separators:
-            if sep in text:
-                parts = text.split(sep)
-                break
-        else:
-            parts = [text]
-        
-        for part in parts:
-            if not part.strip():
-                continue
-            
-            record_data = {}
-            
-            # Parse key=value pairs
-            # Split by | but handle embedded |
-            pairs = part.split('|')
-            
-            for pair in pairs:
-                if '=' in pair:
-                    key, _, value = pair.partition('=')
-                    key = key.strip().upper()
-                    value = value.strip()
-                    
-                    if key:
-                        record_data[key] = value
-            
-            if record_data:
-                record_type = int(record_data.get('RECORD', 0))
-                records.append(AltiumRecord(
-                    record_type=record_type,
-                    data=record_data,
-                    raw=part.encode('latin-1', errors='replace')
-                ))
-        
-        return records
-    
     def _empty_result(self) -> ParsedPCBData:
         """Return empty result"""
         return ParsedPCBData(
@@ -0,0 +1,291 @@
+"""
+Altium PcbDoc stream decoders
+
+Two record encodings are used in a .PcbDoc's OLE storages (<Name>6/Data):
+
+- Property lists (Board6, Components6, Nets6, Polygons6, ...): uint32
+  length, then "|KEY=VALUE|KEY=VALUE...\\0". iter_property_records yields
+  each record as a memoryview and read_properties decodes only the keys
+  asked for.
+- Binary primitives (Tracks6, Arcs6, Vias6, Pads6): uint8 record type,
+  then subrecords of uint32 length + payload with a fixed leading layout.
+  These are unpacked straight from a memoryview into array columns; when
+  every record has the same size (the usual case) the whole stream goes
+  through one struct.iter_unpack call.
+
+Coordinates are int32 in 1/10000 mil (see UNIT_MM); columns keep the raw
+integers and callers scale when building Track/Via objects. Net and
+component indexes are uint16 with NO_INDEX for none.
+"""
+import struct
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+UNIT_MM = 0.0000254  # mm per internal unit (1/10000 mil)
+NO_INDEX = 0xFFFF
+
+RECORD_ARC = 1
+RECORD_PAD = 2
+RECORD_VIA = 3
+RECORD_TRACK = 4
+
+_LENGTH = struct.Struct("<I")
+_HEADER_SIZE = 5  # uint8 type + uint32 subrecord length
+
+# Leading fields of each primitive's main subrecord
+TRACK_LAYOUT = struct.Struct("<BBBHHH4xiiiii")  # layer, flags1, flags2, net, polygon, component, x1, y1, x2, y2, width
+ARC_LAYOUT = struct.Struct("<BBBHHH4xiiiddi")  # layer, flags1, flags2, net, polygon, component, cx, cy, radius, start, end, width
+VIA_LAYOUT = struct.Struct("<xBBH8xiiiiBB")  # flags1, flags2, net, x, y, diameter, hole, start layer, end layer
+PAD_LAYOUT = struct.Struct("<BBBH2xH4xiiiiiiiiiBBBdB")  # layer, flags1, flags2, net, component, x, y, sizes, hole, shapes, rotation, plated
+PAD_SUBRECORDS = 6  # Name, 3 unused, main data (PAD_LAYOUT), size and shape
+
+
+class AltiumFormatError(ValueError):
+    """Stream does not have the expected record structure"""
+
+
+@dataclass
+class TrackColumns:
+    layer: array = field(default_factory=lambda: array("B"))
+    net: array = field(default_factory=lambda: array("H"))
+    component: array = field(default_factory=lambda: array("H"))
+    x1: array = field(default_factory=lambda: array("i"))
+    y1: array = field(default_factory=lambda: array("i"))
+    x2: array = field(default_factory=lambda: array("i"))
+    y2: array = field(default_factory=lambda: array("i"))
+    width: array = field(default_factory=lambda: array("i"))
+
+    def __len__(self) -> int:
+        return len(self.x1)
+
+
+@dataclass
+class ArcColumns:
+    layer: array = field(default_factory=lambda: array("B"))
+    net: array = field(default_factory=lambda: array("H"))
+    component: array = field(default_factory=lambda: array("H"))
+    cx: array = field(default_factory=lambda: array("i"))
+    cy: array = field(default_factory=lambda: array("i"))
+    radius: array = field(default_factory=lambda: array("i"))
+    start_angle: array = field(default_factory=lambda: array("d"))  # Degrees, counterclockwise to end_angle
+    end_angle: array = field(default_factory=lambda: array("d"))
+    width: array = field(default_factory=lambda: array("i"))
+
+    def __len__(self) -> int:
+        return len(self.cx)
+
+
+@dataclass
+class ViaColumns:
+    net: array = field(default_factory=lambda: array("H"))
+    x: array = field(default_factory=lambda: array("i"))
+    y: array = field(default_factory=lambda: array("i"))
+    diameter: array = field(default_factory=lambda: array("i"))
+    hole: array = field(default_factory=lambda: array("i"))
+    start_layer: array = field(default_factory=lambda: array("B"))
+    end_layer: array = field(default_factory=lambda: array("B"))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+
+@dataclass
+class PadColumns:
+    """Pads; names stay in the stream until pad_name is called"""
+    data: bytes = b""
+    name_offset: array = field(default_factory=lambda: array("q"))
+    layer: array = field(default_factory=lambda: array("B"))
+    net: array = field(default_factory=lambda: array("H"))
+    component: array = field(default_factory=lambda: array("H"))
+    x: array = field(default_factory=lambda: array("i"))
+    y: array = field(default_factory=lambda: array("i"))
+    hole: array = field(default_factory=lambda: array("i"))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def pad_name(self, index: int) -> str:
+        offset = self.name_offset[index]
+        size = self.data[offset]
+        return self.data[offset + 1:offset + 1 + size].decode("latin-1")
+
+
+# ------------------------------------------------------------ property lists
+
+def iter_property_records(data: bytes) -> Iterator[memoryview]:
+    """Each length-prefixed property record of a stream (without the length)"""
+    view = memoryview(data)
+    pos, end = 0, len(view)
+    while pos + 4 <= end:
+        (length,) = _LENGTH.unpack_from(view, pos)
+        pos += 4
+        if pos + length > end:
+            raise AltiumFormatError(f"Property record at {pos - 4} overruns the stream")
+        yield view[pos:pos + length]
+        pos += length
+
+
+def read_properties(record: memoryview, keys: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """
+    Decode a property record; only the given keys when keys is set
+
+    Values of %UTF8%KEY entries (non-ASCII text) take precedence over the
+    Windows-1252 KEY entry.
+    """
+    raw = bytes(record).rstrip(b"\0")
+    if keys is None:
+        properties = {}
+        utf8 = {}
+        for pair in raw.split(b"|"):
+            key, sep, value = pair.partition(b"=")
+            if not sep or not key:
+                continue
+            key = key.strip().upper()
+            if key.startswith(b"%UTF8%"):
+                utf8[key[6:].decode("latin-1")] = value.decode("utf-8", errors="replace")
+            else:
+                properties[key.decode("latin-1")] = value.decode("cp1252", errors="replace")
+        properties.update(utf8)
+        return properties
+
+    if not raw.startswith(b"|"):
+        raw = b"|" + raw
+    properties = {}
+    for key in keys:
+        for prefix, encoding in ((b"|%UTF8%", "utf-8"), (b"|", "cp1252")):
+            marker = prefix + key.encode("ascii") + b"="
+            start = raw.find(marker)
+            if start < 0:
+                continue
+            start += len(marker)
+            stop = raw.find(b"|", start)
+            properties[key] = raw[start:stop if stop >= 0 else len(raw)].decode(encoding, errors="replace")
+            break
+    return properties
+
+
+def parse_length(value: str, default_unit: float = 0.0254) -> float:
+    """Property length ("1234.5mil", "0.25mm", "1234.5") in mm"""
+    value = value.strip().lower()
+    if value.endswith("mil"):
+        return float(value[:-3]) * 0.0254
+    if value.endswith("mm"):
+        return float(value[:-2])
+    if value.endswith("in"):
+        return float(value[:-2]) * 25.4
+    return float(value) * default_unit
+
+
+# --------------------------------------------------------- binary primitives
+
+def _fixed_records(data: bytes, record_type: int, layout: struct.Struct) -> Iterator[tuple]:
+    """
+    Leading layout fields of each single-subrecord primitive
+
+    Uniform record sizes (verified by comparing every record's header bytes
+    through strided memoryview slices) are unpacked with one iter_unpack;
+    otherwise the records are walked one by one.
+    """
+    view = memoryview(data)
+    total = len(view)
+    if total < _HEADER_SIZE:
+        return iter(())
+    (length,) = _LENGTH.unpack_from(view, 1)
+    stride = _HEADER_SIZE + length
+    if view[0] == record_type and length >= layout.size and total % stride == 0:
+        header = bytes(view[:_HEADER_SIZE])
+        count = total // stride
+        if all(bytes(view[i::stride]) == header[i:i + 1] * count for i in range(_HEADER_SIZE)):
+            record = struct.Struct(f"<{_HEADER_SIZE}x{layout.format[1:]}{length - layout.size}x")
+            return record.iter_unpack(view)
+    return _walk_records(view, record_type, layout)
+
+
+def _walk_records(view: memoryview, record_type: int, layout: struct.Struct) -> Iterator[tuple]:
+    pos, end = 0, len(view)
+    while pos + _HEADER_SIZE <= end:
+        if view[pos] != record_type:
+            raise AltiumFormatError(f"Unexpected record type {view[pos]} at {pos}")
+        (length,) = _LENGTH.unpack_from(view, pos + 1)
+        body = pos + _HEADER_SIZE
+        if body + length > end:
+            raise AltiumFormatError(f"Record at {pos} overruns the stream")
+        if length >= layout.size:
+            yield layout.unpack_from(view, body)
+        pos = body + length
+
+
+def _columns(rows: Iterator[tuple], target, names: List[str], typecodes: Dict[str, str]):
+    """Transpose unpacked rows into the named array columns of target"""
+    transposed = list(zip(*rows))
+    if not transposed:
+        return target
+    for name, values in zip(names, transposed):
+        if name:
+            setattr(target, name, array(typecodes[name], values))
+    return target
+
+
+def _typecodes(columns) -> Dict[str, str]:
+    return {name: value.typecode for name, value in vars(columns).items() if isinstance(value, array)}
+
+
+def decode_tracks(data: bytes) -> TrackColumns:
+    """Tracks6/Data"""
+    columns = TrackColumns()
+    names = ["layer", None, None, "net", None, "component", "x1", "y1", "x2", "y2", "width"]
+    return _columns(_fixed_records(data, RECORD_TRACK, TRACK_LAYOUT), columns, names, _typecodes(columns))
+
+
+def decode_arcs(data: bytes) -> ArcColumns:
+    """Arcs6/Data"""
+    columns = ArcColumns()
+    names = ["layer", None, None, "net", None, "component", "cx", "cy", "radius",
+             "start_angle", "end_angle", "width"]
+    return _columns(_fixed_records(data, RECORD_ARC, ARC_LAYOUT), columns, names, _typecodes(columns))
+
+
+def decode_vias(data: bytes) -> ViaColumns:
+    """Vias6/Data"""
+    columns = ViaColumns()
+    names = [None, None, "net", "x", "y", "diameter", "hole", "start_layer", "end_layer"]
+    return _columns(_fixed_records(data, RECORD_VIA, VIA_LAYOUT), columns, names, _typecodes(columns))
+
+
+def decode_pads(data: bytes) -> PadColumns:
+    """
+    Pads6/Data
+
+    Pads carry a variable-length name subrecord, so records are walked one
+    by one; only the name's offset is kept.
+    """
+    view = memoryview(data)
+    columns = PadColumns(data=data)
+    pos, end = 0, len(view)
+    while pos + _HEADER_SIZE <= end:
+        if view[pos] != RECORD_PAD:
+            raise AltiumFormatError(f"Unexpected record type {view[pos]} at {pos}")
+        pos += 1
+        bodies = []
+        for _ in range(PAD_SUBRECORDS):
+            if pos + 4 > end:
+                raise AltiumFormatError("Pad record overruns the stream")
+            (length,) = _LENGTH.unpack_from(view, pos)
+            bodies.append((pos + 4, length))
+            pos += 4 + length
+        if pos > end:
+            raise AltiumFormatError("Pad record overruns the stream")
+        name_body, name_length = bodies[0]
+        main_body, main_length = bodies[4]
+        if main_length < PAD_LAYOUT.size or name_length < 1:
+            continue
+        (layer, _, _, net, component, x, y, *_, hole, _, _, _, _, _) = PAD_LAYOUT.unpack_from(view, main_body)
+        columns.name_offset.append(name_body)
+        columns.layer.append(layer)
+        columns.net.append(net)
+        columns.component.append(component)
+        columns.x.append(x)
+        columns.y.append(y)
+        columns.hole.append(hole)
+    return columns
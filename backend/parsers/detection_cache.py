@@ -0,0 +1,115 @@
+"""
+Format Detection Cache
+Remembers FormatDetector results across the upload, file-tree and analysis paths
+
+Detection is a pure function of a file's name and its header bytes, so
+results are kept at two levels:
+
+- (path, size, mtime) -> header hash: a file that has not changed is not
+  read again
+- (header hash, file name) -> result: the same file at another path (the
+  upload copied into extracted/, an archive extracted again for analysis)
+  reuses the result after one header read
+
+Both maps are LRU-bounded by detection_cache_entries and shared by every
+FormatDetector in the process.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from typing import Optional, Tuple
+
+from config import get_settings
+
+PathKey = Tuple[str, int, int]
+ContentKey = Tuple[bytes, str]
+
+
+def header_digest(header: bytes) -> bytes:
+    """Hash of the bytes detection looked at"""
+    return hashlib.blake2b(header, digest_size=16).digest()
+
+
+class DetectionCache:
+    """LRU maps from file identity and content to DetectedFile results"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = get_settings().detection_cache_entries if max_entries is None else max_entries
+        self._by_path: "OrderedDict[PathKey, ContentKey]" = OrderedDict()
+        self._by_content: "OrderedDict[ContentKey, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def path_key(path: Path, stat: os.stat_result) -> PathKey:
+        return (str(path), stat.st_size, stat.st_mtime_ns)
+
+    @staticmethod
+    def content_key(path: Path, header: bytes) -> ContentKey:
+        return (header_digest(header), path.name)
+
+    def _put(self, table: OrderedDict, key, value):
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.max_entries:
+            table.popitem(last=False)
+
+    def _get(self, table: OrderedDict, key):
+        value = table.get(key)
+        if value is not None:
+            table.move_to_end(key)
+        return value
+
+    def get(self, path: Path, stat: os.stat_result):
+        """Result for an unchanged file, without reading it"""
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            content_key = self._get(self._by_path, self.path_key(path, stat))
+            detected = self._get(self._by_content, content_key) if content_key else None
+            if detected is not None:
+                self.hits += 1
+                return replace(detected, path=path, metadata=dict(detected.metadata))
+        return None
+
+    def get_content(self, path: Path, stat: os.stat_result, header: bytes):
+        """Result for the same name and header seen at another path"""
+        if self.max_entries <= 0:
+            return None
+        content_key = self.content_key(path, header)
+        with self._lock:
+            detected = self._get(self._by_content, content_key)
+            if detected is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._put(self._by_path, self.path_key(path, stat), content_key)
+        return replace(detected, path=path, metadata=dict(detected.metadata))
+
+    def put(self, path: Path, stat: os.stat_result, header: bytes, detected):
+        if self.max_entries <= 0:
+            return
+        content_key = self.content_key(path, header)
+        with self._lock:
+            self._put(self._by_content, content_key, replace(detected, metadata=dict(detected.metadata)))
+            self._put(self._by_path, self.path_key(path, stat), content_key)
+
+    def clear(self):
+        with self._lock:
+            self._by_path.clear()
+            self._by_content.clear()
+
+
+_detection_cache: Optional[DetectionCache] = None
+
+
+def get_detection_cache() -> DetectionCache:
+    """Get global detection cache instance"""
+    global _detection_cache
+    if _detection_cache is None:
+        _detection_cache = DetectionCache()
+    return _detection_cache
@@ -6,15 +6,16 @@ Eagle uses XML format since version 6.0, making it well-documented and parseable
 """
 
 import logging
-import xml.etree.ElementTree as ET
+import re
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 
 from .base_parser import (
     BaseParser, ParsedPCBData, BoardInfo, 
     Component, Net, Track, Via, Zone
 )
+from .xml_stream import XML_PARSE_ERRORS, XMLRecordStream
 
 logger = logging.getLogger(__name__)
 
@@ -102,7 +103,7 @@ class EagleParser(BaseParser):
         
         try:
             return self._parse_board_file(brd_file)
-        except ET.ParseError as e:
+        except XML_PARSE_ERRORS as e:
             logger.error(f"XML parse error: {e}")
             return self._empty_result()
         except Exception as e:
@@ -110,256 +111,230 @@ class EagleParser(BaseParser):
             return self._empty_result()
     
     def _parse_board_file(self, brd_file: Path) -> ParsedPCBData:
-        """Parse a .brd file"""
-        tree = ET.parse(brd_file)
-        root = tree.getroot()
+        """
+        Parse a .brd file in one streaming pass
+        
+        Layers, libraries, the plain section, design rules, elements and
+        signals are handled as they close and then freed, so memory is
+        bounded by the largest signal rather than the board.
+        """
+        self._stream = XMLRecordStream(
+            start_handlers={
+                'board': self._on_board,
+            },
+            end_handlers={
+                'layer': self._on_layer,
+                'library': self._on_library,
+                'plain': self._on_plain,
+                'designrules': self._on_design_rules,
+                'element': self._on_element,
+                'signal': self._on_signal,
+                'schematic': self._on_schematic,
+            },
+        )
+        self._has_board = False
+        self._schematic: Optional[ParsedPCBData] = None
+        self._outline_bounds = [float('inf'), float('inf'), float('-inf'), float('-inf')]
+        self._layer_count = 2
+        self._components: List[Component] = []
+        self._nets: List[Net] = []
+        self._tracks: List[Track] = []
+        self._vias: List[Via] = []
+        self._zones: List[Zone] = []
+        
+        self._stream.run(brd_file)
         
         # Verify this is an Eagle file
-        if root.tag != 'eagle':
+        if self._stream.root_tag != 'eagle':
             logger.warning("Not an Eagle file (missing <eagle> root)")
             return self._empty_result()
         
-        # Find the board element
-        drawing = root.find('drawing')
-        if drawing is None:
-            return self._empty_result()
-        
-        board = drawing.find('board')
-        if board is None:
+        if not self._has_board:
             # Might be a schematic file
-            schematic = drawing.find('schematic')
-            if schematic is not None:
-                return self._parse_schematic_element(schematic)
-            return self._empty_result()
-        
-        # Parse layers
-        layers_elem = drawing.find('layers')
-        if layers_elem is not None:
-            self._parse_layers(layers_elem)
-        
-        # Parse libraries
-        libraries_elem = board.find('libraries')
-        if libraries_elem is not None:
-            self._parse_libraries(libraries_elem)
-        
-        # Parse board data
-        board_info = self._parse_board_info(board)
-        components = self._parse_elements(board)
-        nets, tracks, vias, zones = self._parse_signals(board)
+            return self._schematic or self._empty_result()
         
         return ParsedPCBData(
-            board_info=board_info,
-            nets=nets,
-            components=components,
-            tracks=tracks,
-            vias=vias,
-            zones=zones,
+            board_info=self._board_info(),
+            nets=self._nets,
+            components=self._components,
+            tracks=self._tracks,
+            vias=self._vias,
+            zones=self._zones,
             files_found={'eagle_brd': True}
         )
     
-    def _parse_layers(self, layers_elem: ET.Element):
-        """Parse layer definitions"""
-        for layer in layers_elem.findall('layer'):
-            num = int(layer.get('number', 0))
-            self.layers[num] = EagleLayer(
-                number=num,
-                name=layer.get('name', ''),
-                color=int(layer.get('color', 0)),
-                fill=int(layer.get('fill', 0)),
-                visible=layer.get('visible', 'yes') == 'yes',
-                active=layer.get('active', 'yes') == 'yes'
-            )
+    def _on_board(self, elem):
+        self._has_board = True
     
-    def _parse_libraries(self, libraries_elem: ET.Element):
-        """Parse library definitions"""
-        for library in libraries_elem.findall('library'):
-            lib_name = library.get('name', '')
-            packages = {}
-            
-            for package in library.findall('.//package'):
-                pkg_name = package.get('name', '')
-                packages[pkg_name] = {
-                    'name': pkg_name,
-                    'description': package.find('description').text if package.find('description') is not None else ''
-                }
-            
-            self.libraries[lib_name] = packages
+    def _on_layer(self, layer):
+        """Layer definition"""
+        num = int(layer.get('number', 0))
+        self.layers[num] = EagleLayer(
+            number=num,
+            name=layer.get('name', ''),
+            color=int(layer.get('color', 0)),
+            fill=int(layer.get('fill', 0)),
+            visible=layer.get('visible', 'yes') == 'yes',
+            active=layer.get('active', 'yes') == 'yes'
+        )
     
-    def _parse_board_info(self, board: ET.Element) -> BoardInfo:
-        """Extract board dimensions and info"""
-        # Find board outline from plain/wire elements on layer 20 (Dimension)
-        # or calculate from element positions
-        min_x, min_y = float('inf'), float('inf')
-        max_x, max_y = float('-inf'), float('-inf')
+    def _on_library(self, library):
+        """Library definition"""
+        packages = {}
         
-        plain = board.find('plain')
-        if plain is not None:
-            for wire in plain.findall('wire'):
-                layer = int(wire.get('layer', 0))
-                if layer in (20, 44):  # Dimension or Edge.Cuts
-                    x1 = float(wire.get('x1', 0))
-                    y1 = float(wire.get('y1', 0))
-                    x2 = float(wire.get('x2', 0))
-                    y2 = float(wire.get('y2', 0))
-                    
-                    min_x = min(min_x, x1, x2)
-                    min_y = min(min_y, y1, y2)
-                    max_x = max(max_x, x1, x2)
-                    max_y = max(max_y, y1, y2)
+        for package in library.iter('package'):
+            pkg_name = package.get('name', '')
+            description = package.find('description')
+            packages[pkg_name] = {
+                'name': pkg_name,
+                'description': description.text if description is not None else ''
+            }
+        
+        self.libraries[library.get('name', '')] = packages
+    
+    def _on_plain(self, plain):
+        """Board outline from wires on layer 20 (Dimension) or 44 (Edge.Cuts)"""
+        bounds = self._outline_bounds
+        for wire in plain.findall('wire'):
+            layer = int(wire.get('layer', 0))
+            if layer in (20, 44):  # Dimension or Edge.Cuts
+                x1 = float(wire.get('x1', 0))
+                y1 = float(wire.get('y1', 0))
+                x2 = float(wire.get('x2', 0))
+                y2 = float(wire.get('y2', 0))
+                
+                bounds[0] = min(bounds[0], x1, x2)
+                bounds[1] = min(bounds[1], y1, y2)
+                bounds[2] = max(bounds[2], x1, x2)
+                bounds[3] = max(bounds[3], y1, y2)
+    
+    def _on_design_rules(self, design_rules):
+        """Copper layer count from the layerSetup parameter"""
+        for param in design_rules.iter('param'):
+            if param.get('name') == 'layerSetup':
+                # Count layer numbers in setup string like "(1*16)"
+                self._layer_count = len(re.findall(r'\d+', param.get('value', '')))
+                break
+    
+    def _board_info(self) -> BoardInfo:
+        """Board dimensions and info"""
+        min_x, min_y, max_x, max_y = self._outline_bounds
         
         # Fallback: calculate from elements
         if min_x == float('inf'):
-            for element in board.findall('.//element'):
-                x = float(element.get('x', 0))
-                y = float(element.get('y', 0))
-                min_x = min(min_x, x - 5)
-                min_y = min(min_y, y - 5)
-                max_x = max(max_x, x + 5)
-                max_y = max(max_y, y + 5)
+            for component in self._components:
+                min_x = min(min_x, component.x - 5)
+                min_y = min(min_y, component.y - 5)
+                max_x = max(max_x, component.x + 5)
+                max_y = max(max_y, component.y + 5)
         
         size_x = max_x - min_x if max_x != float('-inf') else 100.0
         size_y = max_y - min_y if max_y != float('-inf') else 100.0
         
-        # Count copper layers
-        layer_count = 2  # Default
-        design_rules = board.find('designrules')
-        if design_rules is not None:
-            for param in design_rules.findall('.//param'):
-                if param.get('name') == 'layerSetup':
-                    setup = param.get('value', '')
-                    # Count layers in setup string like "(1*16)"
-                    layer_count = len([c for c in setup if c.isdigit()])
-                    break
-        
         return BoardInfo(
             size_x=size_x,
             size_y=size_y,
-            layer_count=max(2, layer_count)
+            layer_count=max(2, self._layer_count)
         )
     
-    def _parse_elements(self, board: ET.Element) -> List[Component]:
-        """Parse placed components (elements)"""
-        components = []
+    def _on_element(self, elem):
+        """Placed component"""
+        name = elem.get('name', '')
+        value = elem.get('value', '')
+        package = elem.get('package', '')
+        library = elem.get('library', '')
         
-        elements = board.find('elements')
-        if elements is None:
-            return components
+        x = float(elem.get('x', 0))
+        y = float(elem.get('y', 0))
         
-        for elem in elements.findall('element'):
-            name = elem.get('name', '')
-            value = elem.get('value', '')
-            package = elem.get('package', '')
-            library = elem.get('library', '')
-            
-            x = float(elem.get('x', 0))
-            y = float(elem.get('y', 0))
-            
-            # Parse rotation (e.g., "R90", "MR180")
-            rot_str = elem.get('rot', 'R0')
-            mirror = rot_str.startswith('M')
-            rotation = float(rot_str.replace('M', '').replace('R', '') or '0')
-            
-            # Determine layer from mirror
-            layer = 'B.Cu' if mirror else 'F.Cu'
-            
-            components.append(Component(
-                reference=name,
-                value=value,
-                footprint=f"{library}:{package}" if library else package,
-                x=x,
-                y=y,
-                rotation=rotation,
-                layer=layer
-            ))
+        # Parse rotation (e.g., "R90", "MR180")
+        rot_str = elem.get('rot', 'R0')
+        mirror = rot_str.startswith('M')
+        rotation = float(rot_str.replace('M', '').replace('R', '') or '0')
         
-        return components
+        # Determine layer from mirror
+        layer = 'B.Cu' if mirror else 'F.Cu'
+        
+        self._components.append(Component(
+            reference=name,
+            value=value,
+            footprint=f"{library}:{package}" if library else package,
+            x=x,
+            y=y,
+            rotation=rotation,
+            layer=layer
+        ))
     
-    def _parse_signals(self, board: ET.Element) -> Tuple[List[Net], List[Track], List[Via], List[Zone]]:
-        """Parse signals (nets, tracks, vias, polygons)"""
-        nets = []
-        tracks = []
-        vias = []
-        zones = []
+    def _on_signal(self, signal):
+        """Net with its wires, vias and polygons"""
+        net_name = signal.get('name', '')
         
-        signals = board.find('signals')
-        if signals is None:
-            return nets, tracks, vias, zones
+        # Collect pads connected to this net
+        pads = []
+        for contactref in signal.findall('contactref'):
+            element = contactref.get('element', '')
+            pad = contactref.get('pad', '')
+            pads.append(f"{element}.{pad}")
         
-        for signal in signals.findall('signal'):
-            net_name = signal.get('name', '')
-            
-            # Classify net
-            is_power = self.detect_power_net(net_name)
-            is_ground = self.detect_ground_net(net_name)
-            is_mains = self.detect_mains_net(net_name)
+        self._nets.append(Net(
+            name=net_name,
+            is_power=self.detect_power_net(net_name),
+            is_ground=self.detect_ground_net(net_name),
+            is_mains=self.detect_mains_net(net_name),
+            pads=pads
+        ))
+        
+        # Parse wires (tracks)
+        for wire in signal.findall('wire'):
+            layer_num = int(wire.get('layer', 0))
             
-            # Collect pads connected to this net
-            pads = []
-            for contactref in signal.findall('contactref'):
-                element = contactref.get('element', '')
-                pad = contactref.get('pad', '')
-                pads.append(f"{element}.{pad}")
+            # Only include copper layers
+            if layer_num not in (1, 2, 15, 16):
+                continue
             
-            nets.append(Net(
-                name=net_name,
-                is_power=is_power,
-                is_ground=is_ground,
-                is_mains=is_mains,
-                pads=pads
+            self._tracks.append(Track(
+                net_name=net_name,
+                layer=self.LAYER_MAP.get(layer_num, f'Layer{layer_num}'),
+                width=float(wire.get('width', 0.254)),
+                x1=float(wire.get('x1', 0)),
+                y1=float(wire.get('y1', 0)),
+                x2=float(wire.get('x2', 0)),
+                y2=float(wire.get('y2', 0))
+            ))
+        
+        # Parse vias
+        for via in signal.findall('via'):
+            self._vias.append(Via(
+                net_name=net_name,
+                x=float(via.get('x', 0)),
+                y=float(via.get('y', 0)),
+                diameter=float(via.get('diameter', 0.6)),
+                drill=float(via.get('drill', 0.3)),
+                start_layer='F.Cu',
+                end_layer='B.Cu'
             ))
+        
+        # Parse polygons (zones)
+        for polygon in signal.findall('polygon'):
+            layer_num = int(polygon.get('layer', 0))
             
-            # Parse wires (tracks)
-            for wire in signal.findall('wire'):
-                layer_num = int(wire.get('layer', 0))
-                layer_name = self.LAYER_MAP.get(layer_num, f'Layer{layer_num}')
-                
-                # Only include copper layers
-                if layer_num not in (1, 2, 15, 16):
-                    continue
-                
-                tracks.append(Track(
-                    net_name=net_name,
-                    layer=layer_name,
-                    width=float(wire.get('width', 0.254)),
-                    x1=float(wire.get('x1', 0)),
-                    y1=float(wire.get('y1', 0)),
-                    x2=float(wire.get('x2', 0)),
-                    y2=float(wire.get('y2', 0))
-                ))
+            outline = [
+                (float(vertex.get('x', 0)), float(vertex.get('y', 0)))
+                for vertex in polygon.findall('vertex')
+            ]
             
-            # Parse vias
-            for via in signal.findall('via'):
-                vias.append(Via(
+            if outline:
+                self._zones.append(Zone(
                     net_name=net_name,
-                    x=float(via.get('x', 0)),
-                    y=float(via.get('y', 0)),
-                    diameter=float(via.get('diameter', 0.6)),
-                    drill=float(via.get('drill', 0.3)),
-                    start_layer='F.Cu',
-                    end_layer='B.Cu'
+                    layer=self.LAYER_MAP.get(layer_num, f'Layer{layer_num}'),
+                    outline_points=outline
                 ))
-            
-            # Parse polygons (zones)
-            for polygon in signal.findall('polygon'):
-                layer_num = int(polygon.get('layer', 0))
-                layer_name = self.LAYER_MAP.get(layer_num, f'Layer{layer_num}')
-                
-                outline = []
-                for vertex in polygon.findall('vertex'):
-                    x = float(vertex.get('x', 0))
-                    y = float(vertex.get('y', 0))
-                    outline.append((x, y))
-                
-                if outline:
-                    zones.append(Zone(
-                        net_name=net_name,
-                        layer=layer_name,
-                        outline_points=outline
-                    ))
-        
-        return nets, tracks, vias, zones
     
-    def _parse_schematic_element(self, schematic: ET.Element) -> ParsedPCBData:
+    def _on_schematic(self, schematic):
+        """Schematic drawing (when a .sch file is provided)"""
+        self._schematic = self._parse_schematic_element(schematic)
+    
+    def _parse_schematic_element(self, schematic) -> ParsedPCBData:
         """Parse schematic element (when .sch file is provided)"""
         logger.info("Parsing Eagle schematic")
         
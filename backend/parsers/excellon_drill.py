@@ -0,0 +1,245 @@
+"""
+Streaming Excellon drill file reader
+
+Reads NC drill files line by line into column arrays of hits (mm):
+
+- Header (M48 ... % / M95): METRIC/INCH with LZ/TZ zero suppression,
+  FILE_FORMAT / KiCad FORMAT comments for implied-decimal coordinates,
+  tool definitions (T1C0.400, T01F00S00C0.0350)
+- Body: tool selection, drill hits, G85 slots (one hit at the start),
+  G90/G91, M71/M72 unit switches and G00-G03 routing (counted, not drilled)
+- KiCad / X2 attribute comments: "; #@! TF.FileFunction,Plated,1,4,PTH"
+  and "; #@! TA.AperFunction,Plated,PTH,ViaDrill" before a tool definition
+
+parse_excellon is a module-level function with a picklable result, for
+parse_pool workers.
+"""
+import re
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+UNIT_SCALE = {"METRIC": 1.0, "INCH": 25.4}
+DEFAULT_FORMAT = {"METRIC": (3, 3), "INCH": (2, 4)}  # Integer, decimal digits
+
+_TOOL_RE = re.compile(r"T(\d+)(?:[A-BD-Z][-+\d.]*)*C([\d.]+)")
+_COORDINATE_RE = re.compile(r"(?:X([+-]?[\d.]+))?(?:Y([+-]?[\d.]+))?")
+_FORMAT_COMMENT_RE = re.compile(r"(?:FILE_FORMAT=|FORMAT=\{[^/]*/\s*)(\d):(\d)")
+
+
+@dataclass
+class DrillLayer:
+    """
+    Hits of one drill file, as columns
+
+    hit_function holds indexes into functions (X2 tool function, e.g.
+    "Plated,PTH,ViaDrill"), -1 for none.
+    """
+    file_function: str = ""  # X2 TF.FileFunction, e.g. "Plated,1,4,PTH"
+    plated: bool = True
+    tools: Dict[int, float] = field(default_factory=dict)  # Tool number -> diameter (mm)
+    functions: List[str] = field(default_factory=list)
+    slots: int = 0
+    routed: int = 0  # Routed moves (G00-G03 in route mode)
+    skipped: int = 0
+    hit_x: array = field(default_factory=lambda: array("d"))
+    hit_y: array = field(default_factory=lambda: array("d"))
+    hit_diameter: array = field(default_factory=lambda: array("d"))
+    hit_function: array = field(default_factory=lambda: array("i"))
+
+    @property
+    def hits(self) -> int:
+        return len(self.hit_x)
+
+    @property
+    def layer_span(self) -> tuple:
+        """(first, last) copper layer numbers from the file function, (0, 0) if unknown"""
+        parts = self.file_function.split(",")
+        try:
+            return int(parts[1]), int(parts[2])
+        except (IndexError, ValueError):
+            return 0, 0
+
+
+def is_excellon(path: str, limit: int = 4096) -> bool:
+    """True if the start of the file looks like an Excellon program"""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            head = f.read(limit)
+    except OSError:
+        return False
+    lines = [line.strip().upper() for line in head.splitlines()]
+    return "M48" in lines or any(_TOOL_RE.match(line) for line in lines if line.startswith("T"))
+
+
+class _Reader:
+    def __init__(self, drill: DrillLayer):
+        self.drill = drill
+        self.units = "METRIC"
+        self.scale = UNIT_SCALE["METRIC"]
+        self.leading_zeros = False  # LZ: leading zeros kept, trailing omitted
+        self.format = None  # (integer, decimal) digits once declared
+        self.incremental = False
+        self.route = False
+        self.x = self.y = 0.0
+        self.diameter = 0.0
+        self.function = -1
+        self.pending_function = -1  # TA.AperFunction for the next tool definition
+        self.tool_functions: Dict[int, int] = {}
+        self.function_index: Dict[str, int] = {}
+
+    def coordinate(self, text: str) -> float:
+        if "." in text:
+            return float(text) * self.scale
+        integer, decimal = self.format or DEFAULT_FORMAT[self.units]
+        sign = ""
+        if text[0] in "+-":
+            sign, text = text[0], text[1:]
+        if self.leading_zeros:
+            text = text.ljust(integer + decimal, "0")
+        return float(sign + text) / (10 ** decimal) * self.scale
+
+    def set_units(self, units: str):
+        self.units = units
+        self.scale = UNIT_SCALE[units]
+
+    def comment(self, line: str):
+        text = line.lstrip(";").strip()
+        if text.startswith("#@!"):
+            name, _, value = text[3:].strip().partition(",")
+            if name == "TF.FileFunction":
+                self.drill.file_function = value
+                self.drill.plated = not value.startswith("NonPlated")
+            elif name == "TA.AperFunction":
+                self.pending_function = self.function_number(value)
+            return
+        match = _FORMAT_COMMENT_RE.search(text)
+        if match:
+            self.format = (int(match.group(1)), int(match.group(2)))
+
+    def function_number(self, value: str) -> int:
+        number = self.function_index.get(value)
+        if number is None:
+            number = self.function_index[value] = len(self.drill.functions)
+            self.drill.functions.append(value)
+        return number
+
+    def header(self, line: str):
+        """Header statement; also accepted in the body (some writers define tools late)"""
+        if line.startswith(("METRIC", "INCH")):
+            units, *options = line.split(",")
+            self.set_units(units)
+            for option in options:
+                if option in ("LZ", "TZ"):
+                    self.leading_zeros = option == "LZ"
+                elif re.fullmatch(r"0*\.0+", option):
+                    integer, decimal = option.split(".")
+                    self.format = (len(integer), len(decimal))
+            return True
+        if line.startswith("T"):
+            match = _TOOL_RE.match(line)
+            if match:
+                tool = int(match.group(1))
+                self.drill.tools[tool] = float(match.group(2)) * self.scale
+                self.tool_functions[tool] = self.pending_function
+                self.pending_function = -1
+                return True
+        return False
+
+    def body(self, line: str):
+        drill = self.drill
+        if line[0] == "T":
+            if self.header(line):
+                return
+            try:
+                tool = int(line[1:])
+            except ValueError:
+                drill.skipped += 1
+                return
+            self.diameter = drill.tools.get(tool, 0.0)
+            self.function = self.tool_functions.get(tool, -1)
+            return
+        if line[0] == "G":
+            code = line[1:3]
+            if code == "05":
+                self.route = False
+            elif code in ("00", "01", "02", "03"):
+                self.route = True
+                self.move(line[3:])
+                drill.routed += 1
+            elif code == "90":
+                self.incremental = False
+            elif code == "91":
+                self.incremental = True
+            return
+        if line[0] == "M":
+            code = line[1:3]
+            if code == "71":
+                self.set_units("METRIC")
+            elif code == "72":
+                self.set_units("INCH")
+            return
+        if line[0] in "XY":
+            start, slot, _ = line.partition("G85")
+            if not self.move(start):
+                drill.skipped += 1
+                return
+            if self.route:
+                drill.routed += 1
+                return
+            drill.hit_x.append(self.x)
+            drill.hit_y.append(self.y)
+            drill.hit_diameter.append(self.diameter)
+            drill.hit_function.append(self.function)
+            if slot:
+                drill.slots += 1
+                self.move(line[len(start) + 3:])
+            return
+        if not self.header(line):
+            drill.skipped += 1
+
+    def move(self, text: str) -> bool:
+        match = _COORDINATE_RE.match(text)
+        if not match or not (match.group(1) or match.group(2)):
+            return False
+        xs, ys = match.groups()
+        x = self.coordinate(xs) if xs else (0.0 if self.incremental else self.x)
+        y = self.coordinate(ys) if ys else (0.0 if self.incremental else self.y)
+        if self.incremental:
+            x += self.x
+            y += self.y
+        self.x, self.y = x, y
+        return True
+
+
+def parse_excellon(path: str) -> DrillLayer:
+    """Read one Excellon drill file"""
+    drill = DrillLayer()
+    reader = _Reader(drill)
+    in_header = False
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line[0] == ";":
+                reader.comment(line)
+                continue
+            line = line.upper()
+            if line == "M48":
+                in_header = True
+            elif line in ("%", "M95"):
+                in_header = False
+            elif line in ("M30", "M00"):
+                break
+            elif in_header:
+                if line == "ICI,ON":
+                    reader.incremental = True
+                else:
+                    reader.header(line)  # FMAT, VER, ATC, ... carry nothing used here
+            else:
+                try:
+                    reader.body(line)
+                except (ValueError, KeyError):
+                    drill.skipped += 1
+    return drill
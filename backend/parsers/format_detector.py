@@ -19,6 +19,9 @@ from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .detection_cache import get_detection_cache
+from .signature_matcher import SignatureMatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -143,8 +146,16 @@ class FormatDetector:
     1. Extension-based detection (fast)
     2. Content signature detection (accurate)
     3. Structure analysis for archives (ODB++, project folders)
+    
+    Each file's header is read once and matched against every content
+    signature in one pass (SignatureMatcher); results are cached by file
+    identity and content (detection_cache), so the upload, file-tree and
+    analysis paths classify a file once.
     """
     
+    HEADER_BYTES = 8192  # Read for content signatures
+    TEXT_HINT_CHARS = 2000  # Used for X2 layer and CSV column hints
+    
     # Extension mappings (extension -> (format, eda_tool, confidence))
     EXTENSION_MAP = {
         # KiCad
@@ -332,13 +343,44 @@ class FormatDetector:
         Returns:
             DetectedFile with format information
         """
-        if not file_path.exists():
+        try:
+            stat = file_path.stat()
+        except OSError:
             return DetectedFile(
                 path=file_path,
                 format=FileFormat.UNKNOWN,
                 confidence=0.0
             )
         
+        cache = get_detection_cache()
+        cached = cache.get(file_path, stat)
+        if cached is not None:
+            return cached
+        
+        header = self._read_header(file_path)
+        if header is not None:
+            cached = cache.get_content(file_path, stat, header)
+            if cached is not None:
+                return cached
+        
+        detected = self._detect(file_path, header or b'')
+        if header is not None:
+            cache.put(file_path, stat, header, detected)
+        return detected
+    
+    def _read_header(self, file_path: Path) -> Optional[bytes]:
+        """First HEADER_BYTES of a file, None if it cannot be read"""
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read(self.HEADER_BYTES)
+        except IsADirectoryError:
+            return b''
+        except OSError as e:
+            logger.warning(f"Content detection failed for {file_path}: {e}")
+            return None
+    
+    def _detect(self, file_path: Path, header: bytes) -> DetectedFile:
+        """Detect format from the file name and header bytes"""
         # Step 1: Extension-based detection
         ext = file_path.suffix.lower()
         ext_result = self.EXTENSION_MAP.get(ext)
@@ -351,7 +393,7 @@ class FormatDetector:
             initial_format, initial_eda, initial_confidence = ext_result
         
         # Step 2: Content-based detection (improves confidence)
-        content_format, content_confidence = self._detect_from_content(file_path)
+        content_format, content_confidence = self._detect_from_content(header)
         
         # Choose best result
         if content_confidence > initial_confidence:
@@ -361,17 +403,29 @@ class FormatDetector:
             final_format = initial_format
             final_confidence = initial_confidence
         
+        text = None
+        
         # Step 3: Detect Gerber layer type
         layer_type = None
         if final_format in (FileFormat.GERBER, FileFormat.GERBER_X2, FileFormat.EXCELLON):
-            layer_type = self._detect_gerber_layer(file_path)
+            text = self._header_text(header)
+            layer_type = self._detect_gerber_layer(file_path, text)
         
         # Step 4: Detect CSV type (BOM vs PnP)
         if final_format == FileFormat.BOM_CSV:
-            csv_type, csv_confidence = self._detect_csv_type(file_path)
+            text = text if text is not None else self._header_text(header)
+            csv_type, csv_confidence = self._detect_csv_type(text)
             final_format = csv_type
             final_confidence = max(final_confidence, csv_confidence)
         
+        # Unrecognized .txt: placement exports (e.g. Altium "Pick Place for ...txt")
+        elif final_format == FileFormat.UNKNOWN and ext == '.txt':
+            csv_type, csv_confidence = self._detect_csv_type(self._header_text(header))
+            if csv_type == FileFormat.PICK_AND_PLACE and csv_confidence >= 0.80:
+                final_format = FileFormat.PICK_AND_PLACE
+                final_confidence = csv_confidence
+                initial_eda = EDAToolFamily.MANUFACTURING
+        
         return DetectedFile(
             path=file_path,
             format=final_format,
@@ -380,30 +434,24 @@ class FormatDetector:
             layer_type=layer_type
         )
     
-    def _detect_from_content(self, file_path: Path) -> Tuple[FileFormat, float]:
-        """Detect format from file content signatures"""
-        try:
-            # Read first 8KB for signature detection
-            with open(file_path, 'rb') as f:
-                content = f.read(8192)
-            
-            best_format = FileFormat.UNKNOWN
-            best_confidence = 0.0
-            
-            for fmt, signatures in self.CONTENT_SIGNATURES.items():
-                for signature, confidence in signatures:
-                    if signature in content:
-                        if confidence > best_confidence:
-                            best_format = fmt
-                            best_confidence = confidence
-            
-            return best_format, best_confidence
-            
-        except Exception as e:
-            logger.warning(f"Content detection failed for {file_path}: {e}")
-            return FileFormat.UNKNOWN, 0.0
+    def _header_text(self, header: bytes) -> str:
+        """Start of the header as text, for the keyword hints"""
+        return header[:self.TEXT_HINT_CHARS * 4].decode('utf-8', errors='ignore')[:self.TEXT_HINT_CHARS]
     
-    def _detect_gerber_layer(self, file_path: Path) -> Optional[str]:
+    def _detect_from_content(self, header: bytes) -> Tuple[FileFormat, float]:
+        """Detect format from content signatures (highest confidence, first listed on ties)"""
+        best_format = FileFormat.UNKNOWN
+        best_confidence = 0.0
+        best_rank = len(_SIGNATURE_FORMATS)
+        
+        for signature in _SIGNATURE_MATCHER.find(header):
+            for rank, fmt, confidence in _SIGNATURE_FORMATS[signature]:
+                if confidence > best_confidence or (confidence == best_confidence and rank < best_rank):
+                    best_format, best_confidence, best_rank = fmt, confidence, rank
+        
+        return best_format, best_confidence
+    
+    def _detect_gerber_layer(self, file_path: Path, text: str) -> Optional[str]:
         """Detect Gerber layer type from filename and content"""
         filename = file_path.name.lower()
         
@@ -412,52 +460,41 @@ class FormatDetector:
                 return layer_type
         
         # Try to detect from X2 attributes in content
-        try:
-            with open(file_path, 'r', errors='ignore') as f:
-                content = f.read(2000)
-            
-            # X2 FileFunction attribute
-            match = re.search(r'%TF\.FileFunction,(\w+)', content)
-            if match:
-                func = match.group(1).lower()
-                if 'copper' in func:
-                    return 'copper_top' if 'top' in func else 'copper_bottom'
-                elif 'soldermask' in func:
-                    return 'soldermask_top' if 'top' in func else 'soldermask_bottom'
-                elif 'legend' in func or 'silk' in func:
-                    return 'silkscreen_top' if 'top' in func else 'silkscreen_bottom'
-                elif 'paste' in func:
-                    return 'paste_top' if 'top' in func else 'paste_bottom'
-                elif 'profile' in func or 'outline' in func:
-                    return 'board_outline'
-        except:
-            pass
+        # X2 FileFunction attribute
+        match = re.search(r'%TF\.FileFunction,(\w+)', text)
+        if match:
+            func = match.group(1).lower()
+            if 'copper' in func:
+                return 'copper_top' if 'top' in func else 'copper_bottom'
+            elif 'soldermask' in func:
+                return 'soldermask_top' if 'top' in func else 'soldermask_bottom'
+            elif 'legend' in func or 'silk' in func:
+                return 'silkscreen_top' if 'top' in func else 'silkscreen_bottom'
+            elif 'paste' in func:
+                return 'paste_top' if 'top' in func else 'paste_bottom'
+            elif 'profile' in func or 'outline' in func:
+                return 'board_outline'
         
         return None
     
-    def _detect_csv_type(self, file_path: Path) -> Tuple[FileFormat, float]:
+    def _detect_csv_type(self, text: str) -> Tuple[FileFormat, float]:
         """Detect if CSV is BOM or Pick-and-place"""
-        try:
-            with open(file_path, 'r', errors='ignore') as f:
-                content = f.read(2000).lower()
-            
-            # PnP indicators
-            pnp_keywords = ['centroid', 'mid x', 'mid y', 'ref x', 'ref y', 
-                          'rotation', 'side', 'designator', 'footprint']
-            pnp_score = sum(1 for kw in pnp_keywords if kw in content)
-            
-            # BOM indicators  
-            bom_keywords = ['quantity', 'qty', 'part number', 'mpn', 'manufacturer',
-                          'description', 'value', 'price', 'supplier']
-            bom_score = sum(1 for kw in bom_keywords if kw in content)
-            
-            if pnp_score > bom_score:
-                return FileFormat.PICK_AND_PLACE, 0.70 + (pnp_score * 0.05)
-            else:
-                return FileFormat.BOM_CSV, 0.60 + (bom_score * 0.05)
-                
-        except:
-            return FileFormat.BOM_CSV, 0.50
+        content = text.lower()
+        
+        # PnP indicators
+        pnp_keywords = ['centroid', 'mid x', 'mid y', 'ref x', 'ref y', 
+                      'rotation', 'side', 'designator', 'footprint']
+        pnp_score = sum(1 for kw in pnp_keywords if kw in content)
+        
+        # BOM indicators  
+        bom_keywords = ['quantity', 'qty', 'part number', 'mpn', 'manufacturer',
+                      'description', 'value', 'price', 'supplier']
+        bom_score = sum(1 for kw in bom_keywords if kw in content)
+        
+        if pnp_score > bom_score:
+            return FileFormat.PICK_AND_PLACE, 0.70 + (pnp_score * 0.05)
+        else:
+            return FileFormat.BOM_CSV, 0.60 + (bom_score * 0.05)
     
     def detect_project(self, project_path: Path) -> ProjectStructure:
         """
@@ -621,3 +658,15 @@ class FormatDetector:
         self._generate_warnings(structure)
         
         return structure
+
+
+# Signature -> [(rank, format, confidence)], rank being the listing order
+_SIGNATURE_FORMATS: Dict[bytes, List[Tuple[int, FileFormat, float]]] = {}
+for _rank, (_fmt, _signature, _confidence) in enumerate(
+    (fmt, signature, confidence)
+    for fmt, signatures in FormatDetector.CONTENT_SIGNATURES.items()
+    for signature, confidence in signatures
+):
+    _SIGNATURE_FORMATS.setdefault(_signature, []).append((_rank, _fmt, _confidence))
+
+_SIGNATURE_MATCHER = SignatureMatcher(_SIGNATURE_FORMATS)
@@ -0,0 +1,47 @@
+"""
+Shared geometry helpers for the column-based layer decoders
+(ODB++ features, Gerber, Excellon)
+"""
+import math
+from array import array
+from typing import List, Tuple
+
+ARC_STEP = math.pi / 8  # Max sweep per chord (16 chords per full circle)
+
+
+def arc_points(xs: float, ys: float, xe: float, ye: float, xc: float, yc: float,
+               clockwise: bool) -> List[Tuple[float, float]]:
+    """
+    Points after the start of an arc, ending exactly at (xe, ye)
+
+    Arcs are approximated by chords of at most ARC_STEP radians. Equal start
+    and end points make a full circle.
+    """
+    start = math.atan2(ys - yc, xs - xc)
+    end = math.atan2(ye - yc, xe - xc)
+    sweep = (start - end) if clockwise else (end - start)
+    sweep %= 2 * math.pi
+    if sweep == 0:
+        sweep = 2 * math.pi
+    steps = max(1, math.ceil(sweep / ARC_STEP))
+    radius = math.hypot(xs - xc, ys - yc)
+    direction = -1.0 if clockwise else 1.0
+    points = []
+    for i in range(1, steps):
+        angle = start + direction * sweep * i / steps
+        points.append((xc + radius * math.cos(angle), yc + radius * math.sin(angle)))
+    points.append((xe, ye))
+    return points
+
+
+def polygon_points(starts: array, xy: array, index: int) -> List[Tuple[float, float]]:
+    """
+    Outline of polygon index from packed columns
+
+    starts[i] is the first point of polygon i; xy holds x, y pairs of all
+    polygons back to back.
+    """
+    start = 2 * starts[index]
+    end = 2 * starts[index + 1] if index + 1 < len(starts) else len(xy)
+    points = xy[start:end]
+    return list(zip(points[0::2], points[1::2]))
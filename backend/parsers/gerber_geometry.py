@@ -0,0 +1,694 @@
+"""
+Streaming Gerber (RS-274X / X2) interpreter
+
+Reads a Gerber file in fixed-size chunks, splits it into commands and
+interprets them into column arrays of layer primitives (all lengths in mm):
+
+- D01 draws and G02/G03 arcs    -> track rows (arcs as chords, see geometry.arc_points)
+- D03 flashes                   -> flash rows with the aperture's size and X2 function
+- G36/G37 regions               -> one polygon per contour
+
+Supported: FS (leading/trailing zero omission, absolute/incremental), MO and
+G70/G71 units, standard apertures (C, R, O, P) and aperture macros (sized
+from the bounding box of their primitives), G74/G75 quadrant modes, LP
+polarity (clear objects are counted, not emitted), SR step-and-repeat
+blocks, and X2 attributes: TF.FileFunction, TA.AperFunction and TO.N nets
+(net columns index GerberLayer.nets).
+
+Not interpreted: aperture blocks (AB), LM/LR/LS transformations and the
+deprecated image commands (IP, IR, MI, OF, SF); they are listed in
+GerberLayer.unsupported.
+
+Memory is bounded by the columns plus one chunk; only an open step-and-repeat
+block is held for replication. parse_gerber_layer is a module-level function
+with a picklable result, for parse_pool workers.
+"""
+import math
+import re
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .geometry import arc_points, polygon_points
+
+CHUNK_SIZE = 1 << 20  # Characters per read
+
+UNIT_SCALE = {"MM": 1.0, "IN": 25.4}
+
+# Operation word: [G01-03][X][Y][I][J][D01-03] (coordinates may carry a decimal point)
+_OPERATION_RE = re.compile(
+    r"(?:G0*([123]))?(?:X([+-]?[\d.]+))?(?:Y([+-]?[\d.]+))?"
+    r"(?:I([+-]?[\d.]+))?(?:J([+-]?[\d.]+))?(?:D0*([123]))?$"
+)
+_INTERPOLATION_RE = re.compile(r"G0*[123](?!\d)")
+_G_CODE_RE = re.compile(r"G(\d+)")
+_UNSUPPORTED_COMMANDS = ("AB", "LM", "LR", "LS", "IP", "IR", "MI", "OF", "SF", "AS")
+_FORMAT_RE = re.compile(r"FS([LTD]?)([AI])X(\d)(\d)Y(\d)(\d)")
+_APERTURE_RE = re.compile(r"ADD(\d+)([^,]+)(?:,(.*))?$", re.DOTALL)
+_STEP_REPEAT_RE = re.compile(r"SRX(\d+)Y(\d+)I([+-]?[\d.]+)J([+-]?[\d.]+)")
+_EXPRESSION_TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*|\.\d+)|\$(\d+)|([-+xX/()]))")
+
+
+class GerberError(ValueError):
+    """Malformed command that makes the rest of the file unreadable"""
+
+
+@dataclass
+class Aperture:
+    """Aperture size in mm; width is the stroke width when drawing"""
+    shape: str
+    width: float
+    height: float
+    function: int = -1  # Index into GerberLayer.functions
+
+    @property
+    def stroke(self) -> float:
+        return min(self.width, self.height)
+
+
+@dataclass
+class GerberLayer:
+    """
+    Geometry of one Gerber file, as columns
+
+    Net and function columns hold indexes into nets / functions (X2
+    TA.AperFunction; for regions the attribute in effect when drawn), -1 for
+    none. Region i has the points region_xy[2 * region_start[i]:...] (x, y
+    pairs, see region_points).
+    """
+    file_function: str = ""  # X2 TF.FileFunction value, e.g. "Copper,L1,Top"
+    file_polarity: str = ""  # X2 TF.FilePolarity (Negative for plane layers)
+    draws: int = 0
+    arcs: int = 0
+    clear: int = 0  # Objects with clear polarity (not emitted)
+    skipped: int = 0  # Malformed or unusable commands
+    unsupported: List[str] = field(default_factory=list)
+    nets: List[str] = field(default_factory=list)
+    functions: List[str] = field(default_factory=list)
+    min_x: float = math.inf
+    min_y: float = math.inf
+    max_x: float = -math.inf
+    max_y: float = -math.inf
+    track_x1: array = field(default_factory=lambda: array("d"))
+    track_y1: array = field(default_factory=lambda: array("d"))
+    track_x2: array = field(default_factory=lambda: array("d"))
+    track_y2: array = field(default_factory=lambda: array("d"))
+    track_width: array = field(default_factory=lambda: array("d"))
+    track_net: array = field(default_factory=lambda: array("i"))
+    flash_x: array = field(default_factory=lambda: array("d"))
+    flash_y: array = field(default_factory=lambda: array("d"))
+    flash_width: array = field(default_factory=lambda: array("d"))
+    flash_height: array = field(default_factory=lambda: array("d"))
+    flash_net: array = field(default_factory=lambda: array("i"))
+    flash_function: array = field(default_factory=lambda: array("i"))
+    region_net: array = field(default_factory=lambda: array("i"))
+    region_function: array = field(default_factory=lambda: array("i"))
+    region_start: array = field(default_factory=lambda: array("i"))
+    region_xy: array = field(default_factory=lambda: array("d"))
+
+    @property
+    def has_geometry(self) -> bool:
+        return self.min_x <= self.max_x
+
+    def region_points(self, index: int) -> List[Tuple[float, float]]:
+        """Outline of region index as (x, y) tuples"""
+        return polygon_points(self.region_start, self.region_xy, index)
+
+
+def iter_gerber_commands(stream, chunk_size: int = CHUNK_SIZE):
+    """
+    Yield (extended, text) per command of a text stream
+
+    Word commands ("X100Y200D01") come without the '*'; extended commands
+    come as the whole %...% body, which may hold several '*'-terminated
+    statements.
+    """
+    extended = False
+    tail = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        data = tail + chunk if tail else chunk
+        segments = data.split("%")
+        # Every segment but the last was closed by a '%'
+        for segment in segments[:-1]:
+            if extended:
+                yield True, segment.strip()
+            else:
+                for word in segment.split("*"):
+                    word = word.strip()
+                    if word:
+                        yield False, word
+            extended = not extended
+        tail = segments[-1]
+        if not extended:
+            words = tail.split("*")
+            tail = words.pop()
+            for word in words:
+                word = word.strip()
+                if word:
+                    yield False, word
+        if not chunk:
+            return
+
+
+def evaluate_expression(text: str, variables: Dict[int, float]) -> float:
+    """
+    Value of an aperture macro arithmetic expression
+
+    Numbers, $n variables, + - x / and parentheses (unary minus/plus allowed).
+    """
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = _EXPRESSION_TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise GerberError(f"Bad macro expression: {text!r}")
+        number, variable, operator = match.groups()
+        if number is not None:
+            tokens.append(float(number))
+        elif variable is not None:
+            tokens.append(variables.get(int(variable), 0.0))
+        else:
+            tokens.append(operator.lower())
+        pos = match.end()
+
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def factor() -> float:
+        token = take() if position < len(tokens) else None
+        if token == "-":
+            return -factor()
+        if token == "+":
+            return factor()
+        if token == "(":
+            value = expression()
+            if take() != ")":
+                raise GerberError(f"Bad macro expression: {text!r}")
+            return value
+        if isinstance(token, float):
+            return token
+        raise GerberError(f"Bad macro expression: {text!r}")
+
+    def term() -> float:
+        value = factor()
+        while peek() in ("x", "/"):
+            if take() == "x":
+                value *= factor()
+            else:
+                divisor = factor()
+                value = value / divisor if divisor else 0.0
+        return value
+
+    def expression() -> float:
+        value = term()
+        while peek() in ("+", "-"):
+            if take() == "+":
+                value += term()
+            else:
+                value -= term()
+        return value
+
+    try:
+        value = expression()
+    except IndexError:
+        raise GerberError(f"Bad macro expression: {text!r}")
+    if position != len(tokens):
+        raise GerberError(f"Bad macro expression: {text!r}")
+    return value
+
+
+def macro_extent(statements: Sequence[str], parameters: Sequence[float]) -> Tuple[float, float]:
+    """
+    (width, height) of the bounding box of a macro's exposed primitives
+
+    Args:
+        statements: Macro body statements (after the AM name)
+        parameters: AD parameters ($1, $2, ...), in file units
+    """
+    variables = {i + 1: value for i, value in enumerate(parameters)}
+    points: List[Tuple[float, float]] = []
+
+    def add(x: float, y: float, rotation: float, margin: float = 0.0):
+        if rotation:
+            angle = math.radians(rotation)
+            x, y = x * math.cos(angle) - y * math.sin(angle), x * math.sin(angle) + y * math.cos(angle)
+        points.append((x - margin, y - margin))
+        points.append((x + margin, y + margin))
+
+    for statement in statements:
+        statement = statement.strip()
+        if not statement or statement.startswith("0"):
+            continue  # Comment
+        if statement.startswith("$"):
+            name, _, expression = statement.partition("=")
+            variables[int(name[1:])] = evaluate_expression(expression, variables)
+            continue
+        code, *args = statement.split(",")
+        values = [evaluate_expression(arg, variables) for arg in args]
+        code = code.strip()
+        if code == "1" and values[0]:                  # Circle: exp, diameter, x, y[, rot]
+            add(values[2], values[3], values[4] if len(values) > 4 else 0, values[1] / 2)
+        elif code in ("2", "20") and values[0]:        # Vector line: exp, width, xs, ys, xe, ye, rot
+            add(values[2], values[3], values[6], values[1] / 2)
+            add(values[4], values[5], values[6], values[1] / 2)
+        elif code == "21" and values[0]:               # Center line: exp, w, h, x, y, rot
+            w, h = values[1] / 2, values[2] / 2
+            for dx, dy in ((-w, -h), (w, -h), (w, h), (-w, h)):
+                add(values[3] + dx, values[4] + dy, values[5])
+        elif code == "4" and values[0]:                # Outline: exp, n, x0, y0, ..., rot
+            count = int(values[1]) + 1
+            for i in range(count):
+                add(values[2 + 2 * i], values[3 + 2 * i], values[2 + 2 * count])
+        elif code == "5" and values[0]:                # Polygon: exp, vertices, x, y, diameter, rot
+            add(values[2], values[3], values[5], values[4] / 2)
+        elif code == "6":                              # Moire: x, y, outer, ..., cross length, rot
+            add(values[0], values[1], values[8], max(values[2], values[7]) / 2)
+        elif code == "7":                              # Thermal: x, y, outer, inner, gap, rot
+            add(values[0], values[1], values[5], values[2] / 2)
+
+    if not points:
+        return 0.0, 0.0
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return max(xs) - min(xs), max(ys) - min(ys)
+
+
+class _Interpreter:
+    """Graphics state of one file"""
+
+    def __init__(self, layer: GerberLayer):
+        self.layer = layer
+        self.scale = 1.0  # mm per file unit (MM until MO/G70 says otherwise)
+        self.zeros = "L"
+        self.incremental = False
+        self.x_decimals = self.y_decimals = 6
+        self.x_digits = self.y_digits = 12
+        self.apertures: Dict[int, Aperture] = {}
+        self.macros: Dict[str, List[str]] = {}
+        self.aperture: Optional[Aperture] = None
+        self.x = self.y = 0.0
+        self.mode = 1  # G01 linear, G02 clockwise, G03 counterclockwise
+        self.multi_quadrant = True
+        self.operation = 2
+        self.dark = True
+        self.region: Optional[List[Tuple[float, float]]] = None  # Contour in region mode
+        self.in_region = False
+        self.aperture_function = -1
+        self.net = -1
+        self.net_index: Dict[str, int] = {}
+        self.function_index: Dict[str, int] = {}
+        self.step_repeat: Optional[tuple] = None  # (nx, ny, dx, dy, column marks, outer bounds)
+
+    # -------------------------------------------------------- coordinates
+
+    def coordinate(self, text: str, decimals: int, digits: int) -> float:
+        if "." in text:
+            return float(text) * self.scale
+        if self.zeros == "T":
+            sign = ""
+            if text[0] in "+-":
+                sign, text = text[0], text[1:]
+            text = sign + text.ljust(digits, "0")
+        return int(text) / (10 ** decimals) * self.scale
+
+    def bound(self, x: float, y: float):
+        layer = self.layer
+        if x < layer.min_x:
+            layer.min_x = x
+        if x > layer.max_x:
+            layer.max_x = x
+        if y < layer.min_y:
+            layer.min_y = y
+        if y > layer.max_y:
+            layer.max_y = y
+
+    # ------------------------------------------------------------- words
+
+    def word(self, word: str):
+        first = word[0]
+        if first in "XYIJD" or _INTERPOLATION_RE.match(word):
+            match = _OPERATION_RE.match(word)
+            if match:
+                self.operate(*match.groups())
+                return
+        if first == "D":
+            self.select(word)
+        elif first == "G":
+            self.g_code(word)
+        elif first == "M":
+            self.close_step_repeat()  # M02 end of file (M00/M01 in old files)
+        else:
+            self.layer.skipped += 1
+
+    def select(self, word: str):
+        try:
+            number = int(word[1:])
+        except ValueError:
+            self.layer.skipped += 1
+            return
+        self.aperture = self.apertures.get(number)
+        if self.aperture is None:
+            self.layer.skipped += 1
+
+    def g_code(self, word: str):
+        digits = _G_CODE_RE.match(word)
+        code = digits.group(1).lstrip("0") if digits else ""
+        if code == "4":
+            return  # Comment
+        if code in ("54", "55"):
+            if len(word) > digits.end():
+                self.word(word[digits.end():])  # G54D10: deprecated select
+            return
+        if code == "36":
+            self.in_region = True
+            self.region = None
+        elif code == "37":
+            self.close_contour()
+            self.in_region = False
+        elif code == "74":
+            self.multi_quadrant = False
+        elif code == "75":
+            self.multi_quadrant = True
+        elif code == "70":
+            self.scale = UNIT_SCALE["IN"]
+        elif code == "71":
+            self.scale = UNIT_SCALE["MM"]
+        elif code == "90":
+            self.incremental = False
+        elif code == "91":
+            self.incremental = True
+        else:
+            self.layer.skipped += 1
+
+    def operate(self, g, xs, ys, is_, js, d):
+        if g:
+            self.mode = int(g)
+        if d:
+            self.operation = int(d)
+        elif not (xs or ys or is_ or js):
+            return  # Bare G01/G02/G03
+        x = self.coordinate(xs, self.x_decimals, self.x_digits) if xs else (0.0 if self.incremental else self.x)
+        y = self.coordinate(ys, self.y_decimals, self.y_digits) if ys else (0.0 if self.incremental else self.y)
+        if self.incremental:
+            x += self.x
+            y += self.y
+
+        operation = self.operation
+        if operation == 1:
+            i = self.coordinate(is_, self.x_decimals, self.x_digits) if is_ else 0.0
+            j = self.coordinate(js, self.y_decimals, self.y_digits) if js else 0.0
+            self.interpolate(x, y, i, j)
+        elif operation == 2:
+            if self.in_region:
+                self.close_contour()
+        else:
+            self.flash(x, y)
+        self.x, self.y = x, y
+
+    def interpolate(self, x: float, y: float, i: float, j: float):
+        if self.mode == 1:
+            points = [(x, y)]
+        else:
+            center = self.arc_center(x, y, i, j)
+            points = arc_points(self.x, self.y, x, y, center[0], center[1], self.mode == 2)
+            self.layer.arcs += 1
+
+        if self.in_region:
+            if self.region is None:
+                self.region = [(self.x, self.y)]
+            self.region.extend(points)
+            return
+
+        layer = self.layer
+        layer.draws += 1
+        if not self.dark:
+            layer.clear += 1
+            return
+        if self.aperture is None:
+            layer.skipped += 1
+            return
+        width, net = self.aperture.stroke, self.net
+        x1, y1 = self.x, self.y
+        self.bound(x1, y1)
+        for x2, y2 in points:
+            layer.track_x1.append(x1)
+            layer.track_y1.append(y1)
+            layer.track_x2.append(x2)
+            layer.track_y2.append(y2)
+            layer.track_width.append(width)
+            layer.track_net.append(net)
+            self.bound(x2, y2)
+            x1, y1 = x2, y2
+
+    def arc_center(self, x: float, y: float, i: float, j: float) -> Tuple[float, float]:
+        if self.multi_quadrant:
+            return self.x + i, self.y + j
+        # Single quadrant: offsets are unsigned; take the center that makes an
+        # arc of at most 90 degrees with matching start and end radii
+        best, best_error = (self.x + i, self.y + j), math.inf
+        for si in (1, -1):
+            for sj in (1, -1):
+                cx, cy = self.x + si * abs(i), self.y + sj * abs(j)
+                start = math.atan2(self.y - cy, self.x - cx)
+                end = math.atan2(y - cy, x - cx)
+                sweep = ((start - end) if self.mode == 2 else (end - start)) % (2 * math.pi)
+                if sweep > math.pi / 2 + 1e-6:
+                    continue
+                error = abs(math.hypot(self.x - cx, self.y - cy) - math.hypot(x - cx, y - cy))
+                if error < best_error:
+                    best, best_error = (cx, cy), error
+        return best
+
+    def flash(self, x: float, y: float):
+        layer = self.layer
+        if self.in_region:
+            layer.skipped += 1
+            return
+        if not self.dark:
+            layer.clear += 1
+            return
+        aperture = self.aperture
+        if aperture is None:
+            layer.skipped += 1
+            return
+        layer.flash_x.append(x)
+        layer.flash_y.append(y)
+        layer.flash_width.append(aperture.width)
+        layer.flash_height.append(aperture.height)
+        layer.flash_net.append(self.net)
+        layer.flash_function.append(aperture.function)
+        self.bound(x, y)
+
+    def close_contour(self):
+        contour, self.region = self.region, None
+        if not contour or len(contour) < 3:
+            return
+        layer = self.layer
+        if not self.dark:
+            layer.clear += 1
+            return
+        layer.region_net.append(self.net)
+        layer.region_function.append(self.aperture_function)
+        layer.region_start.append(len(layer.region_xy) // 2)
+        for x, y in contour:
+            layer.region_xy.append(x)
+            layer.region_xy.append(y)
+            self.bound(x, y)
+
+    # ---------------------------------------------------------- extended
+
+    def extended(self, body: str):
+        statements = [s.strip() for s in body.split("*")]
+        statements = [s for s in statements if s]
+        if not statements:
+            return
+        if statements[0].startswith("AM"):
+            self.macros[statements[0][2:]] = statements[1:]
+            return
+        for statement in statements:
+            self.statement(statement)
+
+    def statement(self, statement: str):
+        code = statement[:2]
+        layer = self.layer
+        if code == "FS":
+            match = _FORMAT_RE.match(statement)
+            if not match:
+                raise GerberError(f"Bad format specification: {statement}")
+            zeros, notation, xi, xd, yi, yd = match.groups()
+            self.zeros = "T" if zeros == "T" else "L"
+            self.incremental = notation == "I"
+            self.x_decimals, self.x_digits = int(xd), int(xi) + int(xd)
+            self.y_decimals, self.y_digits = int(yd), int(yi) + int(yd)
+        elif code == "MO":
+            self.scale = UNIT_SCALE.get(statement[2:4].upper(), 1.0)
+        elif code == "AD":
+            self.define_aperture(statement)
+        elif code == "LP":
+            self.dark = statement[2:3] != "C"
+        elif code == "SR":
+            self.open_step_repeat(statement)
+        elif code == "TF":
+            name, _, value = statement[2:].partition(",")
+            if name == ".FileFunction":
+                layer.file_function = value
+            elif name == ".FilePolarity":
+                layer.file_polarity = value
+        elif code == "TA":
+            name, _, value = statement[2:].partition(",")
+            if name == ".AperFunction":
+                self.aperture_function = self.function_number(value)
+        elif code == "TO":
+            name, _, value = statement[2:].partition(",")
+            if name == ".N":
+                self.net = self.net_number(value.split(",")[0])
+        elif code == "TD":
+            name = statement[2:]
+            if not name or name == ".N":
+                self.net = -1
+            if not name or name == ".AperFunction":
+                self.aperture_function = -1
+        elif code in ("G0", "IN", "LN") or statement == "IPPOS":
+            return  # Comments, names and the default image polarity
+        elif code in _UNSUPPORTED_COMMANDS:
+            if code not in layer.unsupported:
+                layer.unsupported.append(code)
+        else:
+            layer.skipped += 1
+
+    def function_number(self, value: str) -> int:
+        number = self.function_index.get(value)
+        if number is None:
+            number = self.function_index[value] = len(self.layer.functions)
+            self.layer.functions.append(value)
+        return number
+
+    def net_number(self, name: str) -> int:
+        if not name or name == "N/C":
+            return -1
+        number = self.net_index.get(name)
+        if number is None:
+            number = self.net_index[name] = len(self.layer.nets)
+            self.layer.nets.append(name)
+        return number
+
+    def define_aperture(self, statement: str):
+        match = _APERTURE_RE.match(statement)
+        if not match:
+            self.layer.skipped += 1
+            return
+        number, template, params = match.groups()
+        values = [float(v) for v in params.split("X") if v.strip()] if params else []
+        scale = self.scale
+        if template == "C":
+            width = height = values[0] if values else 0.0
+        elif template in ("R", "O"):
+            width, height = (values[0], values[1]) if len(values) > 1 else (values[0],) * 2
+        elif template == "P":
+            width = height = values[0] if values else 0.0
+        elif template in self.macros:
+            try:
+                width, height = macro_extent(self.macros[template], values)
+            except (GerberError, IndexError, ValueError):
+                width = height = 0.0
+                self.layer.skipped += 1
+        else:
+            width = height = 0.0
+            self.layer.skipped += 1
+        self.apertures[int(number)] = Aperture(template, width * scale, height * scale, self.aperture_function)
+
+    def open_step_repeat(self, statement: str):
+        self.close_step_repeat()
+        match = _STEP_REPEAT_RE.match(statement)
+        if not match:
+            return  # %SR*% closes the block
+        nx, ny, dx, dy = match.groups()
+        layer = self.layer
+        marks = (len(layer.track_x1), len(layer.flash_x), len(layer.region_start), len(layer.region_xy))
+        self.step_repeat = (int(nx), int(ny), float(dx) * self.scale, float(dy) * self.scale, marks,
+                            (layer.min_x, layer.min_y, layer.max_x, layer.max_y))
+        # Bounds of the block alone, merged back (with its copies) on close
+        layer.min_x = layer.min_y = math.inf
+        layer.max_x = layer.max_y = -math.inf
+
+    def close_step_repeat(self):
+        if self.step_repeat is None:
+            return
+        nx, ny, dx, dy, (tracks, flashes, regions, points), bounds = self.step_repeat
+        self.step_repeat = None
+        layer = self.layer
+        track_end, flash_end = len(layer.track_x1), len(layer.flash_x)
+        region_end, point_end = len(layer.region_start), len(layer.region_xy)
+        for ix in range(nx):
+            for iy in range(ny):
+                if ix == 0 and iy == 0:
+                    continue
+                ox, oy = ix * dx, iy * dy
+                for column, offset in ((layer.track_x1, ox), (layer.track_y1, oy),
+                                       (layer.track_x2, ox), (layer.track_y2, oy)):
+                    column.extend([value + offset for value in column[tracks:track_end]])
+                layer.track_width.extend(layer.track_width[tracks:track_end])
+                layer.track_net.extend(layer.track_net[tracks:track_end])
+                layer.flash_x.extend([value + ox for value in layer.flash_x[flashes:flash_end]])
+                layer.flash_y.extend([value + oy for value in layer.flash_y[flashes:flash_end]])
+                for column in (layer.flash_width, layer.flash_height, layer.flash_net, layer.flash_function):
+                    column.extend(column[flashes:flash_end])
+                shift = len(layer.region_xy) // 2 - points // 2
+                layer.region_start.extend([start + shift for start in layer.region_start[regions:region_end]])
+                layer.region_net.extend(layer.region_net[regions:region_end])
+                layer.region_function.extend(layer.region_function[regions:region_end])
+                xy = layer.region_xy[points:point_end]
+                xy[0::2] = array("d", [value + ox for value in xy[0::2]])
+                xy[1::2] = array("d", [value + oy for value in xy[1::2]])
+                layer.region_xy.extend(xy)
+        if layer.has_geometry:
+            block = (layer.min_x, layer.min_y, layer.max_x, layer.max_y)
+            self.bound(block[0] + (nx - 1) * dx, block[1] + (ny - 1) * dy)
+            self.bound(block[2] + (nx - 1) * dx, block[3] + (ny - 1) * dy)
+        if bounds[0] <= bounds[2]:
+            self.bound(bounds[0], bounds[1])
+            self.bound(bounds[2], bounds[3])
+
+
+def parse_gerber_layer(path: str) -> GerberLayer:
+    """
+    Interpret one Gerber file
+
+    Raises:
+        GerberError: Unreadable format specification
+    """
+    layer = GerberLayer()
+    interpreter = _Interpreter(layer)
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as stream:
+        for extended, text in iter_gerber_commands(stream):
+            try:
+                if extended:
+                    interpreter.extended(text)
+                else:
+                    interpreter.word(text)
+            except (ValueError, IndexError) as e:
+                if isinstance(e, GerberError):
+                    raise
+                layer.skipped += 1
+    interpreter.close_step_repeat()
+    return layer
+
+
+def read_file_function(path: str, limit: int = 8192) -> str:
+    """X2 TF.FileFunction from the start of a Gerber file ('' if absent)"""
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            head = f.read(limit)
+    except OSError:
+        return ""
+    match = re.search(r"%TF\.FileFunction,([^*%]*)\*", head)
+    return match.group(1).strip() if match else ""
@@ -1,15 +1,37 @@
 """
 Gerber/Generic PCB parser
 Parses Gerber files, drill files, BOM, and centroid/position files
+
+Copper and outline Gerbers are interpreted by gerber_geometry and drill files
+by excellon_drill (in the parser pool when the output set is large), giving
+tracks, zones, vias and the real board size.
 """
 import re
 import logging
+from itertools import repeat
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-from .base_parser import BaseParser, ParsedPCBData, BoardInfo, Net, Component
+from .base_parser import BaseParser, ParsedPCBData, BoardInfo, Net, Component, Track, Via, Zone
+from .excellon_drill import DrillLayer, is_excellon, parse_excellon
+from .format_detector import FormatDetector
+from .gerber_geometry import GerberError, GerberLayer, parse_gerber_layer, read_file_function
+from .parse_pool import get_parse_pool
 
 logger = logging.getLogger(__name__)
 
+VIA_MAX_DRILL = 0.6  # mm; unattributed plated holes up to this size count as vias
+
+
+def _parse_fabrication_file(path: str, kind: str):
+    """Parser pool task: GerberLayer or DrillLayer for one file (None if unreadable)"""
+    try:
+        if kind == 'drill':
+            return parse_excellon(path)
+        return parse_gerber_layer(path)
+    except (GerberError, OSError) as e:
+        logger.warning(f"Failed to parse {Path(path).name}: {e}")
+        return None
+
 
 class GerberParser(BaseParser):
     """Parser for Gerber files and generic PCB projects"""
@@ -28,7 +50,7 @@ class GerberParser(BaseParser):
         
         # Find files
         gerber_files = self._find_gerber_files(project_dir)
-        drill_files = list(project_dir.glob('*.drl')) + list(project_dir.glob('*.txt'))
+        drill_files = list(project_dir.glob('*.drl')) + list(project_dir.glob('*.xln')) + list(project_dir.glob('*.txt'))
         bom_files = list(project_dir.glob('*bom*.csv')) + list(project_dir.glob('*.xlsx')) + list(project_dir.glob('*.xls'))
         pos_files = list(project_dir.glob('*.csv')) + list(project_dir.glob('*.xy')) + list(project_dir.glob('*.pos'))
         netlist_files = list(project_dir.glob('*.ipc')) + list(project_dir.glob('*.d356')) + list(project_dir.glob('*.net'))
@@ -42,8 +64,11 @@ class GerberParser(BaseParser):
         
         logger.info(f"Found files - Gerbers: {len(gerber_files)}, Drill: {len(drill_files)}, BOM: {len(bom_files)}, Pos: {len(pos_files)}")
         
+        # Geometry from copper, outline and drill files
+        tracks, vias, zones = self._parse_geometry(gerber_files, drill_files)
+        
         # Parse board info from gerbers
-        board_info = self._parse_board_info(gerber_files)
+        board_info = self._parse_board_info(gerber_files, tracks, vias)
         
         # Parse BOM
         components = []
@@ -61,6 +86,12 @@ class GerberParser(BaseParser):
         if netlist_files:
             logger.info(f"Parsing IPC-D-356 netlist: {netlist_files[0]}")
             nets = self._parse_ipc_netlist(netlist_files[0], components)
+        elif self.x2_nets:
+            # Net names from X2 object attributes (TO.N)
+            nets = [
+                Net(name=name, is_power=self.detect_power_net(name), is_ground=self.detect_ground_net(name))
+                for name in self.x2_nets
+            ]
         else:
             # Extract nets from component list (limited without netlist)
             nets = self._extract_nets_from_components(components)
@@ -69,8 +100,11 @@ class GerberParser(BaseParser):
             board_info=board_info,
             nets=nets,
             components=components,
+            tracks=tracks,
+            vias=vias,
+            zones=zones,
             files_found=files_found,
-            raw_data={'gerber_count': len(gerber_files)}
+            raw_data={'gerber_count': len(gerber_files), 'layers': self.layer_summary}
         )
     
     def _find_gerber_files(self, directory: Path) -> List[Path]:
@@ -88,55 +122,220 @@ class GerberParser(BaseParser):
         
         return list(set(gerber_files))  # Remove duplicates
     
-    def _parse_board_info(self, gerber_files: List[Path]) -> BoardInfo:
-        """Parse board information from Gerber files"""
-        # Try to find outline/edge file
-        outline_file = None
-        for gf in gerber_files:
-            name_lower = gf.name.lower()
-            if any(kw in name_lower for kw in ['outline', 'edge', 'gko', 'boardoutline']):
-                outline_file = gf
+    def _classify_layer(self, path: Path) -> Optional[Tuple[str, int]]:
+        """
+        (layer name, copper order) for a copper or outline Gerber, else None
+        
+        Uses the X2 file function when present (Copper,L2,Inr -> In1.Cu),
+        otherwise FormatDetector's filename patterns. The outline is
+        ('outline', 0); B.Cu without a layer number sorts last.
+        """
+        function = read_file_function(str(path))
+        if function:
+            parts = [part.strip() for part in function.split(',')]
+            if parts[0] == 'Profile':
+                return 'outline', 0
+            if parts[0] != 'Copper' or len(parts) < 3:
+                return None
+            match = re.match(r'L(\d+)$', parts[1])
+            number = int(match.group(1)) if match else 0
+            if parts[2] == 'Top':
+                return 'F.Cu', 1
+            if parts[2] == 'Bot':
+                return 'B.Cu', number or 99
+            return f'In{max(number - 1, 1)}.Cu', number or 2
+        
+        layer_type = None
+        for pattern, candidate in FormatDetector.GERBER_LAYER_PATTERNS.items():
+            if re.search(pattern, path.name, re.IGNORECASE):
+                layer_type = candidate
                 break
+        if layer_type == 'copper_top':
+            return 'F.Cu', 1
+        if layer_type == 'copper_bottom':
+            return 'B.Cu', 99
+        if layer_type == 'copper_inner':
+            match = re.search(r'in(\d+)|\.g(\d)l?$', path.name, re.IGNORECASE)
+            inner = int(match.group(1)) if match and match.group(1) else (
+                int(match.group(2)) - 1 if match else 1)
+            return f'In{inner}.Cu', inner + 1
+        if layer_type == 'board_outline':
+            return 'outline', 0
+        return None
+    
+    def _parse_geometry(self, gerber_files: List[Path],
+                        drill_files: List[Path]) -> Tuple[List[Track], List[Via], List[Zone]]:
+        """
+        Tracks, vias and zones from the fabrication files
         
-        size_x, size_y = 100.0, 100.0  # defaults
+        Copper/outline Gerbers and Excellon drill files are parsed into
+        column arrays (concurrently in the parser pool when large). Plated
+        holes become vias when their X2 tool function says ViaDrill, or
+        (without attributes) when a ViaPad is flashed there or the hole is
+        at most VIA_MAX_DRILL. Via size and net come from the copper flash
+        at the hole.
+        """
+        self.copper_layers: Dict[str, GerberLayer] = {}
+        self.outline: Optional[GerberLayer] = None
+        self.x2_nets: List[str] = []
+        self.layer_summary: Dict[str, Dict] = {}
+        tracks: List[Track] = []
+        vias: List[Via] = []
+        zones: List[Zone] = []
         
-        if outline_file:
-            try:
-                # Simple parsing of Gerber outline for dimensions
-                with open(outline_file, 'r') as f:
-                    content = f.read()
-                
-                # Extract coordinates (very simplified)
-                coords = re.findall(r'X([-\d]+)Y([-\d]+)', content)
-                if coords:
-                    xs = [int(x) / 10000 for x, y in coords]  # Convert from Gerber units
-                    ys = [int(y) / 10000 for x, y in coords]
-                    
-                    if xs and ys:
-                        size_x = max(xs) - min(xs)
-                        size_y = max(ys) - min(ys)
+        classified = []
+        for path in sorted(gerber_files):
+            layer = self._classify_layer(path)
+            if layer:
+                classified.append((path, 'gerber') + layer)
+        classified.sort(key=lambda item: item[3])
+        for path in sorted(drill_files):
+            if is_excellon(str(path)):
+                classified.append((path, 'drill', path.name, 0))
+        if not classified:
+            return tracks, vias, zones
+        
+        tasks = [(str(path), kind) for path, kind, _, _ in classified]
+        total_bytes = sum(path.stat().st_size for path, _, _, _ in classified)
+        results = get_parse_pool().map(_parse_fabrication_file, tasks, total_bytes)
+        
+        copper_order: Dict[int, str] = {}
+        drills: List[DrillLayer] = []
+        x2_nets: Dict[str, None] = {}
+        for (path, kind, name, order), result in zip(classified, results):
+            if result is None:
+                continue
+            if kind == 'drill':
+                drills.append(result)
+                self.layer_summary[name] = {
+                    'file': path.name, 'hits': result.hits, 'slots': result.slots,
+                    'routed': result.routed, 'skipped': result.skipped, 'plated': result.plated,
+                }
+                continue
+            self.layer_summary[name] = {
+                'file': path.name, 'function': result.file_function, 'draws': result.draws,
+                'arcs': result.arcs, 'flashes': len(result.flash_x), 'regions': len(result.region_start),
+                'clear': result.clear, 'skipped': result.skipped, 'unsupported': result.unsupported,
+            }
+            if name == 'outline':
+                self.outline = result
+                continue
+            if result.file_polarity == 'Negative':
+                logger.warning(f"Skipping negative copper layer {path.name} (plane clearances)")
+                continue
+            if name in self.copper_layers:
+                logger.warning(f"Duplicate copper layer {name}: {path.name} ignored")
+                continue
+            self.copper_layers[name] = result
+            copper_order[order] = name
+            x2_nets.update(dict.fromkeys(result.nets))
             
-            except Exception as e:
-                logger.warning(f"Failed to parse outline file: {e}")
+            # Net index -> name; -1 (no net) picks the trailing ''
+            net_names = result.nets + ['']
+            tracks.extend(map(
+                Track,
+                map(net_names.__getitem__, result.track_net),
+                repeat(name),
+                result.track_width,
+                result.track_x1, result.track_y1,
+                result.track_x2, result.track_y2
+            ))
+            for i, (net, function) in enumerate(zip(result.region_net, result.region_function)):
+                if function >= 0 and 'Pad' in result.functions[function]:
+                    continue  # Pad shapes drawn as regions
+                zones.append(Zone(net_name=net_names[net], layer=name, outline_points=result.region_points(i)))
+        self.x2_nets = list(x2_nets)
+        
+        # Largest copper flash per location (via pads repeat on every layer)
+        flashes: Dict[Tuple[float, float], Tuple[float, str, bool]] = {}
+        for layer in self.copper_layers.values():
+            net_names = layer.nets + ['']
+            via_functions = {i for i, function in enumerate(layer.functions) if function.startswith('ViaPad')}
+            for x, y, width, height, net, function in zip(
+                layer.flash_x, layer.flash_y, layer.flash_width, layer.flash_height,
+                layer.flash_net, layer.flash_function
+            ):
+                key = (round(x, 3), round(y, 3))
+                size, is_via_pad = min(width, height), function in via_functions
+                previous = flashes.get(key)
+                if previous is None:
+                    flashes[key] = (size, net_names[net], is_via_pad)
+                else:
+                    flashes[key] = (max(size, previous[0]), previous[1] or net_names[net], previous[2] or is_via_pad)
+        
+        ordered = [copper_order[order] for order in sorted(copper_order)]
+        first, last = (ordered[0], ordered[-1]) if ordered else ('F.Cu', 'B.Cu')
+        seen = set()
+        for drill in drills:
+            if not drill.plated:
+                continue
+            start, end = drill.layer_span
+            start_layer = copper_order.get(start, first)
+            end_layer = last if end >= len(ordered) else copper_order.get(end, last)
+            via_functions = [function.endswith('ViaDrill') for function in drill.functions]
+            for x, y, diameter, function in zip(drill.hit_x, drill.hit_y, drill.hit_diameter, drill.hit_function):
+                key = (round(x, 3), round(y, 3))
+                pad = flashes.get(key)
+                if function >= 0:
+                    is_via = via_functions[function]
+                else:
+                    is_via = (pad is not None and pad[2]) or diameter <= VIA_MAX_DRILL
+                if not is_via or key in seen:
+                    continue
+                seen.add(key)
+                vias.append(Via(
+                    net_name=pad[1] if pad else '',
+                    x=x,
+                    y=y,
+                    diameter=pad[0] if pad else diameter * 2,
+                    drill=diameter,
+                    start_layer=start_layer,
+                    end_layer=end_layer
+                ))
+        
+        logger.info(f"Parsed {len(tracks)} tracks, {len(vias)} vias, {len(zones)} zones "
+                    f"from {len(self.copper_layers)} copper layers")
+        return tracks, vias, zones
+    
+    def _parse_board_info(self, gerber_files: List[Path], tracks: List[Track], vias: List[Via]) -> BoardInfo:
+        """Parse board information from Gerber files"""
+        size_x, size_y = 100.0, 100.0  # defaults
         
-        # Estimate layer count from file names
-        layer_count = 2  # default
-        layer_keywords = ['top', 'bottom', 'inner', 'l1', 'l2', 'l3', 'l4']
-        found_layers = set()
+        # Board size from the outline's extent, else the copper's
+        if self.outline is not None and self.outline.has_geometry:
+            extents = [self.outline]
+        else:
+            extents = [layer for layer in self.copper_layers.values() if layer.has_geometry]
+        if extents:
+            size_x = max(layer.max_x for layer in extents) - min(layer.min_x for layer in extents)
+            size_y = max(layer.max_y for layer in extents) - min(layer.min_y for layer in extents)
         
-        for gf in gerber_files:
-            name_lower = gf.name.lower()
-            for kw in layer_keywords:
-                if kw in name_lower:
-                    found_layers.add(kw)
+        if self.copper_layers:
+            layer_count = max(2, len(self.copper_layers))
+        else:
+            # Estimate layer count from file names
+            layer_count = 2  # default
+            layer_keywords = ['top', 'bottom', 'inner', 'l1', 'l2', 'l3', 'l4']
+            found_layers = set()
+            
+            for gf in gerber_files:
+                name_lower = gf.name.lower()
+                for kw in layer_keywords:
+                    if kw in name_lower:
+                        found_layers.add(kw)
+            
+            if 'inner' in found_layers or any(f'l{i}' in found_layers for i in range(3, 10)):
+                layer_count = 4  # At least 4 layers
         
-        if 'inner' in found_layers or any(f'l{i}' in found_layers for i in range(3, 10)):
-            layer_count = 4  # At least 4 layers
+        widths = [track.width for track in tracks if track.width > 0]
+        via_sizes = [via.diameter for via in vias if via.diameter > 0]
         
         return BoardInfo(
             size_x=round(size_x, 2),
             size_y=round(size_y, 2),
-            layer_count=layer_count
+            layer_count=layer_count,
+            min_track_width=min(widths) if widths else None,
+            min_via_size=min(via_sizes) if via_sizes else None
         )
     
     def _parse_bom(self, bom_file: Path) -> List[Component]:
@@ -7,14 +7,15 @@ Philosophy:
 - Never let AI make CRITICAL claims without deterministic backing
 """
 import logging
-import sexpdata
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union, IO
 from collections import defaultdict
 from openai import OpenAI
 from config import get_settings
 from parsers.base_parser import ParsedPCBData, BoardInfo, Component, Net, Track, Via, Zone
 from parsers.kicad_sch_parser import KiCadSchematicParser
+from parsers.sexpr_stream import iter_sexpr_items
+from tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,9 @@ class HybridParser:
     2. GPT-4o for semantic understanding
     """
     
+    # Bump whenever parse output changes, so cached parses are not reused
+    PARSER_VERSION = "hybrid-4"
+    
     def __init__(self):
         self.settings = get_settings()
         self.client = OpenAI(api_key=self.settings.openai_api_key)
@@ -55,22 +59,53 @@ class HybridParser:
         schematic_data = None
         if sch_files:
             logger.info(f"Parsing {len(sch_files)} schematic files")
-            schematic_data = self.sch_parser.parse_project_schematics(project_path)
+            with span("parse:schematics", files=len(sch_files)):
+                schematic_data = self.sch_parser.parse_project_schematics(project_path)
         else:
             logger.info("No schematic files found - using PCB data only")
         
-        # Step 3: Deterministic parsing for FACTS
+        # Step 3: Deterministic parsing for FACTS (streamed, never fully in memory)
         logger.info(f"Parsing PCB file deterministically: {pcb_file.name}")
-        pcb_content = pcb_file.read_text(errors='ignore')
-        
-        geometric_data = self._parse_geometry_deterministic(pcb_content)
+        with span("parse:geometry", bytes=pcb_file.stat().st_size) as geometry_span:
+            geometric_data = self._parse_geometry_deterministic(pcb_file)
+            geometry_span.set(
+                components=len(geometric_data.get('components', [])),
+                tracks=len(geometric_data.get('tracks', [])),
+            )
         
         # Step 4: GPT semantic analysis for UNDERSTANDING
         logger.info("Using GPT for semantic classification")
-        semantic_data = self._classify_semantics_gpt(geometric_data, pcb_content[:50000])
+        with span("parse:gpt_semantics"):
+            with open(pcb_file, 'r', errors='ignore') as f:
+                pcb_sample = f.read(50000)
+            semantic_data = self._classify_semantics_gpt(geometric_data, pcb_sample)
         
         # Step 5: Merge deterministic facts with semantic insights and schematic data
-        return self._merge_results(geometric_data, semantic_data, schematic_data)
+        with span("parse:merge"):
+            result = self._merge_results(geometric_data, semantic_data, schematic_data)
+        
+        # Stages that fell back to an empty result (see cacheable)
+        degraded = []
+        if geometric_data.get('error'):
+            degraded.append('geometry')
+        if not semantic_data:
+            degraded.append('semantics')
+        if degraded:
+            logger.warning(f"Degraded parse ({', '.join(degraded)} failed), result will not be cached")
+        result.raw_data['degraded'] = degraded
+        return result
+    
+    def cacheable(self, result: ParsedPCBData) -> bool:
+        """Whether a parse may be cached: not when a stage failed (a transient
+        OpenAI error must not be served for every later upload of the file)"""
+        return not result.raw_data.get('degraded')
+    
+    def source_files(self, project_path: Path) -> List[Path]:
+        """Files whose content determines the parse result (for cache keys)"""
+        pcb_file = self._find_pcb_file(project_path)
+        if not pcb_file:
+            return []
+        return [pcb_file] + sorted(self._find_schematic_files(project_path))
     
     def _find_pcb_file(self, project_path: Path) -> Optional[Path]:
         """Find .kicad_pcb file (not backup)"""
@@ -88,16 +123,22 @@ class HybridParser:
                     files.append(f)
         return files
     
-    def _parse_geometry_deterministic(self, pcb_content: str) -> Dict[str, Any]:
+    def _parse_geometry_deterministic(self, pcb_source: Union[str, Path, IO]) -> Dict[str, Any]:
         """
         Parse geometry using deterministic S-expression parsing
         
+        The board is read as a stream of top-level items (see
+        parsers.sexpr_stream), so the full S-expression tree is never built.
+        Everything is collected in one fused traversal: each item is visited
+        exactly once, and each footprint is walked once for its position,
+        texts and pads.
+        
+        Args:
+            pcb_source: Path to the .kicad_pcb file, or an open file/mmap
+        
         Returns facts only - no interpretation
         """
         try:
-            # Parse S-expression
-            data = sexpdata.loads(pcb_content)
-            
             result = {
                 'board_info': {},
                 'components': [],
@@ -108,55 +149,56 @@ class HybridParser:
                 'edge_coords': []  # Collect edge coordinates
             }
             
-            # CRITICAL: Extract net map and pad connections first
-            # This enables proper net connectivity checking
-            net_map = self._extract_net_map(data)
-            net_to_pads = self._extract_pad_connections(data, net_map)
+            # CRITICAL: Net map and pad connections enable proper net
+            # connectivity checking. Pads are resolved against the net map once
+            # the stream ends, so declaration order in the file does not matter.
+            net_map: Dict[int, str] = {}
+            
+            for item in iter_sexpr_items(pcb_source):
+                tag = str(item[0]) if len(item) > 0 else None
+                
+                if tag == 'general':
+                    result['board_info'] = self._extract_general_info(item)
+                elif tag == 'layers':
+                    # Extract layer count from (layers ...) block
+                    layer_count = self._extract_layer_count(item)
+                    if layer_count > 0:
+                        result['board_info']['layer_count'] = layer_count
+                elif tag == 'gr_line' or tag == 'gr_rect' or tag == 'gr_arc' or tag == 'gr_poly' or tag == 'gr_circle':
+                    # Edge cuts - collect coordinates for board size calculation
+                    coords = self._extract_edge_coords(item)
+                    if coords:
+                        result['edge_coords'].extend(coords)
+                elif tag == 'module' or tag == 'footprint':
+                    # Component record carries its pads
+                    comp = self._extract_component_deterministic(item)
+                    if comp:
+                        result['components'].append(comp)
+                elif tag == 'net':
+                    entry = self._extract_net_entry(item)
+                    if entry:
+                        net_map[entry[0]] = entry[1]
+                    net = self._extract_net_deterministic(item)
+                    if net:
+                        result['nets'].append(net)
+                elif tag == 'segment':
+                    track = self._extract_track(item)
+                    if track:
+                        result['tracks'].append(track)
+                elif tag == 'via':
+                    via = self._extract_via(item)
+                    if via:
+                        result['vias'].append(via)
+                elif tag == 'zone':
+                    zone = self._extract_zone(item)
+                    if zone:
+                        result['zones'].append(zone)
+            
+            logger.info(f"✓ Extracted {len(net_map)} net definitions")
             
             # Store for later use when building Net objects
             result['net_map'] = net_map
-            result['net_to_pads'] = net_to_pads
-            
-            # Extract from kicad_pcb root
-            if isinstance(data, list) and len(data) > 0:
-                for item in data:
-                    if not isinstance(item, list):
-                        continue
-                    
-                    tag = str(item[0]) if len(item) > 0 else None
-                    
-                    if tag == 'general':
-                        result['board_info'] = self._extract_general_info(item)
-                    elif tag == 'layers':
-                        # Extract layer count from (layers ...) block
-                        layer_count = self._extract_layer_count(item)
-                        if layer_count > 0:
-                            result['board_info']['layer_count'] = layer_count
-                    elif tag == 'gr_line' or tag == 'gr_rect' or tag == 'gr_arc' or tag == 'gr_poly' or tag == 'gr_circle':
-                        # Edge cuts - collect coordinates for board size calculation
-                        coords = self._extract_edge_coords(item)
-                        if coords:
-                            result['edge_coords'].extend(coords)
-                    elif tag == 'module' or tag == 'footprint':
-                        comp = self._extract_component_deterministic(item)
-                        if comp:
-                            result['components'].append(comp)
-                    elif tag == 'net':
-                        net = self._extract_net_deterministic(item)
-                        if net:
-                            result['nets'].append(net)
-                    elif tag == 'segment':
-                        track = self._extract_track(item)
-                        if track:
-                            result['tracks'].append(track)
-                    elif tag == 'via':
-                        via = self._extract_via(item)
-                        if via:
-                            result['vias'].append(via)
-                    elif tag == 'zone':
-                        zone = self._extract_zone(item)
-                        if zone:
-                            result['zones'].append(zone)
+            result['net_to_pads'] = self._resolve_pad_connections(result['components'], net_map)
             
             # Calculate board dimensions from edge coordinates
             if result['edge_coords']:
@@ -177,7 +219,8 @@ class HybridParser:
             
         except Exception as e:
             logger.error(f"Deterministic parsing failed: {e}", exc_info=True)
-            return {'board_info': {}, 'components': [], 'nets': [], 'tracks': [], 'vias': [], 'zones': [], 'edge_coords': []}
+            return {'board_info': {}, 'components': [], 'nets': [], 'tracks': [], 'vias': [], 'zones': [], 'edge_coords': [],
+                    'error': str(e)}
     
     def _extract_general_info(self, general_block: list) -> Dict:
         """Extract board info from (general ...) block"""
@@ -245,9 +288,9 @@ class HybridParser:
             logger.error(f"Failed to extract layer count: {e}", exc_info=True)
             return 2  # Default fallback
     
-    def _extract_net_map(self, pcb_root: list) -> Dict[int, str]:
+    def _extract_net_entry(self, elem: list) -> Optional[Tuple[int, str]]:
         """
-        Build a mapping from KiCad net ID -> net name.
+        Extract a KiCad net ID -> net name entry from a top-level net definition.
         
         KiCad .kicad_pcb has net definitions like:
           (net 0 "")
@@ -257,42 +300,26 @@ class HybridParser:
         
         This creates the foundation for pad-to-net connectivity.
         """
-        net_map: Dict[int, str] = {}
+        if len(elem) < 3:
+            return None
         
         try:
-            if not isinstance(pcb_root, list):
-                return net_map
-            
-            for elem in pcb_root:
-                if not isinstance(elem, list) or len(elem) < 3:
-                    continue
-                
-                # Check if this is a net definition
-                tag = str(elem[0]) if elem else None
-                if tag != 'net':
-                    continue
-                
-                try:
-                    # (net ID "NAME")
-                    net_id = int(elem[1])
-                    net_name = str(elem[2]).strip('"')
-                    net_map[net_id] = net_name
-                except (ValueError, TypeError, IndexError) as e:
-                    logger.debug(f"Skipping malformed net entry: {elem}")
-                    continue
-            
-            logger.info(f"✓ Extracted {len(net_map)} net definitions")
-            return net_map
-            
-        except Exception as e:
-            logger.error(f"Failed to extract net map: {e}", exc_info=True)
-            return {}
+            # (net ID "NAME")
+            return int(elem[1]), str(elem[2]).strip('"')
+        except (ValueError, TypeError, IndexError):
+            logger.debug(f"Skipping malformed net entry: {elem}")
+            return None
     
-    def _extract_pad_connections(self, pcb_root: list, net_map: Dict[int, str]) -> Dict[str, List[str]]:
+    def _resolve_pad_connections(
+        self,
+        components: List[Dict],
+        net_map: Dict[int, str]
+    ) -> Dict[str, List[str]]:
         """
-        Extract pad-to-net connectivity mapping.
+        Resolve component pads to net names and build pad-to-net connectivity.
         
-        Returns: net_name -> list of 'Ref.PadNum' strings
+        Fills in 'net_name' on every pad record and returns
+        net_name -> list of 'Ref.PadNum' strings
         
         Example: {"BAT(+)": ["J1.1", "U3.2", "R5.1", "C2.1"], ...}
         
@@ -301,104 +328,71 @@ class HybridParser:
         """
         net_to_pads: Dict[str, List[str]] = defaultdict(list)
         
-        try:
-            if not isinstance(pcb_root, list):
-                return dict(net_to_pads)
-            
-            for elem in pcb_root:
-                if not isinstance(elem, list) or not elem:
-                    continue
-                
-                tag = str(elem[0])
-                
-                # Handle both 'footprint' (KiCad 6+) and 'module' (KiCad 5)
-                if tag not in ('footprint', 'module'):
-                    continue
+        for comp in components:
+            ref = comp['reference']
+            for pad in comp['pads']:
+                # Prefer net_map lookup for consistency, fall back to the
+                # name written inline on the pad
+                net_id = pad['net']
+                net_name = net_map.get(net_id) if net_id is not None else None
+                if net_name is None:
+                    net_name = pad['net_name']
+                pad['net_name'] = net_name
                 
-                # Extract reference designator
-                ref = self._find_footprint_reference(elem)
-                if not ref:
-                    continue
-                
-                # Extract pads from this footprint
-                for sub in elem:
-                    if not isinstance(sub, list) or not sub:
-                        continue
-                    
-                    if str(sub[0]) != 'pad':
-                        continue
-                    
-                    # Parse pad: (pad "1" thru_hole rect ... (net 3 "BAT(+)") ...)
-                    if len(sub) < 2:
-                        continue
-                    
-                    pad_num = str(sub[1]).strip('"')
-                    
-                    # Find net assignment in pad
-                    net_name = self._find_pad_net(sub, net_map)
-                    
-                    if net_name and net_name.strip():  # Ignore empty net names
-                        pad_ref = f"{ref}.{pad_num}"
-                        net_to_pads[net_name].append(pad_ref)
-            
-            # Log statistics
-            total_pads = sum(len(pads) for pads in net_to_pads.values())
-            nets_with_pads = len([n for n, p in net_to_pads.items() if len(p) > 0])
-            logger.info(f"✓ Extracted {total_pads} pad connections across {nets_with_pads} nets")
-            
-            # Sample some connections for debugging
-            sample_nets = list(net_to_pads.items())[:3]
-            for net_name, pads in sample_nets:
-                logger.debug(f"  {net_name}: {len(pads)} pads - {pads[:3]}...")
-            
-            return dict(net_to_pads)
-            
-        except Exception as e:
-            logger.error(f"Failed to extract pad connections: {e}", exc_info=True)
-            return {}
+                if net_name and net_name.strip():  # Ignore empty net names
+                    net_to_pads[net_name].append(f"{ref}.{pad['number']}")
+        
+        # Log statistics
+        total_pads = sum(len(pads) for pads in net_to_pads.values())
+        nets_with_pads = len([n for n, p in net_to_pads.items() if len(p) > 0])
+        logger.info(f"✓ Extracted {total_pads} pad connections across {nets_with_pads} nets")
+        
+        # Sample some connections for debugging
+        sample_nets = list(net_to_pads.items())[:3]
+        for net_name, pads in sample_nets:
+            logger.debug(f"  {net_name}: {len(pads)} pads - {pads[:3]}...")
+        
+        return dict(net_to_pads)
     
-    def _find_footprint_reference(self, footprint_block: list) -> Optional[str]:
-        """Extract reference designator from footprint block."""
-        try:
-            for sub in footprint_block:
-                if not isinstance(sub, list) or len(sub) < 3:
-                    continue
-                
-                # (fp_text reference "U1" ...)
-                if (str(sub[0]) == 'fp_text' and 
-                    len(sub) >= 3 and 
-                    str(sub[1]) == 'reference'):
-                    return str(sub[2]).strip('"')
-            
-            return None
-        except Exception:
+    def _extract_pad(self, pad_block: list) -> Optional[Dict]:
+        """
+        Extract pad number and net assignment from a pad block.
+        
+        (pad "1" thru_hole rect ... (net 3 "BAT(+)") ...)
+        
+        'net' is the KiCad net ID; 'net_name' is the inline name (if any)
+        until _resolve_pad_connections replaces it from the net map.
+        """
+        if len(pad_block) < 2:
             return None
-    
-    def _find_pad_net(self, pad_block: list, net_map: Dict[int, str]) -> Optional[str]:
-        """Extract net name from pad block."""
-        try:
-            for token in pad_block:
-                if not isinstance(token, list) or not token:
-                    continue
-                
-                if str(token[0]) != 'net':
-                    continue
-                
-                # (net 3 "BAT(+)") or (net 3)
-                if len(token) >= 2:
-                    try:
-                        net_id = int(token[1])
-                        # Prefer net_map lookup for consistency
-                        return net_map.get(net_id)
-                    except (ValueError, TypeError):
-                        continue
+        
+        pad = {'number': str(pad_block[1]).strip('"'), 'net': None, 'net_name': None}
+        
+        for token in pad_block[2:]:
+            if not isinstance(token, list) or len(token) < 2:
+                continue
             
-            return None
-        except Exception:
-            return None
+            if str(token[0]) != 'net':
+                continue
+            
+            # (net 3 "BAT(+)") or (net 3)
+            try:
+                pad['net'] = int(token[1])
+            except (ValueError, TypeError):
+                continue
+            if len(token) > 2:
+                pad['net_name'] = str(token[2]).strip('"')
+            break
+        
+        return pad
     
     def _extract_component_deterministic(self, module_block: list) -> Optional[Dict]:
-        """Extract component with positions, no interpretation"""
+        """
+        Extract component with positions and pads, no interpretation
+        
+        Reference and value come from (fp_text reference/value ...) up to
+        KiCad 7, and from (property "Reference"/"Value" ...) in KiCad 8.
+        """
         try:
             comp = {
                 'reference': 'Unknown',
@@ -407,7 +401,8 @@ class HybridParser:
                 'x': 0.0,
                 'y': 0.0,
                 'rotation': 0.0,
-                'layer': 'F.Cu'
+                'layer': 'F.Cu',
+                'pads': []
             }
             
             # Module/footprint name is usually second element
@@ -421,7 +416,12 @@ class HybridParser:
                 
                 tag = str(item[0])
                 
-                if tag == 'at':
+                if tag == 'pad':
+                    pad = self._extract_pad(item)
+                    if pad:
+                        comp['pads'].append(pad)
+                
+                elif tag == 'at':
                     # Position (at X Y [rotation])
                     comp['x'] = float(item[1]) if len(item) > 1 else 0.0
                     comp['y'] = float(item[2]) if len(item) > 2 else 0.0
@@ -430,13 +430,15 @@ class HybridParser:
                 elif tag == 'layer':
                     comp['layer'] = str(item[1])
                 
-                elif tag == 'fp_text':
+                elif tag == 'fp_text' or tag == 'property':
                     # (fp_text reference "U1" ...)
                     # (fp_text value "ATmega328P" ...)
+                    # (property "Reference" "U1" ...)  - KiCad 8
                     if len(item) > 2:
-                        text_type = str(item[1])
+                        text_type = str(item[1]).lower()
                         text_value = str(item[2]).strip('"')
                         
+                        # Last one wins, as with fp_text before
                         if text_type == 'reference':
                             comp['reference'] = text_value
                         elif text_type == 'value':
@@ -734,11 +736,10 @@ Be specific. Only classify what you see. Return ONLY JSON."""
     def _merge_results(self, geometric: Dict, semantic: Dict, schematic=None) -> ParsedPCBData:
         """Merge deterministic geometry with semantic understanding"""
         
-        # Create net ID to name mapping
-        net_id_to_name = {}
-        for net_data in geometric['nets']:
-            if 'id' in net_data:
-                net_id_to_name[net_data['id']] = net_data['name']
+        # Create net ID to name mapping (net 0 "" means unconnected)
+        net_id_to_name = {
+            net_id: name for net_id, name in geometric.get('net_map', {}).items() if name
+        }
         
         # Create components with semantic types
         components = []
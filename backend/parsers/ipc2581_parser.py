@@ -12,7 +12,6 @@ IPC-2581 is a vendor-neutral XML format that includes:
 """
 
 import logging
-import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
@@ -21,6 +20,7 @@ from .base_parser import (
     BaseParser, ParsedPCBData, BoardInfo,
     Component, Net, Track, Via, Zone
 )
+from .xml_stream import XML_PARSE_ERRORS, XMLRecordStream
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +85,17 @@ class IPC2581Parser(BaseParser):
     </IPC-2581>
     """
     
+    # Copper layer functions counted from the stackup
+    COPPER_FUNCTIONS = ('SIGNAL', 'PLANE', 'POWER', 'GROUND')
+    
+    # CadHeader units / legacy Content Units -> mm
+    UNIT_SCALES = {
+        'MILLIMETER': 1.0, 'MM': 1.0,
+        'MICRON': 0.001,
+        'INCH': 25.4,
+        'MIL': 0.0254, 'MILS': 0.0254,
+    }
+    
     def __init__(self):
         """Initialize parser"""
         self.ns = IPC_NS
@@ -126,7 +137,7 @@ class IPC2581Parser(BaseParser):
         
         try:
             return self._parse_ipc2581(ipc_file)
-        except ET.ParseError as e:
+        except XML_PARSE_ERRORS as e:
             logger.error(f"XML parse error: {e}")
             return self._empty_result()
         except Exception as e:
@@ -143,138 +154,213 @@ class IPC2581Parser(BaseParser):
             return False
     
     def _parse_ipc2581(self, file_path: Path) -> ParsedPCBData:
-        """Parse IPC-2581 XML file"""
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        
-        # Handle namespace
-        if root.tag.startswith('{'):
-            ns_end = root.tag.find('}')
-            namespace = root.tag[1:ns_end]
-            self.ns = {'ipc': namespace}
-        
-        # Parse units
-        self._parse_units(root)
-        
-        # Parse ECAD data
-        ecad = root.find('.//Ecad', self.ns) or root.find('Ecad')
-        if ecad is None:
-            # Try without namespace
-            ecad = self._find_element(root, 'Ecad')
-        
-        if ecad is None:
-            logger.warning("No ECAD section found")
-            return self._empty_result()
-        
-        # Parse CAD data
-        cad_data = self._find_element(ecad, 'CadData')
-        if cad_data is None:
-            return self._empty_result()
+        """
+        Parse IPC-2581 XML file in one streaming pass
         
-        # Find step (design data)
-        step = self._find_element(cad_data, 'Step')
-        if step is None:
+        Records (Component, LogicalNet, Set, BomItem, ...) are handled as
+        they close and then freed, so memory stays bounded for exports of
+        hundreds of MB. Only the first Step is read. BOM values are applied
+        at the end, since the Bom section usually precedes the Ecad data.
+        """
+        self._stream = XMLRecordStream(
+            start_handlers={
+                'CadHeader': self._on_cad_header,
+                'Step': self._on_step,
+                'LayerFeature': self._on_layer_feature,
+            },
+            end_handlers={
+                'Units': self._on_units,
+                'BomItem': self._on_bom_item,
+                'StackupLayer': self._on_stackup_layer,
+                'Profile': self._on_profile,
+                'Package': self._on_package,
+                'Component': self._on_component,
+                'LogicalNet': self._on_logical_net,
+                'Set': self._on_set,
+            },
+        )
+        self._steps = 0
+        self._layer_name = ''
+        self._copper_layers = 0
+        self._stackup_seen = False
+        self._outline: List[Tuple[float, float]] = []
+        self._components: List[Component] = []
+        self._logical_nets: Dict[str, List[str]] = {}
+        self._feature_nets: Dict[str, None] = {}
+        self._bom: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._tracks: List[Track] = []
+        self._vias: List[Via] = []
+        
+        self._stream.run(file_path)
+        
+        if self._stream.root_tag != 'IPC-2581':
+            logger.warning(f"Not an IPC-2581 file (root <{self._stream.root_tag}>)")
+        if self._steps == 0:
+            logger.warning("No ECAD step found")
             return self._empty_result()
+        if self._stream.namespace:
+            self.ns = {'ipc': self._stream.namespace}
         
-        # Parse components
-        board_info = self._parse_board_info(step)
-        components = self._parse_components(step)
-        nets = self._parse_nets(root, step)
-        tracks, vias = self._parse_layer_features(step)
-        
-        # Parse BOM if present
-        bom = self._find_element(root, 'Bom')
-        if bom is not None:
-            self._enhance_with_bom(components, bom)
+        self._enhance_with_bom(self._components)
         
         return ParsedPCBData(
-            board_info=board_info,
-            components=components,
-            nets=nets,
-            tracks=tracks,
-            vias=vias,
+            board_info=self._board_info(),
+            components=self._components,
+            nets=self._build_nets(),
+            tracks=self._tracks,
+            vias=self._vias,
             zones=[],
             files_found={'ipc2581': True}
         )
     
-    def _find_element(self, parent: ET.Element, tag: str) -> Optional[ET.Element]:
-        """Find element with or without namespace"""
-        # Try with namespace
-        for ns_prefix, ns_uri in self.ns.items():
-            elem = parent.find(f'{{{ns_uri}}}{tag}')
-            if elem is not None:
-                return elem
-        
-        # Try without namespace
-        elem = parent.find(tag)
-        if elem is not None:
-            return elem
-        
-        # Try recursive search
-        for child in parent:
-            local_tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-            if local_tag == tag:
-                return child
-        
-        return None
+    # ------------------------------------------------------------ context
     
-    def _find_all_elements(self, parent: ET.Element, tag: str) -> List[ET.Element]:
-        """Find all elements with or without namespace"""
-        results = []
-        
-        for child in parent:
-            local_tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-            if local_tag == tag:
-                results.append(child)
-        
-        return results
+    def _set_units(self, units: str):
+        scale = self.UNIT_SCALES.get(units.upper())
+        if scale is not None:
+            self.units = units.lower()
+            self.unit_scale = scale
     
-    def _parse_units(self, root: ET.Element):
-        """Parse unit specification"""
-        content = self._find_element(root, 'Content')
-        if content is not None:
-            units_elem = self._find_element(content, 'Units')
-            if units_elem is not None:
-                self.units = units_elem.get('units', 'mm').lower()
-                if self.units == 'inch':
-                    self.unit_scale = 25.4
-                elif self.units == 'mil':
-                    self.unit_scale = 0.0254
+    def _on_cad_header(self, elem):
+        self._set_units(elem.get('units', 'MILLIMETER'))
     
-    def _parse_board_info(self, step: ET.Element) -> BoardInfo:
-        """Parse board information from Step element"""
-        # Get profile (board outline)
-        profile = self._find_element(step, 'Profile')
-        
-        min_x, min_y = float('inf'), float('inf')
-        max_x, max_y = float('-inf'), float('-inf')
-        
-        if profile is not None:
-            # Parse polygon outline
-            polygon = self._find_element(profile, 'Polygon')
-            if polygon is not None:
-                for point in self._find_all_elements(polygon, 'PolyStepSegment'):
-                    x = float(point.get('x', 0)) * self.unit_scale
-                    y = float(point.get('y', 0)) * self.unit_scale
-                    min_x = min(min_x, x)
-                    min_y = min(min_y, y)
-                    max_x = max(max_x, x)
-                    max_y = max(max_y, y)
+    def _on_units(self, elem):
+        """Legacy <Content><Units units="inch"/> form"""
+        self._set_units(elem.get('units', 'mm'))
+    
+    def _on_step(self, elem):
+        self._steps += 1
+    
+    def _in_first_step(self) -> bool:
+        return self._steps == 1
+    
+    def _on_layer_feature(self, elem):
+        self._layer_name = elem.get('layerRef', '')
+    
+    # ------------------------------------------------------------ records
+    
+    def _on_stackup_layer(self, elem):
+        """Copper layers for the layer count"""
+        if not self._in_first_step():
+            return
+        self._stackup_seen = True
+        if elem.get('layerFunctionValue', '') in self.COPPER_FUNCTIONS:
+            self._copper_layers += 1
+    
+    def _on_profile(self, elem):
+        """Board outline points"""
+        if not self._in_first_step() or self._outline:
+            return
+        q = self._stream.qualify
+        polygon = elem.find(q('Polygon'))
+        if polygon is None:
+            return
+        for point in polygon:
+            if point.tag in (q('PolyBegin'), q('PolyStepSegment'), q('PolyStepCurve')):
+                self._outline.append((
+                    float(point.get('x', 0)) * self.unit_scale,
+                    float(point.get('y', 0)) * self.unit_scale
+                ))
+    
+    def _on_package(self, elem):
+        """Package (footprint) definition"""
+        pkg_name = elem.get('name', '')
+        self.packages[pkg_name] = {
+            'name': pkg_name,
+            'pins': len(elem.findall(self._stream.qualify('Pin')))
+        }
+    
+    def _on_component(self, elem):
+        """Component placement"""
+        if not self._in_first_step():
+            return
+        q = self._stream.qualify
+        
+        # Get location
+        location = elem.find(q('Location'))
+        x, y, rotation = 0.0, 0.0, 0.0
+        if location is not None:
+            x = float(location.get('x', 0)) * self.unit_scale
+            y = float(location.get('y', 0)) * self.unit_scale
+            rotation = float(location.get('rotation', 0))
+        
+        # Determine side (LayerRef child in older exports, layerRef attribute in rev C)
+        layer = elem.find(q('LayerRef'))
+        layer_name = (layer.get('name', '') if layer is not None else elem.get('layerRef', '')).lower()
+        side = 'B.Cu' if 'bot' in layer_name else 'F.Cu'
+        
+        self._components.append(Component(
+            reference=elem.get('refDes', ''),
+            value='',  # Will be filled from BOM
+            footprint=elem.get('packageRef', ''),
+            x=x,
+            y=y,
+            rotation=rotation,
+            layer=side
+        ))
+    
+    def _on_logical_net(self, elem):
+        """Net with its pins"""
+        pads = [
+            f"{pin_ref.get('componentRef', '')}.{pin_ref.get('pin', '')}"
+            for pin_ref in elem.iter(self._stream.qualify('PinRef'))
+        ]
+        self._logical_nets.setdefault(elem.get('name', ''), []).extend(pads)
+    
+    def _on_set(self, elem):
+        """Tracks and vias of one net on the current LayerFeature layer"""
+        if not self._in_first_step():
+            return
+        q = self._stream.qualify
+        net_name = elem.get('net', '')
+        if net_name:
+            self._feature_nets[net_name] = None
+        layer_name = self._layer_name
+        scale = self.unit_scale
+        
+        # Lines (tracks), directly in the Set or inside Features/UserSpecial
+        for line in elem.iter(q('Line')):
+            self._tracks.append(Track(
+                net_name=net_name,
+                layer=layer_name,
+                width=float(line.get('lineWidth', 0.2)) * scale,
+                x1=float(line.get('startX', 0)) * scale,
+                y1=float(line.get('startY', 0)) * scale,
+                x2=float(line.get('endX', 0)) * scale,
+                y2=float(line.get('endY', 0)) * scale
+            ))
         
-        size_x = max_x - min_x if max_x != float('-inf') else 100.0
-        size_y = max_y - min_y if max_y != float('-inf') else 100.0
+        for via in elem.iter(q('Via')):
+            self._vias.append(Via(
+                net_name=net_name,
+                x=float(via.get('x', 0)) * scale,
+                y=float(via.get('y', 0)) * scale,
+                diameter=0.6,  # Default
+                drill=0.3
+            ))
+    
+    def _on_bom_item(self, elem):
+        """Value and MPN per reference designator"""
+        q = self._stream.qualify
+        chars = elem.find(q('Characteristics'))
+        approved = elem.find(q('ApprovedManufacturerPart'))
+        value = chars.get('value', '') if chars is not None else None
+        mpn = approved.get('mpn', '') if approved is not None else None
+        for ref_des in elem.findall(q('RefDes')):
+            self._bom[ref_des.get('name', '')] = (value, mpn)
+    
+    # ------------------------------------------------------------- result
+    
+    def _board_info(self) -> BoardInfo:
+        """Board size from the profile outline, layer count from the stackup"""
+        if self._outline:
+            xs = [x for x, _ in self._outline]
+            ys = [y for _, y in self._outline]
+            size_x, size_y = max(xs) - min(xs), max(ys) - min(ys)
+        else:
+            size_x, size_y = 100.0, 100.0
         
-        # Parse stackup for layer count
-        layer_count = 2
-        stackup = self._find_element(step, 'Stackup')
-        if stackup is not None:
-            copper_layers = 0
-            for group in self._find_all_elements(stackup, 'StackupGroup'):
-                for layer in self._find_all_elements(group, 'StackupLayer'):
-                    layer_type = layer.get('layerFunctionValue', '')
-                    if layer_type in ('SIGNAL', 'PLANE', 'POWER', 'GROUND'):
-                        copper_layers += 1
-            layer_count = max(2, copper_layers)
+        layer_count = max(2, self._copper_layers) if self._stackup_seen else 2
         
         return BoardInfo(
             size_x=size_x,
@@ -282,153 +368,34 @@ class IPC2581Parser(BaseParser):
             layer_count=layer_count
         )
     
-    def _parse_components(self, step: ET.Element) -> List[Component]:
-        """Parse component placements"""
-        components = []
-        
-        # First parse packages (footprints)
-        for package in self._find_all_elements(step, 'Package'):
-            pkg_name = package.get('name', '')
-            self.packages[pkg_name] = {
-                'name': pkg_name,
-                'pins': len(self._find_all_elements(package, 'Pin'))
-            }
-        
-        # Parse component placements
-        for comp in self._find_all_elements(step, 'Component'):
-            ref = comp.get('refDes', '')
-            pkg_ref = comp.get('packageRef', '')
-            
-            # Get location
-            location = self._find_element(comp, 'Location')
-            x, y, rotation = 0.0, 0.0, 0.0
-            if location is not None:
-                x = float(location.get('x', 0)) * self.unit_scale
-                y = float(location.get('y', 0)) * self.unit_scale
-                rotation = float(location.get('rotation', 0))
-            
-            # Determine side
-            layer = self._find_element(comp, 'LayerRef')
-            side = 'F.Cu'
-            if layer is not None:
-                layer_name = layer.get('name', '').lower()
-                if 'bot' in layer_name or 'bottom' in layer_name:
-                    side = 'B.Cu'
-            
-            components.append(Component(
-                reference=ref,
-                value='',  # Will be filled from BOM
-                footprint=pkg_ref,
-                x=x,
-                y=y,
-                rotation=rotation,
-                layer=side
-            ))
-        
-        return components
-    
-    def _parse_nets(self, root: ET.Element, step: ET.Element) -> List[Net]:
-        """Parse net information"""
-        nets = []
-        net_map = {}
-        
-        # Parse from LogicalNet section if present
-        for logical_net in self._find_all_elements(root, 'LogicalNet'):
-            net_name = logical_net.get('name', '')
-            
-            # Collect pins
-            pads = []
-            for pin_ref in self._find_all_elements(logical_net, 'PinRef'):
-                comp = pin_ref.get('componentRef', '')
-                pin = pin_ref.get('pin', '')
-                pads.append(f"{comp}.{pin}")
-            
-            net_map[net_name] = pads
-        
-        # Also check NetPoint elements in step
-        for layer_feature in self._find_all_elements(step, 'LayerFeature'):
-            for set_elem in self._find_all_elements(layer_feature, 'Set'):
-                net_name = set_elem.get('net', '')
-                if net_name and net_name not in net_map:
-                    net_map[net_name] = []
-        
-        # Build net list
-        for net_name, pads in net_map.items():
-            nets.append(Net(
+    def _build_nets(self) -> List[Net]:
+        """LogicalNets first, then nets only named by layer feature Sets"""
+        net_map = dict(self._logical_nets)
+        for net_name in self._feature_nets:
+            net_map.setdefault(net_name, [])
+        
+        return [
+            Net(
                 name=net_name,
                 is_power=self.detect_power_net(net_name),
                 is_ground=self.detect_ground_net(net_name),
                 is_mains=self.detect_mains_net(net_name),
                 pads=pads
-            ))
-        
-        return nets
+            )
+            for net_name, pads in net_map.items()
+        ]
     
-    def _parse_layer_features(self, step: ET.Element) -> Tuple[List[Track], List[Via]]:
-        """Parse tracks and vias from LayerFeature elements"""
-        tracks = []
-        vias = []
-        
-        for layer_feature in self._find_all_elements(step, 'LayerFeature'):
-            layer_name = layer_feature.get('layerRef', '')
-            
-            for set_elem in self._find_all_elements(layer_feature, 'Set'):
-                net_name = set_elem.get('net', '')
-                
-                # Parse lines (tracks)
-                for line in self._find_all_elements(set_elem, 'Line'):
-                    start_x = float(line.get('startX', 0)) * self.unit_scale
-                    start_y = float(line.get('startY', 0)) * self.unit_scale
-                    end_x = float(line.get('endX', 0)) * self.unit_scale
-                    end_y = float(line.get('endY', 0)) * self.unit_scale
-                    width = float(line.get('lineWidth', 0.2)) * self.unit_scale
-                    
-                    tracks.append(Track(
-                        net_name=net_name,
-                        layer=layer_name,
-                        width=width,
-                        x1=start_x,
-                        y1=start_y,
-                        x2=end_x,
-                        y2=end_y
-                    ))
-                
-                # Parse vias
-                for via in self._find_all_elements(set_elem, 'Via'):
-                    x = float(via.get('x', 0)) * self.unit_scale
-                    y = float(via.get('y', 0)) * self.unit_scale
-                    
-                    vias.append(Via(
-                        net_name=net_name,
-                        x=x,
-                        y=y,
-                        diameter=0.6,  # Default
-                        drill=0.3
-                    ))
-        
-        return tracks, vias
-    
-    def _enhance_with_bom(self, components: List[Component], bom: ET.Element):
+    def _enhance_with_bom(self, components: List[Component]):
         """Enhance components with BOM data"""
-        # Create lookup by refDes
-        comp_map = {c.reference: c for c in components}
-        
-        for bom_item in self._find_all_elements(bom, 'BomItem'):
-            for ref_des in self._find_all_elements(bom_item, 'RefDes'):
-                ref = ref_des.get('name', '')
-                
-                if ref in comp_map:
-                    # Get characteristics
-                    chars = self._find_element(bom_item, 'Characteristics')
-                    if chars is not None:
-                        value = chars.get('value', '')
-                        comp_map[ref].value = value
-                    
-                    # Get MPN
-                    approved = self._find_element(bom_item, 'ApprovedManufacturerPart')
-                    if approved is not None:
-                        mpn = approved.get('mpn', '')
-                        comp_map[ref].mpn = mpn
+        for component in components:
+            entry = self._bom.get(component.reference)
+            if entry is None:
+                continue
+            value, mpn = entry
+            if value is not None:
+                component.value = value
+            if mpn is not None:
+                component.mpn = mpn
     
     def _empty_result(self) -> ParsedPCBData:
         """Return empty result"""
@@ -0,0 +1,453 @@
+"""
+Streaming ODB++ feature decoder
+
+Reads one layer's `features` file line by line and decodes it straight into
+typed column arrays (array('d') / array('i')), so memory is bounded by the
+columns rather than the file text or one object per record. Files may be
+plain text, gzip or UNIX compress (.Z, LZW) - ODB++ exporters write the
+latter as `features.z`; the format is detected from the magic bytes.
+
+Records handled:
+- L  lines            -> track rows
+- A  arcs             -> track rows (chords, see geometry.arc_points)
+- P  pads             -> pad rows; vias flagged from EDA subnets, .pad_usage
+                         or (legacy exports) the symbol name
+- S  surfaces         -> one zone per island (OB ... I), holes skipped
+- T, B text/barcodes  -> counted only (they still take a feature index)
+
+Net numbers come from the EDA FID map (feature index -> net) built by
+ODBPPParser; legacy files that name the symbol inline and end each record
+with the net number are read as well.
+
+parse_layer_features is a module-level function with picklable arguments
+and a picklable result, so layers can be decoded in parse_pool workers.
+"""
+import gzip
+import io
+import re
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, IO, List, Optional, Tuple, Union
+
+from .geometry import arc_points, polygon_points
+
+GZIP_MAGIC = b"\x1f\x8b"
+LZW_MAGIC = b"\x1f\x9d"
+
+DEFAULT_WIDTH = 0.2  # mm, symbols of unknown size
+
+# mm per coordinate unit / per symbol size unit (mils, microns)
+UNIT_SCALE = {"INCH": 25.4, "MM": 1.0}
+SYMBOL_SCALE = {"INCH": 0.0254, "MM": 0.001}
+
+# .pad_usage option values, in spec order
+PAD_USAGE_VIA = 1
+
+# Standard symbols: r120, s60, rect20x40, oval20x40, di.., oct.., donut_r50x30
+_STANDARD_SYMBOL_RE = re.compile(
+    r"^(rect|oval|oct|donut_r|donut_s|di|r|s)(\d+(?:\.\d+)?)(?:x(\d+(?:\.\d+)?))?"
+)
+
+_LZW_CHUNK_SIZE = 1 << 16
+
+
+@dataclass
+class LayerFeatures:
+    """
+    Decoded features of one layer, as columns (all lengths in mm)
+
+    Tracks and pads share a row index across their columns; zone i has the
+    points zone_xy[2 * zone_start[i]:2 * zone_start[i + 1]] (x, y pairs).
+    Net columns hold EDA net numbers, -1 for no net.
+    """
+    features: int = 0  # Feature records read (each takes one feature index)
+    arcs: int = 0
+    negative: int = 0  # Negative-polarity features (clearances), not copper
+    skipped: int = 0  # Malformed records
+    track_x1: array = field(default_factory=lambda: array("d"))
+    track_y1: array = field(default_factory=lambda: array("d"))
+    track_x2: array = field(default_factory=lambda: array("d"))
+    track_y2: array = field(default_factory=lambda: array("d"))
+    track_width: array = field(default_factory=lambda: array("d"))
+    track_net: array = field(default_factory=lambda: array("i"))
+    pad_x: array = field(default_factory=lambda: array("d"))
+    pad_y: array = field(default_factory=lambda: array("d"))
+    pad_size: array = field(default_factory=lambda: array("d"))
+    pad_net: array = field(default_factory=lambda: array("i"))
+    pad_via: array = field(default_factory=lambda: array("b"))
+    zone_net: array = field(default_factory=lambda: array("i"))
+    zone_start: array = field(default_factory=lambda: array("i"))
+    zone_xy: array = field(default_factory=lambda: array("d"))
+
+    def zone_points(self, index: int) -> List[Tuple[float, float]]:
+        """Outline of zone index as (x, y) tuples"""
+        return polygon_points(self.zone_start, self.zone_xy, index)
+
+
+class LZWReader(io.RawIOBase):
+    """
+    Streaming decoder for UNIX compress (.Z) data
+
+    Same semantics as gzip's unlzw: codes of 9..maxbits bits packed LSB
+    first, read in groups of n_bits bytes (8 codes); a code width change or
+    CLEAR (block mode) skips the rest of the current group.
+    """
+
+    def __init__(self, raw: IO[bytes]):
+        header = raw.read(3)
+        if len(header) < 3 or header[:2] != LZW_MAGIC:
+            raise OSError("Not a compress (.Z) stream")
+        self._maxbits = header[2] & 0x1F
+        self._block_mode = bool(header[2] & 0x80)
+        if not 9 <= self._maxbits <= 16:
+            raise OSError(f"Unsupported compress code size: {self._maxbits} bits")
+        self._raw = raw
+        self._input = bytearray()
+        self._output = bytearray()
+        self._eof = False
+        self._maxmaxcode = 1 << self._maxbits
+        self._table: List[bytes] = [bytes((i,)) for i in range(256)] + [b""] * (self._maxmaxcode - 256)
+        self._free = 257 if self._block_mode else 256
+        self._n_bits = 9
+        self._prev: Optional[bytes] = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._output and not (self._eof and not self._input):
+            self._decode_chunk()
+        size = min(len(buffer), len(self._output))
+        buffer[:size] = self._output[:size]
+        del self._output[:size]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._raw.close()
+        super().close()
+
+    def _decode_chunk(self):
+        chunk = self._raw.read(_LZW_CHUNK_SIZE)
+        if chunk:
+            self._input += chunk
+        else:
+            self._eof = True
+
+        data, out, table = self._input, self._output, self._table
+        maxbits, maxmaxcode, block_mode = self._maxbits, self._maxmaxcode, self._block_mode
+        free, prev, n_bits = self._free, self._prev, self._n_bits
+        maxcode = maxmaxcode if n_bits == maxbits else (1 << n_bits) - 1
+        pos, end = 0, len(data)
+
+        while True:
+            group_end = pos + n_bits
+            if group_end <= end:
+                count = 8
+            elif self._eof:
+                count = (end - pos) * 8 // n_bits
+                if count == 0:
+                    break
+            else:
+                break  # Wait for the rest of the group
+            value = int.from_bytes(data[pos:group_end], "little")
+            mask = (1 << n_bits) - 1
+            consumed = True
+            for k in range(count):
+                if free > maxcode:
+                    # Wider codes start at the next group (this one if untouched)
+                    consumed = k > 0
+                    n_bits += 1
+                    maxcode = maxmaxcode if n_bits == maxbits else (1 << n_bits) - 1
+                    break
+                code = value & mask
+                value >>= n_bits
+                if prev is None:
+                    if code >= 256:
+                        raise OSError("Corrupt compress stream")
+                    prev = table[code]
+                    out += prev
+                    continue
+                if code == 256 and block_mode:
+                    free = 256
+                    n_bits = 9
+                    maxcode = (1 << n_bits) - 1
+                    break
+                if code < free:
+                    entry = table[code]
+                elif code == free:
+                    entry = prev + prev[:1]
+                else:
+                    raise OSError("Corrupt compress stream")
+                out += entry
+                if free < maxmaxcode:
+                    table[free] = prev + entry[:1]
+                    free += 1
+                prev = entry
+            if consumed:
+                pos = min(group_end, end)
+
+        if self._eof:
+            data.clear()  # Only padding bits are left
+        else:
+            del data[:pos]
+        self._free, self._prev, self._n_bits = free, prev, n_bits
+
+
+def find_odb_file(path: Union[str, Path]) -> Optional[Path]:
+    """path, or its compressed variant (path.z / path.Z), if present"""
+    path = Path(path)
+    for candidate in (path, Path(f"{path}.z"), Path(f"{path}.Z")):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def open_odb_binary(path: Union[str, Path]) -> IO[bytes]:
+    """Open an ODB++ file for reading bytes, decompressing gzip/compress data"""
+    raw = open(path, "rb")
+    try:
+        magic = raw.read(2)
+        raw.seek(0)
+        if magic == GZIP_MAGIC:
+            raw.close()
+            return gzip.open(path, "rb")
+        if magic == LZW_MAGIC:
+            return io.BufferedReader(LZWReader(raw), buffer_size=_LZW_CHUNK_SIZE)
+    except Exception:
+        raw.close()
+        raise
+    return raw
+
+
+def open_odb_text(path: Union[str, Path]) -> io.TextIOWrapper:
+    """Open an ODB++ file as text lines (compressed or not)"""
+    return io.TextIOWrapper(open_odb_binary(path), encoding="utf-8", errors="replace")
+
+
+def _has_option(attributes: str, attribute: str, value: int) -> bool:
+    """Whether a record's attribute list (text after ';') sets attribute to value"""
+    target = f"{attribute}={value}"
+    return any(item.strip() == target for item in attributes.split(","))
+
+
+def symbol_size(name: str, units: str = "MM") -> Optional[Tuple[float, float]]:
+    """
+    (width, height) in mm of a standard symbol, None if not a standard name
+
+    Sizes are mils in INCH files and microns in MM files.
+    """
+    match = _STANDARD_SYMBOL_RE.match(name)
+    if not match:
+        return None
+    scale = SYMBOL_SCALE.get(units, SYMBOL_SCALE["MM"])
+    width = float(match.group(2)) * scale
+    height = float(match.group(3)) * scale if match.group(3) else width
+    return width, height
+
+
+def parse_layer_features(
+    path: str,
+    net_map: Optional[array] = None,
+    via_map: Optional[bytes] = None,
+    net_count: int = 0,
+    symbol_widths: Optional[Dict[str, float]] = None,
+    default_units: str = "MM",
+) -> LayerFeatures:
+    """
+    Decode one features file
+
+    Args:
+        path: features file (plain, gzip or compress)
+        net_map: EDA net number per feature index (-1 = none)
+        via_map: Non-zero for feature indexes in an EDA via subnet
+        net_count: Number of EDA nets; other net numbers become -1
+        symbol_widths: Sizes of user-defined symbols (symbols/ directory), mm
+        default_units: Units if the file has no UNITS line
+    """
+    result = LayerFeatures()
+    net_map = net_map if net_map is not None else array("i")
+    via_map = via_map if via_map is not None else b""
+    mapped = len(net_map)
+    symbol_widths = symbol_widths or {}
+
+    units = default_units
+    scale = UNIT_SCALE.get(units, 1.0)
+    symbol_names: Dict[int, str] = {}
+    symbol_units: Dict[str, str] = {}  # Symbols declared with their own units (I/M flag)
+    token_widths: Dict[str, float] = {}  # Symbol token of a record -> size; reset with units/symbols
+    pad_usage_attr: Optional[str] = None
+
+    # Surface being read: (positive, net) and the island's points
+    surface: Optional[Tuple[bool, int]] = None
+    island: Optional[List[Tuple[float, float]]] = None
+
+    tx1, ty1, tx2, ty2 = result.track_x1, result.track_y1, result.track_x2, result.track_y2
+    twidth, tnet = result.track_width, result.track_net
+
+    def width_of(token: str) -> float:
+        # token: symbol number, or the symbol name in legacy records
+        width = token_widths.get(token)
+        if width is None:
+            name = symbol_names.get(int(token), "") if token.isdigit() else token
+            if name in symbol_widths:
+                width = symbol_widths[name]
+            else:
+                size = symbol_size(name, symbol_units.get(name, units))
+                width = max(size) if size else DEFAULT_WIDTH
+            token_widths[token] = width
+        return width
+
+    def feature_net(index: int, legacy: Optional[str]) -> int:
+        net = net_map[index] if index < mapped else -1
+        if net < 0 and legacy is not None and legacy.isdigit():
+            net = int(legacy)
+        return net if 0 <= net < net_count else -1
+
+    with open_odb_text(path) as lines:
+        index = 0
+        for line in lines:
+            record, _, attributes = line.partition(";")
+            parts = record.split()
+            if not parts:
+                continue
+            kind = parts[0]
+
+            try:
+                # Surface contours
+                if surface is not None:
+                    if kind == "OS":
+                        if island is not None:
+                            island.append((float(parts[1]) * scale, float(parts[2]) * scale))
+                        continue
+                    if kind == "OC":
+                        if island is not None and island:
+                            xs, ys = island[-1]
+                            island.extend(arc_points(
+                                xs, ys, float(parts[1]) * scale, float(parts[2]) * scale,
+                                float(parts[3]) * scale, float(parts[4]) * scale,
+                                parts[5].upper() == "Y"))
+                        continue
+                    if kind == "OB":
+                        # Islands become zones; holes (H) are left out of the outline
+                        is_island = len(parts) < 4 or parts[3].upper() != "H"
+                        island = [(float(parts[1]) * scale, float(parts[2]) * scale)] if is_island else None
+                        continue
+                    if kind == "OE":
+                        positive, net = surface
+                        if island is not None and positive and len(island) >= 3:
+                            result.zone_net.append(net)
+                            result.zone_start.append(len(result.zone_xy) // 2)
+                            for x, y in island:
+                                result.zone_xy.append(x)
+                                result.zone_xy.append(y)
+                        island = None
+                        continue
+                    if kind == "SE":
+                        surface = island = None
+                        continue
+
+                if kind == "L":
+                    feature = index
+                    index += 1
+                    symbol = parts[5]
+                    legacy = None if symbol.isdigit() else (parts[-1] if len(parts) > 8 else None)
+                    if len(parts) > 6 and parts[6] == "N":
+                        result.negative += 1
+                        continue
+                    tx1.append(float(parts[1]) * scale)
+                    ty1.append(float(parts[2]) * scale)
+                    tx2.append(float(parts[3]) * scale)
+                    ty2.append(float(parts[4]) * scale)
+                    twidth.append(width_of(symbol))
+                    tnet.append(feature_net(feature, legacy))
+
+                elif kind == "P":
+                    feature = index
+                    index += 1
+                    aperture = parts[3]
+                    legacy = None
+                    if aperture == "-1":
+                        # -1 <sym_num> <resize_factor>: standard symbol resized to
+                        # resize_factor thousandths of a mil/micron
+                        name = symbol_names.get(int(parts[4]), "")
+                        size = float(parts[5]) / 1000 * SYMBOL_SCALE.get(symbol_units.get(name, units),
+                                                                         SYMBOL_SCALE["MM"])
+                        polarity = parts[6]
+                    else:
+                        if not aperture.isdigit():
+                            legacy = parts[-1] if len(parts) > 6 else None
+                        size = width_of(aperture)
+                        polarity = parts[4] if len(parts) > 4 else "P"
+                    if polarity == "N":
+                        result.negative += 1
+                        continue
+                    is_via = (
+                        (feature < len(via_map) and via_map[feature])
+                        or (pad_usage_attr is not None and _has_option(attributes, pad_usage_attr, PAD_USAGE_VIA))
+                        or (legacy is not None and "via" in aperture.lower())
+                    )
+                    result.pad_x.append(float(parts[1]) * scale)
+                    result.pad_y.append(float(parts[2]) * scale)
+                    result.pad_size.append(size)
+                    result.pad_net.append(feature_net(feature, legacy))
+                    result.pad_via.append(1 if is_via else 0)
+
+                elif kind == "A":
+                    # A <xs> <ys> <xe> <ye> <xc> <yc> <sym_num> <pol> <dcode> <cw>
+                    feature = index
+                    index += 1
+                    result.arcs += 1
+                    if parts[8] == "N":
+                        result.negative += 1
+                        continue
+                    width = width_of(parts[7])
+                    net = feature_net(feature, None)
+                    x, y = float(parts[1]) * scale, float(parts[2]) * scale
+                    for x2, y2 in arc_points(
+                            x, y, float(parts[3]) * scale, float(parts[4]) * scale,
+                            float(parts[5]) * scale, float(parts[6]) * scale,
+                            parts[10].upper() == "Y"):
+                        tx1.append(x)
+                        ty1.append(y)
+                        tx2.append(x2)
+                        ty2.append(y2)
+                        twidth.append(width)
+                        tnet.append(net)
+                        x, y = x2, y2
+
+                elif kind == "S":
+                    feature = index
+                    index += 1
+                    positive = parts[1] != "N"
+                    if not positive:
+                        result.negative += 1
+                    surface = (positive, feature_net(feature, None))
+                    island = None
+
+                elif kind in ("T", "B"):
+                    index += 1
+
+                elif kind[0] == "$":
+                    # $<num> <name> [I|M]
+                    symbol_names[int(kind[1:])] = parts[1]
+                    if len(parts) > 2 and parts[2] in ("I", "M"):
+                        symbol_units[parts[1]] = "INCH" if parts[2] == "I" else "MM"
+                    token_widths.clear()
+
+                elif kind[0] == "@":
+                    if parts[1] == ".pad_usage":
+                        pad_usage_attr = kind[1:]
+
+                elif kind.startswith("UNITS=") or (kind == "U" and len(parts) > 1):
+                    units = (kind[6:] if kind != "U" else parts[1]).upper()
+                    scale = UNIT_SCALE.get(units, 1.0)
+                    token_widths.clear()
+
+            except (ValueError, IndexError):
+                result.skipped += 1
+
+        result.features = index
+
+    return result
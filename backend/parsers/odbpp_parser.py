@@ -18,8 +18,9 @@ Reference: https://odbplusplus.com/design/specification/
 
 import os
 import re
-import gzip
 import logging
+from array import array
+from itertools import repeat
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Set
 from dataclasses import dataclass, field
@@ -29,6 +30,8 @@ from .base_parser import (
     BaseParser, ParsedPCBData, BoardInfo,
     Component, Net, Track, Via, Zone
 )
+from .odbpp_features import find_odb_file, open_odb_text, parse_layer_features
+from .parse_pool import get_parse_pool
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +85,8 @@ class ODBPPParser(BaseParser):
     - Netlist connectivity
     """
     
+    COPPER_LAYER_TYPES = ('SIGNAL', 'POWER_GROUND', 'MIXED')
+    
     # Layer type mapping
     LAYER_TYPE_MAP = {
         'SIGNAL': 'signal',
@@ -97,11 +102,19 @@ class ODBPPParser(BaseParser):
     
     def __init__(self):
         """Initialize parser"""
+        self._reset()
+    
+    def _reset(self):
+        """Clear per-parse state (a parser instance is reused across boards)"""
         self.layers: Dict[str, ODBLayer] = {}
         self.symbols: Dict[str, ODBSymbol] = {}
         self.units = 'mm'
         self.scale = 1.0
         self.net_names: Dict[int, str] = {}
+        self.eda_layers: List[str] = []  # EDA LYR list; FID records index into it
+        # EDA layer index -> (feature indexes, net numbers, via flags) from FID records
+        self.feature_nets: Dict[int, Tuple[array, array, bytearray]] = {}
+        self.feature_counts: Dict[str, int] = defaultdict(int)
     
     def parse(self, project_path: str) -> ParsedPCBData:
         """
@@ -113,6 +126,7 @@ class ODBPPParser(BaseParser):
         Returns:
             ParsedPCBData with normalized data
         """
+        self._reset()
         project_path = Path(project_path)
         
         # Find ODB++ root
@@ -165,7 +179,8 @@ class ODBPPParser(BaseParser):
                 raw_data={
                     'odb_root': str(odb_root),
                     'step': step_name,
-                    'layers': list(self.layers.keys())
+                    'layers': list(self.layers.keys()),
+                    'feature_counts': dict(self.feature_counts)
                 }
             )
             
@@ -193,28 +208,16 @@ class ODBPPParser(BaseParser):
         return None
     
     def _read_odb_file(self, file_path: Path) -> str:
-        """Read ODB++ file (handles gzip compression)"""
-        if not file_path.exists():
-            # Try with .z extension (gzip)
-            gz_path = file_path.with_suffix(file_path.suffix + '.z')
-            if gz_path.exists():
-                file_path = gz_path
-            else:
-                gz_path = Path(str(file_path) + '.z')
-                if gz_path.exists():
-                    file_path = gz_path
-                else:
-                    return ""
+        """Read ODB++ file (plain, or .z compressed with compress/gzip)"""
+        found = find_odb_file(file_path)
+        if not found:
+            return ""
         
         try:
-            if str(file_path).endswith('.z'):
-                with gzip.open(file_path, 'rt', encoding='utf-8', errors='replace') as f:
-                    return f.read()
-            else:
-                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                    return f.read()
+            with open_odb_text(found) as f:
+                return f.read()
         except Exception as e:
-            logger.warning(f"Failed to read {file_path}: {e}")
+            logger.warning(f"Failed to read {found}: {e}")
             return ""
     
     def _parse_matrix(self, odb_root: Path):
@@ -327,34 +330,82 @@ class ODBPPParser(BaseParser):
         return None
     
     def _parse_eda_data(self, step_path: Path):
-        """Parse EDA/data file for net names"""
-        eda_file = step_path / 'eda' / 'data'
-        content = self._read_odb_file(eda_file)
+        """
+        Parse EDA/data file for net names and net-to-feature links
         
-        if not content:
+        NET records are numbered in order. FID records under a net's subnets
+        (SNT) name the layer features (LYR index, feature index) of that net;
+        features of SNT VIA subnets are vias.
+        """
+        eda_file = find_odb_file(step_path / 'eda' / 'data')
+        if not eda_file:
             return
         
-        # Parse NET definitions
-        for line in content.split('\n'):
-            line = line.strip()
-            
-            # NET definition: NET <net_name>
-            if line.startswith('NET '):
-                parts = line.split()
-                if len(parts) >= 2:
-                    # Assign sequential net number
-                    net_num = len(self.net_names)
-                    self.net_names[net_num] = parts[1]
-            
-            # Or SNT (subnet) definition
-            elif line.startswith('SNT '):
-                parts = line.split()
-                if len(parts) >= 2:
+        net_num = -1
+        via_subnet = False
+        
+        with open_odb_text(eda_file) as lines:
+            for line in lines:
+                # FID <type> <layer_index> <feature_index> (most of the file)
+                if line.startswith('FID '):
+                    parts = line.split()
+                    if net_num < 0 or len(parts) < 4:
+                        continue
+                    try:
+                        layer_index, feature_index = int(parts[2]), int(parts[3])
+                    except ValueError:
+                        continue
+                    fids = self.feature_nets.get(layer_index)
+                    if fids is None:
+                        fids = self.feature_nets[layer_index] = (array('i'), array('i'), bytearray())
+                    fids[0].append(feature_index)
+                    fids[1].append(net_num)
+                    fids[2].append(via_subnet)
+                    continue
+                
+                parts = line.partition(';')[0].split()
+                if not parts:
+                    continue
+                record = parts[0]
+                
+                # NET <net_name>
+                if record == 'NET' and len(parts) >= 2:
                     net_num = len(self.net_names)
                     self.net_names[net_num] = parts[1]
+                    via_subnet = False
+                
+                # SNT <TRC|VIA|PLN|TOP> ... (subnet of the current net)
+                elif record == 'SNT':
+                    via_subnet = len(parts) >= 2 and parts[1] == 'VIA'
+                
+                elif record == 'LYR':
+                    self.eda_layers.extend(parts[1:])
+                
+                # Packages follow the netlist
+                elif record == 'PKG':
+                    net_num = -1
         
         logger.info(f"Parsed {len(self.net_names)} net names from EDA data")
     
+    def _feature_net_map(self, layer_name: str) -> Tuple[array, bytes]:
+        """Net number and via flag per feature index of a layer (from EDA FIDs)"""
+        names = [name.lower() for name in self.eda_layers]
+        if layer_name.lower() not in names:
+            return array('i'), b''
+        
+        fids = self.feature_nets.get(names.index(layer_name.lower()))
+        if not fids or not fids[0]:
+            return array('i'), b''
+        
+        features, nets, vias = fids
+        size = max(features) + 1
+        net_map = array('i', [-1]) * size
+        via_map = bytearray(size)
+        for feature_index, net_num, is_via in zip(features, nets, vias):
+            net_map[feature_index] = net_num
+            via_map[feature_index] |= is_via
+        return net_map, bytes(via_map)
+    
     def _parse_profile(self, step_path: Path) -> BoardInfo:
         """Parse profile file for board outline"""
         profile_file = step_path / 'profile'
@@ -392,7 +443,7 @@ class ODBPPParser(BaseParser):
         # Count copper layers
         copper_layers = sum(
             1 for layer in self.layers.values()
-            if layer.layer_type in ('SIGNAL', 'POWER_GROUND', 'MIXED')
+            if layer.layer_type in self.COPPER_LAYER_TYPES
         )
         
         return BoardInfo(
@@ -464,7 +515,14 @@ class ODBPPParser(BaseParser):
         return components
     
     def _parse_layers(self, step_path: Path) -> Tuple[List[Track], List[Via], List[Zone]]:
-        """Parse layer features"""
+        """
+        Parse layer features
+        
+        Copper layers (and drill layers, for via drill sizes) are decoded by
+        parse_layer_features into column arrays, concurrently in the parser
+        pool when the files are large. Via pads repeat on every copper layer
+        they span and become one Via per location.
+        """
         tracks = []
         vias = []
         zones = []
@@ -474,78 +532,88 @@ class ODBPPParser(BaseParser):
         if not layers_dir.exists():
             return tracks, vias, zones
         
-        for layer_name, layer_info in self.layers.items():
-            # Only parse copper layers
-            if layer_info.layer_type not in ('SIGNAL', 'POWER_GROUND', 'MIXED'):
+        layer_files = []
+        for layer_name, layer_info in sorted(self.layers.items(), key=lambda item: item[1].row):
+            if layer_info.layer_type not in self.COPPER_LAYER_TYPES + ('DRILL',):
                 continue
-            
-            layer_dir = layers_dir / layer_name
-            features_file = layer_dir / 'features'
-            
-            content = self._read_odb_file(features_file)
-            if not content:
+            features_file = find_odb_file(layers_dir / layer_name / 'features')
+            if features_file:
+                layer_files.append((layer_name, layer_info, features_file))
+        
+        symbol_widths = {name: symbol.width for name, symbol in self.symbols.items() if symbol.width > 0}
+        tasks = []
+        for layer_name, _, features_file in layer_files:
+            net_map, via_map = self._feature_net_map(layer_name)
+            tasks.append((str(features_file), net_map, via_map, len(self.net_names),
+                          symbol_widths, self.units.upper()))
+        
+        total_bytes = sum(features_file.stat().st_size for _, _, features_file in layer_files)
+        results = get_parse_pool().map(parse_layer_features, tasks, total_bytes)
+        
+        # Net number -> name; -1 (no net) picks the trailing ''
+        net_names = list(self.net_names.values()) + ['']
+        
+        # Drill hole size per location
+        drills = {}
+        for (_, layer_info, _), features in zip(layer_files, results):
+            if layer_info.layer_type == 'DRILL':
+                for x, y, size in zip(features.pad_x, features.pad_y, features.pad_size):
+                    drills[(round(x, 3), round(y, 3))] = size
+        
+        vias_at: Dict[Tuple[float, float], Via] = {}
+        for (layer_name, layer_info, _), features in zip(layer_files, results):
+            self.feature_counts['features'] += features.features
+            self.feature_counts['arcs'] += features.arcs
+            self.feature_counts['negative'] += features.negative
+            self.feature_counts['skipped'] += features.skipped
+            if layer_info.layer_type == 'DRILL':
+                self.feature_counts['holes'] += len(features.pad_x)
                 continue
             
-            # Map layer name
             mapped_layer = self._map_layer_name(layer_name, layer_info)
             
-            # Parse features
-            for line in content.split('\n'):
-                line = line.strip()
-                
-                if not line or line.startswith('#') or line.startswith('$'):
+            tracks.extend(map(
+                Track,
+                map(net_names.__getitem__, features.track_net),
+                repeat(mapped_layer),
+                features.track_width,
+                features.track_x1, features.track_y1,
+                features.track_x2, features.track_y2
+            ))
+            
+            for i, net_num in enumerate(features.zone_net):
+                zones.append(Zone(
+                    net_name=net_names[net_num],
+                    layer=mapped_layer,
+                    outline_points=features.zone_points(i)
+                ))
+            
+            for x, y, size, net_num, is_via in zip(
+                features.pad_x, features.pad_y, features.pad_size, features.pad_net, features.pad_via
+            ):
+                if not is_via:
+                    self.feature_counts['pads'] += 1
                     continue
-                
-                # Line feature: L <xs> <ys> <xe> <ye> <sym> <polarity> <dcode> <net>
-                if line.startswith('L '):
-                    parts = line.split()
-                    if len(parts) >= 6:
-                        try:
-                            # Get symbol for width
-                            sym_name = parts[5] if len(parts) > 5 else ''
-                            width = self._get_symbol_width(sym_name)
-                            
-                            net_num = int(parts[-1]) if parts[-1].isdigit() else 0
-                            net_name = self.net_names.get(net_num, '')
-                            
-                            tracks.append(Track(
-                                net_name=net_name,
-                                layer=mapped_layer,
-                                width=width,
-                                x1=float(parts[1]) * self.scale,
-                                y1=float(parts[2]) * self.scale,
-                                x2=float(parts[3]) * self.scale,
-                                y2=float(parts[4]) * self.scale
-                            ))
-                        except (ValueError, IndexError):
-                            pass
-                
-                # Pad feature (could be via): P <x> <y> <symbol> <polarity> <dcode> <net>
-                elif line.startswith('P '):
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        try:
-                            x = float(parts[1]) * self.scale
-                            y = float(parts[2]) * self.scale
-                            sym_name = parts[3] if len(parts) > 3 else ''
-                            
-                            # Check if this is a via (appears on multiple layers)
-                            symbol = self.symbols.get(sym_name)
-                            if symbol and 'via' in sym_name.lower():
-                                net_num = int(parts[-1]) if parts[-1].isdigit() else 0
-                                net_name = self.net_names.get(net_num, '')
-                                
-                                vias.append(Via(
-                                    net_name=net_name,
-                                    x=x,
-                                    y=y,
-                                    diameter=symbol.width if symbol else 0.6,
-                                    drill=symbol.width * 0.5 if symbol else 0.3
-                                ))
-                        except (ValueError, IndexError):
-                            pass
+                key = (round(x, 3), round(y, 3))
+                via = vias_at.get(key)
+                if via is None:
+                    via = vias_at[key] = Via(
+                        net_name=net_names[net_num],
+                        x=x,
+                        y=y,
+                        diameter=size,
+                        drill=drills.get(key, size * 0.5),
+                        start_layer=mapped_layer,
+                        end_layer=mapped_layer
+                    )
+                    vias.append(via)
+                else:
+                    via.end_layer = mapped_layer
+                    via.diameter = max(via.diameter, size)
+                    via.net_name = via.net_name or net_names[net_num]
         
-        logger.info(f"Parsed {len(tracks)} tracks, {len(vias)} vias")
+        logger.info(f"Parsed {len(tracks)} tracks, {len(vias)} vias, {len(zones)} zones "
+                    f"from {len(layer_files)} layers")
         return tracks, vias, zones
     
     def _map_layer_name(self, name: str, layer_info: ODBLayer) -> str:
@@ -565,20 +633,6 @@ class ODBPPParser(BaseParser):
         
         return name
     
-    def _get_symbol_width(self, sym_name: str) -> float:
-        """Get width from symbol name"""
-        symbol = self.symbols.get(sym_name)
-        if symbol and symbol.width > 0:
-            return symbol.width
-        
-        # Try to parse from name (e.g., "r100" = 100 mils = 2.54mm)
-        match = re.search(r'r?(\d+)', sym_name.lower())
-        if match:
-            mils = float(match.group(1))
-            return mils * 0.0254  # Convert mils to mm
-        
-        return 0.2  # Default width
-    
     def _build_nets(self) -> List[Net]:
         """Build net list from collected data"""
         nets = []
@@ -0,0 +1,278 @@
+"""
+Parser Process Pool
+Runs independent parts of one parse (ODB++ layers, the files of an
+upload, ...) in worker processes
+
+Feature decoding is pure-Python and CPU-bound, so threads would be
+serialized by the GIL. Tasks are module-level functions with picklable
+arguments that return compact results (array columns rather than per-object
+lists), so little is copied back. Inputs smaller than parser_pool_min_bytes
+and pool failures run inline with the same results.
+
+Independent files of one upload (board, IPC-2581, BOM, ...) go through
+imap_unordered, which yields results as they finish and runs every task
+under a time budget (SIGALRM) and, in workers, an address-space budget
+(RLIMIT_AS), so one pathological file fails alone instead of stalling the
+job.
+
+Usage:
+    results = get_parse_pool().map(parse_layer, [(path, layer), ...], total_bytes)
+
+    for index, result, error in get_parse_pool().imap_unordered(
+            parse_file, tasks, total_bytes, timeout=600, memory_mb=4096):
+        ...
+"""
+import logging
+import multiprocessing as mp
+import os
+import pickle
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+from config import get_settings
+
+try:
+    import resource
+except ImportError:  # Not on Windows: no address-space budget
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds the parent waits past the workers' own time budgets before
+# killing a pool whose worker stopped responding (stuck in native code)
+BUDGET_GRACE_SECONDS = 30
+
+_in_worker = False  # Set in pool workers: nested map calls run inline
+
+
+class ParseBudgetExceeded(BaseException):
+    """
+    A parse task ran past its time or memory budget
+
+    A BaseException, like KeyboardInterrupt: it is raised from SIGALRM at
+    whatever line the parser is running, and parsers catch Exception around
+    stages and single records, which would swallow it and keep going.
+    """
+
+
+def _mark_worker():
+    global _in_worker
+    _in_worker = True
+
+
+def _on_alarm(signum, frame):
+    raise ParseBudgetExceeded("time budget exceeded")
+
+
+def _address_space() -> Optional[int]:
+    """Current virtual memory size in bytes (Linux), None if unknown"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def run_budgeted(fn: Callable, task: Tuple, timeout: Optional[float] = None,
+                 memory_bytes: Optional[int] = None) -> Any:
+    """
+    fn(*task) under a time and memory budget
+
+    The time budget needs the main thread (SIGALRM); the memory budget caps
+    the process's address space at its current size plus memory_bytes and
+    is only meant for pool workers. Budgets that cannot be applied are
+    skipped.
+
+    Raises:
+        ParseBudgetExceeded: A budget ran out (not an Exception: catch it by name)
+    """
+    alarm = (bool(timeout) and hasattr(signal, "SIGALRM")
+             and threading.current_thread() is threading.main_thread())
+    limits = None
+    if memory_bytes and resource is not None:
+        current = _address_space()
+        if current is not None:
+            limits = resource.getrlimit(resource.RLIMIT_AS)
+            cap = current + memory_bytes
+            if limits[1] != resource.RLIM_INFINITY:
+                cap = min(cap, limits[1])
+            resource.setrlimit(resource.RLIMIT_AS, (cap, limits[1]))
+    if alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*task)
+    except MemoryError:
+        raise ParseBudgetExceeded("memory budget exceeded") from None
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler or signal.SIG_DFL)
+        if limits is not None:
+            resource.setrlimit(resource.RLIMIT_AS, limits)
+
+
+def _pool_context():
+    """
+    Worker start method: the API and job worker processes run threads, so
+    parse workers are never plain-forked from them
+    """
+    if "forkserver" not in mp.get_all_start_methods():
+        return mp.get_context("spawn")
+    context = mp.get_context("forkserver")
+    context.set_forkserver_preload([__name__, "parsers"])
+    return context
+
+
+class ParsePool:
+    """Shared process pool for parser tasks"""
+
+    def __init__(self, max_workers: Optional[int] = None, min_bytes: Optional[int] = None):
+        settings = get_settings()
+        workers = settings.parser_workers if max_workers is None else max_workers
+        self.max_workers = workers if workers > 0 else (mp.cpu_count() or 1)
+        self.min_bytes = settings.parser_pool_min_bytes if min_bytes is None else min_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=_pool_context(), initializer=_mark_worker
+                )
+                logger.info(f"Parser pool started with {self.max_workers} workers")
+            return self._pool
+
+    def _reset_pool(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _kill_pool(self):
+        """Terminate the workers, including ones stuck in a task"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            # The executor has no public way to stop running tasks
+            for process in list((pool._processes or {}).values()):
+                process.terminate()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _use_pool(self, tasks: Sequence[Tuple], total_bytes: int) -> bool:
+        return not _in_worker and self.max_workers > 1 and len(tasks) > 1 and total_bytes >= self.min_bytes
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def map(self, fn: Callable, tasks: Sequence[Tuple], total_bytes: int = 0) -> List[Any]:
+        """
+        fn(*task) for every task, results in task order
+
+        Args:
+            fn: Module-level function (picklable by reference)
+            tasks: Argument tuples
+            total_bytes: Input size; below min_bytes the tasks run inline
+        """
+        if self._use_pool(tasks, total_bytes):
+            try:
+                pool = self._get_pool()
+                futures = [pool.submit(fn, *task) for task in tasks]
+                return [future.result() for future in futures]
+            except (BrokenProcessPool, OSError, pickle.PicklingError) as e:
+                logger.warning(f"Parser pool unavailable ({e}), parsing inline")
+                self._reset_pool()
+        return [fn(*task) for task in tasks]
+
+    def imap_unordered(self, fn: Callable, tasks: Sequence[Tuple], total_bytes: int = 0,
+                       timeout: Optional[float] = None,
+                       memory_mb: Optional[int] = None,
+                       inline_fn: Optional[Callable] = None) -> Iterator[Tuple[int, Any, Optional[BaseException]]]:
+        """
+        fn(*task) for every task, as (task index, result, error) in completion order
+
+        A task that raises (including ParseBudgetExceeded) yields its error
+        and the others carry on. Inline runs (small inputs, no pool) keep
+        the time budget when called from the main thread but have no
+        memory budget.
+
+        Args:
+            fn: Module-level function (picklable by reference)
+            tasks: Argument tuples
+            total_bytes: Input size; below min_bytes the tasks run inline
+            timeout: Seconds per task (None/0 = no limit)
+            memory_mb: Extra address space per task in workers (None/0 = no limit)
+            inline_fn: Run instead of fn when tasks run inline (need not be
+                picklable, e.g. a bound method keeping the caller's state)
+        """
+        timeout = timeout or None
+        memory_bytes = memory_mb * 1024 * 1024 if memory_mb else None
+        futures = {}
+        if self._use_pool(tasks, total_bytes):
+            try:
+                pool = self._get_pool()
+                futures = {
+                    pool.submit(run_budgeted, fn, task, timeout, memory_bytes): index
+                    for index, task in enumerate(tasks)
+                }
+            except (BrokenProcessPool, OSError) as e:
+                logger.warning(f"Parser pool unavailable ({e}), parsing inline")
+                self._reset_pool()
+                futures = {}
+
+        if not futures:
+            for index, task in enumerate(tasks):
+                try:
+                    yield index, run_budgeted(inline_fn or fn, task, timeout), None
+                except (Exception, ParseBudgetExceeded) as e:
+                    yield index, None, e
+            return
+
+        # Backstop for workers that cannot be interrupted: every wave of
+        # tasks gets its budget, plus a grace period
+        deadline = None
+        if timeout:
+            waves = -(-len(tasks) // self.max_workers)
+            deadline = timeout * waves + BUDGET_GRACE_SECONDS
+        broken = False
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                index = futures.pop(future)
+                error = future.exception()
+                broken = broken or isinstance(error, BrokenProcessPool)
+                yield index, None if error is not None else future.result(), error
+        except FuturesTimeoutError:
+            logger.warning(f"Parser pool tasks unresponsive after {deadline}s, stopping workers")
+            self._kill_pool()
+            for index in sorted(futures.values()):
+                yield index, None, ParseBudgetExceeded("time budget exceeded (worker unresponsive)")
+            return
+        if broken:
+            # A worker died (e.g. native code hitting the memory cap)
+            self._reset_pool()
+
+
+_parse_pool: Optional[ParsePool] = None
+
+
+def get_parse_pool() -> ParsePool:
+    """Get global parser pool instance"""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ParsePool()
+    return _parse_pool
+
+
+def shutdown_parse_pool():
+    """Stop the global parser pool's workers (application shutdown)"""
+    if _parse_pool is not None:
+        _parse_pool.shutdown()
@@ -0,0 +1,184 @@
+"""
+Streaming S-expression reader for KiCad files
+
+Reads a `.kicad_pcb` (or any single-root S-expression file) incrementally and
+yields each top-level child of the root expression as soon as it closes,
+e.g. every `(net ...)`, `(footprint ...)`, `(segment ...)` or `(zone ...)`.
+Items have the same shape `sexpdata.loads` produces (nested lists of
+`Symbol`, `str`, `int` and `float`), so existing extractors can consume them
+unchanged. Peak memory is bounded by the largest single item plus one read
+chunk, not by the file size.
+
+Usage:
+    with open(path, 'rb') as f:
+        for item in iter_sexpr_items(f):
+            handle(item)
+"""
+import codecs
+import io
+import logging
+import mmap
+import re
+from pathlib import Path
+from typing import Iterator, List, Union
+
+from sexpdata import Symbol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1MB
+
+# One token per match: "(", ")", a quoted string, or a bare atom
+_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|"((?:[^"\\]|\\.)*)"|([^\s()"]+))', re.DOTALL)
+_WHITESPACE_RE = re.compile(r'\s*')
+_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+# String escapes sexpdata decodes; any other backslash pair is kept as is
+_ESCAPES = {'\\': '\\', '"': '"', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+Source = Union[str, Path, bytes, mmap.mmap, io.IOBase]
+
+
+def _unescape(match: re.Match) -> str:
+    return _ESCAPES.get(match.group(1), match.group(0))
+
+
+class SExprSyntaxError(ValueError):
+    """Raised when the input is not a well-formed S-expression"""
+
+
+# Bare tokens starting with anything else can never parse as int/float
+# ("inf"/"nan" variants start with i/n), so they skip the conversions
+_NUMERIC_START = frozenset('0123456789+-.iInN')
+
+
+def _atom(token: str):
+    """Convert a bare token the way sexpdata does: int, then float, else Symbol"""
+    if token[0] not in _NUMERIC_START:
+        return Symbol(token)
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        return Symbol(token)
+
+
+def _iter_text_chunks(source: Source, chunk_size: int) -> Iterator[str]:
+    """Yield decoded text chunks from a path, file object, mmap or bytes"""
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as f:
+            yield from _iter_text_chunks(f, chunk_size)
+        return
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+
+    # Undecodable bytes are dropped, matching Path.read_text(errors='ignore')
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, str):
+            yield chunk
+        else:
+            yield decoder.decode(chunk)
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def iter_sexpr_items(source: Source, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list]:
+    """
+    Yield the top-level children of the root expression one at a time
+
+    Args:
+        source: File path, binary/text file object, mmap or bytes
+        chunk_size: Bytes (or characters) read per chunk
+
+    Yields:
+        Each list-valued child of the root, e.g. [Symbol('net'), 1, 'GND'].
+        Atoms directly under the root (such as the root tag) are skipped.
+
+    Raises:
+        SExprSyntaxError: On unbalanced parentheses or unterminated strings
+    """
+    stack: List[list] = []
+    root_seen = False
+    buf = ''
+    pos = 0
+    chunks = _iter_text_chunks(source, chunk_size)
+    eof = False
+
+    while True:
+        # Pull more text when the remaining buffer may hold a partial token
+        if not eof and len(buf) - pos < 4096:
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+            else:
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+
+        m = _TOKEN_RE.match(buf, pos)
+        if m is None:
+            if _WHITESPACE_RE.match(buf, pos).end() == len(buf):
+                if eof:
+                    break
+                buf, pos = '', 0
+                continue
+            if not eof:
+                # Unterminated string: read on until it closes
+                chunk = next(chunks, None)
+                if chunk is None:
+                    eof = True
+                else:
+                    buf = buf[pos:] + chunk
+                    pos = 0
+                continue
+            raise SExprSyntaxError(f"Unterminated string near: {buf[pos:pos + 40]!r}")
+
+        # A bare atom touching the end of the buffer may continue in the next chunk
+        if m.lastindex == 4 and m.end() == len(buf) and not eof:
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+            else:
+                buf = buf[pos:] + chunk
+                pos = 0
+            continue
+
+        pos = m.end()
+        kind = m.lastindex
+
+        if kind == 1:
+            if not stack and root_seen:
+                raise SExprSyntaxError("Multiple root expressions")
+            stack.append([])
+            root_seen = True
+        elif kind == 2:
+            if not stack:
+                raise SExprSyntaxError("Unbalanced ')'")
+            done = stack.pop()
+            if len(stack) == 1:
+                yield done
+            elif stack:
+                stack[-1].append(done)
+        else:
+            if not stack:
+                raise SExprSyntaxError("Atom outside of root expression")
+            if kind == 3:
+                text = m.group(3)
+                value = _ESCAPE_RE.sub(_unescape, text) if '\\' in text else text
+            else:
+                value = _atom(m.group(4))
+            # Root-level atoms (the root tag itself) are not yielded
+            if len(stack) > 1:
+                stack[-1].append(value)
+
+    if stack:
+        raise SExprSyntaxError(f"Unexpected end of input ({len(stack)} unclosed expressions)")
+
@@ -0,0 +1,58 @@
+"""
+Multi-signature matcher for format detection
+
+Finds which of a fixed set of byte signatures occur in a buffer in one
+pass, instead of one substring scan per signature. The automaton is an
+Aho-Corasick style dictionary matcher whose scan runs inside the regex
+engine:
+
+- One alternation of all signatures, longest first, so the engine reports
+  the longest signature at each match position
+- Output links: every signature contained in a reported one (the shorter
+  signatures matching at the same position, or inside the match) is added
+  from a table built once
+- Signatures that can start inside another signature and run past its end
+  (a suffix of one is a prefix of the other) can be hidden by a
+  non-overlapping scan; those few are checked directly
+
+Built once per signature set (FormatDetector builds its matcher at import).
+"""
+import re
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+
+class SignatureMatcher:
+    """Set of byte signatures matched together"""
+
+    def __init__(self, signatures: Iterable[bytes]):
+        self.signatures: List[bytes] = sorted(set(signatures), key=lambda s: (-len(s), s))
+        if not self.signatures or not all(self.signatures):
+            raise ValueError("SignatureMatcher needs non-empty signatures")
+        self._pattern = re.compile(b"|".join(re.escape(s) for s in self.signatures))
+
+        # Output links: signatures found whenever a longer one is
+        self._outputs: Dict[bytes, FrozenSet[bytes]] = {
+            outer: frozenset(inner for inner in self.signatures if inner in outer)
+            for outer in self.signatures
+        }
+
+        # Signatures that can straddle the end of another match
+        self._straddling: List[bytes] = [
+            signature for signature in self.signatures
+            if any(
+                other.endswith(signature[:size])
+                for other in self.signatures
+                for size in range(1, len(signature))
+                if signature not in other
+            )
+        ]
+
+    def find(self, data: bytes) -> Set[bytes]:
+        """Signatures occurring anywhere in data"""
+        found: Set[bytes] = set()
+        for match in set(self._pattern.findall(data)):
+            found |= self._outputs[match]
+        for signature in self._straddling:
+            if signature not in found and signature in data:
+                found.add(signature)
+        return found
@@ -28,6 +28,9 @@ from .odbpp_parser import ODBPPParser
 from .cadence_parser import CadenceParser
 from .bom_parser import BOMParser, PickAndPlaceParser, BOMData
 from .hybrid_parser import HybridParser
+from .parse_pool import get_parse_pool
+from config import get_settings
+from tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +52,46 @@ class ParseResult:
     files_parsed: List[str] = field(default_factory=list)
 
 
+@dataclass
+class PlannedParse:
+    """
+    One parser run of a directory parse plan
+    
+    Runs are independent and may execute in any order; their results are
+    applied once every entry in `after` has been applied (the board before
+    IPC-2581 merges, all board data before BOM/PnP enhancement).
+    """
+    role: str  # 'pcb', 'gerber', 'ipc', 'bom' or 'pnp'
+    path: Path
+    detected: Optional[DetectedFile] = None
+    size: int = 0  # Input bytes
+    after: List[int] = field(default_factory=list)  # Plan indexes applied first
+    sources: List[str] = field(default_factory=list)  # Reported in files_parsed
+
+
+_worker_parser: Optional['UniversalParser'] = None  # One per pool worker process
+
+
+def _run_planned_parse(role: str, path: str, detected: Optional[DetectedFile]) -> Any:
+    """
+    Run one plan entry in a parse_pool worker (module-level, picklable)
+    
+    Inline runs use the calling UniversalParser instead, so its parser
+    overrides apply and no state is shared between unrelated parses.
+    """
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = UniversalParser()
+    return _worker_parser._run_planned(role, Path(path), detected)
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
 class UniversalParser:
     """
     Universal parser that handles any supported file format
@@ -105,16 +148,25 @@ class UniversalParser:
                 errors=[f"Input not found: {input_path}"]
             )
         
-        # Handle ZIP archives
-        if input_path.is_file() and input_path.suffix.lower() == '.zip':
-            return self._parse_zip(input_path)
-        
-        # Handle single files
-        if input_path.is_file():
-            return self._parse_single_file(input_path)
-        
-        # Handle directories
-        return self._parse_directory(input_path)
+        with span("parse:universal") as parse_span:
+            # Handle ZIP archives
+            if input_path.is_file() and input_path.suffix.lower() == '.zip':
+                result = self._parse_zip(input_path)
+            
+            # Handle single files
+            elif input_path.is_file():
+                result = self._parse_single_file(input_path)
+            
+            # Handle directories
+            else:
+                result = self._parse_directory(input_path)
+            
+            parse_span.set(
+                format=result.detected_format.value if result.detected_format else None,
+                components=len(result.pcb_data.components),
+                files=len(result.files_parsed),
+            )
+        return result
     
     def _parse_zip(self, zip_path: Path) -> ParseResult:
         """Extract and parse ZIP archive"""
@@ -180,7 +232,13 @@ class UniversalParser:
         )
     
     def _parse_directory(self, dir_path: Path) -> ParseResult:
-        """Parse a project directory"""
+        """
+        Parse a project directory
+        
+        The board, IPC-2581, BOM and PnP files are parsed concurrently
+        (parse_pool, with per-file time and memory budgets) and merged in
+        plan order as their results arrive.
+        """
         logger.info(f"Parsing directory: {dir_path}")
         
         # Detect project structure
@@ -191,55 +249,46 @@ class UniversalParser:
         
         warnings = list(project_structure.warnings)
         errors = []
-        files_parsed = []
-        
-        # Parse main PCB file
-        pcb_data = self._empty_pcb_data()
         
-        if project_structure.main_pcb_file:
-            main_file = project_structure.main_pcb_file
-            pcb_data = self._route_to_parser(main_file, main_file.path)
-            files_parsed.append(str(main_file.path))
-            
-            logger.info(f"Parsed main PCB: {len(pcb_data.components)} components, "
-                       f"{len(pcb_data.nets)} nets")
-        
-        # If no main PCB but have Gerbers, use Gerber parser
-        elif project_structure.gerber_files:
-            pcb_data = self.parsers[EDAToolFamily.GERBER].parse(str(dir_path))
-            files_parsed.extend([str(f.path) for f in project_structure.gerber_files])
-        
-        # Check for IPC-2581
-        for other_file in project_structure.other_files:
-            if other_file.format == FileFormat.IPC_2581:
-                ipc_data = self.ipc_parser.parse(str(other_file.path))
-                if ipc_data.components:
-                    pcb_data = self._merge_pcb_data(pcb_data, ipc_data)
-                    files_parsed.append(str(other_file.path))
-        
-        # Parse BOM files
-        bom_data = None
-        if project_structure.bom_files:
-            bom_file = project_structure.bom_files[0]
-            bom_data = self.bom_parser.parse(str(bom_file.path))
-            files_parsed.append(str(bom_file.path))
-            
-            # Enhance components with BOM data
-            pcb_data = self._enhance_with_bom(pcb_data, bom_data)
-            
-            logger.info(f"Parsed BOM: {bom_data.total_unique_parts} parts")
-        
-        # Parse PnP files
-        pnp_data = None
-        if project_structure.pnp_files:
-            pnp_file = project_structure.pnp_files[0]
-            pnp_data = self.pnp_parser.parse(str(pnp_file.path))
-            files_parsed.append(str(pnp_file.path))
-            
-            # Enhance components with position data
-            pcb_data = self._enhance_with_pnp(pcb_data, pnp_data)
+        plan = self._plan_directory(project_structure, dir_path)
+        state = {'pcb_data': self._empty_pcb_data(), 'bom_data': None, 'pnp_data': None}
+        results = {}
+        applied = set()
+        used = set()  # Entries whose data made it into the result
+        
+        settings = get_settings()
+        outcomes = get_parse_pool().imap_unordered(
+            _run_planned_parse,
+            [(entry.role, str(entry.path), entry.detected) for entry in plan],
+            sum(entry.size for entry in plan),
+            timeout=settings.parser_file_timeout,
+            memory_mb=settings.parser_file_memory_mb,
+            inline_fn=self._run_planned_inline,
+        )
+        for index, result, error in outcomes:
+            results[index] = (result, error)
             
-            logger.info(f"Parsed PnP: {len(pnp_data)} placements")
+            # Apply every entry whose result and dependencies are in
+            progress = True
+            while progress:
+                progress = False
+                for ready, entry in enumerate(plan):
+                    if ready in applied or ready not in results:
+                        continue
+                    if not all(dependency in applied for dependency in entry.after):
+                        continue
+                    data, failure = results.pop(ready)
+                    applied.add(ready)
+                    progress = True
+                    if failure is not None:
+                        message = f"Parsing {entry.path.name} failed: {failure}"
+                        logger.warning(message)
+                        (errors if entry.role in ('pcb', 'gerber') else warnings).append(message)
+                    elif self._apply_planned(entry, data, state):
+                        used.add(ready)
+        
+        pcb_data = state['pcb_data']
+        files_parsed = [source for index, entry in enumerate(plan) if index in used for source in entry.sources]
         
         # Determine success
         success = (
@@ -254,8 +303,8 @@ class UniversalParser:
         return ParseResult(
             success=success,
             pcb_data=pcb_data,
-            bom_data=bom_data,
-            pnp_data=pnp_data,
+            bom_data=state['bom_data'],
+            pnp_data=state['pnp_data'],
             project_structure=project_structure,
             detected_format=project_structure.main_pcb_file.format if project_structure.main_pcb_file else FileFormat.UNKNOWN,
             detected_eda=project_structure.eda_tool,
@@ -264,6 +313,89 @@ class UniversalParser:
             errors=errors
         )
     
+    def _plan_directory(self, project_structure: ProjectStructure, dir_path: Path) -> List[PlannedParse]:
+        """Parser runs for a project directory, with their merge dependencies"""
+        plan = []
+        
+        # Main PCB file, or the Gerber set when there is none
+        if project_structure.main_pcb_file:
+            main_file = project_structure.main_pcb_file
+            plan.append(PlannedParse(
+                role='pcb', path=main_file.path, detected=main_file,
+                size=_file_size(main_file.path), sources=[str(main_file.path)]
+            ))
+        elif project_structure.gerber_files:
+            fabrication = project_structure.gerber_files + project_structure.drill_files
+            plan.append(PlannedParse(
+                role='gerber', path=dir_path,
+                size=sum(_file_size(f.path) for f in fabrication),
+                sources=[str(f.path) for f in project_structure.gerber_files]
+            ))
+        
+        # IPC-2581 merges, in order, after the board (primary takes precedence)
+        for other_file in project_structure.other_files:
+            if other_file.format == FileFormat.IPC_2581:
+                plan.append(PlannedParse(
+                    role='ipc', path=other_file.path, after=[len(plan) - 1] if plan else [],
+                    size=_file_size(other_file.path), sources=[str(other_file.path)]
+                ))
+        
+        # BOM / PnP enhance the merged components
+        board = [len(plan) - 1] if plan else []
+        for role, files in (('bom', project_structure.bom_files), ('pnp', project_structure.pnp_files)):
+            if files:
+                plan.append(PlannedParse(
+                    role=role, path=files[0].path, after=board,
+                    size=_file_size(files[0].path), sources=[str(files[0].path)]
+                ))
+        
+        return plan
+    
+    def _run_planned_inline(self, role: str, path: str, detected: Optional[DetectedFile]) -> Any:
+        """Run one plan entry in this process (same task arguments as _run_planned_parse)"""
+        return self._run_planned(role, Path(path), detected)
+    
+    def _run_planned(self, role: str, path: Path, detected: Optional[DetectedFile]) -> Any:
+        """Parse one plan entry"""
+        if role == 'pcb':
+            return self._route_to_parser(detected, path)
+        if role == 'gerber':
+            return self.parsers[EDAToolFamily.GERBER].parse(str(path))
+        if role == 'ipc':
+            return self.ipc_parser.parse(str(path))
+        if role == 'bom':
+            return self.bom_parser.parse(str(path))
+        if role == 'pnp':
+            return self.pnp_parser.parse(str(path))
+        raise ValueError(f"Unknown plan role: {role}")
+    
+    def _apply_planned(self, entry: PlannedParse, result: Any, state: Dict[str, Any]) -> bool:
+        """Merge one plan entry's result into state; False if it contributed nothing"""
+        if entry.role in ('pcb', 'gerber'):
+            state['pcb_data'] = result
+            logger.info(f"Parsed main PCB: {len(result.components)} components, "
+                       f"{len(result.nets)} nets")
+            return True
+        
+        if entry.role == 'ipc':
+            if not result.components:
+                return False
+            state['pcb_data'] = self._merge_pcb_data(state['pcb_data'], result)
+            return True
+        
+        if entry.role == 'bom':
+            # Enhance components with BOM data
+            state['bom_data'] = result
+            state['pcb_data'] = self._enhance_with_bom(state['pcb_data'], result)
+            logger.info(f"Parsed BOM: {result.total_unique_parts} parts")
+            return True
+        
+        # Enhance components with position data
+        state['pnp_data'] = result
+        state['pcb_data'] = self._enhance_with_pnp(state['pcb_data'], result)
+        logger.info(f"Parsed PnP: {len(result)} placements")
+        return True
+    
     def _route_to_parser(self, detected: DetectedFile, file_path: Path) -> ParsedPCBData:
         """Route file to appropriate parser based on format"""
         fmt = detected.format
@@ -275,7 +407,8 @@ class UniversalParser:
         
         # KiCad
         if fmt in (FileFormat.KICAD_PCB, FileFormat.KICAD_SCH, FileFormat.KICAD_PRO):
-            return self.parsers[EDAToolFamily.KICAD].parse(file_path)
+            # HybridParser searches a project folder for the board and schematics
+            return self.parsers[EDAToolFamily.KICAD].parse(file_path.parent if file_path.is_file() else file_path)
         
         # Eagle
         if fmt in (FileFormat.EAGLE_BRD, FileFormat.EAGLE_SCH):
@@ -315,7 +448,7 @@ class UniversalParser:
             
             # Check for S-expression (KiCad-like)
             if content.strip().startswith('('):
-                return self.parsers[EDAToolFamily.KICAD].parse(file_path)
+                return self.parsers[EDAToolFamily.KICAD].parse(file_path.parent)
             
             # Check for XML
             if content.strip().startswith('<?xml') or content.strip().startswith('<'):
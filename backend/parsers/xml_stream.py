@@ -0,0 +1,134 @@
+"""
+Streaming XML walker for the XML-based parsers (IPC-2581, Eagle)
+
+Elements are dispatched to handlers as the parser opens and closes them,
+instead of building the whole tree and searching it repeatedly:
+
+- start handlers see an element as it opens (attributes only) - used for
+  context such as units or the current layer
+- end handlers see a complete element - these are the records (Component,
+  LogicalNet, signal, ...). A record's subtree is kept until its handler
+  ran; everything outside open records is freed as soon as it closes, so
+  memory is bounded by the largest record rather than the file.
+
+Handler tables are keyed by local name and resolved once against the root
+element's namespace, so dispatch is a single dict lookup per element.
+
+Uses lxml.etree.iterparse when installed (entity resolution and network
+access disabled, huge_tree for large exports); xml.etree otherwise.
+"""
+import logging
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+try:
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:  # xml.etree is used instead
+    etree = ET
+    HAS_LXML = False
+
+logger = logging.getLogger(__name__)
+
+# Malformed XML from either backend (lxml's XMLSyntaxError subclasses its ParseError)
+XML_PARSE_ERRORS = (ET.ParseError, etree.ParseError)
+
+Handler = Callable[[ET.Element], None]
+
+
+def local_name(tag: str) -> str:
+    """Tag without its {namespace} prefix"""
+    return tag.rpartition('}')[2]
+
+
+def _iterparse(path: str):
+    if HAS_LXML:
+        return etree.iterparse(
+            path, events=('start', 'end'), resolve_entities=False,
+            no_network=True, huge_tree=True, remove_comments=True, remove_pis=True
+        )
+    return ET.iterparse(path, events=('start', 'end'))
+
+
+class XMLRecordStream:
+    """
+    One pass over an XML file with start/end handler tables
+
+    Usage:
+        stream = XMLRecordStream(start_handlers={'Step': on_step},
+                                 end_handlers={'Component': on_component})
+        stream.run(path)
+
+    Handlers look up children with stream.qualify('Location'), which adds
+    the document namespace. A handler can call stop() to end the pass early.
+    """
+
+    def __init__(self, start_handlers: Optional[Dict[str, Handler]] = None,
+                 end_handlers: Optional[Dict[str, Handler]] = None):
+        self.start_handlers = start_handlers or {}
+        self.end_handlers = end_handlers or {}
+        self.namespace = ''
+        self.root_tag = ''
+        self._stopped = False
+
+    def qualify(self, name: str) -> str:
+        """Clark-notation tag for a local name in the document namespace"""
+        return f'{{{self.namespace}}}{name}' if self.namespace else name
+
+    def stop(self):
+        """End the pass after the current handler returns"""
+        self._stopped = True
+
+    def _resolve(self, handlers: Dict[str, Handler]) -> Dict[str, Handler]:
+        resolved = dict(handlers)
+        if self.namespace:
+            resolved.update((self.qualify(name), handler) for name, handler in handlers.items())
+        return resolved
+
+    def run(self, path: Union[str, Path]):
+        """
+        Walk the file, calling handlers in document order
+
+        Raises:
+            XML_PARSE_ERRORS: Malformed XML
+        """
+        starts: Dict[str, Handler] = {}
+        ends: Dict[str, Handler] = {}
+        open_elements = []  # Ancestors of the current element (xml.etree has no parent links)
+        record_depth = 0  # Open elements with an end handler
+        self._stopped = False
+
+        for event, elem in _iterparse(str(path)):
+            if event == 'start':
+                if not open_elements:
+                    # Root: fix the namespace and resolve the tables once
+                    self.root_tag = local_name(elem.tag)
+                    if elem.tag.startswith('{'):
+                        self.namespace = elem.tag[1:elem.tag.index('}')]
+                    starts = self._resolve(self.start_handlers)
+                    ends = self._resolve(self.end_handlers)
+                open_elements.append(elem)
+                handler = starts.get(elem.tag)
+                if handler is not None:
+                    handler(elem)
+                if elem.tag in ends:
+                    record_depth += 1
+            else:
+                open_elements.pop()
+                handler = ends.get(elem.tag)
+                if handler is not None:
+                    handler(elem)
+                    record_depth -= 1
+                if record_depth == 0 and open_elements:
+                    # Free the closed subtree (and, with lxml, earlier siblings)
+                    if HAS_LXML:
+                        elem.clear(keep_tail=True)
+                        parent = open_elements[-1]
+                        while elem.getprevious() is not None:
+                            del parent[0]
+                    else:
+                        elem.clear()
+                        open_elements[-1].remove(elem)
+            if self._stopped:
+                break
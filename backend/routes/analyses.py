@@ -7,19 +7,33 @@ Features:
 - Issue comments
 - File purposes
 - PDF report access
+- Live progress (Server-Sent Events)
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
 from pathlib import Path
+from config import get_settings
 from supabase_client import get_supabase
 from auth_middleware import verify_token, AuthContext
 from services.file_analyzer import FileAnalyzer
 from services.file_loader import FileLoader
 from parsers.hybrid_parser import HybridParser
+from services.cache_service import get_parsed_board_cache
 from services.ai_service import AIAnalysisService
+from services.rule_scheduler import RuleSpec, get_rule_scheduler
+from services.job_queue import PermanentJobError, get_job_queue, will_retry
+from services.issue_store import issue_dicts, issue_rows
+from services.analysis_issues import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SORT_COLUMNS, STATUS_CHANGE_COMMENT, InvalidCursor,
+    fetch_issue_page, issue_statuses, store_analysis_issues
+)
+from services.progress import ProgressEvent, ProgressReporter, get_progress_bus, sse_message
+from tracing import span, trace
 from rules import (
     MainsSafetyRules,
     BusInterfaceRules,
@@ -97,7 +111,14 @@ async def run_pcb_analysis(
     organization_id: str,
     user_id: str
 ):
-    """Run full PCB analysis in background - parses files, runs DRC, generates PDF"""
+    """
+    Run full PCB analysis in a job worker - parses files, runs DRC, generates PDF
+    
+    Failures are re-raised so the job queue can retry them. The analysis is
+    marked failed only once no retry is left (PermanentJobError, or the last
+    attempt); before that it goes back to pending and its progress stream
+    stays open.
+    """
     supabase = get_supabase()
     
     def update_status(status: str, **kwargs):
@@ -106,14 +127,24 @@ async def run_pcb_analysis(
         data.update(kwargs)
         supabase.table("analyses").update(data).eq("id", analysis_id).execute()
     
+    def write_progress(fields: dict):
+        supabase.table("analyses").update(fields).eq("id", analysis_id).execute()
+    
+    # Stage changes are coalesced and written in the background; clients
+    # follow them live on /analyses/{id}/events
+    progress = ProgressReporter(analysis_id, sink=write_progress)
+    
+    # Stage timings, stored as raw_results["profile"]
+    profile = trace("analysis", analysis_id=analysis_id).start()
     try:
         # Update status to processing
-        update_status("processing", started_at=datetime.utcnow().isoformat())
+        update_status("processing", started_at=datetime.utcnow().isoformat(), error_message=None,
+                      progress="Starting analysis", progress_percent=0)
         
         # Get project info
         project = supabase.table("projects").select("*").eq("id", project_id).single().execute()
         if not project.data:
-            raise Exception("Project not found")
+            raise PermanentJobError("Project not found")
         
         # Path to uploaded/extracted files
         project_path = Path(f"uploads/{project_id}")
@@ -121,25 +152,27 @@ async def run_pcb_analysis(
         analysis_path = extracted_path if extracted_path.exists() else project_path
         
         if not analysis_path.exists():
-            raise Exception(f"Project files not found at {analysis_path}")
+            raise PermanentJobError(f"Project files not found at {analysis_path}")
         
         logger.info(f"🔍 Running full PCB analysis on: {analysis_path}")
         
         # ===== STEP 1: File Analysis =====
-        update_status("processing")
-        file_infos, file_tree_node, project_structure = file_analyzer.analyze_project(analysis_path)
+        progress.update("Analyzing project files...", stage="file_analysis", percent=5)
+        with span("file_analysis"):
+            file_infos, file_tree_node, project_structure = file_analyzer.analyze_project(analysis_path)
         file_purposes = file_analyzer.get_file_purposes_dict(file_infos)
         logger.info(f"📁 Found {len(file_infos)} files, type: {project_structure.project_type}")
         
         # ===== STEP 2: Parse PCB Files =====
-        update_status("processing")
+        progress.update("Parsing PCB files...", stage="parsing", percent=15)
         
         pcb_data = None
         board_info = {}
         
         try:
             logger.info(f"🔧 Running HybridParser on: {analysis_path}")
-            pcb_data = hybrid_parser.parse(analysis_path)
+            # Reuses an earlier parse of the same files (e.g. other fab profile)
+            pcb_data = get_parsed_board_cache().get_or_parse(hybrid_parser, analysis_path)
             
             if pcb_data and pcb_data.board_info:
                 board_info = {
@@ -173,38 +206,34 @@ async def run_pcb_analysis(
             }
         
         # ===== STEP 3: Run DRC Rule Engines =====
-        update_status("processing")
+        progress.update("Running analysis rules...", stage="rule_engines", percent=40)
         all_issues = []
+        rule_engines = None
         
         if pcb_data:
             try:
-                # Initialize rule engines
-                rule_engines = [
-                    MainsSafetyRules(),
-                    BusInterfaceRules(),
-                    PowerSMPSRules(),
-                    BOMValidationRules(),
-                    HighSpeedInterfaceRules(),
-                    ThermalAnalysisRules(),
-                    BOMSanityRules(),
-                    AssemblyTestRules()
-                ]
+                # Engines run in worker processes, off the event loop
+                with span("rule_engines"):
+                    rule_run = await get_rule_scheduler().run_async(pcb_data, [
+                        RuleSpec(MainsSafetyRules),
+                        RuleSpec(BusInterfaceRules),
+                        RuleSpec(PowerSMPSRules),
+                        RuleSpec(BOMValidationRules),
+                        RuleSpec(HighSpeedInterfaceRules),
+                        RuleSpec(ThermalAnalysisRules),
+                        RuleSpec(BOMSanityRules),
+                        RuleSpec(AssemblyTestRules)
+                    ])
+                all_issues.extend(rule_run.issues)
+                rule_engines = rule_run.to_dict()
                 
-                # Run each rule engine
-                for engine in rule_engines:
-                    try:
-                        engine_issues = engine.analyze(pcb_data)
-                        all_issues.extend(engine_issues)
-                        logger.info(f"  {engine.__class__.__name__}: {len(engine_issues)} issues")
-                    except Exception as rule_error:
-                        logger.warning(f"  {engine.__class__.__name__} failed: {rule_error}")
-                
-                logger.info(f"🔍 DRC found {len(all_issues)} total issues")
+                logger.info(f"🔍 DRC found {len(all_issues)} total issues "
+                           f"in {rule_engines['wall_ms']} ms ({rule_run.mode})")
             except Exception as drc_error:
                 logger.error(f"❌ DRC failed: {drc_error}")
         
         # ===== STEP 4: AI Analysis =====
-        update_status("processing")
+        progress.update("Running AI insights...", stage="ai_analysis", percent=60)
         board_summary = {}
         ai_suggestions = []
         
@@ -220,12 +249,13 @@ async def run_pcb_analysis(
             }
             
             # Get AI issues and suggestions
-            ai_issues, ai_suggestions = ai_service.analyze_pcb(
-                project_path=analysis_path,
-                parsed_data=parsed_data,
-                rule_engine_issues=all_issues,
-                fab_profile="2l_cheap_proto"
-            )
+            with span("ai_analysis"):
+                ai_issues, ai_suggestions = ai_service.analyze_pcb(
+                    project_path=analysis_path,
+                    parsed_data=parsed_data,
+                    rule_engine_issues=all_issues,
+                    fab_profile="2l_cheap_proto"
+                )
             all_issues.extend(ai_issues)
             logger.info(f"🤖 AI added {len(ai_issues)} issues, {len(ai_suggestions)} suggestions")
             
@@ -273,25 +303,7 @@ async def run_pcb_analysis(
             risk_level = "low"
         
         # Convert issues to JSON-serializable format
-        issues_json = []
-        for issue in all_issues:
-            try:
-                issues_json.append({
-                    "id": str(uuid.uuid4()),
-                    "issue_code": getattr(issue, 'issue_code', 'UNKNOWN'),
-                    "severity": issue.severity.value if hasattr(issue, 'severity') else "info",
-                    "category": getattr(issue, 'category', 'general'),
-                    "title": getattr(issue, 'title', str(issue)),
-                    "description": getattr(issue, 'description', ''),
-                    "suggested_fix": getattr(issue, 'suggested_fix', ''),
-                    "affected_nets": getattr(issue, 'affected_nets', []),
-                    "affected_components": getattr(issue, 'affected_components', []),
-                    "location_x": getattr(issue, 'location_x', None),
-                    "location_y": getattr(issue, 'location_y', None),
-                    "layer": getattr(issue, 'layer', None)
-                })
-            except Exception as issue_err:
-                logger.warning(f"Failed to serialize issue: {issue_err}")
+        issues_json = issue_dicts(issue_rows(all_issues), with_ids=True)
         
         drc_results = {
             "summary": {
@@ -301,12 +313,23 @@ async def run_pcb_analysis(
             },
             "risk_level": risk_level,
             "checks_run": ["file_analysis", "hybrid_parser", "drc_rules", "ai_analysis"],
+            "rule_engines": rule_engines,
             "ai_suggestions": ai_suggestions
         }
         
+        # Rows for the paginated issues API; without facets the analysis is
+        # indexed on first listing instead
+        try:
+            with span("index_issues", issues=len(issues_json)):
+                drc_results["issue_facets"] = store_analysis_issues(
+                    supabase, analysis_id, organization_id, issues_json
+                )
+        except Exception as index_error:
+            logger.warning(f"⚠️ Issue indexing failed: {index_error}")
+        
         # ===== STEP 6: Generate PDF =====
         pdf_path = None
-        update_status("processing")
+        progress.update("Generating PDF report...", stage="pdf_export", percent=85)
         
         try:
             from services.export_service import ExportService
@@ -324,7 +347,8 @@ async def run_pcb_analysis(
             }
             
             # Try to generate PDF (this may fail if export_service expects different format)
-            pdf_path = export_service.generate_pdf_for_supabase(analysis_id, pdf_results, organization_id)
+            with span("pdf_export"):
+                pdf_path = export_service.generate_pdf_for_supabase(analysis_id, pdf_results, organization_id)
             if pdf_path:
                 logger.info(f"✅ PDF generated: {pdf_path}")
         except Exception as pdf_error:
@@ -332,8 +356,11 @@ async def run_pcb_analysis(
             pdf_path = None
         
         # ===== STEP 7: Save Results =====
-        update_status(
+        # Written together with the final progress state in one update
+        progress.finish(
             "completed",
+            "Complete",
+            100,
             completed_at=datetime.utcnow().isoformat(),
             board_info=board_info,
             board_summary=board_summary,
@@ -348,7 +375,8 @@ async def run_pcb_analysis(
                 "components_parsed": board_info.get("components_count", 0),
                 "nets_parsed": board_info.get("nets_count", 0),
                 "issues_found": len(all_issues),
-                "risk_level": risk_level
+                "risk_level": risk_level,
+                "profile": profile.finish().to_dict()
             }
         )
         
@@ -360,12 +388,48 @@ async def run_pcb_analysis(
         import traceback
         traceback.print_exc()
         
-        # Update with error
-        supabase.table("analyses").update({
-            "status": "failed",
-            "completed_at": datetime.utcnow().isoformat(),
-            "error_message": str(e)
-        }).eq("id", analysis_id).execute()
+        if will_retry(e):
+            # Queued again: not terminal, clients keep following the stream
+            progress.finish(
+                "pending",
+                f"Attempt failed, retrying: {e}",
+                0,
+                error_message=str(e)
+            )
+        else:
+            progress.finish(
+                "failed",
+                "Failed",
+                completed_at=datetime.utcnow().isoformat(),
+                error_message=str(e)
+            )
+        raise
+    finally:
+        progress.stop()
+        profile.finish()
+
+
+def fail_pcb_analysis(analysis_id: str, error: str, **payload):
+    """
+    Job queue failure handler for "pcb_analysis" jobs: the queue gave up on
+    the job without run_pcb_analysis recording it (worker crashed on the
+    last attempt), so mark the analysis failed and end its progress stream
+    """
+    supabase = get_supabase()
+    row = supabase.table("analyses").select("status").eq("id", analysis_id).execute()
+    if not row.data or row.data[0].get("status") in ("completed", "failed"):
+        return
+    
+    def write_progress(fields: dict):
+        supabase.table("analyses").update(fields).eq("id", analysis_id).execute()
+    
+    ProgressReporter(analysis_id, sink=write_progress).finish(
+        "failed",
+        "Failed",
+        completed_at=datetime.utcnow().isoformat(),
+        error_message=error
+    )
+    logger.error(f"❌ Analysis {analysis_id} failed: {error}")
 
 
 # ============================================
@@ -375,7 +439,6 @@ async def run_pcb_analysis(
 @router.post("/projects/{project_id}/analyze", response_model=AnalysisResponse)
 async def start_analysis(
     project_id: str,
-    background_tasks: BackgroundTasks,
     auth: AuthContext = Depends(verify_token)
 ):
     """Start PCB analysis for a project"""
@@ -385,7 +448,7 @@ async def start_analysis(
         # Verify project exists and user has access
         project = (
             supabase.table("projects")
-            .select("organization_id")
+            .select("organization_id, file_size_bytes")
             .eq("id", project_id)
             .eq("organization_id", auth.organization_id)  # Security: org isolation
             .single()
@@ -411,16 +474,20 @@ async def start_analysis(
         if not result.data:
             raise HTTPException(status_code=500, detail="Failed to create analysis")
         
-        # Start analysis in background
-        background_tasks.add_task(
-            run_pcb_analysis,
-            analysis_id,
-            project_id,
-            auth.organization_id,
-            auth.user_id
+        # Queue for a worker process; the request returns without waiting
+        get_job_queue().enqueue(
+            "pcb_analysis",
+            {
+                "analysis_id": analysis_id,
+                "project_id": project_id,
+                "organization_id": auth.organization_id,
+                "user_id": auth.user_id
+            },
+            organization_id=auth.organization_id,
+            size_bytes=project.data.get("file_size_bytes")
         )
         
-        logger.info(f"✓ Analysis {analysis_id} started for project {project_id} by {auth.email}")
+        logger.info(f"✓ Analysis {analysis_id} queued for project {project_id} by {auth.email}")
         
         return result.data[0]
         
@@ -626,7 +693,7 @@ async def get_results_legacy(analysis_id: str):
             "job_id": analysis_id,
             "project_id": analysis.get("project_id"),
             "status": analysis.get("status") or "pending",
-            "progress": "Analysis complete" if analysis.get("status") == "completed" else "Processing...",
+            "progress": "Analysis complete" if analysis.get("status") == "completed" else (analysis.get("progress") or "Processing..."),
             "risk_level": risk_level,
             "summary": summary,
             "board_info": analysis.get("board_info") or {},
@@ -693,19 +760,36 @@ async def download_analysis_pdf(
 @router.get("/analyses/{analysis_id}/issues")
 async def list_analysis_issues(
     analysis_id: str,
+    severity: Optional[List[str]] = Query(None, description="critical, warning, info"),
+    category: Optional[List[str]] = Query(None),
+    layer: Optional[List[str]] = Query(None),
+    status: Optional[List[str]] = Query(None, description="open, acknowledged, resolved, wont_fix"),
+    net: Optional[List[str]] = Query(None, description="Issues affecting all of these nets"),
+    component: Optional[List[str]] = Query(None, description="Issues affecting all of these components"),
+    sort: str = Query("severity", description="severity, category, issue_code or position"),
+    order: str = Query("asc", description="asc or desc"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     auth: AuthContext = Depends(verify_token)
 ):
     """
-    List all issues from an analysis with their comments.
-    Combines DRC results with user comments.
+    List issues from an analysis, one page at a time, with their comments.
+    Filter values may be repeated or comma-separated. Pass next_cursor back
+    as cursor for the following page (null on the last page). Facets are
+    the analysis-wide counts per severity and category.
     """
     supabase = get_supabase()
     
+    if sort not in SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort. Must be one of: {list(SORT_COLUMNS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="Invalid order. Must be 'asc' or 'desc'")
+    
     try:
-        # Get analysis with org verification
+        # Get analysis with org verification (facets only, not the issue list)
         result = (
             supabase.table("analyses")
-            .select("drc_results, issues_json, organization_id")
+            .select("status, issue_facets:drc_results->issue_facets, drc_summary:drc_results->summary")
             .eq("id", analysis_id)
             .eq("organization_id", auth.organization_id)
             .single()
@@ -715,58 +799,122 @@ async def list_analysis_issues(
         if not result.data:
             raise HTTPException(status_code=404, detail="Analysis not found")
         
-        # Get issues from DRC results
-        drc_results = result.data.get("drc_results", {})
-        issues_json = result.data.get("issues_json", [])
+        facets = result.data.get("issue_facets")
+        if facets is None and result.data.get("status") == "completed":
+            facets = _index_analysis_issues(supabase, analysis_id, auth.organization_id)
         
-        # Get all comments for this analysis
-        comments_result = (
-            supabase.table("issue_comments")
-            .select("*, users(full_name)")
-            .eq("analysis_id", analysis_id)
-            .order("created_at", desc=True)
-            .execute()
+        filters = {
+            "severity": severity, "category": category, "layer": layer,
+            "status": status, "net": net, "component": component
+        }
+        page = fetch_issue_page(
+            supabase,
+            analysis_id,
+            filters={name: _split_values(values) for name, values in filters.items()},
+            sort=sort,
+            descending=order == "desc",
+            cursor=cursor,
+            limit=limit
         )
         
-        # Group comments by issue_id
+        # Comments for this page's issues only
         comments_by_issue = {}
-        for comment in comments_result.data or []:
-            issue_id = comment["issue_id"]
-            if issue_id not in comments_by_issue:
-                comments_by_issue[issue_id] = []
-            comments_by_issue[issue_id].append({
-                "id": comment["id"],
-                "comment": comment["comment"],
-                "status": comment["status"],
-                "created_by": comment["created_by"],
-                "created_by_name": comment.get("users", {}).get("full_name", "Unknown"),
-                "created_at": comment["created_at"]
-            })
+        issue_ids = [issue["id"] for issue in page.issues]
+        if issue_ids:
+            comments_result = (
+                supabase.table("issue_comments")
+                .select("*, users(full_name)")
+                .eq("analysis_id", analysis_id)
+                .in_("issue_id", issue_ids)
+                .order("created_at", desc=True)
+                .execute()
+            )
+            for comment in comments_result.data or []:
+                comments_by_issue.setdefault(comment["issue_id"], []).append({
+                    "id": comment["id"],
+                    "comment": comment["comment"],
+                    "status": comment["status"],
+                    "created_by": comment["created_by"],
+                    "created_by_name": (comment.get("users") or {}).get("full_name", "Unknown"),
+                    "created_at": comment["created_at"]
+                })
         
         # Merge issues with comments
         issues_with_comments = []
-        for issue in issues_json:
-            issue_id = issue.get("id", "")
+        for issue in page.issues:
+            comments = comments_by_issue.get(issue["id"], [])
             issues_with_comments.append({
                 **issue,
-                "comments": comments_by_issue.get(issue_id, []),
-                "comment_count": len(comments_by_issue.get(issue_id, []))
+                "comments": comments,
+                "comment_count": len(comments)
             })
         
         return {
             "analysis_id": analysis_id,
             "issues": issues_with_comments,
-            "total_issues": len(issues_with_comments),
-            "drc_summary": drc_results.get("summary", {})
+            "next_cursor": page.next_cursor,
+            "facets": facets or {},
+            "total_issues": (facets or {}).get("total", 0),
+            "drc_summary": result.data.get("drc_summary") or {}
         }
         
     except HTTPException:
         raise
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to list issues: {e}")
         raise HTTPException(status_code=500, detail="Failed to list issues")
 
 
+def _split_values(values: Optional[List[str]]) -> List[str]:
+    """Repeated and comma-separated query values as one list"""
+    return [value.strip() for item in values or [] for value in item.split(",") if value.strip()]
+
+
+def _index_analysis_issues(supabase, analysis_id: str, organization_id: str) -> Dict[str, Any]:
+    """Write analysis_issues rows for an analysis completed before the table existed"""
+    analysis = (
+        supabase.table("analyses")
+        .select("drc_results, issues_json")
+        .eq("id", analysis_id)
+        .single()
+        .execute()
+    )
+    drc_results = analysis.data.get("drc_results") or {}
+    issues_json = analysis.data.get("issues_json") or []
+    
+    # Statuses already set through the comments API, oldest first
+    comments = []
+    while True:
+        batch = (
+            supabase.table("issue_comments")
+            .select("issue_id, status, comment")
+            .eq("analysis_id", analysis_id)
+            .order("created_at")
+            .range(len(comments), len(comments) + 999)
+            .execute()
+        ).data or []
+        comments.extend(batch)
+        if len(batch) < 1000:
+            break
+    
+    facets = store_analysis_issues(supabase, analysis_id, organization_id, issues_json,
+                                   issue_statuses(comments))
+    supabase.table("analyses").update(
+        {"drc_results": {**drc_results, "issue_facets": facets}}
+    ).eq("id", analysis_id).execute()
+    logger.info(f"✓ Indexed {len(issues_json)} issues of analysis {analysis_id}")
+    return facets
+
+
+def _sync_issue_status(supabase, analysis_id: str, issue_id: str, status: str):
+    """Keep analysis_issues.status (status filter) in step with status comments"""
+    supabase.table("analysis_issues").update({"status": status}).eq(
+        "analysis_id", analysis_id
+    ).eq("id", issue_id).execute()
+
+
 @router.post("/analyses/{analysis_id}/issues/{issue_id}/comments", response_model=IssueCommentResponse)
 async def add_issue_comment(
     analysis_id: str,
@@ -806,6 +954,9 @@ async def add_issue_comment(
         if not result.data:
             raise HTTPException(status_code=500, detail="Failed to create comment")
         
+        if request.status:
+            _sync_issue_status(supabase, analysis_id, issue_id, request.status)
+        
         logger.info(f"✓ Issue comment added to {issue_id} by {auth.email}")
         
         return {
@@ -909,12 +1060,13 @@ async def update_issue_status(
             "id": str(uuid.uuid4()),
             "analysis_id": analysis_id,
             "issue_id": issue_id,
-            "comment": request.comment or f"Status changed to {request.status}",
+            "comment": request.comment or STATUS_CHANGE_COMMENT.format(status=request.status),
             "status": request.status or "open",
             "created_by": auth.user_id
         }
         
         result = supabase.table("issue_comments").insert(comment_data).execute()
+        _sync_issue_status(supabase, analysis_id, issue_id, comment_data["status"])
         
         logger.info(f"✓ Issue {issue_id} status updated to {request.status} by {auth.email}")
         
@@ -966,6 +1118,138 @@ async def delete_issue_comment(
         raise HTTPException(status_code=500, detail="Failed to delete issue comment")
 
 
+@router.get("/analyses/{analysis_id}/profile")
+async def get_analysis_profile(
+    analysis_id: str,
+    auth: AuthContext = Depends(verify_token)
+):
+    """
+    Get the stage profile of a completed analysis.
+    Wall/CPU time and memory growth per pipeline stage (parsing, rule
+    engines, AI analysis, PDF export).
+    """
+    supabase = get_supabase()
+    
+    try:
+        analysis = (
+            supabase.table("analyses")
+            .select("raw_results")
+            .eq("id", analysis_id)
+            .eq("organization_id", auth.organization_id)  # Security: org isolation
+            .single()
+            .execute()
+        )
+        
+        if not analysis.data:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        
+        profile = (analysis.data.get("raw_results") or {}).get("profile")
+        if not profile:
+            raise HTTPException(status_code=404, detail="No profile recorded for this analysis")
+        
+        return {"analysis_id": analysis_id, "profile": profile}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get analysis profile: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get analysis profile")
+
+
+# ============================================
+# LIVE PROGRESS ENDPOINT
+# ============================================
+
+PROGRESS_COLUMNS = "id, status, progress, progress_percent, error_message"
+
+
+def _stored_progress(analysis_id: str, row: Dict[str, Any]) -> ProgressEvent:
+    """Progress event from the persisted analysis row"""
+    message = row.get("error_message") if row.get("status") == "failed" else row.get("progress")
+    return ProgressEvent(
+        analysis_id=analysis_id,
+        status=row.get("status"),
+        message=message,
+        percent=row.get("progress_percent")
+    )
+
+
+async def _progress_stream(analysis_id: str, row: Dict[str, Any]):
+    settings = get_settings()
+    bus = get_progress_bus()
+    supabase = get_supabase()
+    
+    def fetch_row():
+        result = supabase.table("analyses").select(PROGRESS_COLUMNS).eq("id", analysis_id).single().execute()
+        return result.data
+    
+    current = _stored_progress(analysis_id, row)
+    live = bus.last(analysis_id)
+    if live and not current.terminal:
+        current = live  # Fresher than the coalesced database write
+    yield sse_message(current)
+    if current.terminal:
+        return
+    
+    seen_live = live is not None
+    async for event in bus.subscribe(analysis_id, settings.progress_stream_heartbeat):
+        if event is None:
+            # Nothing live within the heartbeat. Without Redis, workers publish
+            # to a bus this process cannot see, so check the stored row (which
+            # lags live events: only its terminal state is used once any arrived)
+            stored = await asyncio.to_thread(fetch_row)
+            event = _stored_progress(analysis_id, stored) if stored else None
+            if event is None or (seen_live and not event.terminal) or \
+                    (event.status, event.message, event.percent) == (current.status, current.message, current.percent):
+                yield ": keep-alive\n\n"
+                continue
+        else:
+            seen_live = True
+        current = event
+        yield sse_message(event)
+        if event.terminal:
+            break
+
+
+@router.get("/analyses/{analysis_id}/events")
+async def stream_analysis_progress(
+    analysis_id: str,
+    auth: AuthContext = Depends(verify_token)
+):
+    """
+    Stream analysis progress as Server-Sent Events.
+    Sends the current state, then a `progress` event per stage change, and
+    closes once the analysis completes or fails. Replaces polling
+    GET /analyses/{id} while an analysis runs.
+    """
+    supabase = get_supabase()
+    
+    try:
+        analysis = (
+            supabase.table("analyses")
+            .select(PROGRESS_COLUMNS)
+            .eq("id", analysis_id)
+            .eq("organization_id", auth.organization_id)  # Security: org isolation
+            .single()
+            .execute()
+        )
+        
+        if not analysis.data:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to open progress stream: {e}")
+        raise HTTPException(status_code=500, detail="Failed to open progress stream")
+    
+    return StreamingResponse(
+        _progress_stream(analysis_id, analysis.data),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ============================================
 # FILE PURPOSES ENDPOINT
 # ============================================
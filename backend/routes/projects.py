@@ -16,13 +16,17 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
 import os
-import shutil
 import zipfile
 import io
 from pathlib import Path
 from supabase_client import get_supabase
 from auth_middleware import verify_token, AuthContext
 from services.file_analyzer import FileAnalyzer
+from services.blob_store import get_blob_store
+from services.archive_ingest import (
+    ArchiveLimitError, diff_manifests, ensure_extracted, ingest_archive, ingest_single_file,
+    load_manifest, project_manifests, release_project, stream_upload,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -132,6 +136,15 @@ class VersionResponse(BaseModel):
     created_at: datetime
 
 
+class VersionChangesResponse(BaseModel):
+    version_id: str
+    base_version_id: Optional[str]  # None = the original upload
+    added: List[str]
+    removed: List[str]
+    modified: List[str]
+    unchanged_count: int
+
+
 class ContributorResponse(BaseModel):
     user_id: str
     full_name: str
@@ -319,13 +332,12 @@ async def create_project(
         upload_dir.mkdir(parents=True, exist_ok=True)
         
         file_path = upload_dir / file.filename
-        file_size = 0
         
-        # Stream file to disk
-        with open(file_path, "wb") as buffer:
-            while chunk := await file.read(1024 * 1024):  # 1MB chunks
-                file_size += len(chunk)
-                buffer.write(chunk)
+        # Stream file to disk, hashing as it goes
+        try:
+            file_size, file_sha256 = await stream_upload(file, file_path)
+        except ArchiveLimitError as e:
+            raise HTTPException(status_code=413, detail=str(e))
         
         logger.info(f"Saved {file_size / 1024 / 1024:.2f}MB to {file_path}")
         
@@ -337,16 +349,18 @@ async def create_project(
         
         if is_zip:
             try:
-                with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                    zip_ref.extractall(extracted_path)
+                ingest_archive(file_path, extracted_path, file_sha256)
                 logger.info(f"Extracted ZIP to {extracted_path}")
                 extraction_status = "extracted"
             except zipfile.BadZipFile:
                 logger.error("Invalid ZIP file")
                 raise HTTPException(status_code=400, detail="Invalid ZIP file")
+            except ArchiveLimitError as e:
+                logger.error(f"Rejected ZIP: {e}")
+                raise HTTPException(status_code=400, detail=f"ZIP rejected: {e}")
         else:
-            # Single file - copy to extracted folder
-            shutil.copy2(file_path, extracted_path / file.filename)
+            # Single file - stored once and linked into the extracted folder
+            ingest_single_file(file_path, extracted_path, file_sha256)
             extraction_status = "single_file"
         
         # Analyze file tree
@@ -418,7 +432,7 @@ async def create_project(
         logger.error(f"Failed to create project: {e}", exc_info=True)
         # Cleanup on failure
         if upload_dir and upload_dir.exists():
-            shutil.rmtree(upload_dir, ignore_errors=True)
+            release_project(upload_dir)
         raise HTTPException(status_code=500, detail=f"Failed to create project: {str(e)}")
 
 
@@ -465,7 +479,7 @@ async def delete_project(
         # Delete local files
         local_path = Path(f"uploads/{project_id}")
         if local_path.exists():
-            shutil.rmtree(local_path, ignore_errors=True)
+            release_project(local_path)
         
         # Delete project (cascade will delete analyses)
         supabase.table("projects").delete().eq("id", project_id).execute()
@@ -616,6 +630,8 @@ async def get_file_info(
             raise HTTPException(status_code=404, detail="Project files not found")
         
         full_file_path = local_path / file_path
+        # Deferred archive members are extracted when first asked for
+        ensure_extracted(local_path, [file_path])
         if not full_file_path.exists():
             raise HTTPException(status_code=404, detail="File not found")
         
@@ -991,8 +1007,12 @@ async def download_project_zip(
             except Exception as e:
                 logger.warning(f"Could not get signed URL: {e}")
         
-        # Fall back to local file
+        # Fall back to local file (served from the blob store if only the manifest is left)
         local_path = Path(f"uploads/{project_id}/{original_filename}")
+        if not local_path.exists():
+            manifest = load_manifest(Path(f"uploads/{project_id}/extracted"))
+            if manifest is not None and get_blob_store().has(manifest.archive_sha256):
+                local_path = get_blob_store().path(manifest.archive_sha256)
         if local_path.exists():
             def iter_file():
                 with open(local_path, "rb") as f:
@@ -1118,12 +1138,11 @@ async def create_project_version(
         upload_dir.mkdir(parents=True, exist_ok=True)
         
         file_path = upload_dir / file.filename
-        file_size = 0
         
-        with open(file_path, "wb") as buffer:
-            while chunk := await file.read(1024 * 1024):
-                file_size += len(chunk)
-                buffer.write(chunk)
+        try:
+            file_size, file_sha256 = await stream_upload(file, file_path)
+        except ArchiveLimitError as e:
+            raise HTTPException(status_code=413, detail=str(e))
         
         # Extract if ZIP
         extracted_path = upload_dir / "extracted"
@@ -1135,8 +1154,9 @@ async def create_project_version(
         
         if is_zip:
             try:
-                with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                    zip_ref.extractall(extracted_path)
+                # Members unchanged since an earlier version are linked, not decompressed
+                ingest_archive(file_path, extracted_path, file_sha256,
+                               reuse_from=project_manifests(Path(f"uploads/{project_id}")))
                 
                 # Analyze files
                 try:
@@ -1147,8 +1167,10 @@ async def create_project_version(
                     logger.warning(f"File analysis failed: {e}")
             except zipfile.BadZipFile:
                 raise HTTPException(status_code=400, detail="Invalid ZIP file")
+            except ArchiveLimitError as e:
+                raise HTTPException(status_code=400, detail=f"ZIP rejected: {e}")
         else:
-            shutil.copy2(file_path, extracted_path / file.filename)
+            ingest_single_file(file_path, extracted_path, file_sha256)
         
         # Upload to Supabase Storage
         try:
@@ -1228,6 +1250,83 @@ async def create_project_version(
         raise HTTPException(status_code=500, detail=f"Failed to create version: {str(e)}")
 
 
+def _version_tree(project_id: str, version: Dict[str, Any]) -> Path:
+    """Local extracted tree of a project_versions row"""
+    project_dir = Path(f"uploads/{project_id}")
+    versioned = project_dir / "versions" / Path(version["id"]).name / "extracted"
+    # Uploaded versions are stored under .../versions/{id}; rows migrated from
+    # single-version projects (002) point at the original upload
+    if "/versions/" in (version.get("storage_path") or "") and versioned.exists():
+        return versioned
+    return project_dir / "extracted"
+
+
+@router.get("/{project_id}/versions/{version_id}/changes", response_model=VersionChangesResponse)
+async def get_version_changes(
+    project_id: str,
+    version_id: str,
+    base_version_id: Optional[str] = None,
+    auth: AuthContext = Depends(verify_token)
+):
+    """
+    Files added, removed and modified in a version
+
+    Compared against base_version_id, or the previous version by default.
+    Computed from the stored manifests; nothing is read or extracted.
+    """
+    supabase = get_supabase()
+    
+    def fetch_version(**filters):
+        query = (
+            supabase.table("project_versions")
+            .select("id, version_number, storage_path")
+            .eq("project_id", project_id)
+            .eq("organization_id", auth.organization_id)
+        )
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        result = query.execute()
+        return result.data[0] if result.data else None
+    
+    try:
+        version = fetch_version(id=version_id)
+        if not version:
+            raise HTTPException(status_code=404, detail="Version not found")
+        
+        if base_version_id is not None:
+            base_version = fetch_version(id=base_version_id)
+            if not base_version:
+                raise HTTPException(status_code=404, detail="Base version not found")
+        else:
+            base_version = fetch_version(version_number=version["version_number"] - 1)
+        
+        head_tree = _version_tree(project_id, version)
+        base_tree = _version_tree(project_id, base_version) if base_version else Path(f"uploads/{project_id}/extracted")
+        if base_version is None and head_tree == base_tree:
+            raise HTTPException(status_code=404, detail="No earlier version to compare with")
+        
+        head = load_manifest(head_tree)
+        base = load_manifest(base_tree)
+        if head is None or base is None:
+            raise HTTPException(status_code=404, detail="Version files not found")
+        
+        changes = diff_manifests(base, head)
+        return {
+            "version_id": version_id,
+            "base_version_id": base_version["id"] if base_version else None,
+            "added": changes["added"],
+            "removed": changes["removed"],
+            "modified": changes["modified"],
+            "unchanged_count": len(changes["unchanged"])
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to compare versions: {e}")
+        raise HTTPException(status_code=500, detail="Failed to compare versions")
+
+
 @router.get("/{project_id}/contributors", response_model=List[ContributorResponse])
 async def list_project_contributors(
     project_id: str,
@@ -175,9 +175,12 @@ class MainsSafetyRulesV2(BaseRule):
         mains_components = []
         selv_components = []
         
+        mains_net_set = set(mains_nets)
+        nets_by_component = self._get_component_net_map(pcb_data)
+        
         for comp in pcb_data.components:
-            comp_nets = self._get_component_nets(comp, pcb_data)
-            if any(net in mains_nets for net in comp_nets):
+            comp_nets = nets_by_component.get(comp.reference, [])
+            if any(net in mains_net_set for net in comp_nets):
                 mains_components.append(comp.reference)
             else:
                 selv_components.append(comp.reference)
@@ -198,17 +201,20 @@ class MainsSafetyRulesV2(BaseRule):
         
         return mains_zone, selv_zone
     
-    def _get_component_nets(self, component, pcb_data) -> List[str]:
-        """Get nets connected to a component"""
-        # This would need actual netlist data - simplified for now
-        nets = []
+    def _get_component_net_map(self, pcb_data) -> Dict[str, List[str]]:
+        """Map each component reference to the nets connected to it"""
+        # Canonical boards keep this index already
+        if hasattr(pcb_data, 'indexes'):
+            return pcb_data.indexes.nets_by_refdes
+        
+        # Parsed data: one pass over net pads ("R1.2" -> R1)
+        nets_by_component: Dict[str, List[str]] = {}
         for net in pcb_data.nets:
-            if hasattr(net, 'pads'):
-                for pad in net.pads or []:
-                    if component.reference in pad:
-                        nets.append(net.name)
-                        break
-        return nets
+            for pad in getattr(net, 'pads', None) or []:
+                connected = nets_by_component.setdefault(pad.split('.')[0], [])
+                if not connected or connected[-1] != net.name:
+                    connected.append(net.name)
+        return nets_by_component
     
     def _detect_isolation_barriers(self, pcb_data) -> List[IsolationBarrier]:
         """Detect isolation components"""
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Board Lookup Accessors
+Micro-benchmarks get_component, get_net, get_net_components and
+get_differential_pairs against the original linear-scan implementations
+"""
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.canonical import Board, Component, Net, Point
+
+
+def make_board(n_components: int, n_nets: int, seed: int = 42) -> Board:
+    """Synthetic board: every component has 2-8 pins spread over random nets"""
+    rng = random.Random(seed)
+    components = [
+        Component(refdes=f"U{i}", position=Point(rng.uniform(0, 200), rng.uniform(0, 200)))
+        for i in range(n_components)
+    ]
+
+    nets = []
+    n_pairs = n_nets // 20
+    for i in range(n_nets):
+        if i < 2 * n_pairs:
+            pair = f"DP{i // 2}"
+            positive = i % 2 == 0
+            nets.append(Net(
+                name=f"{pair}_{'P' if positive else 'N'}",
+                is_differential=True, pair_name=pair, is_positive=positive
+            ))
+        else:
+            nets.append(Net(name=f"NET{i}"))
+
+    for comp in components:
+        for pad in range(1, rng.randint(2, 8) + 1):
+            rng.choice(nets).pins.append(f"{comp.refdes}.{pad}")
+
+    return Board(id="bench", name="bench", components=components, nets=nets)
+
+
+# Original implementations, kept here as the reference path
+
+def linear_get_component(board: Board, refdes: str):
+    return next((c for c in board.components if c.refdes == refdes), None)
+
+
+def linear_get_net(board: Board, name: str):
+    return next((n for n in board.nets if n.name == name), None)
+
+
+def linear_get_net_components(board: Board, net_name: str):
+    net = linear_get_net(board, net_name)
+    if not net:
+        return []
+    refs = {pin.split(".")[0] for pin in net.pins if "." in pin}
+    return [c for c in board.components if c.refdes in refs]
+
+
+def linear_get_differential_pairs(board: Board):
+    pairs = []
+    processed = set()
+    for net in board.nets:
+        if net.is_differential and net.pair_name and net.pair_name not in processed:
+            complement = next(
+                (n for n in board.nets
+                 if n.pair_name == net.pair_name and n.is_positive != net.is_positive),
+                None
+            )
+            if complement:
+                pairs.append((net, complement) if net.is_positive else (complement, net))
+                processed.add(net.pair_name)
+    return pairs
+
+
+def bench(label: str, linear, indexed, number: int):
+    assert linear() == indexed(), f"{label}: results differ"
+    t_linear = timeit.timeit(linear, number=number) / number
+    t_indexed = timeit.timeit(indexed, number=number) / number
+    print(f"  {label:<26} {t_linear * 1e6:12.1f} us {t_indexed * 1e6:12.2f} us {t_linear / t_indexed:10.0f}x")
+
+
+def run(n_components: int, n_nets: int, number: int):
+    board = make_board(n_components, n_nets)
+    rng = random.Random(7)
+    refdes = [c.refdes for c in rng.sample(board.components, 100)]
+    names = [n.name for n in rng.sample(board.nets, 100)]
+
+    build = timeit.timeit(lambda: (board.invalidate_indexes(), board.indexes), number=5) / 5
+    print(f"\nBoard: {n_components:,} components, {n_nets:,} nets (index build {build * 1000:.1f} ms)")
+    print(f"  {'accessor (x100 lookups)':<26} {'linear':>15} {'indexed':>15} {'speedup':>11}")
+
+    bench("get_component",
+          lambda: [linear_get_component(board, r) for r in refdes],
+          lambda: [board.get_component(r) for r in refdes], number)
+    bench("get_net",
+          lambda: [linear_get_net(board, n) for n in names],
+          lambda: [board.get_net(n) for n in names], number)
+    bench("get_net_components",
+          lambda: [linear_get_net_components(board, n) for n in names],
+          lambda: [board.get_net_components(n) for n in names], number)
+    bench("get_differential_pairs",
+          lambda: linear_get_differential_pairs(board),
+          lambda: board.get_differential_pairs(), number)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Board lookup accessors")
+    parser.add_argument("--components", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--nets-per-component", type=float, default=1.5)
+    parser.add_argument("--number", type=int, default=3, help="Timing repetitions")
+    args = parser.parse_args()
+
+    for count in args.components:
+        run(count, int(count * args.nets_per_component), args.number)
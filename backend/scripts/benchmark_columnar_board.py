@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Columnar vs Object Track Storage
+Measures allocated memory and a trace-width scan for a synthetic board
+converted with per-object Track dataclasses and with TrackTable columns
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from parsers.base_parser import Track as ParsedTrack
+from models.canonical import Point, Track
+from models.columnar import StringTable, TrackTable
+
+
+def make_parsed_tracks(count: int, seed: int = 42):
+    """Synthetic parser output: short segments over ~1000 nets on 4 layers"""
+    rng = random.Random(seed)
+    layers = ["F.Cu", "In1.Cu", "In2.Cu", "B.Cu"]
+    tracks = []
+    for _ in range(count):
+        x, y = rng.uniform(0, 300), rng.uniform(0, 300)
+        tracks.append(ParsedTrack(
+            net_name=f"NET_{rng.randrange(1000)}",
+            layer=rng.choice(layers),
+            width=rng.choice([0.1, 0.15, 0.2, 0.25, 0.5]),
+            x1=x, y1=y, x2=x + rng.uniform(-2, 2), y2=y + rng.uniform(-2, 2),
+        ))
+    return tracks
+
+
+def to_objects(parsed):
+    """Same conversion as ParserBridge._convert_routing"""
+    return [
+        Track(
+            id=f"track_{idx}",
+            net=t.net_name,
+            layer=t.layer,
+            start=Point(t.x1, t.y1),
+            end=Point(t.x2, t.y2),
+            width=t.width,
+        )
+        for idx, t in enumerate(parsed)
+    ]
+
+
+def to_columns(parsed):
+    return TrackTable.from_parsed(parsed, StringTable(), StringTable())
+
+
+def measure(build, parsed):
+    """Return (result, bytes retained after build)"""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = build(parsed)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return result, retained
+
+
+def run(count: int, min_width: float):
+    parsed = make_parsed_tracks(count)
+
+    objects, object_bytes = measure(to_objects, parsed)
+    table, table_bytes = measure(to_columns, parsed)
+
+    start = time.perf_counter()
+    object_hits = sum(1 for t in objects if t.width < min_width)
+    object_scan = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table_hits = int(np.count_nonzero(table.width < min_width))
+    table_scan = time.perf_counter() - start
+
+    assert object_hits == table_hits
+
+    print(f"\nTracks: {count:,}")
+    print(f"  objects : {object_bytes / 1e6:8.1f} MB  ({object_bytes / count:6.0f} B/segment)  scan {object_scan * 1000:7.2f} ms")
+    print(f"  columnar: {table_bytes / 1e6:8.1f} MB  ({table_bytes / count:6.0f} B/segment)  scan {table_scan * 1000:7.2f} ms")
+    print(f"  memory reduction: {object_bytes / max(table_bytes, 1):.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark columnar track storage")
+    parser.add_argument("--tracks", type=int, default=200000, help="Number of track segments")
+    parser.add_argument("--min-width", type=float, default=0.15, help="Trace-width threshold for the scan")
+    args = parser.parse_args()
+
+    run(args.tracks, args.min_width)
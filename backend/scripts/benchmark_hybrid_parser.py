@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: HybridParser Deterministic Parse Time
+Times the fused single-pass geometry extraction on KiCad 5/6/7/8 boards.
+Real boards can be passed with --boards; otherwise synthetic boards are
+generated in each format's dialect and the extracted counts are checked
+against what was generated, so format regressions show up as failures
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import sexpdata
+
+from benchmarks.synthetic import KICAD_VERSIONS, BoardSpec, kicad_board_text
+from parsers.hybrid_parser import HybridParser
+import logging
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+COUNTED = ("components", "nets", "tracks", "vias", "zones")
+
+
+def make_board(version: int, n_components: int, seed: int = 42) -> Tuple[str, Dict[str, int]]:
+    """Synthetic .kicad_pcb text in the given KiCad major version's dialect"""
+    text, expected = kicad_board_text(BoardSpec(components=n_components, seed=seed), version)
+    return text, {key: expected[key] for key in COUNTED}
+
+
+def time_parse(parser: HybridParser, path: Path, repeat: int):
+    """Best-of-N wall time for the deterministic parse"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parser._parse_geometry_deterministic(path)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def peak_memory(fn) -> int:
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def report(label: str, path: Path, parser: HybridParser, args, expected=None) -> bool:
+    size_mb = path.stat().st_size / 1e6
+    result, elapsed = time_parse(parser, path, args.repeat)
+    counts = {k: len(result[k]) for k in COUNTED}
+    pads = sum(len(p) for p in result.get("net_to_pads", {}).values())
+
+    line = (f"{label:<24} {size_mb:8.1f} {elapsed * 1000:10.1f} {size_mb / elapsed:8.1f} "
+            f"{counts['components']:7d} {counts['nets']:7d} {counts['tracks']:8d} {counts['vias']:7d} {pads:8d}")
+
+    if args.memory:
+        line += f" {peak_memory(lambda: parser._parse_geometry_deterministic(path)) / 1e6:9.1f}"
+    if args.compare_sexpdata:
+        start = time.perf_counter()
+        sexpdata.loads(path.read_text(errors="ignore"))
+        line += f" {(time.perf_counter() - start) * 1000:10.1f}"
+    print(line)
+
+    if expected and counts != expected:
+        logger.error(f"{label}: extracted {counts}, expected {expected}")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HybridParser deterministic parsing")
+    parser.add_argument("--boards", type=Path, nargs="+",
+                        help="Real .kicad_pcb files to time (skips synthetic boards)")
+    parser.add_argument("--versions", type=int, nargs="+", default=sorted(KICAD_VERSIONS),
+                        choices=sorted(KICAD_VERSIONS), help="KiCad major versions for synthetic boards")
+    parser.add_argument("--components", type=int, default=1000,
+                        help="Components per synthetic board (tracks = 10x, vias = 1x)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--memory", action="store_true", help="Also report peak traced memory")
+    parser.add_argument("--compare-sexpdata", action="store_true",
+                        help="Also time a full-tree sexpdata.loads of the same file")
+    args = parser.parse_args()
+
+    # Skip the GPT client; only the deterministic pass is measured
+    hybrid = HybridParser.__new__(HybridParser)
+
+    header = (f"{'board':<24} {'MB':>8} {'parse ms':>10} {'MB/s':>8} "
+              f"{'comps':>7} {'nets':>7} {'tracks':>8} {'vias':>7} {'pads':>8}")
+    if args.memory:
+        header += f" {'peak MB':>9}"
+    if args.compare_sexpdata:
+        header += f" {'sexpdata':>10}"
+    print(header)
+
+    ok = True
+    if args.boards:
+        for path in args.boards:
+            ok &= report(path.name, path, hybrid, args)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            for version in args.versions:
+                text, expected = make_board(version, args.components)
+                path = Path(tmp) / f"kicad{version}.kicad_pcb"
+                path.write_text(text)
+                ok &= report(f"KiCad {version} (synthetic)", path, hybrid, args, expected)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
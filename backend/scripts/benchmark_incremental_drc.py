@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Incremental DRC Re-analysis
+Runs DRCEngineV2 on a synthetic board, applies a small edit (one component
+moved, one track changed, ...) and compares a full re-run against an
+incremental run from the previous result. Both must report the same
+violations
+"""
+import argparse
+import gc
+import pickle
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.canonical import BoardOutline, Net, Point, Polygon
+from services.drc_engine_v2 import DRCEngineV2
+from scripts.benchmark_spatial_index import make_board
+import logging
+
+# Synthetic boards lack fields some domain rules expect, which they log as
+# errors on every run; keep the table readable
+logging.getLogger().setLevel(logging.CRITICAL)
+
+
+def edit_move_component(board):
+    comp = board.components[len(board.components) // 2]
+    comp.position = Point(comp.position.x + 0.5, comp.position.y)
+
+
+def edit_track_width(board):
+    board.tracks[0].width = 0.05
+
+
+def edit_net_pins(board):
+    board.nets[0].pins.append("U0.99")
+
+
+def edit_component_value(board):
+    board.components[0].value = "22k"
+
+
+EDITS = {
+    "move_component": edit_move_component,
+    "track_width": edit_track_width,
+    "net_pins": edit_net_pins,
+    "component_value": edit_component_value,
+}
+
+
+def prepare_board(object_count: int):
+    board = make_board(object_count)
+    side = max(c.position.x for c in board.components) + 1.0
+    board.outline = BoardOutline(Polygon([Point(0, 0), Point(side, 0), Point(side, side), Point(0, side)]))
+    board.nets = [
+        Net(name=f"N{i}", pins=[f"U{j}.1" for j in range(i, len(board.components), 97)])
+        for i in range(97)
+    ]
+    return board
+
+
+def signature(result):
+    return [(v.check, v.id, v.title, v.actual) for v in result.violations]
+
+
+def best_ms(fn, board_bytes: bytes, repeat: int):
+    """
+    Fastest of repeat fn(board) calls in ms, and the last result
+
+    Each call gets a fresh copy of the board: DRC caches spatial indexes on
+    the board object, which a re-uploaded board would not have. Garbage from
+    earlier calls is collected first so it is not billed to the next one.
+    """
+    best = None
+    for _ in range(repeat):
+        board = pickle.loads(board_bytes)
+        gc.collect()
+        start = time.perf_counter()
+        result = fn(board)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(object_count: int, profile_id: str, repeat: int) -> bool:
+    engine = DRCEngineV2(max_workers=4)
+    board = prepare_board(object_count)
+    baseline = engine.run_full_analysis(board, profile_id)
+
+    print(f"\nBoard: {len(board.components):,} components, {len(board.tracks):,} tracks "
+          f"({baseline.summary['total']} violations)")
+    print(f"  {'edit':<18} {'full (ms)':>10} {'incr (ms)':>10} {'speedup':>8}  checks re-run")
+
+    ok = True
+    for name, edit in EDITS.items():
+        # Deep copy, as a re-uploaded board would be a fresh object graph
+        edited = pickle.loads(pickle.dumps(board))
+        edit(edited)
+
+        edited_bytes = pickle.dumps(edited)
+        full_ms, full = best_ms(lambda b: engine.run_full_analysis(b, profile_id), edited_bytes, repeat)
+        incremental_ms, incremental = best_ms(
+            lambda b: engine.run_full_analysis(b, profile_id, previous_board=board, previous_result=baseline),
+            edited_bytes, repeat,
+        )
+
+        match = signature(full) == signature(incremental)
+        ok &= match
+
+        print(f"  {name:<18} {full_ms:10.1f} {incremental_ms:10.1f} {full_ms / incremental_ms:7.1f}x  "
+              f"{', '.join(incremental.checks_run) or '-'}{'' if match else '  MISMATCH'}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark incremental DRC re-analysis")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 20000],
+                        help="Synthetic board sizes in objects (components + tracks)")
+    parser.add_argument("--profile", default="ipc2221_class2", help="Rule profile id")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    ok = all([run(size, args.profile, args.repeat) for size in args.sizes])
+    sys.exit(0 if ok else 1)
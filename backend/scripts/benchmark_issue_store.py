@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Issue Persistence
+Rows/sec for storing an analysis' issues: the original one-ORM-object-per-
+issue path against issue_store.bulk_insert_issues (COPY on PostgreSQL,
+batched executemany elsewhere), plus the issues_json serialization used for
+Supabase analyses. Uses a throwaway SQLite file unless --database-url is given
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def make_issues(count: int, seed: int = 42):
+    """Synthetic findings with realistic field sizes"""
+    from rules.base_rule import Issue, IssueSeverity
+
+    rng = random.Random(seed)
+    severities = list(IssueSeverity)
+    issues = []
+    for i in range(count):
+        nets = [f"NET{rng.randrange(5000)}" for _ in range(rng.randint(0, 4))]
+        refs = [f"U{rng.randrange(2000)}" for _ in range(rng.randint(1, 6))]
+        issues.append(Issue(
+            issue_code=f"DRC-{i % 400:03d}",
+            severity=rng.choice(severities),
+            category=rng.choice(["mains_safety", "bus_interfaces", "power", "bom", "assembly"]),
+            title=f"Clearance below minimum between {refs[0]} and nearby copper",
+            description="Measured clearance is below the fab profile minimum.\n"
+                        "Check the footprint courtyard and the routed track width. " * 2,
+            suggested_fix="Increase spacing or reroute the track on an inner layer.",
+            affected_nets=nets,
+            affected_components=refs,
+            location_x=rng.uniform(0, 200) if i % 3 else None,
+            location_y=rng.uniform(0, 150) if i % 3 else None,
+            layer=rng.choice(["F.Cu", "B.Cu", None]),
+        ))
+    return issues
+
+
+# Original implementations, kept here as the reference path
+
+def orm_store_issues(db, job_id, issues):
+    from models.issue import Issue as IssueModel
+
+    for issue in issues:
+        db.add(IssueModel(
+            job_id=job_id,
+            issue_code=issue.issue_code,
+            severity=issue.severity.value,
+            category=issue.category,
+            title=issue.title,
+            description=issue.description,
+            suggested_fix=issue.suggested_fix,
+            affected_nets=issue.affected_nets,
+            affected_components=issue.affected_components,
+            location_x=issue.location_x,
+            location_y=issue.location_y,
+            layer=issue.layer
+        ))
+    db.commit()
+
+
+def getattr_issues_json(issues):
+    issues_json = []
+    for issue in issues:
+        try:
+            issues_json.append({
+                "id": str(uuid.uuid4()),
+                "issue_code": getattr(issue, 'issue_code', 'UNKNOWN'),
+                "severity": issue.severity.value if hasattr(issue, 'severity') else "info",
+                "category": getattr(issue, 'category', 'general'),
+                "title": getattr(issue, 'title', str(issue)),
+                "description": getattr(issue, 'description', ''),
+                "suggested_fix": getattr(issue, 'suggested_fix', ''),
+                "affected_nets": getattr(issue, 'affected_nets', []),
+                "affected_components": getattr(issue, 'affected_components', []),
+                "location_x": getattr(issue, 'location_x', None),
+                "location_y": getattr(issue, 'location_y', None),
+                "layer": getattr(issue, 'layer', None)
+            })
+        except Exception:
+            pass
+    return issues_json
+
+
+def time_best(fn, repeat: int, setup=None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(label: str, count: int, seconds: float, reference: float = None):
+    line = f"  {label:<34} {seconds * 1000:9.1f} ms {count / seconds:12,.0f} rows/s"
+    if reference:
+        line += f"   {reference / seconds:5.1f}x"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk issue persistence")
+    parser.add_argument("--issues", type=int, default=10000, help="Issues per analysis")
+    parser.add_argument("--batch-size", type=int, help="Rows per bulk statement (default from settings)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--database-url", help="Database (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tmp.name}/issues.db"
+
+    from database import Base, SessionLocal, engine
+    from models import AnalysisJob, Issue as IssueModel, Project
+    from services.issue_store import bulk_insert_issues, issue_dicts, issue_rows
+
+    Base.metadata.create_all(engine, tables=[Project.__table__, AnalysisJob.__table__, IssueModel.__table__])
+    db = SessionLocal()
+    project = Project(name="benchmark", eda_tool="kicad", zip_path="benchmark.zip")
+    db.add(project)
+    db.flush()
+    job = AnalysisJob(project_id=project.id)
+    db.add(job)
+    db.commit()
+
+    def clear():
+        db.query(IssueModel).filter(IssueModel.job_id == job.id).delete()
+        db.commit()
+
+    issues = make_issues(args.issues)
+    bulk_label = "COPY" if engine.dialect.name == "postgresql" else "executemany"
+    print(f"{args.issues:,} issues, {engine.dialect.name}, best of {args.repeat}")
+
+    print("Store (including commit):")
+    orm = time_best(lambda: orm_store_issues(db, job.id, issues), args.repeat, clear)
+    report("ORM, one object per issue", args.issues, orm)
+
+    def bulk():
+        bulk_insert_issues(db, job.id, issue_rows(issues), args.batch_size)
+        db.commit()
+    report(f"bulk_insert_issues ({bulk_label})", args.issues, time_best(bulk, args.repeat, clear), orm)
+
+    stored = db.query(IssueModel).filter(IssueModel.job_id == job.id).count()
+    if stored != args.issues:
+        print(f"  ERROR: {stored} rows stored, expected {args.issues}")
+        sys.exit(1)
+
+    print("Serialize for issues_json:")
+    reference = time_best(lambda: getattr_issues_json(issues), args.repeat)
+    report("getattr per field", args.issues, reference)
+    report("issue_dicts(issue_rows())", args.issues,
+           time_best(lambda: issue_dicts(issue_rows(issues), with_ids=True), args.repeat), reference)
+
+    clear()
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
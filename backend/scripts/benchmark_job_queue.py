@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Job Queue API-Side Latency
+Measures what an analysis request costs the API process (one enqueue) with
+the workers idle and with every worker busy on CPU-bound jobs, plus queue
+throughput. The queue lives in a throwaway SQLite file unless
+--database-url is given
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def spin(seconds: float):
+    """CPU-bound stand-in for an analysis"""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(i * i for i in range(1000))
+
+
+def measure_enqueue(queue, count: int, job_seconds: float):
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        queue.enqueue("benchmark_spin", {"seconds": job_seconds},
+                      organization_id=f"org{i % 4}", size_bytes=1024)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies
+
+
+def report(label: str, latencies):
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"  {label:<28} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms   max {latencies[-1] * 1000:7.2f} ms")
+
+
+def wait_for_drain(queue, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = queue.get_stats()
+        if not stats["queued"] and not stats["running"]:
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job queue enqueue latency under worker load")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes")
+    parser.add_argument("--requests", type=int, default=200, help="Enqueues per measurement")
+    parser.add_argument("--job-seconds", type=float, default=0.5, help="CPU time per job")
+    parser.add_argument("--database-url", help="Queue database (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tmp.name}/queue.db"
+    os.environ.setdefault("JOB_QUEUE_POLL_INTERVAL", "0.1")
+    # Workers are separate processes; organizations are not the bottleneck here
+    os.environ.setdefault("JOB_QUEUE_ORG_CONCURRENCY", str(args.workers))
+
+    from services import job_queue
+    from services.job_queue import JobQueue
+    from services.job_worker import WorkerSupervisor
+
+    handlers = dict(job_queue.JOB_HANDLERS, benchmark_spin="scripts.benchmark_job_queue:spin")
+    job_queue.JOB_HANDLERS.update(handlers)
+
+    queue = JobQueue()
+    queue.ensure_schema()
+
+    print(f"Workers: {args.workers}, {args.requests} enqueues per run, {args.job_seconds}s jobs")
+    idle = measure_enqueue(queue, args.requests, 0)
+    report("workers stopped", idle)
+
+    supervisor = WorkerSupervisor(args.workers, handlers=handlers)
+    supervisor.start()
+    try:
+        # Let the idle batch drain, then saturate every worker
+        wait_for_drain(queue, 120)
+        measure_enqueue(queue, args.workers * 4, args.job_seconds)
+        time.sleep(1)
+        busy = measure_enqueue(queue, args.requests, args.job_seconds)
+        report("workers saturated", busy)
+
+        start = time.perf_counter()
+        drained = wait_for_drain(queue, 600)
+        elapsed = time.perf_counter() - start
+        jobs = args.requests + args.workers * 4
+        print(f"  drained {jobs} jobs in {elapsed:.1f}s ({jobs / elapsed:.1f} jobs/s)"
+              + ("" if drained else " (timed out)"))
+    finally:
+        supervisor.stop()
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Rule Engine Scheduling
+Runs the analysis rule engines on a synthetic KiCad board inline and in the
+RuleScheduler process pool, prints per-engine wall times, and checks that
+both modes return the same issues in the same order
+"""
+import argparse
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.suite import rule_specs
+from parsers.hybrid_parser import HybridParser
+from scripts.benchmark_hybrid_parser import make_board
+from services.rule_scheduler import RuleScheduler
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+def parse_board(n_components: int):
+    """Synthetic KiCad 7 board through the deterministic HybridParser path"""
+    text, _ = make_board(7, n_components)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.kicad_pcb"
+        path.write_text(text)
+        hybrid = HybridParser.__new__(HybridParser)
+        return hybrid._merge_results(hybrid._parse_geometry_deterministic(path), {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inline vs process-pool rule engines")
+    parser.add_argument("--components", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--workers", type=int, default=4, help="Pool processes")
+    parser.add_argument("--repeat", type=int, default=3, help="Pool runs per board (first includes warm-up)")
+    parser.add_argument("--fab-profile", default="cheap_cn_8mil")
+    args = parser.parse_args()
+
+    specs = rule_specs(args.fab_profile)
+    inline = RuleScheduler(max_workers=1)
+    pooled = RuleScheduler(max_workers=args.workers, min_components=0)
+    ok = True
+
+    try:
+        for count in args.components:
+            board = parse_board(count)
+            baseline = inline.run(board, specs)
+            runs = [pooled.run(board, specs) for _ in range(args.repeat)]
+            best = min(runs, key=lambda r: r.wall_seconds)
+
+            print(f"\nBoard: {count:,} components ({len(baseline.issues)} issues)")
+            print(f"  {'engine':<26} {'inline ms':>10} {'pool ms':>10}")
+            for a, b in zip(baseline.engines, best.engines):
+                print(f"  {a.name:<26} {a.seconds * 1000:10.1f} {b.seconds * 1000:10.1f}")
+            print(f"  {'wall':<26} {baseline.wall_seconds * 1000:10.1f} {best.wall_seconds * 1000:10.1f}"
+                  f"  (first pool run {runs[0].wall_seconds * 1000:.0f} ms, mode {best.mode})")
+
+            for run in runs:
+                if run.issues != baseline.issues:
+                    print("  MISMATCH: pooled issues differ from inline run")
+                    ok = False
+    finally:
+        pooled.shutdown()
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
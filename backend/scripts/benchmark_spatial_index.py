@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Spatial Index vs Pairwise Proximity Checks
+Compares the original O(n²) component spacing loop against the grid-indexed
+DRC path on synthetic boards, and checks both report the same pairs
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.canonical import Board, Component, ComponentSide, Point, Track
+from services import geometry_utils
+from services.drc_engine import DRCEngine
+from services.spatial_index import BoardSpatialIndex
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+FOOTPRINTS = ["R_0603", "C_0805", "R_1206", "SOT-23", "SOIC-8", "QFN-32"]
+
+
+def make_board(object_count: int, seed: int = 42) -> Board:
+    """
+    Build a synthetic board with roughly uniform placement density
+
+    Half the objects are components, half are track segments.
+    """
+    rng = random.Random(seed)
+    n_components = object_count // 2
+    n_tracks = object_count - n_components
+
+    # ~30mm² per component keeps density close to a real dense board
+    side_len = (n_components * 30.0) ** 0.5
+
+    components = [
+        Component(
+            refdes=f"U{i}",
+            footprint=rng.choice(FOOTPRINTS),
+            position=Point(rng.uniform(0, side_len), rng.uniform(0, side_len)),
+            side=ComponentSide.TOP if rng.random() < 0.7 else ComponentSide.BOTTOM,
+        )
+        for i in range(n_components)
+    ]
+
+    tracks = []
+    for i in range(n_tracks):
+        x, y = rng.uniform(0, side_len), rng.uniform(0, side_len)
+        tracks.append(Track(
+            id=f"track_{i}",
+            net=f"N{rng.randrange(max(1, n_tracks // 8))}",
+            layer=rng.choice(["F.Cu", "B.Cu"]),
+            start=Point(x, y),
+            end=Point(x + rng.uniform(-3, 3), y + rng.uniform(-3, 3)),
+            width=0.2,
+        ))
+
+    return Board(id=f"bench_{object_count}", name=f"bench_{object_count}", components=components, tracks=tracks)
+
+
+def naive_component_spacing(board: Board, min_spacing: float):
+    """The original pairwise loop from DRCEngine._check_component_spacing"""
+    pairs = []
+    components = board.components
+    for i, comp1 in enumerate(components):
+        for comp2 in components[i+1:]:
+            if comp1.side != comp2.side:
+                continue
+            if not (comp1.position and comp2.position):
+                continue
+            bbox1 = geometry_utils.component_bounding_box(comp1)
+            bbox2 = geometry_utils.component_bounding_box(comp2)
+            if geometry_utils.bbox_distance(bbox1, bbox2) < min_spacing:
+                pairs.append((comp1.refdes, comp2.refdes))
+    return pairs
+
+
+def run(sizes, naive_limit: int):
+    engine = DRCEngine(max_workers=1)
+    profile = engine.profile_library.get_profile("ipc2221_generic")
+    min_spacing = profile.min_component_spacing.value
+
+    print(f"\n{'objects':>8} {'comps':>7} {'naive (s)':>10} {'indexed (s)':>12} {'build (s)':>10} {'speedup':>8} {'pairs':>7}")
+    for size in sizes:
+        board = make_board(size)
+
+        start = time.perf_counter()
+        BoardSpatialIndex.for_board(board).component_boxes(ComponentSide.TOP.value)
+        BoardSpatialIndex.for_board(board).component_boxes(ComponentSide.BOTTOM.value)
+        BoardSpatialIndex.for_board(board).tracks()
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        violations = engine._check_component_spacing(board, profile)
+        indexed_time = time.perf_counter() - start
+        indexed_pairs = [tuple(v.details[k] for k in ("comp1", "comp2")) for v in violations]
+
+        naive_time = None
+        if len(board.components) <= naive_limit:
+            start = time.perf_counter()
+            naive_pairs = naive_component_spacing(board, min_spacing)
+            naive_time = time.perf_counter() - start
+            if naive_pairs != indexed_pairs:
+                logger.error(f"Mismatch at {size} objects: naive={len(naive_pairs)} indexed={len(indexed_pairs)}")
+
+        naive_col = f"{naive_time:10.3f}" if naive_time is not None else f"{'skipped':>10}"
+        speedup = f"{naive_time / indexed_time:7.1f}x" if naive_time and indexed_time else f"{'-':>8}"
+        print(f"{size:8d} {len(board.components):7d} {naive_col} {indexed_time:12.3f} {build_time:10.3f} {speedup} {len(indexed_pairs):7d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark spatial-index proximity checks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000],
+                        help="Synthetic board sizes in objects (components + tracks)")
+    parser.add_argument("--naive-limit", type=int, default=10000,
+                        help="Skip the O(n²) reference above this many components")
+    args = parser.parse_args()
+
+    run(args.sizes, args.naive_limit)
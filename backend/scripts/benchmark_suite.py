@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Parsing and Analysis Suite
+Generates synthetic KiCad, IPC-2581, ODB++ and Gerber projects at several
+sizes and times the parsers, ParserBridge, DRCEngineV2 and each rule engine,
+reporting throughput, peak memory and how each case scales with board size.
+
+Save a baseline with --save-baseline; a later run with --baseline exits
+non-zero if any case got slower or used more memory than the tolerance
+allows (times are normalised for machine speed)
+"""
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# UniversalParser constructs an OpenAI client; the benchmark never calls it
+if not os.environ.get("OPENAI_API_KEY"):
+    os.environ["OPENAI_API_KEY"] = "benchmark-offline"
+
+from benchmarks import WRITERS, BenchmarkSuite, compare, load_baseline, save_baseline, scaling_exponents
+from benchmarks.suite import calibrate
+
+# Synthetic boards lack fields some domain rules expect, which they log as
+# errors on every run; keep the table readable
+logging.basicConfig(level=logging.CRITICAL)
+
+
+def print_row(m):
+    if m.error:
+        print(f"{m.case:<34} {m.components:>7,}  ERROR {m.error}")
+        return
+    peak = f"{m.peak_mb:9.1f}" if m.peak_mb is not None else f"{'-':>9}"
+    counts = " ".join(f"{k}={v}" for k, v in m.counts.items())
+    line = (f"{m.case:<34} {m.components:>7,} {m.seconds * 1000:10.1f} "
+            f"{m.throughput:12,.0f} {peak}  {counts}")
+    if m.mismatches:
+        line += f"  MISMATCH ({'; '.join(m.mismatches)})"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parsers, DRC and rule engines on synthetic boards")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 8000],
+                        help="Board sizes in components")
+    parser.add_argument("--formats", nargs="+", default=list(WRITERS), choices=list(WRITERS))
+    parser.add_argument("--nets-per-component", type=float, help="Nets per component (default 1.5)")
+    parser.add_argument("--segments-per-component", type=float, help="Track segments per component (default 10)")
+    parser.add_argument("--vias-per-component", type=float, help="Vias per component (default 1)")
+    parser.add_argument("--zones", type=int, default=1, help="Copper zones")
+    parser.add_argument("--layers", type=int, default=2, help="Copper layers (even)")
+    parser.add_argument("--cases", nargs="+", help="Only run cases whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak-memory run")
+    parser.add_argument("--drc-profile", default="ipc2221_class2", help="DRCEngineV2 rule profile")
+    parser.add_argument("--fab-profile", default="cheap_cn_8mil", help="Rule engine fab profile")
+    parser.add_argument("--save-baseline", type=Path, help="Write results to this baseline file")
+    parser.add_argument("--baseline", type=Path, help="Compare against this baseline file")
+    parser.add_argument("--time-tolerance", type=float, default=0.25,
+                        help="Allowed slowdown vs. baseline (0.25 = 25%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.20,
+                        help="Allowed peak-memory growth vs. baseline")
+    args = parser.parse_args()
+
+    densities = {"nets": args.nets_per_component, "segments": args.segments_per_component,
+                 "vias": args.vias_per_component}
+    suite = BenchmarkSuite(
+        args.sizes,
+        formats=args.formats,
+        spec_overrides={"zones": args.zones, "layers": args.layers},
+        densities={name: per for name, per in densities.items() if per is not None},
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        drc_profile=args.drc_profile,
+        fab_profile=args.fab_profile,
+        case_filter=args.cases,
+    )
+
+    calibration = calibrate()
+    print(f"Calibration workload: {calibration * 1000:.1f} ms")
+    print(f"{'case':<34} {'comps':>7} {'best ms':>10} {'objects/s':>12} {'peak MB':>9}  counts")
+    results = suite.run(on_result=print_row)
+
+    exponents = scaling_exponents(results)
+    if exponents:
+        print("\nScaling (time ~ objects^k, smallest to largest board):")
+        for case, k in sorted(exponents.items(), key=lambda item: -item[1]):
+            print(f"  {case:<34} k = {k:5.2f}{'  superlinear' if k > 1.2 else ''}")
+
+    ok = not any(m.error or m.mismatches for m in results)
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results, calibration, settings={
+            "sizes": args.sizes, "formats": args.formats, "repeat": args.repeat,
+            "zones": args.zones, "layers": args.layers,
+        })
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.baseline:
+        baseline = load_baseline(args.baseline)
+        regressions = compare(results, baseline, calibration,
+                              time_tolerance=args.time_tolerance, memory_tolerance=args.memory_tolerance)
+        missing = sorted(set(baseline["results"]) - {m.key for m in results})
+        print(f"\nCompared with {args.baseline} "
+              f"(machine speed factor {calibration / baseline['calibration_seconds']:.2f})")
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+        if missing:
+            print(f"  not run: {', '.join(missing)}")
+        if not regressions:
+            print("  no regressions")
+        ok &= not regressions
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Check: Parse Time Budgets
+Runs a parser-shaped task that catches Exception around every record (as
+the real parsers do) under a short time budget, inline and in the parser
+pool, and checks that it stops at the budget with ParseBudgetExceeded
+instead of finishing with a degraded result
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from parsers.parse_pool import ParseBudgetExceeded, ParsePool
+
+
+def parse_records(records: int, seconds_per_record: float) -> int:
+    """Stand-in parser: skips records that fail, like the per-record loops"""
+    parsed = 0
+    for _ in range(records):
+        try:
+            time.sleep(seconds_per_record)
+            parsed += 1
+        except Exception:
+            continue
+    return parsed
+
+
+def check(label: str, pool: ParsePool, budget: float, records: int, seconds_per_record: float) -> bool:
+    tasks = [(records, seconds_per_record)] * 2
+    start = time.perf_counter()
+    outcomes = list(pool.imap_unordered(parse_records, tasks, total_bytes=1, timeout=budget))
+    elapsed = time.perf_counter() - start
+
+    stopped = all(isinstance(error, ParseBudgetExceeded) and result is None for _, result, error in outcomes)
+    # Generous slack for pool start-up; an ignored budget takes records * seconds_per_record
+    in_time = elapsed < budget * len(tasks) + 2.0
+    ok = stopped and in_time and len(outcomes) == len(tasks)
+    print(f"{label:<8} {elapsed:>6.2f}s  "
+          f"{', '.join(type(error).__name__ if error else f'result={result}' for _, result, error in outcomes)}"
+          f"{'' if ok else '  FAILED'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that parse time budgets stop parsers that catch Exception")
+    parser.add_argument("--budget", type=float, default=0.3, help="Seconds per task")
+    parser.add_argument("--records", type=int, default=40, help="Records per task")
+    parser.add_argument("--seconds-per-record", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"Budget {args.budget}s, unbudgeted task {args.records * args.seconds_per_record:.1f}s\n")
+    inline = ParsePool(max_workers=1)
+    pool = ParsePool(max_workers=2, min_bytes=0)
+    try:
+        ok = check("inline", inline, args.budget, args.records, args.seconds_per_record)
+        ok = check("pool", pool, args.budget, args.records, args.seconds_per_record) and ok
+    finally:
+        pool.shutdown()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
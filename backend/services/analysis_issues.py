@@ -0,0 +1,245 @@
+"""
+Analysis Issues
+Relational copy of an analysis' issues (analysis_issues table) for the
+filtered, keyset-paginated issues API
+
+analyses.issues_json stays the complete record (PDF, legacy results page);
+GET /analyses/{id}/issues pages through the rows here instead of shipping
+the whole list. Facet counts (per severity, per category and per
+category x severity) are computed once when the rows are written and kept
+in drc_results["issue_facets"], which also marks the analysis as indexed:
+analyses from before the table existed are indexed on first listing.
+
+Pages are keyset-paginated on (sort column, ordinal). The cursor carries the
+last row's values, so each page is an index range scan of at most `limit`
+rows, however many issues the analysis has.
+"""
+import base64
+import binascii
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+TABLE = "analysis_issues"
+
+SEVERITY_RANK = {"critical": 0, "warning": 1, "info": 2}
+
+# Sort key -> column; ordinal (position in the analysis output) breaks ties
+SORT_COLUMNS = {
+    "severity": "severity_rank",
+    "category": "category",
+    "issue_code": "issue_code",
+    "position": "ordinal",
+}
+
+# Filter -> column; values of one filter are OR-ed, filters are AND-ed
+VALUE_FILTERS = {"severity": "severity", "category": "category", "layer": "layer", "status": "status"}
+ARRAY_FILTERS = {"net": "affected_nets", "component": "affected_components"}
+
+# Comment written by the status endpoint when none is given
+STATUS_CHANGE_COMMENT = "Status changed to {status}"
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Row columns returned to clients (internal keys are dropped)
+_ISSUE_SELECT = (
+    "id, ordinal, severity, severity_rank, category, issue_code, title, description, "
+    "suggested_fix, affected_nets, affected_components, location_x, location_y, layer, status"
+)
+
+
+class InvalidCursor(ValueError):
+    """Cursor is malformed or belongs to a different sort"""
+
+
+@dataclass
+class IssuePage:
+    """One page of issues in the analyses.issues_json format (plus status)"""
+    issues: List[Dict]
+    next_cursor: Optional[str]
+
+
+def issue_facets(issues: Sequence[Dict]) -> Dict[str, Any]:
+    """Per-severity, per-category and per-category-per-severity counts"""
+    severity: Dict[str, int] = {}
+    category: Dict[str, Dict[str, int]] = {}
+    for issue in issues:
+        sev = issue.get("severity") or "info"
+        cat = issue.get("category") or ""
+        severity[sev] = severity.get(sev, 0) + 1
+        by_severity = category.setdefault(cat, {})
+        by_severity[sev] = by_severity.get(sev, 0) + 1
+    return {
+        "total": len(issues),
+        "severity": severity,
+        "category": {cat: sum(counts.values()) for cat, counts in category.items()},
+        "category_severity": category,
+    }
+
+
+def issue_statuses(comments: Sequence[Dict]) -> Dict[str, str]:
+    """
+    Issue id -> status set by its latest status comment
+
+    Every issue_comments row carries a status, but plain comments record
+    'open' without changing the issue's status; only other statuses and the
+    status endpoint's default reopen message count as status changes.
+
+    Args:
+        comments: issue_comments rows (issue_id, status, comment), oldest first
+    """
+    statuses = {}
+    for comment in comments:
+        status = comment.get("status") or "open"
+        if status != "open" or comment.get("comment") == STATUS_CHANGE_COMMENT.format(status="open"):
+            statuses[comment["issue_id"]] = status
+    return statuses
+
+
+def issue_table_rows(analysis_id: str, organization_id: str, issues: Sequence[Dict],
+                     statuses: Optional[Dict[str, str]] = None) -> List[Dict]:
+    """analysis_issues rows for issues_json entries (NULL sort keys become '')"""
+    statuses = statuses or {}
+    rows = []
+    for ordinal, issue in enumerate(issues):
+        severity = issue.get("severity") or "info"
+        rows.append({
+            "analysis_id": analysis_id,
+            "id": issue["id"],
+            "organization_id": organization_id,
+            "ordinal": ordinal,
+            "severity": severity,
+            "severity_rank": SEVERITY_RANK.get(severity, len(SEVERITY_RANK)),
+            "category": issue.get("category") or "",
+            "issue_code": issue.get("issue_code") or "",
+            "title": issue.get("title"),
+            "description": issue.get("description"),
+            "suggested_fix": issue.get("suggested_fix"),
+            "affected_nets": list(issue.get("affected_nets") or []),
+            "affected_components": list(issue.get("affected_components") or []),
+            "location_x": issue.get("location_x"),
+            "location_y": issue.get("location_y"),
+            "layer": issue.get("layer") or "",
+            "status": statuses.get(issue["id"], "open"),
+        })
+    return rows
+
+
+def store_analysis_issues(supabase, analysis_id: str, organization_id: str,
+                          issues: Sequence[Dict], statuses: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Replace an analysis' rows with issues (issues_json entries, with ids)
+
+    Rows from an earlier attempt are removed first; the insert is an upsert,
+    so two concurrent first listings of an old analysis agree.
+
+    Args:
+        statuses: Issue id -> status (see issue_statuses); others are 'open'
+
+    Returns:
+        The facets to store in drc_results["issue_facets"]
+    """
+    batch_size = get_settings().issue_insert_batch_size
+    rows = issue_table_rows(analysis_id, organization_id, issues, statuses)
+
+    supabase.table(TABLE).delete().eq("analysis_id", analysis_id).execute()
+    for start in range(0, len(rows), batch_size):
+        supabase.table(TABLE).upsert(rows[start:start + batch_size]).execute()
+    return issue_facets(issues)
+
+
+def fetch_issue_page(
+    supabase,
+    analysis_id: str,
+    filters: Optional[Dict[str, Sequence[str]]] = None,
+    sort: str = "severity",
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> IssuePage:
+    """
+    One page of an analysis' issues
+
+    Args:
+        filters: Keys of VALUE_FILTERS (any of the values) and ARRAY_FILTERS
+            (issues touching all of the given nets/components)
+        sort: Key of SORT_COLUMNS
+        cursor: next_cursor of the previous page
+
+    Raises:
+        ValueError: Unknown sort or filter
+        InvalidCursor: Cursor not produced by the same sort and direction
+    """
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"Unknown sort '{sort}'. Must be one of: {list(SORT_COLUMNS)}")
+    column = SORT_COLUMNS[sort]
+
+    query = supabase.table(TABLE).select(_ISSUE_SELECT).eq("analysis_id", analysis_id)
+    for name, values in (filters or {}).items():
+        if not values:
+            continue
+        if name in VALUE_FILTERS:
+            query = query.in_(VALUE_FILTERS[name], list(values))
+        elif name in ARRAY_FILTERS:
+            query = query.contains(ARRAY_FILTERS[name], list(values))
+        else:
+            raise ValueError(f"Unknown filter '{name}'")
+
+    if cursor:
+        value, ordinal = decode_cursor(cursor, sort, descending)
+        op = "lt" if descending else "gt"
+        if column == "ordinal":
+            query = query.filter("ordinal", op, ordinal)
+        else:
+            value = _filter_literal(value)
+            query = query.or_(f"{column}.{op}.{value},and({column}.eq.{value},ordinal.{op}.{ordinal})")
+
+    query = query.order(column, desc=descending)
+    if column != "ordinal":
+        query = query.order("ordinal", desc=descending)
+
+    # One extra row tells whether there is a next page without counting
+    rows = query.limit(limit + 1).execute().data or []
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, descending, last[column], last["ordinal"])
+    return IssuePage([_issue_from_row(row) for row in rows], next_cursor)
+
+
+def encode_cursor(sort: str, descending: bool, value, ordinal: int) -> str:
+    payload = json.dumps([sort, descending, value, ordinal], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, descending: bool):
+    """Returns (sort value, ordinal) of the row the previous page ended on"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_desc, value, ordinal = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if cursor_sort != sort or cursor_desc != descending or not isinstance(ordinal, int):
+        raise InvalidCursor("Cursor belongs to a different sort order")
+    return value, ordinal
+
+
+def _filter_literal(value) -> str:
+    """Value inside a PostgREST or=() filter (strings quoted, so commas/parens are safe)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def _issue_from_row(row: Dict) -> Dict:
+    issue = {key: value for key, value in row.items() if key not in ("ordinal", "severity_rank")}
+    issue["layer"] = row.get("layer") or None
+    return issue
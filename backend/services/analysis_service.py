@@ -2,6 +2,7 @@
 Analysis service - runs PCB analysis pipeline with GPT-5.1 extraction
 Enhanced with DRCEngineV2 and UniversalParser
 """
+import hashlib
 import logging
 from datetime import datetime
 from typing import Optional, Dict, Any, List
@@ -27,12 +28,21 @@ from rules import (
 from services.ai_service import AIAnalysisService
 from services.ai_service_v2 import AIAnalysisServiceV2
 from services.file_loader import FileLoader
+from services.archive_ingest import archive_fingerprint
 from services.gpt_extractor import GPTExtractor
 from services.drc_engine_v2 import DRCEngineV2
-from services.cache_service import get_cache
+from services.cache_service import get_cache, get_parsed_board_cache
+from services.rule_scheduler import RuleRunResult, RuleSpec, get_rule_scheduler
+from services.job_queue import PermanentJobError, will_retry
+from services.progress import ProgressReporter
+from services.issue_store import bulk_insert_issues, issue_rows, issue_rows_from_dicts
+from tracing import span, trace
 
 logger = logging.getLogger(__name__)
 
+# Version tag for stored (Board, DRCResult) baselines; bump when either changes shape
+DRC_BASELINE_VERSION = "drc-v2-baseline-1"
+
 
 class AnalysisService:
     """Handle PCB analysis workflows"""
@@ -79,20 +89,38 @@ class AnalysisService:
             if should_close:
                 db.close()
     
+    def get_upload_size(self, project_id: str) -> Optional[int]:
+        """Size of the project's uploaded archive, used to pick the queue lane"""
+        db = SessionLocal()
+        try:
+            project = db.query(Project).filter(Project.id == project_id).first()
+            if project and project.zip_path and Path(project.zip_path).exists():
+                return Path(project.zip_path).stat().st_size
+            return None
+        finally:
+            db.close()
+    
     async def run_analysis(self, job_id: str, project_id: str, db: Session = None):
         """
-        Run full analysis pipeline (background task)
+        Run full analysis pipeline (queued job, see run_analysis_job)
         
         Args:
             job_id: Analysis job UUID
             project_id: Project UUID
             db: Database session (optional, creates new if not provided)
+        
+        Raises:
+            PermanentJobError: If the job or project no longer exists
+            Exception: Any pipeline failure, after the job is marked failed,
+                so the job queue can retry it
         """
         # Support both injection and manual creation
         should_close = False
         if db is None:
             db = SessionLocal()
             should_close = True
+        profile = None
+        progress = None
         
         try:
             # Get job and project
@@ -101,11 +129,12 @@ class AnalysisService:
             
             if not job or not project:
                 logger.error(f"Job or project not found: {job_id}, {project_id}")
-                return
+                raise PermanentJobError(f"Job or project not found: {job_id}, {project_id}")
             
             # Check cache first
             cache = get_cache()
-            file_hash = cache.compute_file_hash(project.zip_path)
+            # Manifest fingerprint (member CRCs) when the upload was ingested
+            file_hash = archive_fingerprint(Path(project.zip_path), Path(project.extracted_path))
             cache_key = cache.get_cache_key(project_id, file_hash, job.fab_profile or "auto")
             
             cached_result = cache.get(cache_key)
@@ -121,13 +150,12 @@ class AnalysisService:
                 job.critical_count = cached_result.get('critical_count', 0)
                 job.warning_count = cached_result.get('warning_count', 0)
                 job.info_count = cached_result.get('info_count', 0)
-                db.commit()
                 
-                # Restore issues
-                for issue_data in cached_result.get('issues', []):
-                    issue = IssueModel(**issue_data)
-                    issue.job_id = job_id
-                    db.add(issue)
+                # Restore issues (entries from before issue_rows hold dicts)
+                rows = cached_result.get('issue_rows')
+                if rows is None:
+                    rows = issue_rows_from_dicts(cached_result.get('issues', []))
+                bulk_insert_issues(db, job_id, rows)
                 db.commit()
                 
                 logger.info(f"✅ Cache restore complete: {job.critical_count} critical, {job.warning_count} warnings")
@@ -136,29 +164,38 @@ class AnalysisService:
             # Update status
             job.status = "running"
             job.started_at = datetime.utcnow()
+            job.error_message = None
             job.progress = "Parsing project files..."
+            # A retried job starts over: drop issues stored by an earlier attempt
+            db.query(IssueModel).filter(IssueModel.job_id == job_id).delete()
             db.commit()
             
+            # Stage timings, stored as raw_results["profile"]
+            profile = trace("analysis", job_id=job_id, fab_profile=job.fab_profile).start()
+            
+            # Stage changes are coalesced and written from a background thread
+            progress = ProgressReporter(job_id, sink=self._progress_writer(job_id), status="running")
+            
             logger.info(f"Starting GPT-5.1 powered analysis for job {job_id}")
             
             # Step 1: Load and organize files
-            job.progress = "Loading project files..."
-            db.commit()
+            progress.update("Loading project files...", stage="file_loading", percent=5)
             
             file_loader = FileLoader()
-            organized_files = file_loader.extract_and_flatten(
-                Path(project.zip_path),
-                Path(project.extracted_path)
-            )
+            with span("file_loading"):
+                organized_files = file_loader.extract_and_flatten(
+                    Path(project.zip_path),
+                    Path(project.extracted_path)
+                )
             
             # Step 2: Use HybridParser (Deterministic + AI semantic classification)
-            job.progress = "Parsing PCB with hybrid deterministic+AI method..."
-            db.commit()
+            progress.update("Parsing PCB with hybrid deterministic+AI method...", stage="parsing", percent=10)
             
             hybrid_parser = HybridParser()
             try:
                 logger.info(f"Starting HybridParser on: {project.extracted_path}")
-                pcb_data = hybrid_parser.parse(Path(project.extracted_path))
+                # Reuses an earlier parse of the same files (e.g. other fab profile)
+                pcb_data = get_parsed_board_cache().get_or_parse(hybrid_parser, Path(project.extracted_path))
                 logger.info(f"✅ HybridParser success: {len(pcb_data.components)} components, {len(pcb_data.nets)} nets, board_info: {pcb_data.board_info}")
                 
                 # Update raw results with deterministic geometry
@@ -214,12 +251,12 @@ class AnalysisService:
                     db.commit()
             
             # Step 3: Generate board summary (what does this board do?)
-            job.progress = "Analyzing board purpose and functionality..."
-            db.commit()
+            progress.update("Analyzing board purpose and functionality...", stage="board_summary", percent=30)
             
             try:
                 if len(pcb_data.components) > 0:
-                    board_summary = self._generate_board_summary(pcb_data, Path(project.extracted_path))
+                    with span("board_summary"):
+                        board_summary = self._generate_board_summary(pcb_data, Path(project.extracted_path))
                 else:
                     logger.warning("No components found, skipping board summary")
                     board_summary = {
@@ -255,38 +292,44 @@ class AnalysisService:
                 db.commit()
             
             # Step 4: Run rule engines (OLD + NEW DRC)
-            job.progress = "Running analysis rules..."
-            db.commit()
+            progress.update("Running analysis rules...", stage="rule_engines", percent=40)
+            
+            with span("rule_engines"):
+                rule_run = await self._run_rule_engines(pcb_data, job.fab_profile)
+            all_issues = list(rule_run.issues)
             
-            all_issues = self._run_rule_engines(pcb_data, job.fab_profile)
+            # Must reassign the whole dict to trigger SQLAlchemy change detection
+            updated_raw_results = dict(job.raw_results) if job.raw_results else {}
+            updated_raw_results["rule_engines"] = rule_run.to_dict()
+            job.raw_results = updated_raw_results
             
             # Step 4b: Run NEW enhanced DRC engine in parallel
-            job.progress = "Running enhanced DRC checks..."
-            db.commit()
+            progress.update("Running enhanced DRC checks...", stage="enhanced_drc", percent=55)
             
             try:
                 logger.info("Running enhanced DRC engine...")
-                enhanced_issues = self._run_enhanced_drc(pcb_data, str(project.extracted_path), job.fab_profile, project.eda_tool)
+                with span("enhanced_drc"):
+                    enhanced_issues = self._run_enhanced_drc(pcb_data, str(project.extracted_path), job.fab_profile, project.eda_tool, project_id)
                 all_issues.extend(enhanced_issues)
                 logger.info(f"✅ Enhanced DRC found {len(enhanced_issues)} additional issues")
             except Exception as drc_error:
                 logger.error(f"❌ Enhanced DRC failed: {drc_error}", exc_info=True)
             
             # Step 5: AI-enhanced analysis for additional insights
-            job.progress = "Running AI insights (GPT-5.1)..."
-            db.commit()
+            progress.update("Running AI insights (GPT-5.1)...", stage="ai_analysis", percent=65)
             
             ai_service = AIAnalysisService()
-            ai_issues, ai_suggestions = ai_service.analyze_pcb(
-                project_path=Path(project.extracted_path),
-                parsed_data={
-                    "board_info": job.raw_results.get("board_info", {}),
-                    "nets": [{"name": n.name, "connections": n.pads} for n in pcb_data.nets],
-                    "components": [{"reference": c.reference, "value": c.value} for c in pcb_data.components]
-                },
-                rule_engine_issues=all_issues,
-                fab_profile=job.fab_profile
-            )
+            with span("ai_analysis"):
+                ai_issues, ai_suggestions = ai_service.analyze_pcb(
+                    project_path=Path(project.extracted_path),
+                    parsed_data={
+                        "board_info": job.raw_results.get("board_info", {}),
+                        "nets": [{"name": n.name, "connections": n.pads} for n in pcb_data.nets],
+                        "components": [{"reference": c.reference, "value": c.value} for c in pcb_data.components]
+                    },
+                    rule_engine_issues=all_issues,
+                    fab_profile=job.fab_profile
+                )
             
             # Combine rule engine + AI issues
             all_issues.extend(ai_issues)
@@ -298,10 +341,11 @@ class AnalysisService:
             job.raw_results["ai_suggestions"] = ai_suggestions
             
             # Step 6: Store issues
-            job.progress = "Storing results..."
-            db.commit()
+            progress.update("Storing results...", stage="store_issues", percent=80)
             
-            self._store_issues(job_id, all_issues, db)
+            stored_rows = issue_rows(all_issues)
+            with span("store_issues", issues=len(stored_rows)):
+                self._store_issues(job_id, stored_rows, db)
             
             # Step 7: Calculate summary
             critical_count = sum(1 for i in all_issues if i.severity.value == "critical")
@@ -346,22 +390,7 @@ class AnalysisService:
                 'critical_count': critical_count,
                 'warning_count': warning_count,
                 'info_count': info_count,
-                'issues': [
-                    {
-                        'issue_code': issue.issue_code,
-                        'severity': issue.severity,
-                        'category': issue.category,
-                        'title': issue.title,
-                        'description': issue.description,
-                        'suggested_fix': issue.suggested_fix,
-                        'affected_nets': issue.affected_nets,
-                        'affected_components': issue.affected_components,
-                        'location_x': issue.location_x,
-                        'location_y': issue.location_y,
-                        'layer': issue.layer
-                    }
-                    for issue in all_issues
-                ]
+                'issue_rows': stored_rows
             }
             cache.set(cache_key, cache_data)
             
@@ -370,14 +399,14 @@ class AnalysisService:
             logger.info(f"💾 Cached results for future analyses")
             
             # Step 8: Pre-generate PDF report for instant download
-            job.progress = "Generating PDF report..."
-            db.commit()
+            progress.update("Generating PDF report...", stage="pdf_export", percent=90)
             
             try:
                 from services.export_service import ExportService
                 export_service = ExportService()
                 logger.info(f"Starting PDF generation for job {job_id}")
-                pdf_path = export_service.generate_pdf_sync(job_id)  # Synchronous version
+                with span("pdf_export"):
+                    pdf_path = export_service.generate_pdf_sync(job_id)  # Synchronous version
                 if pdf_path:
                     # CRITICAL: Must reassign to trigger SQLAlchemy change detection
                     updated_raw_results = dict(job.raw_results) if job.raw_results else {}
@@ -391,19 +420,45 @@ class AnalysisService:
                 logger.error(f"❌ PDF pre-generation failed: {pdf_error}", exc_info=True)
                 logger.warning("PDF will be generated on-demand when requested")
             
+            # Stop background writes so none lands after the final state; the
+            # expired column is written even if the session last saw "Complete"
+            progress.stop()
+            db.expire(job, ["progress"])
+            
+            # Persist the stage profile (served by /api/analyses/{id}/profile)
+            updated_raw_results = dict(job.raw_results) if job.raw_results else {}
+            updated_raw_results["profile"] = profile.finish().to_dict()
+            job.raw_results = updated_raw_results
+            
             job.progress = "Complete"
             db.commit()
+            progress.finish("completed", "Complete", 100, persist=False)
             
+        except PermanentJobError:
+            raise
+        
         except Exception as e:
             logger.error(f"Analysis failed for job {job_id}: {e}", exc_info=True)
             
+            if progress:
+                progress.stop()
+            db.rollback()
+            # Only fail the analysis once the queue will not run it again
+            status = "pending" if will_retry(e) else "failed"
             job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
             if job:
-                job.status = "failed"
+                job.status = status
                 job.error_message = str(e)
                 db.commit()
+            if progress:
+                progress.finish(status, str(e), persist=False)
+            raise
         
         finally:
+            if progress:
+                progress.stop()
+            if profile:
+                profile.finish()
             if should_close:
                 db.close()
     
@@ -696,60 +751,62 @@ Do NOT output any text outside the JSON. No commentary, no markdown."""
             logger.error(f"Parse failed: {e}", exc_info=True)
             return None
     
-    def _run_rule_engines(self, pcb_data, fab_profile: str) -> List[Issue]:
-        """Run all rule engines (V1 + V2)"""
-        all_issues = []
-        
-        # V1 engines (legacy)
-        v1_engines = [
-            MainsSafetyRules(fab_profile),
-            BusInterfaceRules(fab_profile),
-            PowerSMPSRules(fab_profile),
-            BOMSanityRules(fab_profile),
-            AssemblyTestRules(fab_profile),
-        ]
-        
-        # V2 engines (new standards-based)
-        # Note: These engines have different __init__ signatures
-        v2_engines = [
-            BOMValidationRules(),  # Uses default E24 series
-            HighSpeedInterfaceRules(fab_profile),
-            ThermalAnalysisRules(copper_oz=1.0),  # Default 1oz copper
-        ]
-        
-        # Run V1 engines
-        for engine in v1_engines:
-            try:
-                engine_name = engine.__class__.__name__
-                logger.info(f"Running {engine_name}...")
-                issues = engine.analyze(pcb_data)
-                all_issues.extend(issues)
-                logger.info(f"{engine_name}: {len(issues)} issues found")
-            except Exception as e:
-                logger.error(f"Rule engine {engine.__class__.__name__} failed: {e}", exc_info=True)
-        
-        # Run V2 engines
-        for engine in v2_engines:
+    @staticmethod
+    def _progress_writer(job_id: str):
+        """Progress sink: updates the job's progress column in its own session"""
+        def write(fields: Dict[str, Any]):
+            session = SessionLocal()
             try:
-                engine_name = engine.__class__.__name__
-                logger.info(f"Running V2 {engine_name}...")
-                issues = engine.analyze(pcb_data)
-                all_issues.extend(issues)
-                logger.info(f"V2 {engine_name}: {len(issues)} issues found")
-            except Exception as e:
-                logger.error(f"V2 Rule engine {engine.__class__.__name__} failed: {e}", exc_info=True)
+                session.query(AnalysisJob).filter(AnalysisJob.id == job_id).update(
+                    {"progress": fields["progress"]}, synchronize_session=False
+                )
+                session.commit()
+            finally:
+                session.close()
+        return write
+    
+    async def _run_rule_engines(self, pcb_data, fab_profile: str) -> RuleRunResult:
+        """Run all rule engines (V1 + V2) in the rule scheduler's process pool"""
+        specs = [
+            # V1 engines (legacy)
+            RuleSpec(MainsSafetyRules, (fab_profile,)),
+            RuleSpec(BusInterfaceRules, (fab_profile,)),
+            RuleSpec(PowerSMPSRules, (fab_profile,)),
+            RuleSpec(BOMSanityRules, (fab_profile,)),
+            RuleSpec(AssemblyTestRules, (fab_profile,)),
+            # V2 engines (new standards-based)
+            # Note: These engines have different __init__ signatures
+            RuleSpec(BOMValidationRules),  # Uses default E24 series
+            RuleSpec(HighSpeedInterfaceRules, (fab_profile,)),
+            RuleSpec(ThermalAnalysisRules, kwargs={"copper_oz": 1.0}),  # Default 1oz copper
+        ]
         
-        return all_issues
+        rule_run = await get_rule_scheduler().run_async(pcb_data, specs)
+        logger.info(f"Rule engines: {len(rule_run.issues)} issues in "
+                    f"{rule_run.wall_seconds * 1000:.0f} ms ({rule_run.mode})")
+        return rule_run
     
-    def _run_enhanced_drc(self, pcb_data, extracted_path: str, fab_profile: str, eda_tool: str = "kicad") -> List[Issue]:
+    def _run_enhanced_drc(
+        self,
+        pcb_data,
+        extracted_path: str,
+        fab_profile: str,
+        eda_tool: str = "kicad",
+        project_id: Optional[str] = None
+    ) -> List[Issue]:
         """
         Run enhanced DRC engine and convert results to old Issue format
         
+        With a project_id, the board and DRC result of the project's last run
+        are kept as a baseline, and the next run (e.g. a new upload) only
+        re-executes the checks affected by the design diff.
+        
         Args:
             pcb_data: Parsed PCB data
             extracted_path: Path to extracted project
             fab_profile: Fabrication profile
             eda_tool: EDA tool name
+            project_id: Project to keep an incremental baseline for
             
         Returns:
             List of Issue objects
@@ -772,7 +829,14 @@ Do NOT output any text outside the JSON. No commentary, no markdown."""
             
             # Run DRCEngineV2 (uses all new rule engines)
             drc_engine = DRCEngineV2()
-            drc_result = drc_engine.run_full_analysis(board, profile_id)
+            previous_board, previous_result = self._load_drc_baseline(project_id)
+            drc_result = drc_engine.run_full_analysis(
+                board,
+                profile_id,
+                previous_board=previous_board,
+                previous_result=previous_result
+            )
+            self._store_drc_baseline(project_id, board, drc_result)
             violations = drc_result.violations
             
             # Convert violations to old Issue format
@@ -816,27 +880,30 @@ Do NOT output any text outside the JSON. No commentary, no markdown."""
             logger.error(f"Enhanced DRC failed: {e}", exc_info=True)
             return []
     
-    def _store_issues(self, job_id: str, issues: List[Issue], db):
-        """Store issues in database"""
-        for issue in issues:
-            issue_model = IssueModel(
-                job_id=job_id,
-                issue_code=issue.issue_code,
-                severity=issue.severity.value,
-                category=issue.category,
-                title=issue.title,
-                description=issue.description,
-                suggested_fix=issue.suggested_fix,
-                affected_nets=issue.affected_nets,
-                affected_components=issue.affected_components,
-                location_x=issue.location_x,
-                location_y=issue.location_y,
-                layer=issue.layer
+    @staticmethod
+    def _drc_baseline_key(project_id: str) -> str:
+        return hashlib.sha256(f"drc-baseline:{project_id}".encode("utf-8")).hexdigest()
+    
+    def _load_drc_baseline(self, project_id: Optional[str]):
+        """Last (Board, DRCResult) analyzed for a project, or (None, None)"""
+        if not project_id:
+            return None, None
+        baseline = get_parsed_board_cache().get(self._drc_baseline_key(project_id), DRC_BASELINE_VERSION)
+        if not baseline:
+            return None, None
+        return baseline
+    
+    def _store_drc_baseline(self, project_id: Optional[str], board, drc_result):
+        if project_id:
+            get_parsed_board_cache().set(
+                self._drc_baseline_key(project_id), DRC_BASELINE_VERSION, (board, drc_result)
             )
-            db.add(issue_model)
-        
+    
+    def _store_issues(self, job_id: str, rows: List[tuple], db):
+        """Store issue rows (see issue_store.issue_rows) in database"""
+        bulk_insert_issues(db, job_id, rows)
         db.commit()
-        logger.info(f"Stored {len(issues)} issues for job {job_id}")
+        logger.info(f"Stored {len(rows)} issues for job {job_id}")
     
     async def get_results(self, job_id: str, db: Session = None):
         """
@@ -904,3 +971,23 @@ Do NOT output any text outside the JSON. No commentary, no markdown."""
         finally:
             if should_close:
                 db.close()
+
+
+async def run_analysis_job(job_id: str, project_id: str):
+    """Job queue handler for "legacy_analysis" jobs"""
+    await AnalysisService().run_analysis(job_id, project_id)
+
+
+def fail_analysis_job(job_id: str, error: str, **payload):
+    """Job queue failure handler for "legacy_analysis" jobs (worker crashed on the last attempt)"""
+    db = SessionLocal()
+    try:
+        job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+        if job is None or job.status in ("completed", "failed"):
+            return
+        job.status = "failed"
+        job.error_message = error
+        db.commit()
+    finally:
+        db.close()
+    ProgressReporter(job_id, status="failed").finish("failed", error, persist=False)
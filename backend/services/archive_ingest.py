@@ -0,0 +1,477 @@
+"""
+Archive ingestion - upload streaming, ZIP manifests and incremental extraction
+
+The upload is hashed while it streams to disk. A ZIP is then read once from
+its central directory into a manifest (name, sizes and CRC-32 of every
+member) that is checked against zip-bomb limits before anything is
+decompressed, and stored next to the extracted tree:
+
+    uploads/{project_id}/upload.zip
+    uploads/{project_id}/extracted/
+    uploads/{project_id}/extracted.manifest.json
+
+Members are extracted from the manifest. Extraction is incremental (members
+already on disk with the right size are skipped, so the analysis job does
+not re-extract what the upload already did), and bulky files no parser
+reads (images, documents, 3D models, nested archives) are deferred until
+something asks for them with ensure_extracted.
+
+The manifest's fingerprint (a hash of member names, CRCs and sizes) keys
+analysis caches: it does not change when the same files are zipped again.
+
+Extracted members (and the upload itself) live in the blob store and are
+hard-linked into the tree; the manifest records each member's blob hash.
+A new version of a project reuses the blobs of members whose CRC and size
+match an earlier version of the same project instead of decompressing them
+again, and two versions are compared by diffing their manifests.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import zipfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import UploadFile
+
+from config import get_settings
+from services.blob_store import get_blob_store, hash_file
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Members never read by parsers or detection: extracted on demand only
+DEFERRED_EXTENSIONS = {
+    '.pdf', '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tif', '.tiff', '.svg',
+    '.doc', '.docx', '.ppt', '.pptx',
+    '.step', '.stp', '.wrl', '.stl', '.iges', '.igs',
+    '.zip', '.rar', '.7z', '.gz', '.tar',
+    '.mp4', '.mov',
+}
+
+# Compression ratios are only checked above this size (small text compresses well)
+RATIO_MIN_BYTES = 1024 * 1024
+
+
+class ArchiveLimitError(ValueError):
+    """Archive exceeds a size, member count or compression ratio limit"""
+
+
+@dataclass
+class ArchiveMember:
+    """One file in an uploaded archive"""
+    name: str  # Relative POSIX path
+    size: int
+    compressed_size: int
+    crc: int
+    deferred: bool = False  # Not extracted until requested
+    sha256: str = ""  # Blob hash, known once extracted
+
+
+@dataclass
+class ArchiveManifest:
+    """Members and identity of an uploaded archive"""
+    archive_path: str
+    archive_size: int
+    archive_mtime_ns: int
+    archive_sha256: str = ""
+    members: List[ArchiveMember] = field(default_factory=list)
+
+    @property
+    def unpacked_bytes(self) -> int:
+        return sum(member.size for member in self.members)
+
+    @property
+    def fingerprint(self) -> str:
+        """Content key: member names, CRCs and sizes (the file hash for single files)"""
+        if not self.members:
+            return self.archive_sha256
+        digest = hashlib.sha256()
+        for member in sorted(self.members, key=lambda m: m.name):
+            digest.update(f"{member.name}\0{member.crc:08x}\0{member.size}\n".encode())
+        return digest.hexdigest()
+
+    def matches(self, archive_path: Path) -> bool:
+        """True if archive_path is still the file this manifest describes"""
+        try:
+            stat = archive_path.stat()
+        except OSError:
+            return False
+        return (str(archive_path) == self.archive_path and stat.st_size == self.archive_size
+                and stat.st_mtime_ns == self.archive_mtime_ns)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ArchiveManifest":
+        members = [ArchiveMember(**member) for member in data.get("members", [])]
+        return cls(**{**data, "members": members})
+
+
+def manifest_path(extracted_path: Path) -> Path:
+    """Manifest file kept next to an extracted tree"""
+    extracted_path = Path(extracted_path)
+    return extracted_path.parent / f"{extracted_path.name}.manifest.json"
+
+
+def save_manifest(manifest: ArchiveManifest, extracted_path: Path):
+    path = manifest_path(extracted_path)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest.to_dict()))
+    os.replace(tmp, path)
+
+
+def load_manifest(extracted_path: Path) -> Optional[ArchiveManifest]:
+    """Manifest of an extracted tree, None if there is none (or it is unreadable)"""
+    try:
+        return ArchiveManifest.from_dict(json.loads(manifest_path(extracted_path).read_text()))
+    except (OSError, ValueError, TypeError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning(f"Ignoring unreadable manifest for {extracted_path}: {e}")
+        return None
+
+
+async def stream_upload(file: UploadFile, dest: Path, max_bytes: Optional[int] = None) -> Tuple[int, str]:
+    """
+    Write an upload to disk, hashing it on the way
+
+    Returns:
+        (size in bytes, SHA-256 hex digest)
+
+    Raises:
+        ArchiveLimitError: Upload larger than max_bytes (default max_upload_size);
+            the partial file is removed
+    """
+    limit = get_settings().max_upload_size if max_bytes is None else max_bytes
+    digest = hashlib.sha256()
+    size = 0
+    # An existing dest may be a link to a blob: replace it, never write through it
+    Path(dest).unlink(missing_ok=True)
+    try:
+        with open(dest, "wb") as f:
+            while chunk := await file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if limit and size > limit:
+                    raise ArchiveLimitError(f"Upload exceeds {limit // (1024 * 1024)}MB")
+                digest.update(chunk)
+                f.write(chunk)
+    except Exception:
+        dest.unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+def _member_name(info: zipfile.ZipInfo) -> Optional[str]:
+    """Safe relative path of a member; None for directories and junk"""
+    if info.is_dir():
+        return None
+    path = PurePosixPath(info.filename.replace("\\", "/"))
+    if path.is_absolute() or ".." in path.parts or (path.parts and ":" in path.parts[0]):
+        raise ArchiveLimitError(f"Unsafe path in archive: {info.filename}")
+    name = path.name
+    if "__MACOSX" in path.parts or name.startswith("._") or name == ".DS_Store":
+        return None
+    return str(path)
+
+
+def scan_archive(zip_path: Path, archive_sha256: str = "") -> ArchiveManifest:
+    """
+    Manifest of a ZIP from its central directory (nothing is decompressed)
+
+    Raises:
+        zipfile.BadZipFile: Not a ZIP archive
+        ArchiveLimitError: Member count, total size or compression ratio over limits
+    """
+    settings = get_settings()
+    zip_path = Path(zip_path)
+    stat = zip_path.stat()
+    manifest = ArchiveManifest(
+        archive_path=str(zip_path),
+        archive_size=stat.st_size,
+        archive_mtime_ns=stat.st_mtime_ns,
+        archive_sha256=archive_sha256,
+    )
+    with zipfile.ZipFile(zip_path) as zf:
+        infos = zf.infolist()
+        if len(infos) > settings.archive_max_members:
+            raise ArchiveLimitError(f"Archive has {len(infos)} entries (limit {settings.archive_max_members})")
+        total = 0
+        for info in infos:
+            name = _member_name(info)
+            if name is None:
+                continue
+            total += info.file_size
+            if total > settings.archive_max_unpacked_bytes:
+                raise ArchiveLimitError(
+                    f"Archive unpacks to more than {settings.archive_max_unpacked_bytes // (1024 * 1024)}MB"
+                )
+            if (info.file_size > RATIO_MIN_BYTES
+                    and info.file_size > settings.archive_max_ratio * max(info.compress_size, 1)):
+                raise ArchiveLimitError(f"Suspicious compression ratio for {name}")
+            manifest.members.append(ArchiveMember(
+                name=name,
+                size=info.file_size,
+                compressed_size=info.compress_size,
+                crc=info.CRC,
+                deferred=PurePosixPath(name).suffix.lower() in DEFERRED_EXTENSIONS,
+            ))
+    return manifest
+
+
+def _extract_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, member: ArchiveMember, dest: Path):
+    """
+    Stream one member into the blob store and link it at dest
+
+    The manifest size is enforced, the CRC checked by zipfile, and the
+    member's blob hash recorded.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + ".part")
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with zf.open(info) as src, open(tmp, "wb") as dst:
+            while chunk := src.read(CHUNK_SIZE):
+                written += len(chunk)
+                if written > member.size:
+                    raise ArchiveLimitError(f"{member.name} is larger than its header says")
+                digest.update(chunk)
+                dst.write(chunk)
+        member.sha256 = digest.hexdigest()
+        get_blob_store().adopt(tmp, member.sha256, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def reuse_index(manifests: Iterable[ArchiveManifest]) -> Dict[Tuple[int, int], str]:
+    """
+    (CRC-32, size) -> blob hash of members extracted before
+
+    Only build this from manifests of the same project: a CRC is not a
+    content hash, and matching it against other tenants' files would let a
+    crafted archive pull in their content.
+    """
+    index = {}
+    for manifest in manifests:
+        for member in manifest.members:
+            if member.sha256:
+                index[(member.crc, member.size)] = member.sha256
+    return index
+
+
+def extract_archive(manifest: ArchiveManifest, extracted_path: Path,
+                    names: Optional[Iterable[str]] = None, include_deferred: bool = False,
+                    reuse: Optional[Dict[Tuple[int, int], str]] = None) -> int:
+    """
+    Extract members of a manifest that are not on disk yet
+
+    Members whose blob is already stored (their own hash, or a (CRC, size)
+    match in reuse) are linked instead of decompressed. Blob hashes learned
+    on the way are saved to the manifest.
+
+    Args:
+        names: Only these members (default: all)
+        include_deferred: Also extract deferred members (implied for names)
+        reuse: reuse_index() of earlier versions of the same project
+
+    Returns:
+        Number of members placed in the tree
+    """
+    extracted_path = Path(extracted_path)
+    wanted = set(names) if names is not None else None
+    store = get_blob_store()
+    reuse = reuse or {}
+    written = 0
+    members = {member.name: member for member in manifest.members}
+    with zipfile.ZipFile(manifest.archive_path) as zf:
+        for info in zf.infolist():
+            name = _member_name(info)
+            member = members.get(name) if name else None
+            if member is None:
+                continue
+            if wanted is not None:
+                if name not in wanted:
+                    continue
+            elif member.deferred and not include_deferred:
+                continue
+            dest = extracted_path / name
+            if dest.is_file() and dest.stat().st_size == member.size:
+                continue
+            known = member.sha256 or reuse.get((member.crc, member.size), "")
+            if known and store.link(known, dest):
+                member.sha256 = known
+            else:
+                _extract_member(zf, info, member, dest)
+            written += 1
+    if written:
+        save_manifest(manifest, extracted_path)
+    return written
+
+
+def ingest_archive(zip_path: Path, extracted_path: Path, archive_sha256: str = "",
+                   reuse_from: Iterable[ArchiveManifest] = ()) -> ArchiveManifest:
+    """
+    Manifest and extraction of an uploaded ZIP, reusing an earlier ingest
+
+    Args:
+        archive_sha256: Hash of the upload (stores the archive itself as a blob)
+        reuse_from: Manifests of earlier versions of the same project
+
+    Raises:
+        zipfile.BadZipFile: Not a ZIP archive
+        ArchiveLimitError: Archive over the zip-bomb limits
+    """
+    zip_path = Path(zip_path)
+    extracted_path = Path(extracted_path)
+    manifest = load_manifest(extracted_path)
+    if manifest is None or not manifest.matches(zip_path):
+        manifest = scan_archive(zip_path, archive_sha256)
+        if archive_sha256:
+            # Within limits: store the upload (an identical one becomes a link to it)
+            get_blob_store().adopt(zip_path, archive_sha256)
+            manifest.archive_mtime_ns = zip_path.stat().st_mtime_ns
+        save_manifest(manifest, extracted_path)
+    elif archive_sha256 and not manifest.archive_sha256:
+        manifest.archive_sha256 = archive_sha256
+        save_manifest(manifest, extracted_path)
+    extracted_path.mkdir(parents=True, exist_ok=True)
+    written = extract_archive(manifest, extracted_path, reuse=reuse_index(reuse_from))
+    logger.info(f"Ingested {zip_path.name}: {len(manifest.members)} members, {written} extracted, "
+                f"{sum(m.deferred for m in manifest.members)} deferred")
+    return manifest
+
+
+def ingest_single_file(file_path: Path, extracted_path: Path, file_sha256: str) -> ArchiveManifest:
+    """
+    Store a single-file upload and place it in the extracted tree
+
+    The manifest has no members; its fingerprint is the file hash.
+    """
+    file_path = Path(file_path)
+    store = get_blob_store()
+    store.adopt(file_path, file_sha256)
+    extracted_path = Path(extracted_path)
+    extracted_path.mkdir(parents=True, exist_ok=True)
+    if not store.link(file_sha256, extracted_path / file_path.name):
+        shutil.copy2(file_path, extracted_path / file_path.name)
+    stat = file_path.stat()
+    manifest = ArchiveManifest(
+        archive_path=str(file_path),
+        archive_size=stat.st_size,
+        archive_mtime_ns=stat.st_mtime_ns,
+        archive_sha256=file_sha256,
+    )
+    save_manifest(manifest, extracted_path)
+    return manifest
+
+
+def ensure_extracted(extracted_path: Path, names: Iterable[str]) -> int:
+    """Extract deferred members on demand; no-op without a manifest"""
+    manifest = load_manifest(extracted_path)
+    if manifest is None or not manifest.members:
+        return 0
+    try:
+        return extract_archive(manifest, extracted_path, names=names)
+    except (OSError, zipfile.BadZipFile) as e:
+        logger.warning(f"Could not extract {list(names)} from {manifest.archive_path}: {e}")
+        return 0
+
+
+def deferred_members(extracted_path: Path) -> Dict[str, int]:
+    """Deferred members not on disk yet -> size (for file listings)"""
+    manifest = load_manifest(extracted_path)
+    if manifest is None:
+        return {}
+    extracted_path = Path(extracted_path)
+    return {
+        member.name: member.size for member in manifest.members
+        if member.deferred and not (extracted_path / member.name).exists()
+    }
+
+
+def blob_hashes(extracted_path: Path) -> Dict[str, Tuple[int, str]]:
+    """Relative path -> (size, blob hash) of the files of a tree whose hash is known"""
+    manifest = load_manifest(extracted_path)
+    if manifest is None:
+        return {}
+    if not manifest.members:
+        if not manifest.archive_sha256:
+            return {}
+        return {Path(manifest.archive_path).name: (manifest.archive_size, manifest.archive_sha256)}
+    return {member.name: (member.size, member.sha256) for member in manifest.members if member.sha256}
+
+
+def manifest_blobs(manifest: ArchiveManifest) -> set:
+    """Every blob a tree and its upload link to"""
+    digests = {member.sha256 for member in manifest.members if member.sha256}
+    if manifest.archive_sha256:
+        digests.add(manifest.archive_sha256)
+    return digests
+
+
+def project_manifests(project_dir: Path) -> List[ArchiveManifest]:
+    """Manifests of every tree of a project (original upload and versions/*)"""
+    project_dir = Path(project_dir)
+    trees = [project_dir / "extracted", *sorted(project_dir.glob("versions/*/extracted"))]
+    manifests = [load_manifest(tree) for tree in trees]
+    return [manifest for manifest in manifests if manifest is not None]
+
+
+def release_project(project_dir: Path) -> int:
+    """Delete a project directory and the blobs only it linked to"""
+    digests = set()
+    for manifest in project_manifests(project_dir):
+        digests |= manifest_blobs(manifest)
+    shutil.rmtree(project_dir, ignore_errors=True)
+    return get_blob_store().release(digests)
+
+
+def _member_keys(manifest: ArchiveManifest) -> Dict[str, Tuple]:
+    if not manifest.members:
+        return {Path(manifest.archive_path).name: (manifest.archive_size, manifest.archive_sha256)}
+    return {member.name: (member.size, member.crc, member.sha256) for member in manifest.members}
+
+
+def diff_manifests(base: ArchiveManifest, head: ArchiveManifest) -> Dict[str, List[str]]:
+    """
+    Files added, removed, modified and unchanged between two trees
+
+    Members compare by size and CRC, and by blob hash when both sides know it.
+    """
+    old, new = _member_keys(base), _member_keys(head)
+    modified, unchanged = [], []
+    for name in sorted(old.keys() & new.keys()):
+        a, b = old[name], new[name]
+        same = a[:-1] == b[:-1] and (not a[-1] or not b[-1] or a[-1] == b[-1])
+        (unchanged if same else modified).append(name)
+    return {
+        "added": sorted(new.keys() - old.keys()),
+        "removed": sorted(old.keys() - new.keys()),
+        "modified": modified,
+        "unchanged": unchanged,
+    }
+
+
+def archive_fingerprint(archive_path: Path, extracted_path: Optional[Path] = None) -> str:
+    """
+    Cache key for an uploaded archive or file
+
+    The manifest fingerprint when one matches the file, else its SHA-256.
+    Empty if the file cannot be read.
+    """
+    archive_path = Path(archive_path)
+    if extracted_path is not None:
+        manifest = load_manifest(extracted_path)
+        if manifest is not None and manifest.matches(archive_path) and manifest.fingerprint:
+            return manifest.fingerprint
+    try:
+        return hash_file(archive_path)
+    except OSError as e:
+        logger.error(f"Failed to hash file {archive_path}: {e}")
+        return ""
@@ -0,0 +1,247 @@
+"""
+Blob store - content-addressed storage for uploaded files
+
+Every uploaded archive and every extracted member is stored once, under the
+SHA-256 of its content:
+
+    uploads/blobs/ab/abcdef0123...
+
+Project trees (uploads/{project_id}/..., versions/{version_id}/...) hold hard
+links to the blobs, so a file that is unchanged between versions, or uploaded
+to two projects, takes its space once. The store therefore lives under
+upload_dir by default. If hard links from the store into upload_dir do not
+work (another filesystem, or a platform without them) the store disables
+itself: every link would be a copy, doubling disk use.
+
+A tree file and its blob are the same inode, shared by every project that
+has the file. Blobs are made read-only (0444), but that does not stop root
+or a chmod: a write into a tree file in place changes the file in every
+project. Never open tree files for writing; replace them instead (write a
+new file and os.replace it over the old one, which breaks the link).
+
+A blob whose only link is the store's own is unreferenced: release() removes
+those among the blobs a deleted tree pointed to. A single link that failed
+(e.g. too many links) falls back to a copy, which does not hold its blob: a
+later link() of that blob may miss, and callers re-extract the file.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import stat
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+from config import ensure_upload_dir, get_settings
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+class BlobStore:
+    """SHA-256 addressed files, hard-linked into project trees"""
+
+    def __init__(self, root: str, enabled: bool = True, tree_root: Optional[str] = None):
+        """
+        Args:
+            root: Blob directory
+            enabled: False to store nothing (adopt() only moves files)
+            tree_root: Directory the trees live under; the store is disabled
+                if it cannot hard-link into it
+        """
+        self.root = Path(root)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.stored = 0
+        self.deduplicated = 0
+        self.copies = 0
+
+        if self.enabled:
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"Blob store unavailable, disabling: {e}")
+                self.enabled = False
+        if self.enabled and tree_root is not None and not self._can_link_into(Path(tree_root)):
+            logger.warning(f"Blob store {self.root} cannot hard-link into {tree_root} (different filesystem?), "
+                           f"disabling: files would be stored twice")
+            self.enabled = False
+
+    def _can_link_into(self, tree_root: Path) -> bool:
+        """Whether files in the store can be hard-linked under tree_root"""
+        probe = self.root / f".probe-{os.getpid()}-{threading.get_ident()}"
+        target = tree_root / probe.name
+        try:
+            if os.stat(self.root).st_dev != os.stat(tree_root).st_dev:
+                return False
+            probe.touch()
+            os.link(probe, target)
+            return True
+        except OSError:
+            return False
+        finally:
+            probe.unlink(missing_ok=True)
+            target.unlink(missing_ok=True)
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def has(self, digest: str) -> bool:
+        return self.enabled and bool(digest) and self.path(digest).is_file()
+
+    def _count(self, attr: str):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def link(self, digest: str, dest: Path) -> bool:
+        """
+        Place a stored blob at dest (hard link, copy as a fallback)
+
+        Returns:
+            False if the blob is not in the store (including one a concurrent
+            release() removed)
+        """
+        if not self.has(digest):
+            return False
+        dest = Path(dest)
+        try:
+            # Renaming a link over itself is a no-op that would leave tmp behind
+            if os.path.samefile(self.path(digest), dest):
+                return True
+        except OSError:
+            pass
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + ".link")
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(self.path(digest), tmp)
+        except FileNotFoundError:
+            return False  # Released since has()
+        except OSError:
+            try:
+                shutil.copyfile(self.path(digest), tmp)
+            except FileNotFoundError:
+                tmp.unlink(missing_ok=True)
+                return False
+            self._count("copies")
+        os.replace(tmp, dest)
+        return True
+
+    def adopt(self, src: Path, digest: str, dest: Optional[Path] = None) -> Path:
+        """
+        Move a freshly written file into the store and link it back
+
+        If the content is already stored, src is dropped in favour of the
+        existing blob.
+
+        Args:
+            src: File to store (removed or replaced by a link)
+            digest: SHA-256 of its content
+            dest: Where the tree expects the file (default: src)
+
+        Returns:
+            dest
+        """
+        src = Path(src)
+        dest = Path(dest) if dest is not None else src
+        if not self.enabled or not digest:
+            if src != dest:
+                os.replace(src, dest)
+            return dest
+
+        if self.has(digest):
+            self._count("deduplicated")
+        else:
+            self._store(src, digest)
+
+        if not self.link(digest, dest):
+            # A concurrent release() removed the blob src was deduplicated
+            # against: src is still here, store it again
+            self._store(src, digest)
+            if not self.link(digest, dest):
+                raise FileNotFoundError(f"Blob {digest} was removed while linking {dest}")
+        if src != dest:
+            src.unlink(missing_ok=True)
+        return dest
+
+    def _store(self, src: Path, digest: str):
+        """Put src's content in the store as blob digest"""
+        blob = self.path(digest)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copyfile(src, tmp)
+        os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp, blob)
+        self._count("stored")
+
+    def put_file(self, path: Path, digest: Optional[str] = None) -> str:
+        """Store an existing file in place (hashing it unless digest is given)"""
+        path = Path(path)
+        if not digest:
+            digest = hash_file(path)
+        self.adopt(path, digest)
+        return digest
+
+    def release(self, digests: Iterable[str]) -> int:
+        """
+        Remove blobs no tree links to any more (call after deleting a tree)
+
+        Returns:
+            Number of blobs removed
+        """
+        if not self.enabled:
+            return 0
+        removed = 0
+        for digest in set(digests):
+            if not digest:
+                continue
+            blob = self.path(digest)
+            try:
+                if blob.stat().st_nlink <= 1:
+                    blob.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.info(f"🗑️ Released {removed} unreferenced blobs")
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "stored": self.stored,
+                "deduplicated": self.deduplicated,
+                "copies": self.copies,
+            }
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get global blob store instance"""
+    global _blob_store
+    if _blob_store is None:
+        settings = get_settings()
+        upload_dir = ensure_upload_dir()
+        _blob_store = BlobStore(
+            settings.blob_store_dir or str(upload_dir / "blobs"),
+            enabled=settings.blob_store_enabled,
+            tree_root=str(upload_dir),
+        )
+    return _blob_store
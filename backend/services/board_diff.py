@@ -0,0 +1,344 @@
+"""
+Board diff for incremental re-analysis
+Compares two canonical boards (e.g. consecutive uploads of a project) and
+reports which rule inputs changed, so DRC only re-runs the affected checks
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from models.canonical import Board, Component, Net, Point, Polygon
+from models.columnar import TrackTable, ViaTable
+
+
+# Rule inputs a check can declare a dependency on
+INPUT_COMPONENTS = "components"  # component set and properties (value, footprint, MPN, pads, ...)
+INPUT_PLACEMENT = "placement"    # component position, rotation and side
+INPUT_NETS = "nets"              # net set, pin membership, class and electrical attributes
+INPUT_TRACKS = "tracks"
+INPUT_VIAS = "vias"
+INPUT_ZONES = "zones"
+INPUT_OUTLINE = "outline"
+INPUT_STACKUP = "stackup"
+
+ALL_INPUTS: FrozenSet[str] = frozenset({
+    INPUT_COMPONENTS, INPUT_PLACEMENT, INPUT_NETS, INPUT_TRACKS,
+    INPUT_VIAS, INPUT_ZONES, INPUT_OUTLINE, INPUT_STACKUP,
+})
+
+# Values are compared exactly: the parsers turn identical source text into
+# identical floats, so any difference is a real edit in the design
+
+
+def _point(p: Optional[Point]) -> Optional[Tuple[float, float]]:
+    return None if p is None else (p.x, p.y)
+
+
+def _polygon(poly: Optional[Polygon]) -> Optional[Tuple]:
+    if poly is None:
+        return None
+    return (
+        tuple(_point(p) for p in poly.points),
+        tuple(tuple(_point(p) for p in hole) for hole in poly.holes),
+    )
+
+
+def _placement_signature(comp: Component) -> Tuple:
+    return (_point(comp.position), comp.rotation, comp.side, comp.layer)
+
+
+def _component_signature(comp: Component) -> Tuple:
+    pads = tuple(
+        (p.id, p.net, p.layer, _point(p.position), p.shape, p.size_x, p.size_y, p.drill)
+        for p in comp.pads
+    )
+    return (
+        comp.value, comp.footprint, comp.manufacturer, comp.mpn, comp.supplier, comp.spn,
+        comp.description, comp.package, comp.height, pads,
+        tuple(sorted(comp.properties.items())),
+    )
+
+
+def _net_signature(net: Net) -> Tuple:
+    return (
+        net.net_class, tuple(sorted(net.pins)), net.is_power, net.is_ground,
+        net.is_differential, net.is_high_voltage, net.voltage, net.current,
+        net.pair_name, net.is_positive, net.impedance, net.max_length,
+        net.min_length, net.width, net.clearance,
+    )
+
+
+def _track_keys(tracks) -> Counter:
+    """Multiset of track geometry (ids are positional, so they are ignored)"""
+    if isinstance(tracks, TrackTable):
+        names, layers = tracks.nets, tracks.layers
+        rows = zip(
+            tracks.net_id.tolist(), tracks.layer_id.tolist(),
+            tracks.x1.tolist(), tracks.y1.tolist(),
+            tracks.x2.tolist(), tracks.y2.tolist(),
+            tracks.width.tolist(),
+        )
+        # NaN marks missing geometry; map it to None so equal rows compare equal
+        return Counter(
+            (names[n], layers[l],
+             None if x1 != x1 else (x1, y1), None if x2 != x2 else (x2, y2), w)
+            for n, l, x1, y1, x2, y2, w in rows
+        )
+    return Counter(
+        (t.net, t.layer, _point(t.start), _point(t.end), t.width) for t in tracks
+    )
+
+
+def _remap_ids(ids: np.ndarray, source, target) -> np.ndarray:
+    """Translate interned ids from one StringTable to another (-2 = absent)"""
+    lookup = [target.id_of(value) for value in source.strings]
+    # Trailing entry maps id -1 (None) to itself
+    lookup = np.array([-2 if i is None else i for i in lookup] + [-1], dtype=np.int64)
+    return lookup[ids]
+
+
+def _tracks_identical(old, new) -> bool:
+    """Vectorized row-by-row equality for two TrackTables"""
+    if len(old) != len(new):
+        return False
+    for column in ("x1", "y1", "x2", "y2", "width"):
+        if not np.array_equal(getattr(old, column), getattr(new, column), equal_nan=True):
+            return False
+    return (
+        np.array_equal(_remap_ids(old.net_id, old.nets, new.nets), new.net_id)
+        and np.array_equal(_remap_ids(old.layer_id, old.layers, new.layers), new.layer_id)
+    )
+
+
+def _via_keys(vias) -> Counter:
+    if isinstance(vias, ViaTable):
+        vias = iter(vias)
+    return Counter(
+        (v.net, _point(v.position), v.size, v.drill, v.start_layer, v.end_layer)
+        for v in vias
+    )
+
+
+def _same_order(old, new, key) -> bool:
+    """Cheap check for the common case of an unchanged, identically ordered list"""
+    if len(old) != len(new):
+        return False
+    return all(key(a) == key(b) for a, b in zip(old, new))
+
+
+def _track_key(t) -> Tuple:
+    return (t.net, t.layer, t.start, t.end, t.width)
+
+
+def _via_key(v) -> Tuple:
+    return (v.net, v.position, v.size, v.drill, v.start_layer, v.end_layer)
+
+
+def _multiset_delta(old: Counter, new: Counter) -> Tuple[int, int]:
+    """(added, removed) element counts between two multisets"""
+    if old == new:
+        return 0, 0
+    return sum((new - old).values()), sum((old - new).values())
+
+
+def _zone_keys(board: Board) -> Counter:
+    return Counter(
+        (z.net, z.layer, _polygon(z.polygon), z.clearance, z.min_width, z.is_keepout, z.priority)
+        for z in board.zones
+    )
+
+
+def _outline_signature(board: Board) -> Optional[Tuple]:
+    outline = board.outline
+    if outline is None:
+        return None
+    return (_polygon(outline.polygon), outline.thickness, tuple(_polygon(c) for c in outline.cutouts))
+
+
+def _stackup_signature(board: Board) -> Optional[Tuple]:
+    stackup = board.stackup
+    if stackup is None:
+        return None
+    return (
+        tuple((l.name, l.type, l.order, l.thickness, l.material, l.copper_weight)
+              for l in stackup.layers),
+        stackup.total_thickness, stackup.layer_count,
+    )
+
+
+def _keyed(items: Iterable, key) -> Dict:
+    """First item per key, matching Board.get_component/get_net semantics"""
+    out = {}
+    for item in items:
+        out.setdefault(key(item), item)
+    return out
+
+
+@dataclass
+class BoardDiff:
+    """Changes between two versions of a board"""
+    added_components: List[str] = field(default_factory=list)
+    removed_components: List[str] = field(default_factory=list)
+    moved_components: List[str] = field(default_factory=list)
+    changed_components: List[str] = field(default_factory=list)
+    added_nets: List[str] = field(default_factory=list)
+    removed_nets: List[str] = field(default_factory=list)
+    changed_nets: List[str] = field(default_factory=list)
+    tracks_added: int = 0
+    tracks_removed: int = 0
+    vias_added: int = 0
+    vias_removed: int = 0
+    zones_changed: bool = False
+    outline_changed: bool = False
+    stackup_changed: bool = False
+    complete: bool = True  # False when diff_boards stopped early (stop callback)
+
+    @property
+    def changed_inputs(self) -> FrozenSet[str]:
+        """Rule inputs touched by this diff"""
+        inputs = set()
+        if self.added_components or self.removed_components:
+            inputs.update((INPUT_COMPONENTS, INPUT_PLACEMENT))
+        if self.changed_components:
+            inputs.add(INPUT_COMPONENTS)
+        if self.moved_components:
+            inputs.add(INPUT_PLACEMENT)
+        if self.added_nets or self.removed_nets or self.changed_nets:
+            inputs.add(INPUT_NETS)
+        if self.tracks_added or self.tracks_removed:
+            inputs.add(INPUT_TRACKS)
+        if self.vias_added or self.vias_removed:
+            inputs.add(INPUT_VIAS)
+        if self.zones_changed:
+            inputs.add(INPUT_ZONES)
+        if self.outline_changed:
+            inputs.add(INPUT_OUTLINE)
+        if self.stackup_changed:
+            inputs.add(INPUT_STACKUP)
+        return frozenset(inputs)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.changed_inputs
+
+    def to_dict(self) -> Dict:
+        """Summary for logs and API responses"""
+        return {
+            "changed_inputs": sorted(self.changed_inputs),
+            "components": {
+                "added": self.added_components,
+                "removed": self.removed_components,
+                "moved": self.moved_components,
+                "changed": self.changed_components,
+            },
+            "nets": {
+                "added": self.added_nets,
+                "removed": self.removed_nets,
+                "changed": self.changed_nets,
+            },
+            "tracks": {"added": self.tracks_added, "removed": self.tracks_removed},
+            "vias": {"added": self.vias_added, "removed": self.vias_removed},
+            "zones_changed": self.zones_changed,
+            "outline_changed": self.outline_changed,
+            "stackup_changed": self.stackup_changed,
+            "complete": self.complete,
+        }
+
+
+def diff_boards(
+    old: Board,
+    new: Board,
+    stop: Optional[Callable[[FrozenSet[str]], bool]] = None,
+) -> BoardDiff:
+    """
+    Compare two boards
+
+    Components are matched by refdes and nets by name. Tracks, vias and
+    zones have no stable identity between exports, so they are compared as
+    multisets of their geometry and attributes.
+
+    Inputs are compared one group at a time, placement first. After each
+    group, stop (if given) is called with the inputs changed so far; when it
+    returns True the diff ends there with complete=False. DRC uses this to
+    give up on incremental runs as soon as they cannot pay off, without
+    paying for the rest of the diff.
+
+    Args:
+        old: Previously analyzed board
+        new: New version
+        stop: Called with changed_inputs between groups
+
+    Returns:
+        BoardDiff describing what changed (only partly if stopped)
+    """
+    diff = BoardDiff()
+
+    def stopped() -> bool:
+        if stop is not None and stop(diff.changed_inputs):
+            diff.complete = False
+        return not diff.complete
+
+    old_comps = _keyed(old.components, lambda c: c.refdes)
+    new_comps = _keyed(new.components, lambda c: c.refdes)
+    diff.added_components = [r for r in new_comps if r not in old_comps]
+    diff.removed_components = [r for r in old_comps if r not in new_comps]
+    matched = [(old_comps[refdes], comp) for refdes, comp in new_comps.items() if refdes in old_comps]
+    for before, comp in matched:
+        if _placement_signature(before) != _placement_signature(comp):
+            diff.moved_components.append(comp.refdes)
+            # Placement feeds the costliest checks: settle it at the first move
+            if len(diff.moved_components) == 1 and stopped():
+                return diff
+    if stopped():
+        return diff
+
+    diff.changed_components = [
+        comp.refdes for before, comp in matched
+        if _component_signature(before) != _component_signature(comp)
+    ]
+    if stopped():
+        return diff
+
+    old_nets = _keyed(old.nets, lambda n: n.name)
+    new_nets = _keyed(new.nets, lambda n: n.name)
+    diff.added_nets = [n for n in new_nets if n not in old_nets]
+    diff.removed_nets = [n for n in old_nets if n not in new_nets]
+    diff.changed_nets = [
+        name for name, net in new_nets.items()
+        if name in old_nets and _net_signature(old_nets[name]) != _net_signature(net)
+    ]
+    if stopped():
+        return diff
+
+    # Re-exports usually keep routing in file order, so an in-order pass
+    # (vectorized for columnar tracks) settles the unchanged case before
+    # falling back to the multiset comparison
+    if isinstance(old.tracks, TrackTable) and isinstance(new.tracks, TrackTable):
+        tracks_same = _tracks_identical(old.tracks, new.tracks)
+    elif isinstance(old.tracks, list) and isinstance(new.tracks, list):
+        tracks_same = _same_order(old.tracks, new.tracks, _track_key)
+    else:
+        tracks_same = False
+    if not tracks_same:
+        diff.tracks_added, diff.tracks_removed = _multiset_delta(
+            _track_keys(old.tracks), _track_keys(new.tracks)
+        )
+    if stopped():
+        return diff
+
+    vias_same = (
+        isinstance(old.vias, list) and isinstance(new.vias, list)
+        and _same_order(old.vias, new.vias, _via_key)
+    )
+    if not vias_same:
+        diff.vias_added, diff.vias_removed = _multiset_delta(_via_keys(old.vias), _via_keys(new.vias))
+    if stopped():
+        return diff
+
+    diff.zones_changed = _zone_keys(old) != _zone_keys(new)
+    diff.outline_changed = _outline_signature(old) != _outline_signature(new)
+    diff.stackup_changed = _stackup_signature(old) != _stackup_signature(new)
+
+    return diff
@@ -2,24 +2,280 @@
 Cache Service
 Provides caching for analysis results to avoid recomputation
 Supports both Redis (production) and in-memory (dev) backends
+
+A second, on-disk tier (ParsedBoardCache) keeps parsed boards keyed by
+source content hash and parser version, so re-analysis skips parsing
 """
 import json
 import hashlib
 import logging
-from typing import Optional, Any
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Any, Dict, Iterable, List, Tuple
 from functools import lru_cache
 from datetime import datetime
 from config import get_settings
+from tracing import span
+from services.blob_store import hash_file
+from services.archive_ingest import blob_hashes
 
 logger = logging.getLogger(__name__)
 
+try:
+    import zstandard
+except ImportError:  # zlib is used instead
+    zstandard = None
+
+
+# Payload codec: one flag byte, then the (possibly compressed) JSON.
+# Entries written before compression was added start with '{'.
+_CODEC_RAW = b'J'
+_CODEC_ZLIB = b'z'
+_CODEC_ZSTD = b'Z'
+
+
+def encode_payload(data: dict, compression: str = "zstd", min_bytes: int = 1024) -> bytes:
+    """
+    Serialize a cache entry to compact bytes
+    
+    Args:
+        data: JSON-serializable entry
+        compression: "zstd", "zlib" or "none" (zstd falls back to zlib
+            when the zstandard package is not installed)
+        min_bytes: Payloads smaller than this are stored uncompressed
+    """
+    raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    if compression == "none" or len(raw) < min_bytes:
+        return _CODEC_RAW + raw
+    if compression == "zstd" and zstandard is not None:
+        return _CODEC_ZSTD + zstandard.ZstdCompressor(level=3).compress(raw)
+    return _CODEC_ZLIB + zlib.compress(raw, 6)
+
+
+def decode_payload(blob: bytes) -> dict:
+    """Inverse of encode_payload (also reads legacy plain-JSON entries)"""
+    codec, body = blob[:1], blob[1:]
+    if codec == _CODEC_RAW:
+        raw = body
+    elif codec == _CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd-compressed cache entry but zstandard is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(body)
+    elif codec == _CODEC_ZLIB:
+        raw = zlib.decompress(body)
+    else:
+        raw = blob
+    return json.loads(raw)
+
+
+# Connection pools shared by every CacheService, one per Redis URL
+_redis_pools: Dict[str, Any] = {}
+_redis_pools_lock = threading.Lock()
+
+
+def get_redis_pool(url: str, max_connections: int, socket_timeout: float):
+    """Get or create the shared Redis connection pool for a URL"""
+    import redis
+    
+    with _redis_pools_lock:
+        pool = _redis_pools.get(url)
+        if pool is None:
+            pool = redis.ConnectionPool.from_url(
+                url,
+                max_connections=max_connections,
+                socket_timeout=socket_timeout,
+                socket_connect_timeout=socket_timeout,
+                health_check_interval=30
+            )
+            _redis_pools[url] = pool
+        return pool
+
+
+class MemoryCache:
+    """
+    Thread-safe in-process LRU cache with a byte budget
+    
+    Values are serialized bytes, and the budget is measured on their size.
+    Hits refresh recency; inserts evict least recently used entries until
+    the total fits in `max_bytes`. Expired entries are dropped on read and
+    by a background sweeper thread every `sweep_interval` seconds.
+    Statistics are kept per namespace (the key prefix before the first ':').
+    """
+    
+    def __init__(self, max_bytes: int, sweep_interval: float = 60.0):
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        # key -> (value, expires_at on the monotonic clock), LRU first
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._total_bytes = 0
+        self._namespaces: Dict[str, Dict[str, int]] = {}
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    @staticmethod
+    def namespace_of(key: str) -> str:
+        return key.split(':', 1)[0]
+    
+    def _ns(self, key: str) -> Dict[str, int]:
+        """Stats counters for a key's namespace (lock held)"""
+        ns = self.namespace_of(key)
+        stats = self._namespaces.get(ns)
+        if stats is None:
+            stats = self._namespaces[ns] = {
+                'entries': 0, 'bytes': 0, 'hits': 0, 'misses': 0,
+                'sets': 0, 'evictions': 0, 'expirations': 0
+            }
+        return stats
+    
+    def get(self, key: str) -> Tuple[Optional[bytes], bool]:
+        """
+        Look up a value
+        
+        Returns:
+            (value, expired) - value is None on a miss; expired tells a
+            miss caused by TTL apart from an absent key
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._ns(key)['misses'] += 1
+                return None, False
+            
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._drop(key, 'expirations')
+                self._ns(key)['misses'] += 1
+                return None, True
+            
+            self._entries.move_to_end(key)
+            self._ns(key)['hits'] += 1
+            return value, False
+    
+    def set(self, key: str, value: bytes, ttl: float) -> bool:
+        """Store a value; False if it alone exceeds the byte budget"""
+        size = len(value)
+        if size > self.max_bytes:
+            return False
+        
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._total_bytes += size
+            stats = self._ns(key)
+            stats['entries'] += 1
+            stats['bytes'] += size
+            stats['sets'] += 1
+            
+            while self._total_bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)), 'evictions')
+        
+        self._ensure_sweeper()
+        return True
+    
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._drop(key)
+            return True
+    
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every key starting with prefix; returns the count"""
+        with self._lock:
+            keys = [k for k in self._entries if k.startswith(prefix)]
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+    
+    def sweep(self) -> int:
+        """Drop all expired entries; returns the count"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                self._drop(key, 'expirations')
+        if expired:
+            logger.debug(f"Memory cache sweep removed {len(expired)} expired entries")
+        return len(expired)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            for stats in self._namespaces.values():
+                stats['entries'] = 0
+                stats['bytes'] = 0
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'namespaces': {ns: dict(stats) for ns, stats in self._namespaces.items()}
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def close(self):
+        """Stop the background sweeper"""
+        self._stop.set()
+    
+    def _drop(self, key: str, reason: Optional[str] = None):
+        """Remove an entry and update counters (lock held)"""
+        value, _ = self._entries.pop(key)
+        self._total_bytes -= len(value)
+        stats = self._ns(key)
+        stats['entries'] -= 1
+        stats['bytes'] -= len(value)
+        if reason:
+            stats[reason] += 1
+    
+    def _ensure_sweeper(self):
+        if self._sweeper is not None or self.sweep_interval <= 0:
+            return
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, name="memory-cache-sweeper", daemon=True
+            )
+            self._sweeper.start()
+    
+    def _sweep_loop(self):
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Memory cache sweep failed: {e}")
+
 
 class CacheService:
     """
     Caching service with fallback from Redis to in-memory
     """
     
-    def __init__(self):
+    # Keys per pipelined MGET round trip in get_many()
+    MGET_BATCH = 500
+    
+    def __init__(self, redis_client=None):
+        """
+        Args:
+            redis_client: Optional pre-built client (e.g. fakeredis in
+                tests); by default one is built from settings.redis_url on
+                the shared connection pool
+        """
         self.settings = get_settings()
         self.redis_client = None
         self.use_redis = False
@@ -27,19 +283,21 @@ class CacheService:
         # Try to initialize Redis if enabled
         if self.settings.enable_caching:
             try:
-                import redis
-                self.redis_client = redis.Redis(
-                    host='localhost',
-                    port=6379,
-                    db=0,
-                    decode_responses=False  # We'll handle encoding
-                )
+                if redis_client is None:
+                    import redis
+                    redis_client = redis.Redis(connection_pool=get_redis_pool(
+                        self.settings.redis_url,
+                        self.settings.redis_max_connections,
+                        self.settings.redis_socket_timeout
+                    ))
+                self.redis_client = redis_client
                 # Test connection
                 self.redis_client.ping()
                 self.use_redis = True
                 logger.info("✅ Cache: Using Redis backend")
             except (ImportError, Exception) as e:
                 logger.warning(f"Redis unavailable, falling back to in-memory cache: {e}")
+                self.redis_client = None
                 self.use_redis = False
         else:
             logger.info("Caching disabled in config")
@@ -74,6 +332,21 @@ class CacheService:
         """
         return f"analysis:{project_id}:{file_hash}:{profile}"
     
+    @staticmethod
+    def _project_index_key(cache_key: str) -> Optional[str]:
+        """Redis set listing a project's keys, for analysis:{project_id}:... keys"""
+        parts = cache_key.split(':', 2)
+        if len(parts) == 3 and parts[0] == 'analysis':
+            return f"analysis-index:{parts[1]}"
+        return None
+    
+    def _encode(self, cache_data: dict) -> bytes:
+        return encode_payload(
+            cache_data,
+            self.settings.cache_compression,
+            self.settings.cache_compression_min_bytes
+        )
+    
     def get(self, cache_key: str) -> Optional[dict]:
         """
         Get cached analysis result
@@ -93,7 +366,7 @@ class CacheService:
                 data = self.redis_client.get(cache_key)
                 if data:
                     logger.info(f"✅ Cache HIT: {cache_key[:50]}...")
-                    return json.loads(data.decode('utf-8'))
+                    return decode_payload(data)['data']
                 else:
                     logger.info(f"❌ Cache MISS: {cache_key[:50]}...")
                     return None
@@ -105,6 +378,45 @@ class CacheService:
             logger.error(f"Cache get failed: {e}")
             return None
     
+    def get_many(self, cache_keys: List[str]) -> Dict[str, Optional[dict]]:
+        """
+        Get several cached results at once
+        
+        With Redis the keys are fetched with MGET in batches of MGET_BATCH,
+        all sent in one pipeline round trip.
+        
+        Args:
+            cache_keys: Cache keys
+        
+        Returns:
+            Dict of key -> cached data (None where missing)
+        """
+        results: Dict[str, Optional[dict]] = {key: None for key in cache_keys}
+        if not self.settings.enable_caching or not cache_keys:
+            return results
+        
+        try:
+            if self.use_redis and self.redis_client:
+                keys = list(results)
+                pipe = self.redis_client.pipeline(transaction=False)
+                for i in range(0, len(keys), self.MGET_BATCH):
+                    pipe.mget(keys[i:i + self.MGET_BATCH])
+                
+                values = [v for batch in pipe.execute() for v in batch]
+                for key, data in zip(keys, values):
+                    if data:
+                        results[key] = decode_payload(data)['data']
+                
+                hits = sum(1 for v in results.values() if v is not None)
+                logger.info(f"Cache MGET: {hits}/{len(keys)} hits")
+            else:
+                for key in results:
+                    results[key] = self._get_from_memory(key)
+        except Exception as e:
+            logger.error(f"Cache get_many failed: {e}")
+        
+        return results
+    
     def set(self, cache_key: str, data: dict, ttl: Optional[int] = None) -> bool:
         """
         Store analysis result in cache
@@ -132,14 +444,21 @@ class CacheService:
             }
             
             if self.use_redis and self.redis_client:
-                # Store in Redis
-                json_data = json.dumps(cache_data)
-                self.redis_client.setex(cache_key, ttl, json_data)
-                logger.info(f"💾 Cached: {cache_key[:50]}... (TTL: {ttl}s)")
+                # Store in Redis, and record the key in its project's index set
+                # so clear_project_cache never has to walk the keyspace
+                payload = self._encode(cache_data)
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.set(cache_key, payload, ex=ttl)
+                index_key = self._project_index_key(cache_key)
+                if index_key:
+                    pipe.sadd(index_key, cache_key)
+                    pipe.expire(index_key, ttl)
+                pipe.execute()
+                logger.info(f"💾 Cached: {cache_key[:50]}... (TTL: {ttl}s, {len(payload)} bytes)")
                 return True
             else:
-                # Store in memory
-                return self._set_in_memory(cache_key, cache_data, ttl)
+                # Store in memory (serialized, so the byte budget is exact)
+                return self._set_in_memory(cache_key, json.dumps(cache_data).encode('utf-8'), ttl)
                 
         except Exception as e:
             logger.error(f"Cache set failed: {e}")
@@ -157,8 +476,12 @@ class CacheService:
         """
         try:
             if self.use_redis and self.redis_client:
-                result = self.redis_client.delete(cache_key)
-                return result > 0
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.delete(cache_key)
+                index_key = self._project_index_key(cache_key)
+                if index_key:
+                    pipe.srem(index_key, cache_key)
+                return pipe.execute()[0] > 0
             else:
                 return self._delete_from_memory(cache_key)
         except Exception as e:
@@ -177,14 +500,22 @@ class CacheService:
         """
         try:
             if self.use_redis and self.redis_client:
-                # Find all keys matching pattern
-                pattern = f"analysis:{project_id}:*"
-                keys = self.redis_client.keys(pattern)
-                if keys:
-                    deleted = self.redis_client.delete(*keys)
+                # Keys come from the project's index set; entries written
+                # before the index existed are found with an incremental
+                # SCAN (never the blocking KEYS command)
+                index_key = f"analysis-index:{project_id}"
+                keys = set(self.redis_client.smembers(index_key))
+                keys.update(self.redis_client.scan_iter(match=f"analysis:{project_id}:*", count=1000))
+                
+                deleted = 0
+                keys = list(keys)
+                for i in range(0, len(keys), self.MGET_BATCH):
+                    deleted += self.redis_client.delete(*keys[i:i + self.MGET_BATCH])
+                self.redis_client.delete(index_key)
+                
+                if deleted:
                     logger.info(f"🗑️ Cleared {deleted} cache entries for project {project_id}")
-                    return deleted
-                return 0
+                return deleted
             else:
                 # Clear from memory cache
                 return self._clear_memory_pattern(f"analysis:{project_id}:")
@@ -202,79 +533,388 @@ class CacheService:
         stats = {
             'backend': 'redis' if self.use_redis else 'memory',
             'enabled': self.settings.enable_caching,
-            'ttl': self.settings.cache_ttl
+            'ttl': self.settings.cache_ttl,
+            'parsed_boards': get_parsed_board_cache().get_stats()
         }
         
+        compression = self.settings.cache_compression
+        if compression == 'zstd' and zstandard is None:
+            compression = 'zlib'
+        stats['compression'] = compression
+        
         try:
             if self.use_redis and self.redis_client:
                 info = self.redis_client.info()
                 stats['redis_keys'] = self.redis_client.dbsize()
                 stats['redis_memory'] = info.get('used_memory_human', 'N/A')
+                pool = getattr(self.redis_client, 'connection_pool', None)
+                if pool is not None:
+                    stats['redis_max_connections'] = getattr(pool, 'max_connections', None)
             else:
-                stats['memory_keys'] = len(self._memory_cache)
+                memory_stats = self._memory().stats()
+                stats['memory_keys'] = memory_stats['entries']
+                stats['memory'] = memory_stats
         except:
             pass
         
         return stats
     
-    # In-memory cache fallback (LRU with max size)
-    _memory_cache = {}
-    _cache_max_size = 100
+    # In-memory cache fallback (LRU with a byte budget), shared by all instances
+    _memory_cache: Optional[MemoryCache] = None
+    
+    @classmethod
+    def _memory(cls) -> MemoryCache:
+        if cls._memory_cache is None:
+            settings = get_settings()
+            cls._memory_cache = MemoryCache(
+                settings.memory_cache_max_bytes,
+                settings.memory_cache_sweep_interval
+            )
+        return cls._memory_cache
     
     @classmethod
     def _get_from_memory(cls, key: str) -> Optional[dict]:
         """Get from in-memory cache"""
-        if key in cls._memory_cache:
-            entry = cls._memory_cache[key]
-            # Check TTL
-            cached_at = datetime.fromisoformat(entry['cached_at'])
-            age = (datetime.utcnow() - cached_at).total_seconds()
-            if age < entry['ttl']:
-                logger.info(f"✅ Memory cache HIT: {key[:50]}...")
-                return entry['data']
-            else:
-                # Expired
-                del cls._memory_cache[key]
-                logger.info(f"⏰ Memory cache EXPIRED: {key[:50]}...")
-                return None
+        raw, expired = cls._memory().get(key)
+        if raw is not None:
+            logger.info(f"✅ Memory cache HIT: {key[:50]}...")
+            return json.loads(raw)['data']
+        if expired:
+            logger.info(f"⏰ Memory cache EXPIRED: {key[:50]}...")
         else:
             logger.info(f"❌ Memory cache MISS: {key[:50]}...")
-            return None
+        return None
     
     @classmethod
-    def _set_in_memory(cls, key: str, data: dict, ttl: int) -> bool:
-        """Store in memory cache"""
-        # Implement simple LRU: remove oldest if at capacity
-        if len(cls._memory_cache) >= cls._cache_max_size:
-            # Remove first (oldest) item
-            oldest_key = next(iter(cls._memory_cache))
-            del cls._memory_cache[oldest_key]
-        
-        cls._memory_cache[key] = data
-        logger.info(f"💾 Memory cached: {key[:50]}... (TTL: {ttl}s)")
+    def _set_in_memory(cls, key: str, data: bytes, ttl: int) -> bool:
+        """Store serialized entry in memory cache"""
+        if not cls._memory().set(key, data, ttl):
+            logger.warning(f"Entry too large for memory cache: {key[:50]}... ({len(data)} bytes)")
+            return False
+        logger.info(f"💾 Memory cached: {key[:50]}... (TTL: {ttl}s, {len(data)} bytes)")
         return True
     
     @classmethod
     def _delete_from_memory(cls, key: str) -> bool:
         """Delete from memory cache"""
-        if key in cls._memory_cache:
-            del cls._memory_cache[key]
-            return True
-        return False
+        return cls._memory().delete(key)
     
     @classmethod
     def _clear_memory_pattern(cls, pattern: str) -> int:
         """Clear memory cache entries matching pattern"""
-        keys_to_delete = [k for k in cls._memory_cache.keys() if k.startswith(pattern)]
-        for key in keys_to_delete:
-            del cls._memory_cache[key]
-        if keys_to_delete:
-            logger.info(f"🗑️ Cleared {len(keys_to_delete)} memory cache entries")
-        return len(keys_to_delete)
+        deleted = cls._memory().delete_prefix(pattern)
+        if deleted:
+            logger.info(f"🗑️ Cleared {deleted} memory cache entries")
+        return deleted
+
+
+class ParsedBoardCache:
+    """
+    Persistent cache of parsed boards (ParsedPCBData, canonical Board)
+    
+    Entries are keyed by the SHA256 of the source files and the parser
+    version (the parser's PARSER_VERSION plus a hash of its package's
+    source, see parser_code_version), so a re-run with another fab profile
+    or rule set reuses the parse, while a new upload or a parser change
+    misses. Parses the parser reports as degraded are not stored. Files with a blob
+    hash in their tree's manifest are not read again to compute the key, and
+    an unchanged board in a new project version hits. Entries are
+    pickled and zlib-compressed behind a small header, one file per entry.
+    Total size on disk is bounded by `max_bytes`, evicting the least
+    recently used entries first.
+    """
+    
+    MAGIC = b"BMPB"
+    FORMAT_VERSION = 1
+    # magic, format version, parser version length
+    _HEADER = struct.Struct("<4sBH")
+    _SUFFIX = ".bin"
+    
+    def __init__(self, cache_dir: str, max_bytes: int, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # path -> size in bytes, least recently used first
+        self._entries: "OrderedDict[Path, int]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+        
+        if self.enabled:
+            self._load_index()
+    
+    def _load_index(self):
+        """Rebuild the LRU index from the files on disk (mtime = last use)"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            found = []
+            for path in self.cache_dir.glob(f"*/*{self._SUFFIX}"):
+                stat = path.stat()
+                found.append((stat.st_mtime, path, stat.st_size))
+            for _, path, size in sorted(found):
+                self._entries[path] = size
+                self._total_bytes += size
+            logger.info(f"Parsed board cache: {len(self._entries)} entries, "
+                        f"{self._total_bytes / 1e6:.1f} MB in {self.cache_dir}")
+        except OSError as e:
+            logger.warning(f"Parsed board cache unavailable, disabling: {e}")
+            self.enabled = False
+    
+    @staticmethod
+    def compute_source_hash(paths: Iterable[Path], known: Optional[Dict[str, Tuple[int, str]]] = None) -> str:
+        """
+        SHA256 over the names and content hashes of the files a parser reads
+        
+        Args:
+            paths: Source files, in a stable order
+            known: Absolute path -> (size, SHA256) of files already hashed
+                (blob hashes from the archive manifest)
+        
+        Returns:
+            Hex digest, or "" if there are no files
+        """
+        known = known or {}
+        sha256 = hashlib.sha256()
+        count = 0
+        for path in paths:
+            path = Path(path)
+            size, digest = known.get(os.path.abspath(path), (None, ""))
+            if not digest or path.stat().st_size != size:
+                digest = hash_file(path)
+            sha256.update(f"{path.name}\0{digest}\n".encode("utf-8"))
+            count += 1
+        return sha256.hexdigest() if count else ""
+    
+    def _path_for(self, source_hash: str, parser_version: str) -> Path:
+        version_tag = hashlib.sha256(parser_version.encode("utf-8")).hexdigest()[:12]
+        return self.cache_dir / source_hash[:2] / f"{source_hash}-{version_tag}{self._SUFFIX}"
+    
+    def get(self, source_hash: str, parser_version: str) -> Optional[Any]:
+        """
+        Load a cached parse
+        
+        Returns:
+            The cached object, or None on a miss
+        """
+        if not self.enabled or not source_hash:
+            return None
+        
+        path = self._path_for(source_hash, parser_version)
+        try:
+            with open(path, 'rb') as f:
+                blob = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except OSError as e:
+            logger.error(f"Parsed board cache read failed: {e}")
+            with self._lock:
+                self.errors += 1
+                self.misses += 1
+            return None
+        
+        try:
+            value = self._decode(blob, parser_version)
+        except Exception as e:
+            # Corrupt or foreign file - drop it and parse again
+            logger.warning(f"Discarding unreadable parsed board cache entry {path.name}: {e}")
+            with self._lock:
+                self.errors += 1
+                self.misses += 1
+                self._remove(path)
+            return None
+        
+        with self._lock:
+            self.hits += 1
+            if path in self._entries:
+                self._entries.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        
+        logger.info(f"✅ Parsed board cache HIT: {source_hash[:12]}... ({parser_version})")
+        return value
+    
+    def set(self, source_hash: str, parser_version: str, value: Any) -> bool:
+        """
+        Store a parse result
+        
+        Returns:
+            True if written
+        """
+        if not self.enabled or not source_hash:
+            return False
+        
+        path = self._path_for(source_hash, parser_version)
+        try:
+            blob = self._encode(value, parser_version)
+        except Exception as e:
+            logger.error(f"Parsed board cache encode failed: {e}")
+            with self._lock:
+                self.errors += 1
+            return False
+        
+        if len(blob) > self.max_bytes:
+            logger.info(f"Parsed board too large to cache ({len(blob) / 1e6:.1f} MB)")
+            return False
+        
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so readers never see partial entries
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.error(f"Parsed board cache write failed: {e}")
+            with self._lock:
+                self.errors += 1
+            return False
+        
+        with self._lock:
+            self._total_bytes -= self._entries.pop(path, 0)
+            self._entries[path] = len(blob)
+            self._total_bytes += len(blob)
+            self.writes += 1
+            self._evict()
+        
+        logger.info(f"💾 Parsed board cached: {source_hash[:12]}... ({len(blob) / 1e6:.2f} MB)")
+        return True
+    
+    def get_or_parse(self, parser, project_path: Path) -> Any:
+        """
+        Return the cached parse of a project, parsing and storing it on a miss
+        
+        The parser must expose `parse(project_path)`. Caching is used when it
+        also exposes `PARSER_VERSION` and `source_files(project_path)`; a
+        `cacheable(result)` method, if present, can veto storing a result
+        (e.g. one where a stage failed and fell back to an empty value).
+        """
+        with span("parsing", parser=parser.__class__.__name__) as parse_span:
+            parser_version = getattr(parser, 'PARSER_VERSION', None)
+            source_files = getattr(parser, 'source_files', None)
+            if not self.enabled or parser_version is None or source_files is None:
+                parse_span.set(cache="disabled")
+                return parser.parse(project_path)
+            parser_version = f"{parser_version}+{parser_code_version(type(parser).__module__)}"
+            
+            try:
+                known = {
+                    os.path.abspath(Path(project_path) / name): entry
+                    for name, entry in blob_hashes(project_path).items()
+                }
+                source_hash = self.compute_source_hash(source_files(project_path), known)
+            except OSError as e:
+                logger.warning(f"Could not hash parser sources, parsing uncached: {e}")
+                parse_span.set(cache="error")
+                return parser.parse(project_path)
+            
+            cached = self.get(source_hash, parser_version)
+            if cached is not None:
+                parse_span.set(cache="hit")
+                return cached
+            
+            parse_span.set(cache="miss")
+            result = parser.parse(project_path)
+            cacheable = getattr(parser, 'cacheable', None)
+            if result is None or (cacheable is not None and not cacheable(result)):
+                parse_span.set(cache="skipped")
+            else:
+                self.set(source_hash, parser_version, result)
+            return result
+    
+    def clear(self) -> int:
+        """Delete every entry; returns the number removed"""
+        with self._lock:
+            paths = list(self._entries)
+            for path in paths:
+                self._remove(path)
+        return len(paths)
+    
+    def get_stats(self) -> dict:
+        """Hit/miss counters and size usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'errors': self.errors
+            }
+    
+    def _encode(self, value: Any, parser_version: str) -> bytes:
+        version = parser_version.encode("utf-8")
+        payload = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        return self._HEADER.pack(self.MAGIC, self.FORMAT_VERSION, len(version)) + version + payload
+    
+    def _decode(self, blob: bytes, parser_version: str) -> Any:
+        magic, fmt, version_len = self._HEADER.unpack_from(blob)
+        if magic != self.MAGIC or fmt != self.FORMAT_VERSION:
+            raise ValueError("unknown cache entry format")
+        start = self._HEADER.size
+        version = blob[start:start + version_len].decode("utf-8")
+        if version != parser_version:
+            raise ValueError(f"parser version mismatch ({version})")
+        return pickle.loads(zlib.decompress(blob[start + version_len:]))
+    
+    def _evict(self):
+        """Drop least recently used entries until under budget (lock held)"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            path = next(iter(self._entries))
+            self._remove(path)
+            self.evictions += 1
+    
+    def _remove(self, path: Path):
+        """Forget an entry and delete its file (lock held)"""
+        self._total_bytes -= self._entries.pop(path, 0)
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to delete parsed board cache entry {path.name}: {e}")
+
+
+@lru_cache(maxsize=None)
+def parser_code_version(module_name: str) -> str:
+    """
+    Hash of the source files of a parser module's package
+
+    Part of parsed board cache keys, so a parser fix invalidates old entries
+    even when PARSER_VERSION was not bumped. Empty when the source cannot
+    be read (PARSER_VERSION alone then keys the entries).
+    """
+    module = sys.modules.get(module_name)
+    source = getattr(module, '__file__', None)
+    if not source:
+        return ""
+    root = Path(source).parent
+    sha256 = hashlib.sha256()
+    try:
+        for path in sorted(root.rglob("*.py")):
+            sha256.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+            sha256.update(path.read_bytes())
+    except OSError as e:
+        logger.warning(f"Could not hash {module_name} sources for parsed board cache keys: {e}")
+        return ""
+    return sha256.hexdigest()[:12]
 
 
 # Global cache instance
 _cache_instance = None
+_parsed_board_cache = None
 
 
 def get_cache() -> CacheService:
@@ -283,3 +923,16 @@ def get_cache() -> CacheService:
     if _cache_instance is None:
         _cache_instance = CacheService()
     return _cache_instance
+
+
+def get_parsed_board_cache() -> ParsedBoardCache:
+    """Get or create global parsed board cache"""
+    global _parsed_board_cache
+    if _parsed_board_cache is None:
+        settings = get_settings()
+        _parsed_board_cache = ParsedBoardCache(
+            settings.parsed_cache_dir,
+            settings.parsed_cache_max_bytes,
+            enabled=settings.enable_caching
+        )
+    return _parsed_board_cache
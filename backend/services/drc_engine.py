@@ -10,9 +10,13 @@ from enum import Enum
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import multiprocessing as mp
 
-from models.canonical import Board, Component, Net, Via, Track
+import numpy as np
+
+from models.canonical import Board, Component, ComponentSide, Net, Via, Track
+from models.columnar import TrackTable
 from services.rule_profiles import RuleProfile, RuleProfileLibrary
 from services import geometry_utils
+from services.spatial_index import BoardSpatialIndex
 
 logger = logging.getLogger(__name__)
 
@@ -151,49 +155,45 @@ class DRCEngine:
         violations = []
         min_spacing = profile.min_component_spacing.value
         
-        components = board.components
-        
-        # Parallel processing of component pairs
-        # For very large boards, we can chunk this
-        for i, comp1 in enumerate(components):
-            for comp2 in components[i+1:]:
-                # Skip if different sides
-                if comp1.side != comp2.side:
-                    continue
-                
-                # Skip if positions not known
-                if not (comp1.position and comp2.position):
-                    continue
-                
-                # Calculate bbox-to-bbox distance (more accurate than center-to-center)
-                bbox1 = geometry_utils.component_bounding_box(comp1)
-                bbox2 = geometry_utils.component_bounding_box(comp2)
-                
-                if bbox1 and bbox2:
-                    distance = geometry_utils.bbox_distance(bbox1, bbox2)
-                else:
-                    # Fallback to center-to-center if bbox unavailable
-                    distance = geometry_utils.point_distance(comp1.position, comp2.position)
-                
-                if distance < min_spacing:
-                    violations.append(Violation(
-                        id=f"comp_spacing_{comp1.refdes}_{comp2.refdes}",
-                        category=ViolationCategory.COMPONENT_SPACING,
-                        severity=ViolationSeverity.WARNING,
-                        rule="min_component_spacing",
-                        description=f"Components too close: {comp1.refdes} and {comp2.refdes}",
-                        layer=comp1.side.value,
-                        x=(comp1.position.x + comp2.position.x) / 2,
-                        y=(comp1.position.y + comp2.position.y) / 2,
-                        component=f"{comp1.refdes},{comp2.refdes}",
-                        actual=round(distance, 3),
-                        required=min_spacing,
-                        details={
-                            "comp1": comp1.refdes,
-                            "comp2": comp2.refdes,
-                            "side": comp1.side.value
-                        }
-                    ))
+        # Only same-side pairs whose bounding boxes are within the rule distance
+        # can violate it, so let the spatial index enumerate those directly
+        spatial = BoardSpatialIndex.for_board(board)
+        order = {id(c): i for i, c in enumerate(board.components)}
+        candidate_pairs = []
+        for side in ComponentSide:
+            candidate_pairs.extend(spatial.component_boxes(side.value).pairs_within(min_spacing))
+        candidate_pairs.sort(key=lambda pair: (order[id(pair[0])], order[id(pair[1])]))
+        
+        for comp1, comp2 in candidate_pairs:
+            # Calculate bbox-to-bbox distance (more accurate than center-to-center)
+            bbox1 = geometry_utils.component_bounding_box(comp1)
+            bbox2 = geometry_utils.component_bounding_box(comp2)
+            
+            if bbox1 and bbox2:
+                distance = geometry_utils.bbox_distance(bbox1, bbox2)
+            else:
+                # Fallback to center-to-center if bbox unavailable
+                distance = geometry_utils.point_distance(comp1.position, comp2.position)
+            
+            if distance < min_spacing:
+                violations.append(Violation(
+                    id=f"comp_spacing_{comp1.refdes}_{comp2.refdes}",
+                    category=ViolationCategory.COMPONENT_SPACING,
+                    severity=ViolationSeverity.WARNING,
+                    rule="min_component_spacing",
+                    description=f"Components too close: {comp1.refdes} and {comp2.refdes}",
+                    layer=comp1.side.value,
+                    x=(comp1.position.x + comp2.position.x) / 2,
+                    y=(comp1.position.y + comp2.position.y) / 2,
+                    component=f"{comp1.refdes},{comp2.refdes}",
+                    actual=round(distance, 3),
+                    required=min_spacing,
+                    details={
+                        "comp1": comp1.refdes,
+                        "comp2": comp2.refdes,
+                        "side": comp1.side.value
+                    }
+                ))
         
         return violations
     
@@ -209,6 +209,8 @@ class DRCEngine:
         
         logger.info(f"Checking {len(hv_nets)} high-voltage nets")
         
+        spatial = BoardSpatialIndex.for_board(board)
+        
         for hv_net in hv_nets:
             # Determine required clearance based on voltage
             if hv_net.voltage and hv_net.voltage >= 300:
@@ -224,23 +226,16 @@ class DRCEngine:
             # Get components on this net
             hv_components = board.get_net_components(hv_net.name)
             
-            # Check clearance to other components
+            # Check clearance to nearby same-side components
             for hv_comp in hv_components:
                 if not hv_comp.position:
                     continue
                 
-                for other_comp in board.components:
+                for other_comp in spatial.components_near(hv_comp, required_clearance):
                     # Skip same component
                     if other_comp.refdes == hv_comp.refdes:
                         continue
                     
-                    # Skip if on different side
-                    if other_comp.side != hv_comp.side:
-                        continue
-                    
-                    if not other_comp.position:
-                        continue
-                    
                     # Calculate clearance using bounding boxes
                     hv_bbox = geometry_utils.component_bounding_box(hv_comp)
                     other_bbox = geometry_utils.component_bounding_box(other_comp)
@@ -386,7 +381,19 @@ class DRCEngine:
                 else:
                     power_nets[net.name] = min_trace_width * 1.2
         
-        for track in board.tracks:
+        tracks = board.tracks
+        if isinstance(tracks, TrackTable):
+            # Column store: resolve the required width per net id, then compare
+            # every row at once and only materialise the failing tracks
+            required_by_net = np.full(len(tracks.nets) + 1, min_trace_width)
+            for net_name, width in power_nets.items():
+                net_id = tracks.nets.id_of(net_name)
+                if net_id is not None:
+                    required_by_net[net_id + 1] = width
+            failing = (tracks.net_id >= 0) & (tracks.width < required_by_net[tracks.net_id + 1])
+            tracks = (board.tracks[int(i)] for i in np.flatnonzero(failing))
+        
+        for track in tracks:
             # Skip if no net
             if not track.net:
                 continue
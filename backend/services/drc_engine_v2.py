@@ -14,14 +14,17 @@ This engine integrates all domain-specific rule modules:
 
 import logging
 import time
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, FrozenSet, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import multiprocessing as mp
 
+import numpy as np
+
 # Core imports
-from models.canonical import Board, Component, Net, Via, Track
+from models.canonical import Board, Component, ComponentSide, Net, Via, Track
+from models.columnar import TrackTable
 
 # Standards
 from rules.standards.ipc_2221a import IPC2221A, ConductorType
@@ -42,6 +45,18 @@ from rules.thermal_analysis import ThermalAnalysisRules
 # Profiles
 from services.rule_profiles_v2 import RuleProfileLibrary, RuleProfile, ComplianceLevel
 
+# Geometry
+from services.spatial_index import BoardSpatialIndex
+
+# Incremental analysis
+from services.board_diff import (
+    diff_boards, ALL_INPUTS as ALL_CHECK_INPUTS, INPUT_COMPONENTS, INPUT_PLACEMENT,
+    INPUT_NETS, INPUT_TRACKS, INPUT_VIAS, INPUT_OUTLINE,
+)
+
+# Profiling
+from tracing import in_current_context, span
+
 logger = logging.getLogger(__name__)
 
 
@@ -126,6 +141,7 @@ class Violation:
     # Traceability
     standard_reference: Optional[str] = None
     details: Dict = field(default_factory=dict)
+    check: Optional[str] = None  # Analysis task that produced it (see CHECK_DEPENDENCIES)
 
 
 @dataclass
@@ -138,6 +154,12 @@ class DRCResult:
     profile_used: str
     analysis_time_ms: float
     board_info: Dict
+    include_info: bool = True
+    checks_run: List[str] = field(default_factory=list)
+    checks_reused: List[str] = field(default_factory=list)  # Taken from a previous result
+    checks_failed: List[str] = field(default_factory=list)  # Raised; re-run on the next incremental run
+    check_ms: Dict[str, float] = field(default_factory=dict)  # Wall time per check (reused: when computed)
+    diff: Optional[Dict] = None  # BoardDiff summary for incremental runs
 
 
 class DRCEngineV2:
@@ -151,6 +173,29 @@ class DRCEngineV2:
     - Manufacturer design rules
     """
     
+    # Board inputs each analysis task reads. On incremental runs a task is
+    # re-executed only if one of its inputs changed; keep this in sync when
+    # a check starts looking at new data.
+    CHECK_DEPENDENCIES: Dict[str, FrozenSet[str]] = {
+        "Trace Widths": frozenset({INPUT_TRACKS}),
+        "Via Sizes": frozenset({INPUT_VIAS}),
+        "Component Spacing": frozenset({INPUT_PLACEMENT}),
+        "Edge Clearance": frozenset({INPUT_PLACEMENT, INPUT_OUTLINE}),
+        "Net Connectivity": frozenset({INPUT_NETS}),
+        "HV Clearances": frozenset({INPUT_NETS}),
+        "Mains Safety": frozenset({INPUT_COMPONENTS, INPUT_PLACEMENT, INPUT_NETS}),
+        "Bus Interfaces": frozenset({INPUT_COMPONENTS, INPUT_NETS}),
+        "Power/SMPS": frozenset({INPUT_COMPONENTS, INPUT_PLACEMENT, INPUT_NETS}),
+        "BOM Validation": frozenset({INPUT_COMPONENTS}),
+        "High-Speed": frozenset({INPUT_COMPONENTS, INPUT_NETS}),
+        "Thermal": frozenset({INPUT_COMPONENTS, INPUT_NETS}),
+    }
+    
+    # An incremental run re-running checks that took at least this share of
+    # the previous run's check time would cost about as much as a full run
+    # plus the diff, so the diff is abandoned and everything re-runs
+    INCREMENTAL_MAX_RERUN_FRACTION = 0.5
+    
     def __init__(
         self, 
         max_workers: Optional[int] = None,
@@ -183,15 +228,27 @@ class DRCEngineV2:
         self, 
         board: Board, 
         profile_id: str = "ipc2221_class2",
-        include_info: bool = True
+        include_info: bool = True,
+        previous_board: Optional[Board] = None,
+        previous_result: Optional[DRCResult] = None
     ) -> DRCResult:
         """
         Run comprehensive DRC analysis
         
+        When the previous version of the board and its result are given, the
+        two boards are diffed and only checks whose inputs changed (see
+        CHECK_DEPENDENCIES) are re-run; the other checks' violations are
+        carried over from previous_result. Checks that failed in
+        previous_result are always re-run. When the checks to re-run took
+        INCREMENTAL_MAX_RERUN_FRACTION or more of previous_result's check
+        time, the diff stops early and all checks run.
+        
         Args:
             board: Canonical board model
             profile_id: Rule profile to use
             include_info: Include INFO-level issues
+            previous_board: Previously analyzed version of this board
+            previous_result: DRC result for previous_board
         
         Returns:
             DRCResult with all violations
@@ -206,11 +263,15 @@ class DRCEngineV2:
         
         logger.info(f"Running DRC with profile: {profile.name}")
         
-        violations = []
-        
-        # Define analysis tasks
+        # Define analysis tasks (core DRC checks are scheduled individually
+        # so incremental runs can skip them one by one)
         analysis_tasks = [
-            ("Core DRC", lambda: self._run_core_drc(board, profile)),
+            ("Trace Widths", lambda: self._check_trace_widths(board, profile)),
+            ("Via Sizes", lambda: self._check_via_sizes(board, profile)),
+            ("Component Spacing", lambda: self._check_component_spacing(board, profile)),
+            ("Edge Clearance", lambda: self._check_edge_clearance(board, profile)),
+            ("Net Connectivity", lambda: self._check_net_connectivity(board)),
+            ("HV Clearances", lambda: self._check_hv_clearances(board, profile)),
             ("Mains Safety", lambda: self._run_mains_safety(board, profile)),
             ("Bus Interfaces", lambda: self._run_bus_interfaces(board)),
             ("Power/SMPS", lambda: self._run_power_smps(board)),
@@ -219,21 +280,76 @@ class DRCEngineV2:
             ("Thermal", lambda: self._run_thermal(board)),
         ]
         
-        # Run analyses in parallel
+        # Incremental mode: decide which tasks can reuse previous violations
+        reused_tasks: List[str] = []
+        diff_summary = None
+        if previous_board is not None and previous_result is not None:
+            if self._can_reuse(previous_result, profile.id, include_info):
+                # Baselines stored before failure tracking have no checks_failed
+                previously_failed = set(getattr(previous_result, 'checks_failed', None) or [])
+                costs = getattr(previous_result, 'check_ms', None) or {}
+                total_cost = sum(costs.values())
+                
+                def rerun_checks(changed: FrozenSet[str]) -> List[str]:
+                    return [
+                        name for name, _ in analysis_tasks
+                        if name in previously_failed
+                        or self.CHECK_DEPENDENCIES.get(name, ALL_CHECK_INPUTS) & changed
+                    ]
+                
+                def too_costly(changed: FrozenSet[str]) -> bool:
+                    rerun_cost = sum(costs.get(name, 0.0) for name in rerun_checks(changed))
+                    return total_cost > 0 and rerun_cost >= self.INCREMENTAL_MAX_RERUN_FRACTION * total_cost
+                
+                with span("drc:diff"):
+                    diff = diff_boards(previous_board, board, stop=too_costly)
+                changed = diff.changed_inputs
+                diff_summary = diff.to_dict()
+                if diff.complete:
+                    rerun = set(rerun_checks(changed))
+                    reused_tasks = [name for name, _ in analysis_tasks if name not in rerun]
+                    logger.info(f"Incremental DRC: changed inputs {sorted(changed) or 'none'}, "
+                               f"re-running {len(analysis_tasks) - len(reused_tasks)}/{len(analysis_tasks)} checks")
+                else:
+                    logger.info(f"Incremental DRC: changed inputs {sorted(changed)} cover most of the "
+                               f"previous check time, running full analysis")
+            else:
+                logger.info("Previous DRC result not reusable (profile/options changed), running full analysis")
+        
+        tasks_to_run = [(name, func) for name, func in analysis_tasks if name not in reused_tasks]
+        results: Dict[str, List[Violation]] = {}
+        check_ms: Dict[str, float] = {}
+        failed_tasks: List[str] = []
+        
+        # Run analyses in parallel, each check in its own span of the caller's trace
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             future_to_task = {
-                executor.submit(task_func): task_name
-                for task_name, task_func in analysis_tasks
+                executor.submit(in_current_context(self._traced_check), task_name, task_func): task_name
+                for task_name, task_func in tasks_to_run
             }
             
             for future in as_completed(future_to_task):
                 task_name = future_to_task[future]
                 try:
-                    result = future.result()
-                    violations.extend(result)
+                    result, check_ms[task_name] = future.result()
+                    for violation in result:
+                        violation.check = task_name
+                    results[task_name] = result
                     logger.info(f"✓ {task_name}: {len(result)} issues")
                 except Exception as e:
                     logger.error(f"✗ {task_name} failed: {e}", exc_info=True)
+                    failed_tasks.append(task_name)
+        
+        if reused_tasks:
+            reused = set(reused_tasks)
+            previous_ms = getattr(previous_result, 'check_ms', None) or {}
+            check_ms.update((name, previous_ms[name]) for name in reused_tasks if name in previous_ms)
+            for violation in previous_result.violations:
+                if violation.check in reused:
+                    results.setdefault(violation.check, []).append(violation)
+        
+        # Merge in task order so the output does not depend on completion order
+        violations = [v for name, _ in analysis_tasks for v in results.get(name, [])]
         
         # Filter INFO if not requested
         if not include_info:
@@ -242,12 +358,38 @@ class DRCEngineV2:
         # Generate result
         elapsed_ms = (time.time() - start_time) * 1000
         result = self._generate_result(violations, board, profile.id, elapsed_ms)
+        result.include_info = include_info
+        failed = set(failed_tasks)
+        result.checks_run = [name for name, _ in tasks_to_run if name not in failed]
+        result.checks_reused = reused_tasks
+        result.checks_failed = [name for name, _ in tasks_to_run if name in failed]
+        result.check_ms = {name: round(check_ms[name], 3) for name, _ in analysis_tasks if name in check_ms}
+        result.diff = diff_summary
         
         logger.info(f"DRC completed in {elapsed_ms:.0f}ms - "
                    f"{result.summary['total']} total issues, status: {result.status}")
         
         return result
     
+    @staticmethod
+    def _traced_check(name: str, check) -> Tuple[List[Violation], float]:
+        """Run one check; returns its violations and wall time in ms"""
+        with span(f"drc:{name}") as check_span:
+            start = time.perf_counter()
+            violations = check()
+            check_span.set(violations=len(violations))
+            return violations, (time.perf_counter() - start) * 1000
+    
+    def _can_reuse(self, previous_result: DRCResult, profile_id: str, include_info: bool) -> bool:
+        """Whether previous_result's violations can be carried over"""
+        if previous_result.profile_used != profile_id:
+            return False
+        # INFO violations dropped from the previous result cannot be restored
+        if include_info and not previous_result.include_info:
+            return False
+        # Results from before check tagging cannot be attributed to a task
+        return all(v.check for v in previous_result.violations)
+    
     # ==========================================================================
     # CORE DRC CHECKS
     # ==========================================================================
@@ -281,7 +423,12 @@ class DRCEngineV2:
         violations = []
         min_width = profile.min_trace_width.value
         
-        for track in board.tracks:
+        tracks = board.tracks
+        if isinstance(tracks, TrackTable):
+            # Column store: compare all widths at once, only materialise failing rows
+            tracks = (board.tracks[int(i)] for i in np.flatnonzero(tracks.width < min_width))
+        
+        for track in tracks:
             if track.width < min_width:
                 violations.append(Violation(
                     id=f"trace_width_{track.id}",
@@ -364,39 +511,41 @@ class DRCEngineV2:
         violations = []
         min_spacing = profile.min_component_spacing.value
         
-        components = board.components
-        
-        for i, comp1 in enumerate(components):
-            for comp2 in components[i+1:]:
-                if comp1.side != comp2.side:
-                    continue
-                
-                if not (comp1.position and comp2.position):
-                    continue
-                
-                # Simple center-to-center distance (actual implementation would use bounding boxes)
-                dx = comp1.position.x - comp2.position.x
-                dy = comp1.position.y - comp2.position.y
-                distance = (dx**2 + dy**2)**0.5
-                
-                # Rough size estimate
-                estimated_clearance = distance - 2.0  # Assume ~2mm component size
-                
-                if estimated_clearance < min_spacing and distance < 5.0:
-                    violations.append(Violation(
-                        id=f"comp_spacing_{comp1.refdes}_{comp2.refdes}",
-                        category=ViolationCategory.COMPONENT_SPACING,
-                        severity=ViolationSeverity.WARNING,
-                        rule_id="CORE-COMP-001",
-                        title=f"Components {comp1.refdes} and {comp2.refdes} may be too close",
-                        description=f"Distance {distance:.2f}mm between component centers",
-                        layer=comp1.side.value,
-                        x=(comp1.position.x + comp2.position.x) / 2,
-                        y=(comp1.position.y + comp2.position.y) / 2,
-                        affected_components=[comp1.refdes, comp2.refdes],
-                        actual=distance,
-                        required=min_spacing
-                    ))
+        # A pair is flagged when distance < 5.0 and distance - 2.0 < min_spacing,
+        # so only centers closer than the smaller bound can ever produce a violation
+        search_radius = min(5.0, min_spacing + 2.0)
+        
+        spatial = BoardSpatialIndex.for_board(board)
+        order = {id(c): i for i, c in enumerate(board.components)}
+        candidate_pairs = []
+        for side in ComponentSide:
+            candidate_pairs.extend(spatial.component_centers(side.value).pairs_within(search_radius))
+        candidate_pairs.sort(key=lambda pair: (order[id(pair[0])], order[id(pair[1])]))
+        
+        for comp1, comp2 in candidate_pairs:
+            # Simple center-to-center distance (actual implementation would use bounding boxes)
+            dx = comp1.position.x - comp2.position.x
+            dy = comp1.position.y - comp2.position.y
+            distance = (dx**2 + dy**2)**0.5
+            
+            # Rough size estimate
+            estimated_clearance = distance - 2.0  # Assume ~2mm component size
+            
+            if estimated_clearance < min_spacing and distance < 5.0:
+                violations.append(Violation(
+                    id=f"comp_spacing_{comp1.refdes}_{comp2.refdes}",
+                    category=ViolationCategory.COMPONENT_SPACING,
+                    severity=ViolationSeverity.WARNING,
+                    rule_id="CORE-COMP-001",
+                    title=f"Components {comp1.refdes} and {comp2.refdes} may be too close",
+                    description=f"Distance {distance:.2f}mm between component centers",
+                    layer=comp1.side.value,
+                    x=(comp1.position.x + comp2.position.x) / 2,
+                    y=(comp1.position.y + comp2.position.y) / 2,
+                    affected_components=[comp1.refdes, comp2.refdes],
+                    actual=distance,
+                    required=min_spacing
+                ))
         
         return violations
     
@@ -513,61 +662,39 @@ class DRCEngineV2:
     # ==========================================================================
     # DOMAIN-SPECIFIC ANALYSIS WRAPPERS
     # ==========================================================================
+    # Engine exceptions propagate: run_full_analysis records the check in
+    # checks_failed (re-run next time) instead of as a check without issues
     
     def _run_mains_safety(self, board: Board, profile: RuleProfile) -> List[Violation]:
         """Run mains safety analysis"""
-        try:
-            # Convert base_rule Issues to Violations
-            issues = self.mains_safety.analyze(board)
-            return self._convert_issues_to_violations(issues, ViolationCategory.HIGH_VOLTAGE)
-        except Exception as e:
-            logger.error(f"Mains safety analysis failed: {e}")
-            return []
+        # Convert base_rule Issues to Violations
+        issues = self.mains_safety.analyze(board)
+        return self._convert_issues_to_violations(issues, ViolationCategory.HIGH_VOLTAGE)
     
     def _run_bus_interfaces(self, board: Board) -> List[Violation]:
         """Run bus interface analysis"""
-        try:
-            issues = self.bus_interfaces.analyze(board)
-            return self._convert_issues_to_violations(issues, ViolationCategory.BUS_INTERFACE)
-        except Exception as e:
-            logger.error(f"Bus interface analysis failed: {e}")
-            return []
+        issues = self.bus_interfaces.analyze(board)
+        return self._convert_issues_to_violations(issues, ViolationCategory.BUS_INTERFACE)
     
     def _run_power_smps(self, board: Board) -> List[Violation]:
         """Run power/SMPS analysis"""
-        try:
-            issues = self.power_smps.analyze(board)
-            return self._convert_issues_to_violations(issues, ViolationCategory.POWER_INTEGRITY)
-        except Exception as e:
-            logger.error(f"Power/SMPS analysis failed: {e}")
-            return []
+        issues = self.power_smps.analyze(board)
+        return self._convert_issues_to_violations(issues, ViolationCategory.POWER_INTEGRITY)
     
     def _run_bom_validation(self, board: Board) -> List[Violation]:
         """Run BOM validation"""
-        try:
-            issues = self.bom_validation.analyze(board)
-            return self._convert_issues_to_violations(issues, ViolationCategory.BOM)
-        except Exception as e:
-            logger.error(f"BOM validation failed: {e}")
-            return []
+        issues = self.bom_validation.analyze(board)
+        return self._convert_issues_to_violations(issues, ViolationCategory.BOM)
     
     def _run_high_speed(self, board: Board) -> List[Violation]:
         """Run high-speed interface analysis"""
-        try:
-            issues = self.high_speed.analyze(board)
-            return self._convert_issues_to_violations(issues, ViolationCategory.IMPEDANCE)
-        except Exception as e:
-            logger.error(f"High-speed analysis failed: {e}")
-            return []
+        issues = self.high_speed.analyze(board)
+        return self._convert_issues_to_violations(issues, ViolationCategory.IMPEDANCE)
     
     def _run_thermal(self, board: Board) -> List[Violation]:
         """Run thermal analysis"""
-        try:
-            issues = self.thermal.analyze(board)
-            return self._convert_issues_to_violations(issues, ViolationCategory.THERMAL)
-        except Exception as e:
-            logger.error(f"Thermal analysis failed: {e}")
-            return []
+        issues = self.thermal.analyze(board)
+        return self._convert_issues_to_violations(issues, ViolationCategory.THERMAL)
     
     def _convert_issues_to_violations(
         self, 
@@ -668,6 +795,10 @@ class DRCEngineV2:
             "by_category": result.by_category,
             "profile_used": result.profile_used,
             "analysis_time_ms": result.analysis_time_ms,
+            "checks_run": result.checks_run,
+            "checks_reused": result.checks_reused,
+            "checks_failed": result.checks_failed,
+            "diff": result.diff,
             "violations": [
                 {
                     "id": v.id,
@@ -685,6 +816,7 @@ class DRCEngineV2:
                     "suggested_fix": v.suggested_fix,
                     "standard_reference": v.standard_reference,
                     "details": v.details,
+                    "check": v.check,
                 }
                 for v in result.violations
             ],
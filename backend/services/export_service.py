@@ -18,6 +18,7 @@ from models.analysis_job import AnalysisJob
 from models.project import Project
 from models.issue import Issue
 from config import ensure_upload_dir
+from tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -119,7 +120,8 @@ class ExportService:
             pdf_path = self.upload_dir / job.project_id / f"report_{job_id}.pdf"
             pdf_path.parent.mkdir(parents=True, exist_ok=True)
             
-            self._create_pdf(pdf_path, job, project, issues)
+            with span("pdf:render", issues=len(issues)):
+                self._create_pdf(pdf_path, job, project, issues)
             
             logger.info(f"Generated PDF report: {pdf_path}")
             return str(pdf_path)
@@ -484,7 +486,8 @@ class ExportService:
             ))
             
             # Build PDF
-            doc.build(story)
+            with span("pdf:render", issues=len(results.get('issues', []))):
+                doc.build(story)
             
             logger.info(f"✅ PDF generated for Supabase analysis: {pdf_path}")
             
@@ -19,6 +19,8 @@ from enum import Enum
 
 from openai import OpenAI
 from config import get_settings
+from parsers.format_detector import FormatDetector, FileFormat
+from services.archive_ingest import deferred_members
 
 logger = logging.getLogger(__name__)
 
@@ -196,6 +198,31 @@ EXTENSION_TYPE_MAP = {
     '.rar': FileType.OUTPUT,
 }
 
+# Shared detector formats that settle content-ambiguous files
+DETECTED_TYPE_MAP = {
+    FileFormat.KICAD_PCB: FileType.PCB_LAYOUT,
+    FileFormat.EAGLE_BRD: FileType.PCB_LAYOUT,
+    FileFormat.ALTIUM_PCBDOC: FileType.PCB_LAYOUT,
+    FileFormat.IPC_2581: FileType.PCB_LAYOUT,
+    FileFormat.KICAD_SCH: FileType.SCHEMATIC,
+    FileFormat.EAGLE_SCH: FileType.SCHEMATIC,
+    FileFormat.GERBER: FileType.GERBER,
+    FileFormat.GERBER_X2: FileType.GERBER,
+    FileFormat.EXCELLON: FileType.DRILL,
+    FileFormat.BOM_CSV: FileType.BOM,
+    FileFormat.BOM_XLSX: FileType.BOM,
+    FileFormat.PICK_AND_PLACE: FileType.PICK_AND_PLACE,
+    FileFormat.NETLIST: FileType.NETLIST,
+    FileFormat.IPC_D356: FileType.NETLIST,
+    FileFormat.STEP: FileType.MODEL_3D,
+}
+
+# Extensions whose type depends on content
+CONTENT_TYPED_EXTENSIONS = {'.txt', '.csv'}
+
+# Weaker detections (generic keywords such as "STEP") leave a file as other
+MIN_DETECTED_CONFIDENCE = 0.7
+
 # Gerber layer descriptions
 GERBER_LAYER_MAP = {
     '.gtl': 'Top Copper Layer',
@@ -229,6 +256,8 @@ class FileAnalyzer:
         self.settings = get_settings()
         self.ai_enabled = self.settings.openai_api_key is not None
         
+        self.format_detector = FormatDetector()
+        
         if self.ai_enabled:
             self.client = OpenAI(api_key=self.settings.openai_api_key)
             logger.info("FileAnalyzer initialized with AI capabilities")
@@ -257,6 +286,10 @@ class FileAnalyzer:
             info = self._analyze_file(file_path, project_path)
             file_infos.append(info)
         
+        # Archive members not extracted yet (images, docs, 3D models) are listed from the manifest
+        for name, size in sorted(deferred_members(project_path).items()):
+            file_infos.append(self._analyze_file(project_path / name, project_path, size=size))
+        
         # Step 3: Build file tree
         file_tree = self._build_file_tree(project_path, file_infos)
         
@@ -297,14 +330,17 @@ class FileAnalyzer:
         
         return sorted(files)
     
-    def _analyze_file(self, file_path: Path, project_root: Path) -> FileInfo:
-        """Analyze a single file"""
+    def _analyze_file(self, file_path: Path, project_root: Path, size: Optional[int] = None) -> FileInfo:
+        """Analyze a single file (size given: deferred archive member, not on disk)"""
         rel_path = str(file_path.relative_to(project_root))
         extension = file_path.suffix.lower()
-        size = file_path.stat().st_size
         
         # Determine file type
-        file_type = self._detect_file_type(file_path, extension)
+        if size is None:
+            size = file_path.stat().st_size
+            file_type = self._detect_file_type(file_path, extension)
+        else:
+            file_type = EXTENSION_TYPE_MAP.get(extension, FileType.OTHER)
         
         # Generate purpose and description
         purpose, description = self._generate_description(file_path, file_type, extension)
@@ -321,37 +357,28 @@ class FileAnalyzer:
         )
     
     def _detect_file_type(self, file_path: Path, extension: str) -> FileType:
-        """Detect file type based on extension and content"""
+        """Detect file type based on extension and content (shared FormatDetector)"""
         # Check extension mapping first
-        if extension in EXTENSION_TYPE_MAP:
+        if extension in EXTENSION_TYPE_MAP and extension not in CONTENT_TYPED_EXTENSIONS:
             return EXTENSION_TYPE_MAP[extension]
         
         # Content-based detection for ambiguous files
+        detected = self.format_detector.detect_file(file_path)
+        file_type = None
+        if detected.confidence >= MIN_DETECTED_CONFIDENCE:
+            file_type = DETECTED_TYPE_MAP.get(detected.format)
+        
         if extension == '.txt':
-            # Could be drill file or documentation
-            try:
-                content = file_path.read_text(errors='ignore')[:500]
-                if 'T01' in content or 'M48' in content or 'EXCELLON' in content.upper():
-                    return FileType.DRILL
-                if 'X' in content and 'Y' in content and content.count('\n') > 10:
-                    return FileType.PICK_AND_PLACE
-            except:
-                pass
+            # Could be drill / placement file or documentation
+            if file_type in (FileType.DRILL, FileType.PICK_AND_PLACE):
+                return file_type
             return FileType.DOCUMENTATION
         
         if extension == '.csv':
             # Could be BOM or pick-and-place
-            try:
-                content = file_path.read_text(errors='ignore')[:1000].lower()
-                if 'designator' in content or 'refdes' in content:
-                    if 'x' in content and 'y' in content and 'rotation' in content:
-                        return FileType.PICK_AND_PLACE
-                return FileType.BOM
-            except:
-                pass
-            return FileType.BOM
-        
-        return FileType.OTHER
+            return FileType.PICK_AND_PLACE if file_type == FileType.PICK_AND_PLACE else FileType.BOM
+        
+        return file_type or FileType.OTHER
     
     def _generate_description(self, file_path: Path, file_type: FileType, extension: str) -> Tuple[str, str]:
         """Generate purpose and description for a file"""
@@ -2,11 +2,13 @@
 Advanced file loader - extracts and flattens all files from uploaded ZIP
 """
 import logging
-import zipfile
 import shutil
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from parsers.format_detector import FormatDetector, FileFormat
+from services.archive_ingest import ingest_archive
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,6 +16,7 @@ class FileLoader:
     """Load and organize all files from PCB project ZIP"""
     
     def __init__(self):
+        self.format_detector = FormatDetector()
         self.supported_extensions = {
             'pcb': ['.kicad_pcb', '.kicad_pcb-bak'],
             'schematic': ['.kicad_sch', '.sch', '.bak'],
@@ -27,26 +30,35 @@ class FileLoader:
             'image': ['.jpg', '.jpeg', '.png', '.pdf']
         }
     
-    def extract_and_flatten(self, zip_path: Path, extract_to: Path) -> Dict[str, List[Path]]:
+    def extract_and_flatten(self, zip_path: Path, extract_to: Path, archive_sha256: str = "") -> Dict[str, List[Path]]:
         """
         Extract ZIP and organize files by type
         Flattens nested folders - all files accessible in one place
         
+        Extraction goes through archive_ingest: the archive's manifest is
+        checked against zip-bomb limits first, members already extracted
+        (e.g. at upload) are not written again, and files no parser reads
+        are deferred (listed here, extracted on demand).
+        
         Args:
             zip_path: Path to uploaded ZIP file
             extract_to: Directory to extract to
+            archive_sha256: Hash computed while the upload streamed, if known
             
         Returns:
             Dict mapping file types to list of file paths
+        
+        Raises:
+            zipfile.BadZipFile: Not a ZIP archive
+            ArchiveLimitError: Archive over the zip-bomb limits
         """
         logger.info(f"Extracting ZIP: {zip_path}")
         
         # Extract ZIP
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
+        manifest = ingest_archive(Path(zip_path), Path(extract_to), archive_sha256)
         
-        # Collect all files recursively
-        all_files = self._collect_files(extract_to)
+        # Files from the manifest (junk already filtered out)
+        all_files = [Path(extract_to) / member.name for member in manifest.members]
         
         # Organize by type
         organized = self._organize_by_type(all_files)
@@ -89,6 +101,15 @@ class FileLoader:
         name_lower = file_path.name.lower()
         suffix_lower = file_path.suffix.lower()
         
+        # Tables and XML need a look at the content (shared FormatDetector)
+        if suffix_lower in ('.csv', '.xml'):
+            detected = self.format_detector.detect_file(file_path)
+            if detected.format == FileFormat.PICK_AND_PLACE:
+                return 'position'
+            if suffix_lower == '.xml' and detected.format in (FileFormat.IPC_2581, FileFormat.EAGLE_BRD,
+                                                              FileFormat.EAGLE_SCH):
+                return 'other'
+        
         # Check each category
         for file_type, extensions in self.supported_extensions.items():
             for ext in extensions:
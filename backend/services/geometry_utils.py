@@ -3,8 +3,18 @@ Geometry utility functions for PCB design rule checking
 Provides accurate distance calculations for clearance and creepage
 """
 import math
-from typing import List, Tuple, Optional
+from typing import TYPE_CHECKING, List, Tuple, Optional, Sequence
+
+import numpy as np
+
 from models.canonical import Point, BoundingBox, Polygon
+from models.columnar import TrackTable
+
+if TYPE_CHECKING:
+    from models.canonical import Component, Track, Via, Zone
+
+# Upper bound on elements in one broadcast distance block (~32MB of float64)
+MAX_BATCH_ELEMENTS = 4_000_000
 
 
 def bbox_distance(bbox1: BoundingBox, bbox2: BoundingBox) -> float:
@@ -102,17 +112,10 @@ def point_to_polygon_distance(point: Point, polygon: Polygon) -> float:
     if not polygon.points or len(polygon.points) < 3:
         return float('inf')
     
-    min_dist = float('inf')
-    
-    # Check distance to each edge
-    for i in range(len(polygon.points)):
-        p1 = polygon.points[i]
-        p2 = polygon.points[(i + 1) % len(polygon.points)]
-        
-        dist = point_to_line_segment_distance(point, p1, p2)
-        min_dist = min(min_dist, dist)
-    
-    return min_dist
+    distances = point_to_line_segment_distance_batch(
+        np.array([[point.x, point.y]]), polygon_edges(polygon)
+    )
+    return float(distances.min())
 
 
 def polygon_to_polygon_distance(poly1: Polygon, poly2: Polygon) -> float:
@@ -124,21 +127,7 @@ def polygon_to_polygon_distance(poly1: Polygon, poly2: Polygon) -> float:
     if not poly1.points or not poly2.points:
         return float('inf')
     
-    min_dist = float('inf')
-    
-    # Check each edge of poly1 against each edge of poly2
-    for i in range(len(poly1.points)):
-        p1 = poly1.points[i]
-        p2 = poly1.points[(i + 1) % len(poly1.points)]
-        
-        for j in range(len(poly2.points)):
-            p3 = poly2.points[j]
-            p4 = poly2.points[(j + 1) % len(poly2.points)]
-            
-            dist = line_distance(p1, p2, p3, p4)
-            min_dist = min(min_dist, dist)
-    
-    return min_dist
+    return float(min_line_distance_batch(polygon_edges(poly1), polygon_edges(poly2)).min())
 
 
 def calculate_creepage_distance(poly1: Polygon, poly2: Polygon) -> float:
@@ -283,3 +272,239 @@ def via_to_component_clearance(via: 'Via', component: 'Component', pad_expansion
     
     # Account for via diameter
     return max(0, clearance - via.size / 2)
+
+
+# ==============================================================================
+# BATCHED (VECTORIZED) KERNELS
+# ==============================================================================
+#
+# Structure-of-arrays counterparts of the scalar helpers above. Points are
+# (N, 2) arrays of [x, y] and segments are (N, 4) arrays of [x1, y1, x2, y2].
+# Pairwise results are computed with NumPy broadcasting; the `min_*` variants
+# walk the first operand in row chunks so the intermediate N x M block never
+# exceeds MAX_BATCH_ELEMENTS.
+
+
+def points_array(points: Sequence[Point]) -> np.ndarray:
+    """Convert Points to an (N, 2) array"""
+    return np.array([(p.x, p.y) for p in points], dtype=np.float64).reshape(-1, 2)
+
+
+def polygon_edges(polygon: Polygon) -> np.ndarray:
+    """Closed polygon outline as an (N, 4) segment array"""
+    pts = points_array(polygon.points)
+    return np.hstack([pts, np.roll(pts, -1, axis=0)])
+
+
+def tracks_to_arrays(tracks: Sequence['Track']) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert tracks with geometry to segment and width arrays
+    
+    Tracks missing a start or end point are skipped; the returned segment
+    rows follow the order of the remaining tracks.
+    
+    Returns:
+        (segments (N, 4), widths (N,))
+    """
+    if isinstance(tracks, TrackTable):
+        mask = tracks.has_geometry()
+        return tracks.segments()[mask], tracks.width[mask]
+    
+    rows = [
+        (t.start.x, t.start.y, t.end.x, t.end.y, t.width)
+        for t in tracks if t.start and t.end
+    ]
+    data = np.array(rows, dtype=np.float64).reshape(-1, 5)
+    return data[:, :4], data[:, 4]
+
+
+def _chunk_rows(n_cols: int, chunk_size: Optional[int] = None) -> int:
+    """Rows per chunk so a chunk x n_cols block stays within budget"""
+    if chunk_size:
+        return max(1, chunk_size)
+    return max(1, MAX_BATCH_ELEMENTS // max(1, n_cols))
+
+
+def _point_segment_distance(px, py, ax, ay, bx, by) -> np.ndarray:
+    """Broadcasting point-to-segment distance on pre-split coordinates"""
+    dx = bx - ax
+    dy = by - ay
+    length_sq = dx * dx + dy * dy
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = ((px - ax) * dx + (py - ay) * dy) / length_sq
+    # Degenerate (zero-length) segments collapse to their start point
+    t = np.where(length_sq == 0, 0.0, np.clip(t, 0.0, 1.0))
+    
+    return np.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def _ccw(ax, ay, bx, by, cx, cy) -> np.ndarray:
+    """Broadcasting counter-clockwise test (same predicate as lines_intersect)"""
+    return (cy - ay) * (bx - ax) > (by - ay) * (cx - ax)
+
+
+def point_to_line_segment_distance_batch(points: np.ndarray, segments: np.ndarray) -> np.ndarray:
+    """
+    Distance from every point to every segment
+    
+    Args:
+        points: (N, 2) array
+        segments: (M, 4) array
+    
+    Returns:
+        (N, M) distance matrix
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    
+    px, py = points[:, 0:1], points[:, 1:2]
+    ax, ay, bx, by = (segments[:, i] for i in range(4))
+    return _point_segment_distance(px, py, ax, ay, bx, by)
+
+
+def line_distance_batch(segments1: np.ndarray, segments2: np.ndarray) -> np.ndarray:
+    """
+    Minimum distance between every pair of segments
+    
+    Args:
+        segments1: (N, 4) array
+        segments2: (M, 4) array
+    
+    Returns:
+        (N, M) distance matrix (0 where segments intersect)
+    """
+    s1 = np.asarray(segments1, dtype=np.float64).reshape(-1, 4)
+    s2 = np.asarray(segments2, dtype=np.float64).reshape(-1, 4)
+    
+    x1, y1, x2, y2 = (s1[:, i:i + 1] for i in range(4))
+    x3, y3, x4, y4 = (s2[:, i] for i in range(4))
+    
+    dist = np.minimum(
+        np.minimum(
+            _point_segment_distance(x1, y1, x3, y3, x4, y4),
+            _point_segment_distance(x2, y2, x3, y3, x4, y4),
+        ),
+        np.minimum(
+            _point_segment_distance(x3, y3, x1, y1, x2, y2),
+            _point_segment_distance(x4, y4, x1, y1, x2, y2),
+        ),
+    )
+    
+    intersects = (
+        (_ccw(x1, y1, x3, y3, x4, y4) != _ccw(x2, y2, x3, y3, x4, y4)) &
+        (_ccw(x1, y1, x2, y2, x3, y3) != _ccw(x1, y1, x2, y2, x4, y4))
+    )
+    return np.where(intersects, 0.0, dist)
+
+
+def min_point_to_segment_distance_batch(
+    points: np.ndarray,
+    segments: np.ndarray,
+    chunk_size: Optional[int] = None
+) -> np.ndarray:
+    """
+    Minimum distance from each point to any segment, computed in chunks
+    
+    Returns:
+        (N,) array (inf if there are no segments)
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    
+    result = np.full(len(points), np.inf)
+    if len(segments) == 0:
+        return result
+    
+    step = _chunk_rows(len(segments), chunk_size)
+    for start in range(0, len(points), step):
+        block = point_to_line_segment_distance_batch(points[start:start + step], segments)
+        result[start:start + step] = block.min(axis=1)
+    return result
+
+
+def min_line_distance_batch(
+    segments1: np.ndarray,
+    segments2: np.ndarray,
+    chunk_size: Optional[int] = None
+) -> np.ndarray:
+    """
+    Minimum distance from each segment in segments1 to any segment in segments2
+    
+    Returns:
+        (N,) array (inf if segments2 is empty)
+    """
+    s1 = np.asarray(segments1, dtype=np.float64).reshape(-1, 4)
+    s2 = np.asarray(segments2, dtype=np.float64).reshape(-1, 4)
+    
+    result = np.full(len(s1), np.inf)
+    if len(s2) == 0:
+        return result
+    
+    step = _chunk_rows(len(s2), chunk_size)
+    for start in range(0, len(s1), step):
+        result[start:start + step] = line_distance_batch(s1[start:start + step], s2).min(axis=1)
+    return result
+
+
+def polygon_to_polygon_distance_batch(
+    polygons: Sequence[Polygon],
+    target: Polygon,
+    chunk_size: Optional[int] = None
+) -> np.ndarray:
+    """
+    Edge-to-edge distance from each polygon to a target polygon
+    
+    All source edges are stacked into one segment array so the whole set is
+    evaluated in a single chunked pass.
+    
+    Returns:
+        (N,) array, inf for polygons (or a target) without points
+    """
+    result = np.full(len(polygons), np.inf)
+    if not target.points:
+        return result
+    
+    edge_sets = [polygon_edges(p) if p.points else np.empty((0, 4)) for p in polygons]
+    counts = np.array([len(e) for e in edge_sets])
+    if counts.sum() == 0:
+        return result
+    
+    edge_min = min_line_distance_batch(np.vstack(edge_sets), polygon_edges(target), chunk_size)
+    
+    has_edges = counts > 0
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    result[has_edges] = np.minimum.reduceat(edge_min, offsets[has_edges])
+    return result
+
+
+def track_to_zone_clearance_batch(
+    tracks: Sequence['Track'],
+    zone: 'Zone',
+    chunk_size: Optional[int] = None
+) -> np.ndarray:
+    """
+    Clearance from each track to a zone outline
+    
+    Batched counterpart of track_to_zone_clearance. Instead of sampling points
+    along the track it uses exact segment-to-edge distances, so results are
+    never larger than the scalar version.
+    
+    Returns:
+        (N,) array aligned with `tracks`; inf for same-net tracks or missing geometry
+    """
+    result = np.full(len(tracks), np.inf)
+    if not zone.polygon or not zone.polygon.points or len(zone.polygon.points) < 3:
+        return result
+    
+    rows = [
+        i for i, t in enumerate(tracks)
+        if t.start and t.end and t.net != zone.net
+    ]
+    if not rows:
+        return result
+    
+    segments, widths = tracks_to_arrays([tracks[i] for i in rows])
+    dist = min_line_distance_batch(segments, polygon_edges(zone.polygon), chunk_size)
+    result[rows] = np.maximum(0.0, dist - widths / 2)
+    return result
@@ -0,0 +1,161 @@
+"""
+Issue Store
+Bulk persistence of analysis issues
+
+Issues are flattened once into tuples in ISSUE_FIELDS order, the compact
+layout shared by the issues table writer, the analysis result cache and the
+Supabase issues_json payload. Rows are written in batches of
+issue_insert_batch_size: COPY FROM STDIN on PostgreSQL (psycopg2), a single
+executemany INSERT per batch elsewhere. No ORM objects are built, so
+thousands of findings cost one statement per batch instead of one per issue.
+
+Usage:
+    rows = issue_rows(all_issues)
+    bulk_insert_issues(db, job_id, rows)
+    db.commit()
+"""
+import io
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from config import get_settings
+from models.issue import Issue as IssueModel
+
+# Issue content, in row order
+ISSUE_FIELDS = (
+    "issue_code",
+    "severity",
+    "category",
+    "title",
+    "description",
+    "suggested_fix",
+    "affected_nets",
+    "affected_components",
+    "location_x",
+    "location_y",
+    "layer",
+)
+
+# Columns written to the issues table: generated keys, then the content
+ISSUE_COLUMNS = ("id", "job_id", "created_at") + ISSUE_FIELDS
+
+_JSON_FIELDS = frozenset(("affected_nets", "affected_components"))
+
+IssueRow = Tuple[Any, ...]
+
+
+def issue_rows(issues: Iterable) -> List[IssueRow]:
+    """Flatten rule-engine Issue objects to ISSUE_FIELDS tuples"""
+    return [
+        (
+            issue.issue_code,
+            getattr(issue.severity, "value", issue.severity),
+            issue.category,
+            issue.title,
+            issue.description,
+            issue.suggested_fix,
+            issue.affected_nets,
+            issue.affected_components,
+            issue.location_x,
+            issue.location_y,
+            issue.layer,
+        )
+        for issue in issues
+    ]
+
+
+def issue_rows_from_dicts(issues: Iterable[Dict]) -> List[IssueRow]:
+    """Rows from issue dicts (result cache entries written before issue_rows)"""
+    rows = []
+    for issue in issues:
+        row = [issue.get(name) for name in ISSUE_FIELDS]
+        row[1] = getattr(row[1], "value", row[1])
+        rows.append(tuple(row))
+    return rows
+
+
+def issue_dicts(rows: Iterable[IssueRow], with_ids: bool = False) -> List[Dict]:
+    """
+    Expand rows to dicts keyed by ISSUE_FIELDS
+
+    Args:
+        with_ids: Give each issue a new UUID "id" (Supabase issues_json,
+            where comments and status changes reference issues by id)
+    """
+    if with_ids:
+        return [dict(zip(ISSUE_FIELDS, row), id=str(uuid.uuid4())) for row in rows]
+    return [dict(zip(ISSUE_FIELDS, row)) for row in rows]
+
+
+def bulk_insert_issues(db: Session, job_id: str, rows: Sequence[IssueRow],
+                       batch_size: Optional[int] = None) -> int:
+    """
+    Insert issue rows for a job in the session's transaction (caller commits)
+
+    Args:
+        db: Session; its connection is used, so the rows commit or roll back
+            with the rest of the job update
+        job_id: Analysis job the issues belong to
+        rows: ISSUE_FIELDS tuples (see issue_rows)
+        batch_size: Rows per statement (default settings.issue_insert_batch_size)
+
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+    batch_size = batch_size or get_settings().issue_insert_batch_size
+    connection = db.connection()
+    created_at = datetime.utcnow()
+    use_copy = connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2"
+
+    for start in range(0, len(rows), batch_size):
+        batch = [
+            (str(uuid.uuid4()), job_id, created_at) + tuple(row)
+            for row in rows[start:start + batch_size]
+        ]
+        if use_copy:
+            _copy_batch(connection, batch)
+        else:
+            connection.execute(
+                insert(IssueModel.__table__),
+                [dict(zip(ISSUE_COLUMNS, row)) for row in batch]
+            )
+    return len(rows)
+
+
+def _copy_batch(connection, batch: List[IssueRow]):
+    """COPY one batch through the session connection's psycopg2 cursor"""
+    buffer = io.StringIO()
+    for row in batch:
+        buffer.write("\t".join(_copy_value(name, value) for name, value in zip(ISSUE_COLUMNS, row)))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {IssueModel.__tablename__} ({', '.join(ISSUE_COLUMNS)}) FROM STDIN",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def _copy_value(name: str, value) -> str:
+    """One field in COPY text format"""
+    if value is None:
+        return "\\N"
+    if name in _JSON_FIELDS:
+        value = json.dumps(value, separators=(",", ":"))
+    elif isinstance(value, datetime):
+        return value.isoformat()
+    elif not isinstance(value, str):
+        return repr(value) if isinstance(value, float) else str(value)
+    return (value.replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
@@ -0,0 +1,473 @@
+"""
+Job Queue
+Durable queue for background work (PCB analyses), stored in the database.py
+engine (Postgres in production, the local SQLite file otherwise)
+
+Jobs are claimed by worker processes (services/job_worker.py) under a lease
+that the worker renews while it runs. A worker that crashes stops renewing,
+and its job is put back on the queue once the lease expires. Failed jobs are
+retried with exponential backoff up to max_attempts. A job whose lease
+expires on its last attempt is failed by the queue itself, and the kind's
+JOB_FAILURE_HANDLERS entry records the failure on the job's own records
+(the handler never got to).
+
+Scheduling:
+- Lanes: jobs for small uploads go to the "small" lane, which is always
+  claimed first and can have dedicated workers, so a quick board is never
+  stuck behind a batch of large ones
+- Per-organization limit: at most job_queue_org_concurrency running jobs
+  per organization; other organizations' jobs are claimed meanwhile
+
+Claims are a conditional UPDATE (WHERE status = 'queued'), so concurrent
+workers never run the same job, on SQLite and Postgres alike.
+"""
+import contextvars
+import importlib
+import logging
+import os
+import random
+import socket
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from sqlalchemy import func, update
+
+from config import get_settings
+from database import SessionLocal, engine
+from models.queued_job import QueuedJob
+
+logger = logging.getLogger(__name__)
+
+LANE_SMALL = "small"
+LANE_DEFAULT = "default"
+LANES = (LANE_SMALL, LANE_DEFAULT)  # Claim priority order
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+
+# Job kinds and the functions that run them ("module:function", called with
+# the payload as keyword arguments; coroutine functions are awaited)
+JOB_HANDLERS: Dict[str, str] = {
+    "pcb_analysis": "routes.analyses:run_pcb_analysis",
+    "legacy_analysis": "services.analysis_service:run_analysis_job",
+}
+
+# Called when the queue gives up on a job the handler could not record as
+# failed (lease expired on the last attempt): "module:function", called with
+# the payload as keyword arguments plus error
+JOB_FAILURE_HANDLERS: Dict[str, str] = {
+    "pcb_analysis": "routes.analyses:fail_pcb_analysis",
+    "legacy_analysis": "services.analysis_service:fail_analysis_job",
+}
+
+LEASE_EXPIRED_ERROR = "Worker lease expired (worker crashed or stalled)"
+
+# Candidates examined per claim attempt
+_CLAIM_BATCH = 20
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help (e.g. project deleted)"""
+
+
+@dataclass
+class ClaimedJob:
+    """Snapshot of a job handed to a worker"""
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    organization_id: Optional[str]
+    lane: str
+    attempts: int
+    max_attempts: int
+
+
+# Job being run by the current worker (handlers read it through current_job)
+_current_job: contextvars.ContextVar[Optional[ClaimedJob]] = contextvars.ContextVar("current_job", default=None)
+
+
+def current_job() -> Optional[ClaimedJob]:
+    """The job the calling handler runs for, None outside a worker"""
+    return _current_job.get()
+
+
+@contextmanager
+def running_job(job: ClaimedJob):
+    """Make job the current_job() of handlers run in this block"""
+    token = _current_job.set(job)
+    try:
+        yield job
+    finally:
+        _current_job.reset(token)
+
+
+def will_retry(error: BaseException) -> bool:
+    """Whether the queue will run the current job again after it raises error"""
+    job = current_job()
+    if job is None or isinstance(error, PermanentJobError):
+        return False
+    return job.attempts < job.max_attempts
+
+
+def resolve_handler(target: str) -> Callable:
+    """Import a "module:function" handler"""
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class JobQueue:
+    """Database-backed job queue with leases, retries, lanes and per-org limits"""
+
+    def __init__(self, session_factory=None):
+        settings = get_settings()
+        self._session_factory = session_factory or SessionLocal
+        self.small_board_bytes = settings.job_queue_small_board_bytes
+        self.org_concurrency = settings.job_queue_org_concurrency
+        self.max_attempts = settings.job_queue_max_attempts
+        self.lease_seconds = settings.job_queue_lease_seconds
+        self.retry_base = settings.job_queue_retry_base_seconds
+        self.retry_max = settings.job_queue_retry_max_seconds
+
+    @contextmanager
+    def _session(self):
+        db = self._session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def ensure_schema(self):
+        """Create the queue table if missing (workers may start before the API)"""
+        QueuedJob.__table__.create(bind=engine, checkfirst=True)
+
+    def lane_for(self, size_bytes: Optional[int]) -> str:
+        """Lane for an upload of the given size (unknown sizes use the default lane)"""
+        if size_bytes is not None and 0 <= size_bytes <= self.small_board_bytes:
+            return LANE_SMALL
+        return LANE_DEFAULT
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        organization_id: Optional[str] = None,
+        size_bytes: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ) -> str:
+        """
+        Add a job to the queue
+
+        Args:
+            kind: Handler name from JOB_HANDLERS
+            payload: JSON-serializable handler keyword arguments
+            organization_id: Owner, for per-organization concurrency limits
+            size_bytes: Upload size, selects the lane
+            max_attempts: Override for job_queue_max_attempts
+
+        Returns:
+            Queued job ID
+        """
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = QueuedJob(
+            kind=kind,
+            payload=payload,
+            organization_id=organization_id,
+            lane=self.lane_for(size_bytes),
+            status=STATUS_QUEUED,
+            available_at=datetime.utcnow(),
+            max_attempts=max_attempts or self.max_attempts,
+        )
+        with self._session() as db:
+            db.add(job)
+            db.commit()
+            logger.info(f"Queued {kind} job {job.id} ({job.lane} lane)")
+            return job.id
+
+    def claim(self, worker_id: str, lanes: Sequence[str] = LANES) -> Optional[ClaimedJob]:
+        """
+        Claim the next runnable job
+
+        Lanes are tried in the given order; within a lane, oldest first.
+        Jobs of organizations already at their concurrency limit are skipped.
+
+        Returns:
+            ClaimedJob, or None when nothing is runnable
+        """
+        now = datetime.utcnow()
+        with self._session() as db:
+            self._reap_expired(db, now)
+            running = self._running_per_org(db, now)
+
+            for lane in lanes:
+                candidates = (
+                    db.query(QueuedJob.id, QueuedJob.organization_id)
+                    .filter(
+                        QueuedJob.status == STATUS_QUEUED,
+                        QueuedJob.lane == lane,
+                        QueuedJob.available_at <= now,
+                    )
+                    .order_by(QueuedJob.created_at, QueuedJob.id)
+                    .limit(_CLAIM_BATCH)
+                    .all()
+                )
+                for job_id, org_id in candidates:
+                    if org_id is not None and running.get(org_id, 0) >= self.org_concurrency:
+                        continue
+                    if not self._try_claim(db, job_id, worker_id, now):
+                        continue  # Another worker got it first
+
+                    # Two workers can pass the limit check at once; the later
+                    # one backs off so the limit holds
+                    if org_id is not None and self._running_count(db, now, org_id) > self.org_concurrency:
+                        self._unclaim(db, job_id, worker_id)
+                        running[org_id] = self.org_concurrency
+                        continue
+
+                    job = db.get(QueuedJob, job_id)
+                    return ClaimedJob(
+                        id=job.id,
+                        kind=job.kind,
+                        payload=dict(job.payload or {}),
+                        organization_id=job.organization_id,
+                        lane=job.lane,
+                        attempts=job.attempts,
+                        max_attempts=job.max_attempts,
+                    )
+        return None
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Renew a lease; False means the lease was lost (job reclaimed)"""
+        with self._session() as db:
+            result = db.execute(
+                update(QueuedJob)
+                .where(
+                    QueuedJob.id == job_id,
+                    QueuedJob.lease_owner == worker_id,
+                    QueuedJob.status == STATUS_RUNNING,
+                )
+                .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds))
+            )
+            db.commit()
+            return result.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str) -> bool:
+        """Mark a claimed job as succeeded"""
+        with self._session() as db:
+            result = db.execute(
+                update(QueuedJob)
+                .where(
+                    QueuedJob.id == job_id,
+                    QueuedJob.lease_owner == worker_id,
+                    QueuedJob.status == STATUS_RUNNING,
+                )
+                .values(
+                    status=STATUS_SUCCEEDED,
+                    finished_at=datetime.utcnow(),
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    last_error=None,
+                )
+            )
+            db.commit()
+            return result.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> bool:
+        """
+        Record a failed attempt
+
+        The job is re-queued after a backoff delay while attempts remain
+        (and retry is True), otherwise it is marked failed.
+        """
+        now = datetime.utcnow()
+        with self._session() as db:
+            job = db.get(QueuedJob, job_id)
+            if job is None or job.lease_owner != worker_id or job.status != STATUS_RUNNING:
+                return False
+
+            if retry and job.attempts < job.max_attempts:
+                values = dict(
+                    status=STATUS_QUEUED,
+                    available_at=now + timedelta(seconds=self.backoff(job.attempts)),
+                )
+            else:
+                values = dict(status=STATUS_FAILED, finished_at=now)
+
+            result = db.execute(
+                update(QueuedJob)
+                .where(
+                    QueuedJob.id == job_id,
+                    QueuedJob.lease_owner == worker_id,
+                    QueuedJob.status == STATUS_RUNNING,
+                )
+                .values(lease_owner=None, lease_expires_at=None, last_error=error[:4000], **values)
+            )
+            db.commit()
+            return result.rowcount == 1
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before the next attempt: base * 2^(attempts-1), capped, with jitter"""
+        delay = min(self.retry_base * (2 ** max(attempts - 1, 0)), self.retry_max)
+        return delay * random.uniform(1.0, 1.25)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job state for status endpoints"""
+        with self._session() as db:
+            job = db.get(QueuedJob, job_id)
+            if job is None:
+                return None
+            return {
+                "id": job.id,
+                "kind": job.kind,
+                "status": job.status,
+                "lane": job.lane,
+                "organization_id": job.organization_id,
+                "attempts": job.attempts,
+                "max_attempts": job.max_attempts,
+                "last_error": job.last_error,
+                "created_at": job.created_at.isoformat() if job.created_at else None,
+                "started_at": job.started_at.isoformat() if job.started_at else None,
+                "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counts per lane and status"""
+        with self._session() as db:
+            rows = (
+                db.query(QueuedJob.lane, QueuedJob.status, func.count(QueuedJob.id))
+                .group_by(QueuedJob.lane, QueuedJob.status)
+                .all()
+            )
+        lanes: Dict[str, Dict[str, int]] = {lane: {} for lane in LANES}
+        for lane, status, count in rows:
+            lanes.setdefault(lane, {})[status] = count
+        return {
+            "lanes": lanes,
+            "queued": sum(l.get(STATUS_QUEUED, 0) for l in lanes.values()),
+            "running": sum(l.get(STATUS_RUNNING, 0) for l in lanes.values()),
+        }
+
+    # Internal helpers
+
+    def _try_claim(self, db, job_id: str, worker_id: str, now: datetime) -> bool:
+        result = db.execute(
+            update(QueuedJob)
+            .where(QueuedJob.id == job_id, QueuedJob.status == STATUS_QUEUED)
+            .values(
+                status=STATUS_RUNNING,
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                attempts=QueuedJob.attempts + 1,
+                started_at=now,
+            )
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def _unclaim(self, db, job_id: str, worker_id: str):
+        """Hand a just-claimed job back without counting the attempt"""
+        db.execute(
+            update(QueuedJob)
+            .where(QueuedJob.id == job_id, QueuedJob.lease_owner == worker_id)
+            .values(
+                status=STATUS_QUEUED,
+                lease_owner=None,
+                lease_expires_at=None,
+                attempts=QueuedJob.attempts - 1,
+            )
+        )
+        db.commit()
+
+    def _running_per_org(self, db, now: datetime) -> Dict[str, int]:
+        rows = (
+            db.query(QueuedJob.organization_id, func.count(QueuedJob.id))
+            .filter(
+                QueuedJob.status == STATUS_RUNNING,
+                QueuedJob.lease_expires_at > now,
+                QueuedJob.organization_id.isnot(None),
+            )
+            .group_by(QueuedJob.organization_id)
+            .all()
+        )
+        return dict(rows)
+
+    def _running_count(self, db, now: datetime, organization_id: str) -> int:
+        return (
+            db.query(func.count(QueuedJob.id))
+            .filter(
+                QueuedJob.status == STATUS_RUNNING,
+                QueuedJob.lease_expires_at > now,
+                QueuedJob.organization_id == organization_id,
+            )
+            .scalar()
+        ) or 0
+
+    def _reap_expired(self, db, now: datetime):
+        """Re-queue jobs whose worker stopped renewing its lease"""
+        expired = (QueuedJob.status == STATUS_RUNNING, QueuedJob.lease_expires_at <= now)
+        candidates = (
+            db.query(QueuedJob.id, QueuedJob.kind, QueuedJob.payload)
+            .filter(*expired, QueuedJob.attempts >= QueuedJob.max_attempts)
+            .all()
+        )
+        exhausted = []
+        for job_id, kind, payload in candidates:
+            # Per job, so only the reaper that fails it runs the failure handler
+            result = db.execute(
+                update(QueuedJob)
+                .where(QueuedJob.id == job_id, *expired)
+                .values(
+                    status=STATUS_FAILED,
+                    finished_at=now,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    last_error=LEASE_EXPIRED_ERROR,
+                )
+            )
+            if result.rowcount == 1:
+                exhausted.append((job_id, kind, payload))
+        requeued = db.execute(
+            update(QueuedJob)
+            .where(*expired)
+            .values(
+                status=STATUS_QUEUED,
+                available_at=now,
+                lease_owner=None,
+                lease_expires_at=None,
+                last_error=LEASE_EXPIRED_ERROR,
+            )
+        ).rowcount
+        db.commit()
+        if exhausted or requeued:
+            logger.warning(f"Reclaimed expired leases: {requeued} re-queued, {len(exhausted)} failed")
+        for job_id, kind, payload in exhausted:
+            self._on_exhausted(job_id, kind, payload or {})
+
+    def _on_exhausted(self, job_id: str, kind: str, payload: Dict[str, Any]):
+        """Run the kind's failure handler for a job the queue gave up on"""
+        target = JOB_FAILURE_HANDLERS.get(kind)
+        if target is None:
+            return
+        try:
+            resolve_handler(target)(error=LEASE_EXPIRED_ERROR, **payload)
+        except Exception as e:
+            logger.error(f"Failure handler for {kind} job {job_id} failed: {e}")
+
+_queue_instance: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get global job queue instance"""
+    global _queue_instance
+    if _queue_instance is None:
+        _queue_instance = JobQueue()
+    return _queue_instance
@@ -0,0 +1,221 @@
+"""
+Job Worker
+Worker processes that run queued jobs (services/job_queue.py) outside the
+API process, so analysis bursts do not compete with request handling
+
+- JobWorker: claim/run/complete loop for one process, one job at a time,
+  with a heartbeat thread renewing the job's lease while it runs
+- WorkerSupervisor: starts and restarts a set of worker processes, some of
+  them reserved for the small-board lane
+
+Run standalone with `python worker.py`, or let the API start
+job_queue_embedded_workers processes at startup.
+"""
+import asyncio
+import inspect
+import logging
+import multiprocessing as mp
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List, Optional, Sequence
+
+from config import get_settings
+from services.job_queue import (
+    JOB_HANDLERS,
+    LANE_SMALL,
+    LANES,
+    ClaimedJob,
+    JobQueue,
+    PermanentJobError,
+    default_worker_id,
+    resolve_handler,
+    running_job,
+)
+from metrics import counter, get_metrics, histogram
+
+logger = logging.getLogger(__name__)
+
+JOBS_TOTAL = counter("boardmint_jobs_total", "Jobs run by workers", ["kind", "status"])
+JOB_SECONDS = histogram("boardmint_job_seconds", "Wall time of job attempts", ["kind"])
+
+
+class JobWorker:
+    """Runs queued jobs one at a time in the current process"""
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        lanes: Sequence[str] = LANES,
+        worker_id: Optional[str] = None,
+        handlers: Optional[Dict[str, str]] = None,
+    ):
+        settings = get_settings()
+        self.queue = queue or JobQueue()
+        self.lanes = tuple(lanes)
+        self.worker_id = worker_id or default_worker_id()
+        self.handlers = handlers or JOB_HANDLERS
+        self.poll_interval = settings.job_queue_poll_interval
+        self._resolved: Dict[str, Callable] = {}
+
+    def run_forever(self, stop_event):
+        """Claim and run jobs until stop_event is set"""
+        logger.info(f"Worker {self.worker_id} serving lanes {', '.join(self.lanes)}")
+        while not stop_event.is_set():
+            try:
+                ran = self.run_one()
+            except Exception as e:
+                # Queue unreachable (DB restart, locked SQLite file): wait and retry
+                logger.error(f"Worker {self.worker_id} loop error: {e}")
+                ran = False
+            if not ran:
+                stop_event.wait(self.poll_interval)
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    def run_one(self) -> bool:
+        """Run the next job, if any; returns whether a job was run"""
+        job = self.queue.claim(self.worker_id, self.lanes)
+        if job is None:
+            return False
+
+        logger.info(f"Worker {self.worker_id} running {job.kind} job {job.id} "
+                    f"(attempt {job.attempts}/{job.max_attempts}, {job.lane} lane)")
+        start = time.perf_counter()
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, done), daemon=True)
+        heartbeat.start()
+        status = "failed"
+        try:
+            with running_job(job):
+                self._execute(job)
+        except PermanentJobError as e:
+            self.queue.fail(job.id, self.worker_id, f"{e}", retry=False)
+            logger.error(f"Job {job.id} failed permanently: {e}")
+        except Exception as e:
+            self.queue.fail(job.id, self.worker_id, f"{e.__class__.__name__}: {e}\n{traceback.format_exc()}")
+            logger.error(f"Job {job.id} failed (attempt {job.attempts}/{job.max_attempts}): {e}")
+        else:
+            status = "succeeded"
+            if not self.queue.complete(job.id, self.worker_id):
+                logger.warning(f"Job {job.id} finished after its lease was lost")
+            logger.info(f"Job {job.id} completed in {time.perf_counter() - start:.1f}s")
+        finally:
+            done.set()
+            heartbeat.join()
+            JOBS_TOTAL.inc(kind=job.kind, status=status)
+            JOB_SECONDS.observe(time.perf_counter() - start, kind=job.kind)
+            # Make this process's counters visible to the API's /metrics
+            get_metrics().flush()
+        return True
+
+    def _execute(self, job: ClaimedJob):
+        handler = self._resolved.get(job.kind)
+        if handler is None:
+            target = self.handlers.get(job.kind)
+            if target is None:
+                raise PermanentJobError(f"No handler for job kind {job.kind!r}")
+            handler = self._resolved[job.kind] = resolve_handler(target)
+
+        result = handler(**job.payload)
+        if inspect.isawaitable(result):
+            asyncio.run(result)
+
+    def _heartbeat(self, job: ClaimedJob, done: threading.Event):
+        interval = max(self.queue.lease_seconds / 3, 1)
+        while not done.wait(interval):
+            try:
+                if not self.queue.heartbeat(job.id, self.worker_id):
+                    logger.warning(f"Lost lease on job {job.id}; it may be re-run elsewhere")
+                    return
+            except Exception as e:
+                logger.warning(f"Heartbeat for job {job.id} failed: {e}")
+
+
+def _worker_main(lanes: Sequence[str], handlers: Dict[str, str], stop_event):
+    """Entry point of a worker process"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    queue = JobQueue()
+    queue.ensure_schema()
+    JobWorker(queue, lanes=lanes, handlers=handlers).run_forever(stop_event)
+
+
+class WorkerSupervisor:
+    """
+    Keeps a fixed set of worker processes running
+
+    Workers are non-daemonic so they can start the rule scheduler's process
+    pool. A worker that exits unexpectedly is restarted; its job is
+    recovered through the lease.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        small_lane_processes: int = 0,
+        handlers: Optional[Dict[str, str]] = None,
+        shutdown_grace: float = 30.0,
+    ):
+        # At least one worker always serves every lane
+        reserved = min(small_lane_processes, max(processes - 1, 0))
+        self.lane_sets: List[Sequence[str]] = (
+            [(LANE_SMALL,)] * reserved + [LANES] * (processes - reserved)
+        )
+        self.handlers = handlers or JOB_HANDLERS
+        self.shutdown_grace = shutdown_grace
+        self._context = mp.get_context("spawn")
+        self._stop = self._context.Event()
+        self._processes: List[Optional[mp.Process]] = [None] * len(self.lane_sets)
+        self._monitor: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the workers and a thread that restarts any that die"""
+        for slot in range(len(self.lane_sets)):
+            self._spawn(slot)
+        self._monitor = threading.Thread(target=self._watch, name="worker-supervisor", daemon=True)
+        self._monitor.start()
+        logger.info(f"Started {len(self.lane_sets)} job workers "
+                    f"({self.lane_sets.count((LANE_SMALL,))} reserved for small boards)")
+
+    def _spawn(self, slot: int):
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self.lane_sets[slot], self.handlers, self._stop),
+            name=f"job-worker-{slot}",
+        )
+        process.start()
+        self._processes[slot] = process
+
+    def _watch(self):
+        while not self._stop.wait(5):
+            for slot, process in enumerate(self._processes):
+                if process is not None and not process.is_alive():
+                    logger.warning(f"Job worker {process.name} exited ({process.exitcode}), restarting")
+                    self._spawn(slot)
+
+    def request_stop(self):
+        """Signal-safe: ask workers to stop after their current job"""
+        self._stop.set()
+
+    def stop(self):
+        """Ask workers to finish their current job, then terminate stragglers"""
+        self._stop.set()
+        deadline = time.monotonic() + self.shutdown_grace
+        for process in self._processes:
+            if process is not None:
+                process.join(max(deadline - time.monotonic(), 0))
+        for process in self._processes:
+            if process is not None and process.is_alive():
+                logger.warning(f"Terminating job worker {process.name}; its lease will expire and the job re-run")
+                process.terminate()
+                process.join(5)
+
+    def join(self):
+        """Block until the workers exit (standalone worker.py)"""
+        try:
+            while not self._stop.is_set():
+                time.sleep(1)
+        finally:
+            self.stop()
@@ -13,9 +13,13 @@ from models.canonical import (
     Board, BoardOutline, Stackup, Layer, Component, Net, Track, Via, Zone,
     ComponentSide, NetClass, Units, LayerType, Point, Polygon
 )
+from models.columnar import StringTable, TrackTable, ViaTable
 
 logger = logging.getLogger(__name__)
 
+# Boards with at least this many track segments get array-backed tracks/vias
+COLUMNAR_TRACK_THRESHOLD = 20000
+
 
 class ParserBridge:
     """Bridge between old parsers and new canonical model"""
@@ -53,8 +57,23 @@ class ParserBridge:
         logger.info(f"Converted to canonical: {board.component_count()} components, {board.net_count()} nets")
         return board
     
-    def _convert_to_canonical(self, parsed: ParsedPCBData, project_path: str, tool_family: str) -> Board:
-        """Convert ParsedPCBData to canonical Board"""
+    def _convert_to_canonical(
+        self,
+        parsed: ParsedPCBData,
+        project_path: str,
+        tool_family: str,
+        columnar: Optional[bool] = None
+    ) -> Board:
+        """
+        Convert ParsedPCBData to canonical Board
+        
+        Args:
+            parsed: Parser output
+            project_path: Path to extracted project
+            tool_family: Detected CAD tool family
+            columnar: Store tracks/vias as TrackTable/ViaTable column arrays
+                      (default: only when the board has COLUMNAR_TRACK_THRESHOLD+ tracks)
+        """
         
         # Create board ID from path
         board_id = Path(project_path).parent.name
@@ -109,33 +128,16 @@ class ParserBridge:
             )
             nets.append(canonical_net)
         
-        # Convert tracks
-        tracks = []
-        for idx, track in enumerate(parsed.tracks):
-            canonical_track = Track(
-                id=f"track_{idx}",
-                net=track.net_name,
-                layer=track.layer,
-                start=Point(track.x1, track.y1) if track.x1 is not None else None,
-                end=Point(track.x2, track.y2) if track.x2 is not None else None,
-                width=track.width
-            )
-            tracks.append(canonical_track)
+        if columnar is None:
+            columnar = len(parsed.tracks) >= COLUMNAR_TRACK_THRESHOLD
         
-        # Convert vias
-        vias = []
-        for idx, via in enumerate(parsed.vias):
-            canonical_via = Via(
-                id=f"via_{idx}",
-                net=via.net_name,
-                position=Point(via.x, via.y) if via.x is not None else None,
-                size=via.diameter,
-                drill=via.drill,
-                start_layer=via.start_layer,
-                end_layer=via.end_layer,
-                is_through=(via.start_layer == "F.Cu" and via.end_layer == "B.Cu") if via.start_layer and via.end_layer else True
-            )
-            vias.append(canonical_via)
+        if columnar:
+            # Array-backed routing: no per-segment objects, shared name tables
+            layer_table, net_table = StringTable(), StringTable()
+            tracks = TrackTable.from_parsed(parsed.tracks, layer_table, net_table)
+            vias = ViaTable.from_parsed(parsed.vias, layer_table, net_table)
+        else:
+            tracks, vias = self._convert_routing(parsed)
         
         # Convert zones
         zones = []
@@ -171,9 +173,44 @@ class ParserBridge:
             }
         )
         
-        logger.info(f"Converted to canonical: {len(tracks)} tracks, {len(vias)} vias, {len(zones)} zones")
+        logger.info(
+            f"Converted to canonical: {len(tracks)} tracks, {len(vias)} vias, {len(zones)} zones"
+            f"{' (columnar)' if columnar else ''}"
+        )
         return board
     
+    def _convert_routing(self, parsed: ParsedPCBData) -> tuple[list, list]:
+        """Convert tracks and vias to per-object canonical dataclasses"""
+        # Convert tracks
+        tracks = []
+        for idx, track in enumerate(parsed.tracks):
+            canonical_track = Track(
+                id=f"track_{idx}",
+                net=track.net_name,
+                layer=track.layer,
+                start=Point(track.x1, track.y1) if track.x1 is not None else None,
+                end=Point(track.x2, track.y2) if track.x2 is not None else None,
+                width=track.width
+            )
+            tracks.append(canonical_track)
+        
+        # Convert vias
+        vias = []
+        for idx, via in enumerate(parsed.vias):
+            canonical_via = Via(
+                id=f"via_{idx}",
+                net=via.net_name,
+                position=Point(via.x, via.y) if via.x is not None else None,
+                size=via.diameter,
+                drill=via.drill,
+                start_layer=via.start_layer,
+                end_layer=via.end_layer,
+                is_through=(via.start_layer == "F.Cu" and via.end_layer == "B.Cu") if via.start_layer and via.end_layer else True
+            )
+            vias.append(canonical_via)
+        
+        return tracks, vias
+    
     def _create_stackup(self, board_info) -> Stackup:
         """Create stackup from board info"""
         layers = []
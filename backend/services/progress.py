@@ -0,0 +1,375 @@
+"""
+Progress Reporting
+Coalesced analysis progress, persisted on a time/step budget and pushed
+live to clients
+
+Writing every stage change to the database is a blocking round trip on the
+analysis path. ProgressReporter keeps the latest state in memory; a
+background thread publishes it to the ProgressBus (debounced by
+progress_publish_interval) and writes it through a sink at most every
+progress_persist_interval seconds or progress_persist_steps updates.
+
+ProgressBus carries events to SSE subscribers. Analyses run in job worker
+processes, so events go through Redis pub/sub when Redis is reachable;
+without Redis they only reach subscribers in the publishing process and the
+SSE endpoint falls back to reading the persisted state.
+
+Usage:
+    reporter = ProgressReporter(analysis_id, sink=write_row)
+    reporter.update("Parsing PCB...", stage="parsing", percent=20)
+    ...
+    reporter.finish("completed", "Complete", 100, completed_at=...)
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from config import get_settings
+from services.cache_service import get_redis_pool
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+@dataclass
+class ProgressEvent:
+    """State of an analysis at one point in time"""
+    analysis_id: str
+    status: str
+    message: Optional[str] = None
+    stage: Optional[str] = None
+    percent: Optional[int] = None
+    seq: int = 0
+    timestamp: float = 0.0
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, data) -> "ProgressEvent":
+        return cls(**json.loads(data))
+
+
+class ProgressBus:
+    """Fan-out of progress events to live subscribers"""
+
+    CHANNEL_PREFIX = "progress:"
+    LAST_PREFIX = "progress:last:"
+
+    def __init__(self, redis_client=None, redis_url: Optional[str] = None):
+        """
+        Args:
+            redis_client: Optional pre-built client (e.g. fakeredis in tests);
+                by default one is built from settings.redis_url
+            redis_url: URL for the asyncio subscriber connections
+        """
+        settings = get_settings()
+        self.redis_url = redis_url or settings.redis_url
+        self.last_ttl = settings.cache_ttl
+        self.redis_client = None
+        self._local: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._last: Dict[str, ProgressEvent] = {}
+        self._lock = threading.Lock()
+
+        if settings.enable_caching:
+            try:
+                if redis_client is None:
+                    import redis
+                    redis_client = redis.Redis(connection_pool=get_redis_pool(
+                        settings.redis_url,
+                        settings.redis_max_connections,
+                        settings.redis_socket_timeout
+                    ))
+                redis_client.ping()
+                self.redis_client = redis_client
+            except Exception as e:
+                logger.info(f"Progress bus: Redis unavailable, events stay in-process ({e})")
+                self.redis_client = None
+
+    @property
+    def use_redis(self) -> bool:
+        return self.redis_client is not None
+
+    def publish(self, event: ProgressEvent):
+        """Deliver an event to current subscribers and remember it as the latest"""
+        if self.use_redis:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.set(f"{self.LAST_PREFIX}{event.analysis_id}", event.to_json(), ex=self.last_ttl)
+                pipe.publish(f"{self.CHANNEL_PREFIX}{event.analysis_id}", event.to_json())
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"Progress publish failed for {event.analysis_id}: {e}")
+            return
+
+        with self._lock:
+            if event.terminal:
+                self._last.pop(event.analysis_id, None)
+            else:
+                self._last[event.analysis_id] = event
+            subscribers = list(self._local.get(event.analysis_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass  # Subscriber's loop already closed
+
+    def last(self, analysis_id: str) -> Optional[ProgressEvent]:
+        """Latest non-expired event for an analysis, if any"""
+        if self.use_redis:
+            try:
+                data = self.redis_client.get(f"{self.LAST_PREFIX}{analysis_id}")
+                return ProgressEvent.from_json(data) if data else None
+            except Exception as e:
+                logger.warning(f"Progress lookup failed for {analysis_id}: {e}")
+                return None
+        with self._lock:
+            return self._last.get(analysis_id)
+
+    async def subscribe(self, analysis_id: str, heartbeat: float) -> AsyncIterator[Optional[ProgressEvent]]:
+        """
+        Yield events for one analysis as they are published
+
+        Yields None after `heartbeat` seconds without an event, so the caller
+        can send a keep-alive or re-check the stored state.
+        """
+        if self.use_redis:
+            async for event in self._subscribe_redis(analysis_id, heartbeat):
+                yield event
+            return
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        entry = (loop, queue)
+        with self._lock:
+            self._local.setdefault(analysis_id, []).append(entry)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                subscribers = self._local.get(analysis_id, [])
+                if entry in subscribers:
+                    subscribers.remove(entry)
+                if not subscribers:
+                    self._local.pop(analysis_id, None)
+
+    async def _subscribe_redis(self, analysis_id: str, heartbeat: float) -> AsyncIterator[Optional[ProgressEvent]]:
+        import redis.asyncio as aioredis
+
+        client = aioredis.from_url(self.redis_url)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(f"{self.CHANNEL_PREFIX}{analysis_id}")
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=heartbeat)
+                yield ProgressEvent.from_json(message["data"]) if message else None
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+
+class ProgressReporter:
+    """
+    Coalesces one analysis's progress updates
+
+    update() only records state and wakes the background thread, so the
+    analysis never waits on the database or the bus. finish() stops the
+    thread and writes the terminal state synchronously.
+    """
+
+    def __init__(
+        self,
+        analysis_id: str,
+        sink: Optional[Callable[[Dict], None]] = None,
+        bus: Optional[ProgressBus] = None,
+        status: str = "processing",
+        persist_interval: Optional[float] = None,
+        persist_steps: Optional[int] = None,
+        publish_interval: Optional[float] = None,
+    ):
+        """
+        Args:
+            analysis_id: Analysis (or legacy job) id, also the bus channel
+            sink: Writes row fields (status, progress, progress_percent and
+                any finish() fields) to the database; None to only publish
+            bus: Defaults to the global ProgressBus
+            status: Status the analysis is already in
+        """
+        settings = get_settings()
+        self.analysis_id = analysis_id
+        self.sink = sink
+        self.bus = bus or get_progress_bus()
+        self.persist_interval = settings.progress_persist_interval if persist_interval is None else persist_interval
+        self.persist_steps = settings.progress_persist_steps if persist_steps is None else persist_steps
+        self.publish_interval = settings.progress_publish_interval if publish_interval is None else publish_interval
+
+        self._event = ProgressEvent(analysis_id, status)
+        self._persisted_status = status
+        self._unpersisted_steps = 0
+        self._unpublished = False
+        self._last_persist = time.monotonic()
+        self._lock = threading.Lock()
+        self._sink_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def update(self, message: Optional[str] = None, stage: Optional[str] = None,
+               percent: Optional[int] = None, status: Optional[str] = None):
+        """Record the current stage; returns immediately"""
+        if self._stopped.is_set():
+            return
+        with self._lock:
+            self._apply(message, stage, percent, status)
+            self._unpersisted_steps += 1
+            self._unpublished = True
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"progress-{self.analysis_id}", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def flush(self):
+        """Publish and persist pending state now"""
+        self._publish()
+        self._persist()
+
+    def stop(self):
+        """Stop the background thread, dropping state not yet persisted"""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        with self._lock:
+            self._unpersisted_steps = 0
+
+    def finish(self, status: str, message: Optional[str] = None, percent: Optional[int] = None,
+               persist: bool = True, **fields):
+        """
+        Record the terminal state in one write and publish it
+
+        Args:
+            status: Final status ("completed" / "failed"), or "pending" when
+                the job goes back to the queue for a retry
+            persist: False when the caller has already stored the final state
+            **fields: Extra row fields written with it (results, error_message...)
+
+        Raises whatever the sink raises: the final write must not be lost silently.
+        """
+        self.stop()
+        with self._lock:
+            self._apply(message, None, percent, status)
+            event = self._snapshot()
+            row = self._row(event, include_status=True)
+        if persist and self.sink:
+            row.update(fields)
+            with self._sink_lock:
+                self.sink(row)
+        self.bus.publish(event)
+
+    # Internal helpers
+
+    def _apply(self, message, stage, percent, status):
+        event = self._event
+        event.seq += 1
+        event.timestamp = time.time()
+        if message is not None:
+            event.message = message
+        if stage is not None:
+            event.stage = stage
+        if percent is not None:
+            event.percent = max(0, min(100, int(percent)))
+        if status is not None:
+            event.status = status
+
+    def _snapshot(self) -> ProgressEvent:
+        return ProgressEvent(**asdict(self._event))
+
+    def _row(self, event: ProgressEvent, include_status: bool) -> Dict:
+        row = {"progress": event.message, "progress_percent": event.percent}
+        if include_status:
+            row["status"] = event.status
+        return row
+
+    def _run(self):
+        while not self._stopped.is_set():
+            with self._lock:
+                pending = self._unpersisted_steps
+            timeout = None
+            if pending:
+                timeout = max(self.persist_interval - (time.monotonic() - self._last_persist), 0)
+            self._wake.wait(timeout)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            # Debounce: let a burst of stage changes collapse into one event
+            self._stopped.wait(self.publish_interval)
+            self._publish()
+            with self._lock:
+                due = (self._unpersisted_steps >= self.persist_steps or
+                       (self._unpersisted_steps and
+                        time.monotonic() - self._last_persist >= self.persist_interval))
+            if due:
+                self._persist()
+
+    def _publish(self):
+        with self._lock:
+            if not self._unpublished:
+                return
+            self._unpublished = False
+            event = self._snapshot()
+        self.bus.publish(event)
+
+    def _persist(self):
+        if self.sink is None:
+            return
+        with self._lock:
+            if not self._unpersisted_steps:
+                return
+            event = self._snapshot()
+            include_status = event.status != self._persisted_status
+            steps, self._unpersisted_steps = self._unpersisted_steps, 0
+            self._last_persist = time.monotonic()
+        try:
+            with self._sink_lock:
+                self.sink(self._row(event, include_status))
+            if include_status:
+                self._persisted_status = event.status
+        except Exception as e:
+            # Progress is advisory; retry with the next budget
+            logger.warning(f"Progress write for {self.analysis_id} failed: {e}")
+            with self._lock:
+                self._unpersisted_steps += steps
+
+
+_progress_bus: Optional[ProgressBus] = None
+
+
+def get_progress_bus() -> ProgressBus:
+    """Get global progress bus"""
+    global _progress_bus
+    if _progress_bus is None:
+        _progress_bus = ProgressBus()
+    return _progress_bus
+
+
+def sse_message(event: ProgressEvent) -> str:
+    """Server-Sent Events frame for a progress event"""
+    return f"event: progress\nid: {event.seq}\ndata: {event.to_json()}\n\n"
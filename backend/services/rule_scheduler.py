@@ -0,0 +1,277 @@
+"""
+Rule Scheduler
+Runs the PCB rule engines (MainsSafetyRules, BusInterfaceRules, ...) in a
+process pool instead of one after another on the calling thread.
+
+The rules are pure-Python and CPU-bound, so threads (as in DRCEngine) are
+serialized by the GIL. Here the parsed board is pickled once into a shared
+memory segment; each worker unpickles it at most once per analysis and then
+runs any number of engines against it. Issues are merged in the order the
+engines were given, so the output does not depend on which worker finished
+first, and every engine's wall time is reported.
+
+Usage:
+    specs = [RuleSpec(MainsSafetyRules, (fab_profile,)), ...]
+    result = get_rule_scheduler().run(pcb_data, specs)
+    result.issues, result.timings()
+"""
+import asyncio
+import logging
+import multiprocessing as mp
+import pickle
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import get_settings
+from rules import Issue
+from tracing import record_span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RuleSpec:
+    """A rule engine class and its constructor arguments (must be picklable)"""
+    engine: type
+    args: Tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return self.engine.__name__
+
+    def build(self):
+        return self.engine(*self.args, **self.kwargs)
+
+
+@dataclass
+class EngineRun:
+    """Outcome of one rule engine"""
+    name: str
+    seconds: float
+    issue_count: int = 0
+    error: Optional[str] = None
+    cpu_seconds: Optional[float] = None
+
+
+@dataclass
+class RuleRunResult:
+    """Merged output of a scheduler run"""
+    issues: List[Issue]
+    engines: List[EngineRun]
+    wall_seconds: float
+    mode: str  # "process" or "inline"
+    workers: int = 1
+
+    def timings(self) -> Dict[str, float]:
+        """Wall time per engine, in seconds"""
+        return {run.name: run.seconds for run in self.engines}
+
+    def to_dict(self) -> Dict:
+        """Summary for logs and stored results"""
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "wall_ms": round(self.wall_seconds * 1000, 1),
+            "engines": [
+                {
+                    "name": run.name,
+                    "ms": round(run.seconds * 1000, 1),
+                    "cpu_ms": None if run.cpu_seconds is None else round(run.cpu_seconds * 1000, 1),
+                    "issues": run.issue_count,
+                    "error": run.error,
+                }
+                for run in self.engines
+            ],
+        }
+
+
+def _run_spec(spec: RuleSpec, pcb_data) -> Tuple[List[Issue], float, float, Optional[str]]:
+    """Run one engine, capturing its wall and CPU time and any failure"""
+    start, cpu_start = time.perf_counter(), time.process_time()
+    issues, error = [], None
+    try:
+        issues = list(spec.build().analyze(pcb_data))
+    except Exception as e:
+        logger.debug(traceback.format_exc())
+        error = f"{e.__class__.__name__}: {e}"
+    return issues, time.perf_counter() - start, time.process_time() - cpu_start, error
+
+
+# Per-worker board snapshot: (segment name, unpickled board)
+_worker_board: Tuple[Optional[str], Any] = (None, None)
+
+
+def _load_shared_board(segment: str, size: int):
+    """Unpickle the board from shared memory, once per worker and segment"""
+    global _worker_board
+    if _worker_board[0] != segment:
+        shm = shared_memory.SharedMemory(name=segment)
+        try:
+            _worker_board = (segment, pickle.loads(shm.buf[:size]))
+        finally:
+            shm.close()
+    return _worker_board[1]
+
+
+def _worker_run(segment: str, size: int, spec: RuleSpec):
+    return _run_spec(spec, _load_shared_board(segment, size))
+
+
+def _pool_context():
+    """
+    Worker start method: the API process runs threads (cache sweeper,
+    Redis pool, executors), so workers are never plain-forked from it
+    """
+    if "forkserver" not in mp.get_all_start_methods():
+        return mp.get_context("spawn")
+    context = mp.get_context("forkserver")
+    # Workers fork from a server that has already imported the rule engines
+    context.set_forkserver_preload([__name__, "rules"])
+    return context
+
+
+class RuleScheduler:
+    """
+    Fans rule engines out to a shared process pool
+
+    Small boards (below min_components) and pool failures fall back to
+    running the engines inline, with the same result shape.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, min_components: Optional[int] = None):
+        settings = get_settings()
+        workers = settings.rule_workers if max_workers is None else max_workers
+        self.max_workers = workers if workers > 0 else (mp.cpu_count() or 1)
+        self.min_components = (
+            settings.rule_pool_min_components if min_components is None else min_components
+        )
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_pool_context())
+                logger.info(f"Rule scheduler pool started with {self.max_workers} workers")
+            return self._pool
+
+    def _reset_pool(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def run(self, pcb_data, specs: List[RuleSpec]) -> RuleRunResult:
+        """
+        Run every engine against pcb_data
+
+        Args:
+            pcb_data: Parsed board passed to each engine's analyze()
+            specs: Engines to run; issues are merged in this order
+
+        Returns:
+            RuleRunResult with merged issues and per-engine timings
+        """
+        start = time.perf_counter()
+        use_pool = (
+            self.max_workers > 1 and len(specs) > 1
+            and len(getattr(pcb_data, "components", None) or []) >= self.min_components
+        )
+
+        outcomes = None
+        if use_pool:
+            try:
+                outcomes = self._run_pool(pcb_data, specs)
+            except (BrokenProcessPool, OSError, pickle.PicklingError) as e:
+                logger.warning(f"Rule pool unavailable ({e}), running engines inline")
+                self._reset_pool()
+
+        mode = "process" if outcomes is not None else "inline"
+        if outcomes is None:
+            outcomes = [_run_spec(spec, pcb_data) for spec in specs]
+
+        issues: List[Issue] = []
+        engines: List[EngineRun] = []
+        for spec, (engine_issues, seconds, cpu_seconds, error) in zip(specs, outcomes):
+            if error:
+                logger.error(f"Rule engine {spec.name} failed: {error}")
+            else:
+                logger.info(f"{spec.name}: {len(engine_issues)} issues found ({seconds * 1000:.1f} ms)")
+            issues.extend(engine_issues)
+            engines.append(EngineRun(spec.name, seconds, len(engine_issues), error, cpu_seconds))
+            record_span(f"rule:{spec.name}", seconds, cpu_seconds, issues=len(engine_issues), mode=mode)
+
+        return RuleRunResult(
+            issues=issues,
+            engines=engines,
+            wall_seconds=time.perf_counter() - start,
+            mode=mode,
+            workers=min(self.max_workers, len(specs)) if mode == "process" else 1,
+        )
+
+    async def run_async(self, pcb_data, specs: List[RuleSpec]) -> RuleRunResult:
+        """run() without blocking the event loop"""
+        return await asyncio.to_thread(self.run, pcb_data, specs)
+
+    def _run_pool(self, pcb_data, specs: List[RuleSpec]):
+        payload = pickle.dumps(pcb_data, protocol=pickle.HIGHEST_PROTOCOL)
+        size = len(payload)
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            shm.buf[:size] = payload
+            del payload
+            pool = self._get_pool()
+            futures = [pool.submit(_worker_run, shm.name, size, spec) for spec in specs]
+            # Collected in submission order, which keeps the merge deterministic
+            return [self._collect(future) for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    @staticmethod
+    def _collect(future):
+        """
+        One engine's outcome from the pool
+
+        Pool failures propagate (run() falls back to inline); anything else
+        the worker raised outside the engine, or unpickling its issues, fails
+        only this engine, as in _run_spec.
+        """
+        try:
+            return future.result()
+        except (BrokenProcessPool, OSError, pickle.PicklingError):
+            raise
+        except Exception as e:
+            logger.debug(traceback.format_exc())
+            return [], 0.0, 0.0, f"{e.__class__.__name__}: {e}"
+
+
+_scheduler_instance: Optional[RuleScheduler] = None
+
+
+def get_rule_scheduler() -> RuleScheduler:
+    """Get global rule scheduler instance"""
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        _scheduler_instance = RuleScheduler()
+    return _scheduler_instance
+
+
+def shutdown_rule_scheduler():
+    """Stop the global scheduler's workers (application shutdown)"""
+    if _scheduler_instance is not None:
+        _scheduler_instance.shutdown()
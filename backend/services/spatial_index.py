@@ -0,0 +1,312 @@
+"""
+Spatial index for proximity-based design rule checks
+Uniform-grid bucketing of bounding boxes so clearance/spacing checks only
+compare objects that can actually be within the rule distance
+"""
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from models.canonical import Board, BoundingBox, Component, Track, Via, Zone
+from services import geometry_utils
+
+
+# (min_x, min_y, max_x, max_y)
+Box = Tuple[float, float, float, float]
+
+DEFAULT_CELL_SIZE = 5.0  # mm
+MIN_CELL_SIZE = 0.5  # mm
+
+
+def _box_gap_squared(a: Box, b: Box) -> float:
+    """Squared minimum distance between two boxes (0 if they overlap)"""
+    dx = max(0.0, b[0] - a[2], a[0] - b[2])
+    dy = max(0.0, b[1] - a[3], a[1] - b[3])
+    return dx * dx + dy * dy
+
+
+def _suggest_cell_size(boxes: List[Box]) -> float:
+    """Pick a cell size from the median object extent"""
+    if not boxes:
+        return DEFAULT_CELL_SIZE
+    extents = sorted(max(b[2] - b[0], b[3] - b[1]) for b in boxes)
+    median = extents[len(extents) // 2]
+    return max(MIN_CELL_SIZE, median * 2.0) if median > 0 else DEFAULT_CELL_SIZE
+
+
+class SpatialIndex:
+    """
+    Uniform grid index over axis-aligned bounding boxes
+
+    Each item is bucketed into every grid cell its box overlaps. Queries
+    return candidates in insertion order, so callers that previously looped
+    over a list see results in the same order as before.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        self.cell_size = max(cell_size, MIN_CELL_SIZE)
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._boxes: List[Box] = []
+        self._items: List[Any] = []
+
+    @classmethod
+    def from_items(cls, entries: List[Tuple[Any, Box]], cell_size: Optional[float] = None) -> "SpatialIndex":
+        """
+        Build an index from (item, box) pairs
+
+        Args:
+            entries: Items with their (min_x, min_y, max_x, max_y) boxes
+            cell_size: Grid cell size (default: derived from object sizes)
+        """
+        if cell_size is None:
+            cell_size = _suggest_cell_size([box for _, box in entries])
+        index = cls(cell_size)
+        for item, box in entries:
+            index.insert(item, box)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _cell_range(self, box: Box) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            math.floor(box[0] / size),
+            math.floor(box[1] / size),
+            math.floor(box[2] / size),
+            math.floor(box[3] / size),
+        )
+
+    def insert(self, item: Any, box: Box) -> int:
+        """Add an item with its bounding box, returns its index"""
+        idx = len(self._items)
+        self._items.append(item)
+        self._boxes.append(box)
+
+        cx0, cy0, cx1, cy1 = self._cell_range(box)
+        cells = self._cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cells[(cx, cy)].append(idx)
+        return idx
+
+    def query_indices(self, box: Box, distance: float = 0.0) -> List[int]:
+        """
+        Indices of items whose box lies within `distance` of `box`
+
+        The box-to-box gap is used as the filter, so this is a superset of
+        items whose true geometry is within `distance`. Callers still run
+        their exact check on the returned candidates.
+        """
+        expanded = (box[0] - distance, box[1] - distance, box[2] + distance, box[3] + distance)
+        cx0, cy0, cx1, cy1 = self._cell_range(expanded)
+        limit = distance * distance
+        boxes = self._boxes
+
+        # Query spans more cells than there are items: a linear pass is cheaper
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(boxes):
+            return [i for i, b in enumerate(boxes) if _box_gap_squared(box, b) <= limit]
+
+        found = set()
+        cells = self._cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+
+        return sorted(i for i in found if _box_gap_squared(box, boxes[i]) <= limit)
+
+    def query(self, box: Box, distance: float = 0.0) -> List[Any]:
+        """Items whose box lies within `distance` of `box`, in insertion order"""
+        items = self._items
+        return [items[i] for i in self.query_indices(box, distance)]
+
+    def pairs_within(self, distance: float) -> Iterator[Tuple[Any, Any]]:
+        """
+        Yield each unordered pair of items whose boxes are within `distance`
+
+        Pairs come out as (earlier, later) in insertion order, matching the
+        classic `for i ...: for j in range(i + 1, n)` loop.
+        """
+        items = self._items
+        for i, box in enumerate(self._boxes):
+            for j in self.query_indices(box, distance):
+                if j > i:
+                    yield items[i], items[j]
+
+
+def bbox_to_box(bbox: BoundingBox) -> Box:
+    """Convert a canonical BoundingBox to a plain tuple"""
+    return (bbox.min_x, bbox.min_y, bbox.max_x, bbox.max_y)
+
+
+def track_box(track: Track) -> Optional[Box]:
+    """Bounding box of a track segment including its width"""
+    if not track.start or not track.end:
+        return None
+    half = track.width / 2
+    return (
+        min(track.start.x, track.end.x) - half,
+        min(track.start.y, track.end.y) - half,
+        max(track.start.x, track.end.x) + half,
+        max(track.start.y, track.end.y) + half,
+    )
+
+
+def via_box(via: Via) -> Optional[Box]:
+    """Bounding box of a via pad"""
+    if not via.position:
+        return None
+    half = via.size / 2
+    return (via.position.x - half, via.position.y - half, via.position.x + half, via.position.y + half)
+
+
+def zone_box(zone: Zone) -> Optional[Box]:
+    """Bounding box of a zone polygon"""
+    if not zone.polygon or not zone.polygon.points:
+        return None
+    return bbox_to_box(zone.polygon.bounding_box())
+
+
+class BoardSpatialIndex:
+    """
+    Per-board collection of spatial indexes
+
+    Indexes are built lazily the first time a check asks for them and are
+    reused by every later proximity query on the same board. Use
+    `BoardSpatialIndex.for_board()` rather than constructing directly so the
+    index is shared between checks.
+    """
+
+    _ATTR = "_spatial_index"
+
+    def __init__(self, board: Board):
+        self.board = board
+        self._indexes: Dict[Tuple[str, Optional[str]], SpatialIndex] = {}
+        self._component_boxes: Dict[int, Box] = {}
+        self._signature = self._board_signature(board)
+
+    @staticmethod
+    def _board_signature(board: Board) -> Tuple[int, ...]:
+        return (
+            id(board.components), len(board.components),
+            id(board.tracks), len(board.tracks),
+            id(board.vias), len(board.vias),
+            id(board.zones), len(board.zones),
+        )
+
+    @classmethod
+    def for_board(cls, board: Board) -> "BoardSpatialIndex":
+        """Get the cached index for a board, rebuilding if the board changed"""
+        index = board.__dict__.get(cls._ATTR)
+        if index is None or index._signature != cls._board_signature(board):
+            index = cls(board)
+            board.__dict__[cls._ATTR] = index
+        return index
+
+    # --------------------------------------------------------------------------
+    # Components
+    # --------------------------------------------------------------------------
+
+    def component_box(self, component: Component) -> Optional[Box]:
+        """Component bounding box (pads/courtyard/footprint estimate), memoised"""
+        key = id(component)
+        box = self._component_boxes.get(key)
+        if box is None:
+            bbox = geometry_utils.component_bounding_box(component)
+            if bbox is None:
+                return None
+            box = bbox_to_box(bbox)
+            self._component_boxes[key] = box
+        return box
+
+    def _get_index(self, kind: str, key: Optional[str], build) -> SpatialIndex:
+        index = self._indexes.get((kind, key))
+        if index is None:
+            index = SpatialIndex.from_items(build())
+            self._indexes[(kind, key)] = index
+        return index
+
+    def component_boxes(self, side: Optional[str] = None) -> SpatialIndex:
+        """Index of positioned components by bounding box, optionally one side only"""
+        def build():
+            entries = []
+            for comp in self.board.components:
+                if not comp.position or (side is not None and comp.side.value != side):
+                    continue
+                box = self.component_box(comp)
+                if box is not None:
+                    entries.append((comp, box))
+            return entries
+        return self._get_index("component_boxes", side, build)
+
+    def component_centers(self, side: Optional[str] = None) -> SpatialIndex:
+        """Index of positioned components by placement point, optionally one side only"""
+        def build():
+            return [
+                (comp, (comp.position.x, comp.position.y, comp.position.x, comp.position.y))
+                for comp in self.board.components
+                if comp.position and (side is None or comp.side.value == side)
+            ]
+        return self._get_index("component_centers", side, build)
+
+    def components_near(self, component: Component, distance: float) -> List[Component]:
+        """Same-side components whose bounding box is within `distance` of `component`"""
+        box = self.component_box(component)
+        if box is None:
+            return []
+        return self.component_boxes(component.side.value).query(box, distance)
+
+    # --------------------------------------------------------------------------
+    # Copper
+    # --------------------------------------------------------------------------
+
+    def tracks(self, layer: Optional[str] = None) -> SpatialIndex:
+        """Index of track segments, optionally one layer only"""
+        def build():
+            entries = []
+            for track in self.board.tracks:
+                if layer is not None and track.layer != layer:
+                    continue
+                box = track_box(track)
+                if box is not None:
+                    entries.append((track, box))
+            return entries
+        return self._get_index("tracks", layer, build)
+
+    def vias(self) -> SpatialIndex:
+        """Index of vias (vias span layers, so there is no per-layer split)"""
+        def build():
+            entries = []
+            for via in self.board.vias:
+                box = via_box(via)
+                if box is not None:
+                    entries.append((via, box))
+            return entries
+        return self._get_index("vias", None, build)
+
+    def zones(self, layer: Optional[str] = None) -> SpatialIndex:
+        """Index of zone polygons, optionally one layer only"""
+        def build():
+            entries = []
+            for zone in self.board.zones:
+                if layer is not None and zone.layer != layer:
+                    continue
+                box = zone_box(zone)
+                if box is not None:
+                    entries.append((zone, box))
+            return entries
+        return self._get_index("zones", layer, build)
+
+    def tracks_near(self, box: Box, distance: float, layer: Optional[str] = None) -> List[Track]:
+        """Track candidates within `distance` of a box"""
+        return self.tracks(layer).query(box, distance)
+
+    def vias_near(self, box: Box, distance: float) -> List[Via]:
+        """Via candidates within `distance` of a box"""
+        return self.vias().query(box, distance)
+
+    def zones_near(self, box: Box, distance: float, layer: Optional[str] = None) -> List[Zone]:
+        """Zone candidates within `distance` of a box"""
+        return self.zones(layer).query(box, distance)
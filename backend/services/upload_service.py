@@ -21,6 +21,7 @@ from database import SessionLocal
 from models.project import Project
 from config import get_settings, ensure_upload_dir
 from services.file_loader import FileLoader
+from services.archive_ingest import ArchiveLimitError, ingest_single_file, release_project, stream_upload
 from services.cad_detector import CADToolDetector
 from parsers.format_detector import FormatDetector, FileFormat, EDAToolFamily
 
@@ -99,17 +100,16 @@ class UploadService:
         
         # Stream file to disk (never load full file into memory)
         uploaded_path = project_dir / filename
-        total_size = 0
-        chunk_size = 1024 * 1024  # 1MB chunks
         
         try:
-            with open(uploaded_path, 'wb') as f:
-                while chunk := await file.read(chunk_size):
-                    total_size += len(chunk)
-                    f.write(chunk)
+            # Hashed on the way in: the hash keys caches without re-reading the file
+            total_size, upload_sha256 = await stream_upload(file, uploaded_path)
             
             logger.info(f"✅ Streamed {total_size / 1024 / 1024:.2f}MB to {uploaded_path}")
             
+        except ArchiveLimitError as e:
+            shutil.rmtree(project_dir, ignore_errors=True)
+            raise HTTPException(status_code=413, detail=str(e))
         except Exception as e:
             # Clean up on error
             if uploaded_path.exists():
@@ -128,16 +128,20 @@ class UploadService:
         if is_zip:
             # Extract ZIP archive
             try:
-                organized_files = self.file_loader.extract_and_flatten(uploaded_path, extracted_path)
+                organized_files = self.file_loader.extract_and_flatten(uploaded_path, extracted_path, upload_sha256)
                 logger.info(f"Extracted ZIP: {[(k, len(v)) for k, v in organized_files.items()]}")
+            except ArchiveLimitError as e:
+                logger.warning(f"Rejected ZIP for {project_id}: {e}")
+                shutil.rmtree(project_dir)
+                raise HTTPException(status_code=400, detail=f"ZIP rejected: {e}")
             except Exception as e:
                 logger.error(f"Failed to extract ZIP: {e}", exc_info=True)
-                shutil.rmtree(project_dir)
+                release_project(project_dir)
                 raise HTTPException(status_code=400, detail="Invalid ZIP file")
         else:
-            # Single file - copy to extracted folder
+            # Single file - stored once and linked into the extracted folder
             dest_path = extracted_path / filename
-            shutil.copy2(uploaded_path, dest_path)
+            ingest_single_file(uploaded_path, extracted_path, upload_sha256)
             
             # Detect format and generate warning if incomplete
             detected = self.format_detector.detect_file(dest_path)
@@ -0,0 +1,180 @@
+"""
+Pipeline Tracing
+Lightweight spans for profiling the analysis pipeline
+
+A trace is a tree of spans. Each span records wall time, process CPU time,
+growth of the process's peak RSS, and the change in allocated memory blocks
+(a cheap proxy for live Python objects). Spans nest through a ContextVar, so
+code deep in a parser or rule engine can open a span without being handed
+a tracer; outside an active trace, span() only costs a ContextVar lookup.
+
+Every finished span is also observed in the
+boardmint_pipeline_stage_seconds histogram exposed on /metrics.
+
+Usage:
+    with trace("analysis", job_id=job_id) as root:
+        with span("parsing"):
+            ...
+    job.raw_results["profile"] = root.to_dict()
+"""
+import contextvars
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from metrics import histogram
+
+try:
+    import resource
+except ImportError:  # Windows: RSS is not reported
+    resource = None
+
+STAGE_SECONDS = histogram(
+    "boardmint_pipeline_stage_seconds",
+    "Wall time of analysis pipeline stages",
+    ["stage"],
+)
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+# ru_maxrss is in KB on Linux and bytes on macOS
+_RSS_DIVISOR = 1024 if sys.platform == "darwin" else 1
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // _RSS_DIVISOR
+
+
+@dataclass
+class Span:
+    """One timed stage of a trace"""
+    name: str
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    wall_ms: float = 0.0
+    cpu_ms: Optional[float] = None
+    peak_rss_delta_kb: Optional[int] = None
+    alloc_blocks_delta: Optional[int] = None
+    error: Optional[str] = None
+    children: List["Span"] = field(default_factory=list)
+
+    def set(self, **attributes):
+        """Attach attributes (counts, cache hits, ...) to the span"""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict:
+        data = {
+            "name": self.name,
+            "wall_ms": round(self.wall_ms, 2),
+            "cpu_ms": None if self.cpu_ms is None else round(self.cpu_ms, 2),
+            "peak_rss_delta_kb": self.peak_rss_delta_kb,
+            "alloc_blocks_delta": self.alloc_blocks_delta,
+        }
+        if self.attributes:
+            data["attributes"] = self.attributes
+        if self.error:
+            data["error"] = self.error
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+
+@contextmanager
+def _measure(s: Span) -> Iterator[Span]:
+    token = _current_span.set(s)
+    rss_before = _peak_rss_kb()
+    blocks_before = sys.getallocatedblocks()
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+    try:
+        yield s
+    except BaseException as e:
+        s.error = f"{e.__class__.__name__}: {e}"
+        raise
+    finally:
+        s.wall_ms = (time.perf_counter() - wall_before) * 1000
+        s.cpu_ms = (time.process_time() - cpu_before) * 1000
+        s.alloc_blocks_delta = sys.getallocatedblocks() - blocks_before
+        if rss_before is not None:
+            s.peak_rss_delta_kb = _peak_rss_kb() - rss_before
+        _current_span.reset(token)
+        STAGE_SECONDS.observe(s.wall_ms / 1000, stage=s.name)
+
+
+class trace:
+    """
+    Start a new trace whose root span becomes the current span
+
+    Use as a context manager, or call start()/finish() when the traced
+    code is too long to indent (both must run in the same context).
+    """
+
+    def __init__(self, name: str, **attributes):
+        self.root = Span(name, dict(attributes))
+        self._measure = None
+
+    def __enter__(self) -> Span:
+        self._measure = _measure(self.root)
+        return self._measure.__enter__()
+
+    def __exit__(self, *exc_info):
+        measure, self._measure = self._measure, None
+        return measure.__exit__(*exc_info) if measure else False
+
+    def start(self) -> "trace":
+        self.__enter__()
+        return self
+
+    def finish(self) -> Span:
+        """End the trace (idempotent) and return the root span"""
+        self.__exit__(None, None, None)
+        return self.root
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span]:
+    """
+    Time a stage as a child of the current span
+
+    Outside an active trace, yields a detached span and measures nothing.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield Span(name, dict(attributes))
+        return
+    child = Span(name, dict(attributes))
+    parent.children.append(child)
+    with _measure(child):
+        yield child
+
+
+def record_span(name: str, wall_seconds: float, cpu_seconds: Optional[float] = None, **attributes):
+    """Add a span measured elsewhere (e.g. in a worker process) to the current trace"""
+    parent = _current_span.get()
+    if parent is None:
+        return
+    STAGE_SECONDS.observe(wall_seconds, stage=name)
+    parent.children.append(Span(
+        name,
+        dict(attributes),
+        wall_ms=wall_seconds * 1000,
+        cpu_ms=None if cpu_seconds is None else cpu_seconds * 1000,
+    ))
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def in_current_context(fn: Callable) -> Callable:
+    """
+    Bind fn to a copy of the caller's trace context, for executor threads
+
+    Make one wrapper per submitted call: a context copy cannot be entered
+    by two threads at once.
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
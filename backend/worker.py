@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Job worker entry point
+Runs queued analyses in separate processes. Use this when the API is started
+with JOB_QUEUE_EMBEDDED_WORKERS=0 (workers scaled independently of the API)
+"""
+import argparse
+import logging
+import signal
+
+from config import get_settings
+from services.job_queue import get_job_queue
+from services.job_worker import WorkerSupervisor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument("--processes", type=int, default=max(settings.job_queue_embedded_workers, 1),
+                        help="Worker processes")
+    parser.add_argument("--small-lane", type=int, default=settings.job_queue_small_lane_workers,
+                        help="Processes reserved for small boards")
+    args = parser.parse_args()
+
+    get_job_queue().ensure_schema()
+    supervisor = WorkerSupervisor(args.processes, args.small_lane)
+    signal.signal(signal.SIGTERM, lambda *_: supervisor.request_stop())
+    supervisor.start()
+    try:
+        supervisor.join()
+    except KeyboardInterrupt:
+        logger.info("Stopping workers...")
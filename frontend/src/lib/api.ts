@@ -13,11 +13,9 @@ const api = axios.create({
   },
 })
 
-// Add auth token to requests if available
-// Supabase stores auth in localStorage with project-specific key
-api.interceptors.request.use(async (config) => {
-  // Try to get token from Supabase's localStorage
-  // Supabase uses format: sb-<project-ref>-auth-token
+// Try to get token from Supabase's localStorage
+// Supabase uses format: sb-<project-ref>-auth-token
+const getAccessToken = (): string | null => {
   const keys = Object.keys(localStorage)
   const supabaseKey = keys.find(key => key.startsWith('sb-') && key.endsWith('-auth-token'))
   
@@ -26,15 +24,22 @@ api.interceptors.request.use(async (config) => {
       const stored = localStorage.getItem(supabaseKey)
       if (stored) {
         const parsed = JSON.parse(stored)
-        const accessToken = parsed?.access_token
-        if (accessToken) {
-          config.headers.Authorization = `Bearer ${accessToken}`
-        }
+        return parsed?.access_token || null
       }
     } catch (e) {
       console.error('Failed to parse auth token:', e)
     }
   }
+  return null
+}
+
+// Add auth token to requests if available
+// Supabase stores auth in localStorage with project-specific key
+api.interceptors.request.use(async (config) => {
+  const accessToken = getAccessToken()
+  if (accessToken) {
+    config.headers.Authorization = `Bearer ${accessToken}`
+  }
   return config
 })
 
@@ -445,6 +450,58 @@ export const getAnalysisV2 = async (analysisId: string): Promise<any> => {
   return response.data
 }
 
+export interface AnalysisProgress {
+  analysis_id: string
+  status: string
+  message: string | null
+  stage: string | null
+  percent: number | null
+}
+
+/**
+ * Follow analysis progress over Server-Sent Events
+ * Uses fetch rather than EventSource so the auth header can be sent.
+ * Resolves when the analysis completes or fails (or the stream is aborted).
+ */
+export const streamAnalysisProgress = async (
+  analysisId: string,
+  onProgress: (progress: AnalysisProgress) => void,
+  signal?: AbortSignal
+): Promise<void> => {
+  const accessToken = getAccessToken()
+  const response = await fetch(`${API_BASE_URL}/api/analyses/${analysisId}/events`, {
+    headers: accessToken ? { Authorization: `Bearer ${accessToken}` } : {},
+    signal,
+  })
+  if (!response.ok || !response.body) {
+    throw new Error(`Progress stream failed: ${response.status}`)
+  }
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  while (true) {
+    const { done, value } = await reader.read()
+    if (done) return
+    buffer += decoder.decode(value, { stream: true })
+
+    // Events are separated by a blank line; keep-alive comments start with ':'
+    let boundary
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const frame = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      const data = frame
+        .split('\n')
+        .filter(line => line.startsWith('data: '))
+        .map(line => line.slice(6))
+        .join('\n')
+      if (data) {
+        onProgress(JSON.parse(data))
+      }
+    }
+  }
+}
+
 /**
  * List analyses for current org
  */
@@ -474,13 +531,44 @@ export const getAnalysisFilePurposes = async (analysisId: string): Promise<{
 /**
  * Get all issues with comments
  */
-export const getAnalysisIssues = async (analysisId: string): Promise<{
+export interface IssueQuery {
+  severity?: string[]
+  category?: string[]
+  layer?: string[]
+  status?: string[]
+  net?: string[]
+  component?: string[]
+  sort?: 'severity' | 'category' | 'issue_code' | 'position'
+  order?: 'asc' | 'desc'
+  cursor?: string
+  limit?: number
+}
+
+export interface IssueFacets {
+  total: number
+  severity: Record<string, number>
+  category: Record<string, number>
+  category_severity: Record<string, Record<string, number>>
+}
+
+export const getAnalysisIssues = async (analysisId: string, query: IssueQuery = {}): Promise<{
   analysis_id: string
   issues: any[]
+  next_cursor: string | null
+  facets: IssueFacets
   total_issues: number
   drc_summary: any
 }> => {
-  const response = await api.get(`/api/analyses/${analysisId}/issues`)
+  // List filters are sent comma-separated
+  const params: Record<string, string | number> = {}
+  for (const [key, value] of Object.entries(query)) {
+    if (Array.isArray(value)) {
+      if (value.length) params[key] = value.join(',')
+    } else if (value !== undefined) {
+      params[key] = value
+    }
+  }
+  const response = await api.get(`/api/analyses/${analysisId}/issues`, { params })
   return response.data
 }
 
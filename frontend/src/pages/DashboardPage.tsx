@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react'
 import { useParams, useNavigate } from 'react-router-dom'
-import { getAnalysisResults, getAnalysisPdfUrl, AnalysisResults } from '@/lib/api'
+import { getAnalysisResults, getAnalysisPdfUrl, streamAnalysisProgress, AnalysisResults } from '@/lib/api'
 import RiskBadge from '@/components/RiskBadge'
 import CategoryCard from '@/components/CategoryCard'
 import IssueCard from '@/components/IssueCard'
@@ -20,6 +20,7 @@ export default function DashboardPage() {
 
     let active = true // Track if component is mounted
     let timeoutId: NodeJS.Timeout | null = null
+    const controller = new AbortController()
 
     const fetchResults = async () => {
       if (!active) return // Don't fetch if unmounted
@@ -33,9 +34,8 @@ export default function DashboardPage() {
         setResults(data)
         setLoading(false)
 
-        // If still running, schedule next poll using setTimeout (not setInterval)
-        if (data.status === 'running' || data.status === 'pending') {
-          timeoutId = setTimeout(fetchResults, 3000)
+        if (data.status !== 'completed' && data.status !== 'failed') {
+          followProgress()
         }
       } catch (err: any) {
         if (active) {
@@ -45,11 +45,32 @@ export default function DashboardPage() {
       }
     }
 
+    // Live progress over SSE; results are fetched again once it finishes
+    const followProgress = async () => {
+      try {
+        await streamAnalysisProgress(jobId, (progress) => {
+          if (!active) return
+          setResults((current) => current && {
+            ...current,
+            status: progress.status,
+            progress: progress.message || current.progress,
+          })
+        }, controller.signal)
+        if (active) fetchResults()
+      } catch (err: any) {
+        // Stream unavailable: fall back to polling using setTimeout (not setInterval)
+        if (active) {
+          timeoutId = setTimeout(fetchResults, 3000)
+        }
+      }
+    }
+
     fetchResults()
 
     // Cleanup function
     return () => {
       active = false // Prevent state updates after unmount
+      controller.abort() // Close the progress stream
       if (timeoutId) {
         clearTimeout(timeoutId) // Cancel pending poll
       }